@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Interactive latency under batch load, with and without admission control.
+
+A steady stream of interactive requests runs alongside a flood of batch
+re-screening requests against one ArgusGateway whose upstream models are
+fixed-latency stand-ins with limited concurrency. Without admission
+control every request contends for the upstream; with it, batch may hold
+only its share of slots and interactive requests jump the queue.
+
+Usage: python scripts/bench_admission.py [--batch-clients 64] [--seconds 5] [--upstream 8]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.core.admission import AdmissionControl, Lane  # noqa: E402
+from argus.core.gateway import ArgusGateway  # noqa: E402
+from argus.llm.mock_llm import MockLLM  # noqa: E402
+
+
+class LimitedLLM(MockLLM):
+    """An upstream that serves at most `capacity` calls at a time."""
+
+    def __init__(self, latency, capacity):
+        super().__init__(latency_range=(0.0, 0.0))
+        self.latency = latency
+        self._slots = threading.Semaphore(capacity)
+
+    def get_response(self, prompt):
+        with self._slots:
+            time.sleep(self.latency)
+        return "ok"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else float("nan")
+
+
+def run(admission_on, batch_clients, seconds, upstream, latency):
+    guard_slots = threading.Semaphore(upstream)
+
+    def fake_guard(**kwargs):
+        with guard_slots:
+            time.sleep(latency)
+        return {"status": "success", "decision": "CLEAN", "reason": None}
+
+    admission = None
+    if admission_on:
+        lanes = {
+            "interactive": Lane("interactive", priority=0, max_queue=256, max_wait=2.0),
+            "batch": Lane("batch", priority=10, max_queue=4096, max_share=0.5, max_wait=60.0),
+        }
+        admission = AdmissionControl({"primary_llm": upstream, "l2_guard": upstream}, lanes, "interactive")
+
+    stop = threading.Event()
+    interactive_latencies = []
+    batch_done = [0]
+    lock = threading.Lock()
+
+    with patch("argus.core.gateway.analyze_response_with_guard", fake_guard):
+        gateway = ArgusGateway(llm=LimitedLLM(latency, upstream), admission=admission)
+        gateway.singleflight = None
+
+        def batch_client(i):
+            n = 0
+            while not stop.is_set():
+                gateway.process_prompt(f"TEST::safe::batch {i} {n}", lane="batch")
+                n += 1
+                with lock:
+                    batch_done[0] += 1
+
+        def interactive_client(i):
+            n = 0
+            while not stop.is_set():
+                start = time.perf_counter()
+                gateway.process_prompt(f"TEST::safe::interactive {i} {n}", lane="interactive")
+                interactive_latencies.append(time.perf_counter() - start)
+                n += 1
+                time.sleep(latency)
+
+        threads = [threading.Thread(target=batch_client, args=(i,)) for i in range(batch_clients)]
+        threads += [threading.Thread(target=interactive_client, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+    return interactive_latencies, batch_done[0], admission.stats() if admission else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--batch-clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--upstream", type=int, default=8, help="concurrent calls each upstream can serve")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per upstream call")
+    args = parser.parse_args()
+
+    print(f"{'admission':10s} {'p50':>8s} {'p99':>8s} {'inter':>7s} {'batch':>7s}")
+    for admission_on in (False, True):
+        latencies, batch, stats = run(admission_on, args.batch_clients, args.seconds, args.upstream, args.latency)
+        print(
+            f"{'on' if admission_on else 'off':10s} {percentile(latencies, 50) * 1000:7.0f}ms "
+            f"{percentile(latencies, 99) * 1000:7.0f}ms {len(latencies):7d} {batch:7d}"
+        )
+        if stats:
+            for stage, values in stats.items():
+                print(f"  {stage}: queued={values['queued']} shed={values['shed']}")
+
+
+if __name__ == "__main__":
+    main()
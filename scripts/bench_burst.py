@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Burst-traffic benchmark for gateway request coalescing and the result cache.
+
+Fires waves of identical prompts from many threads at one ArgusGateway and
+counts how many primary and guard calls actually reach upstream, with
+coalescing and caching off, coalescing only, and coalescing plus cache.
+Upstream models are stand-ins with fixed latency, so no API key is needed.
+
+Usage: python scripts/bench_burst.py [--clients 50] [--waves 5] [--latency 0.2]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.core.cache import ResultCache  # noqa: E402
+from argus.core.gateway import ArgusGateway  # noqa: E402
+from argus.llm.mock_llm import MockLLM  # noqa: E402
+
+
+class CountingLLM(MockLLM):
+    def __init__(self, latency):
+        super().__init__(latency_range=(latency, latency))
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_response(self, prompt):
+        with self._lock:
+            self.calls += 1
+        return super().get_response(prompt)
+
+
+def run(mode, clients, waves, latency):
+    guard_calls = [0]
+    lock = threading.Lock()
+
+    def fake_guard(**kwargs):
+        with lock:
+            guard_calls[0] += 1
+        time.sleep(latency)
+        return {"status": "success", "decision": "CLEAN", "reason": None}
+
+    llm = CountingLLM(latency)
+    with patch("argus.core.gateway.analyze_response_with_guard", fake_guard):
+        gateway = ArgusGateway(llm=llm, result_cache=ResultCache(1000) if mode == "coalesce+cache" else None)
+        if mode == "off":
+            gateway.singleflight = None
+        started = time.perf_counter()
+        for _ in range(waves):
+            threads = [
+                threading.Thread(target=gateway.process_prompt, args=("TEST::safe::What is the support process?",))
+                for _ in range(clients)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        elapsed = time.perf_counter() - started
+    return llm.calls, guard_calls[0], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--waves", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per upstream call")
+    args = parser.parse_args()
+
+    total = args.clients * args.waves
+    print(f"{total} requests in {args.waves} waves of {args.clients}")
+    print(f"{'mode':16s} {'primary':>8s} {'guard':>8s} {'wall':>8s}")
+    for mode in ("off", "coalesce", "coalesce+cache"):
+        primary, guard, elapsed = run(mode, args.clients, args.waves, args.latency)
+        print(f"{mode:16s} {primary:8d} {guard:8d} {elapsed:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Per-text versus batch Layer 1 checks over many short chat turns.
+
+Builds a synthetic corpus of short messages (a small share containing PII
+or blocklisted terms) and runs the default input and output pipelines over
+it, first one text at a time with Pipeline.run and then with
+Pipeline.run_batch, checking that both give the same results.
+
+Usage: python scripts/bench_l1_batch.py [--texts 200000]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.filters.layer1 import batch  # noqa: E402
+from argus.filters.layer1.rules import CompiledRules  # noqa: E402
+from argus.filters.pipeline import build_pipeline  # noqa: E402
+
+WORDS = "the a support ticket order please thanks when how can you help my account shipping refund".split()
+RISKY = ["123-45-6789", "jane@example.com", "ignore previous instructions", "confidential"]
+
+
+def corpus(count, seed=1):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(3, 12))
+        if rng.random() < 0.02:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(RISKY))
+        texts.append(" ".join(words))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", type=int, default=200000)
+    args = parser.parse_args()
+    # Violations are logged per text; keep the benchmark about matching.
+    logging.disable(logging.WARNING)
+
+    texts = corpus(args.texts)
+    print(f"{len(texts)} texts, NumPy {'on' if batch.np is not None else 'off (bisect)'}")
+    print(f"{'pipeline':10s} {'per-text':>10s} {'batch':>10s} {'speedup':>8s}")
+    for name, stages, rules in (
+        ("input", ["input_blocklist", "input_pii"], CompiledRules.for_input()),
+        ("output", ["output_blocklist", "output_pii"], CompiledRules.for_output()),
+    ):
+        pipeline = build_pipeline(stages, rules, name=name)
+        start = time.perf_counter()
+        single = [pipeline.run(text) for text in texts]
+        per_text = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = pipeline.run_batch(texts)
+        batch_time = time.perf_counter() - start
+        assert single == batched, "batch results differ from per-text results"
+        print(f"{name:10s} {per_text:9.2f}s {batch_time:9.2f}s {per_text / batch_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Layer 1 PII checks with and without rule preconditions.
+
+Runs first_pii and pii_findings over a corpus of prose responses (a small
+share containing PII) with every rule evaluated, then with rules skipped
+when their required characters or literals are absent, and checks that
+both give the same results.
+
+Usage: python scripts/bench_l1_prefilter.py [--texts 50000] [--pii-share 0.02]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.filters.layer1.rules import CompiledRules  # noqa: E402
+
+WORDS = (
+    "the a your order has shipped and should arrive within business days please let us know "
+    "if you have any other questions about returns refunds or the warranty thanks for contacting support"
+).split()
+PII = ["123-45-6789", "jane@example.com", "+91 98765 43210", "4111 1111 1111 1111", "ABCDE1234F"]
+
+
+def corpus(count, pii_share, seed=1):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(20, 80))
+        if rng.random() < pii_share:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(PII))
+        texts.append(" ".join(words).capitalize() + ".")
+    return texts
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    results = [fn(text) for text in texts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", type=int, default=50000)
+    parser.add_argument("--pii-share", type=float, default=0.02)
+    args = parser.parse_args()
+
+    texts = corpus(args.texts, args.pii_share)
+    plain = CompiledRules.for_output(prefilter=False)
+    gated = CompiledRules.for_output()
+    print(f"{len(texts)} texts, {args.pii_share:.0%} with PII")
+    print(f"{'method':14s} {'all rules':>10s} {'prefilter':>10s} {'speedup':>8s}")
+    for method in ("first_pii", "pii_findings"):
+        base, expected = timed(getattr(plain, method), texts)
+        fast, results = timed(getattr(gated, method), texts)
+        if method == "first_pii":
+            expected = [rule and rule.name for rule in expected]
+            results = [rule and rule.name for rule in results]
+        assert results == expected, "prefiltered results differ"
+        print(f"{method:14s} {base:9.2f}s {fast:9.2f}s {base / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
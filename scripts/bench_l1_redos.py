@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Worst-case latency benchmark for Layer 1 PII matching.
+
+Runs every PII rule, in its configured and in its hardened form, against a set
+of adversarial inputs built to maximise regex backtracking, and reports the
+slowest input per rule. Time per character should stay flat as the input size
+grows for the hardened rules; quadratic rules show up as a growing ratio.
+
+Usage: python scripts/bench_l1_redos.py [--sizes 8000 16000 32000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.filters.layer1.rules import CompiledRules  # noqa: E402
+
+
+def adversarial_inputs(size):
+    """Inputs that defeat early failure in the PII patterns."""
+    return {
+        "dot-word run": "a." * (size // 2),
+        "dot-word run + @": ("a." * 40 + "@") * (size // 81),
+        "dash run": "a-" * (size // 2),
+        "dash run + @": ("a-" * 32 + "@") * (size // 65),
+        "domain run": "a@" + "a." * (size // 2),
+        "digit/space run": "1 " * (size // 2),
+        "digit run": "1" * size,
+        "separator run": "1. (" * (size // 4),
+    }
+
+
+def worst_case(matcher, inputs):
+    worst = (0.0, None)
+    for name, text in inputs.items():
+        started = time.perf_counter()
+        matcher.search(text)
+        elapsed = time.perf_counter() - started
+        if elapsed > worst[0]:
+            worst = (elapsed, name)
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[8000, 16000, 32000])
+    args = parser.parse_args()
+
+    plain = CompiledRules.for_input()
+    hardened = CompiledRules.for_input(hardened=True)
+
+    print(f"{'rule':22s} {'risk':11s} " + " ".join(f"{'orig ' + str(n):>12s} {'hard ' + str(n):>12s}" for n in args.sizes))
+    for plain_rule, hard_rule in zip(plain.pii_rules, hardened.pii_rules):
+        cells = []
+        for size in args.sizes:
+            inputs = adversarial_inputs(size)
+            orig, _ = worst_case(plain_rule.matcher, inputs)
+            hard, _ = worst_case(hard_rule.matcher, inputs)
+            cells.append(f"{orig * 1000:10.1f}ms {hard * 1000:10.1f}ms")
+        print(f"{plain_rule.name:22s} {hard_rule.risk.level:11s} " + " ".join(cells))
+
+    size = max(args.sizes)
+    inputs = adversarial_inputs(size)
+    worst = 0.0
+    for text in inputs.values():
+        started = time.perf_counter()
+        for rule in hardened.pii_rules:
+            rule.matcher.search(text)
+        worst = max(worst, time.perf_counter() - started)
+    print(f"\nWorst full hardened PII sweep at {size} chars: {worst * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
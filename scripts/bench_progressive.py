@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Time from the last streamed token to release, with and without progressive L2.
+
+The primary LLM stand-in streams a multi-paragraph answer at a fixed
+token rate; the guard stand-in takes a base latency plus a cost per 1000
+input characters. Without progressive review the guard starts after the
+last token and sees the whole answer; with it, completed paragraphs are
+reviewed during generation and the final check sees only the tail.
+
+Usage: python scripts/bench_progressive.py [--paragraphs 8] [--token-delay 0.002] [--guard 0.3]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.config.settings import settings  # noqa: E402
+from argus.core.gateway import ArgusGateway  # noqa: E402
+from argus.llm.mock_llm import MockLLM  # noqa: E402
+
+PARAGRAPH = ("The onboarding guide walks new staff through account setup, shared drives and the weekly "
+             "planning meeting. Questions go to the team channel, where someone usually answers within "
+             "the hour. ")
+
+
+class StreamingLLM(MockLLM):
+    def __init__(self, paragraphs, token_delay):
+        super().__init__(latency_range=(0.0, 0.0))
+        self.paragraphs = paragraphs
+        self.token_delay = token_delay
+        self.last_token_at = 0.0
+
+    def stream_response(self, prompt):
+        for _ in range(self.paragraphs):
+            for word in (PARAGRAPH * 2).split(" "):
+                time.sleep(self.token_delay)
+                yield word + " "
+            yield "\n\n"
+        self.last_token_at = time.perf_counter()
+
+    def get_response(self, prompt):
+        return "".join(self.stream_response(prompt))
+
+
+def run(progressive, args):
+    calls = []
+
+    def fake_guard(user_prompt, response_text, prompt_template=None):
+        calls.append(len(response_text))
+        time.sleep(args.guard + args.guard_per_kchar * len(response_text) / 1000.0)
+        return {"status": "success", "decision": "CLEAN", "reason": None}
+
+    llm = StreamingLLM(args.paragraphs, args.token_delay)
+    with patch.object(settings, "l2_progressive", progressive), \
+            patch("argus.core.gateway.analyze_response_with_guard", fake_guard):
+        gateway = ArgusGateway(llm=llm)
+        gateway.singleflight = None
+        started = time.perf_counter()
+        gateway.process_prompt("Summarize the onboarding guide.")
+        finished = time.perf_counter()
+    return finished - started, finished - llm.last_token_at, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paragraphs", type=int, default=8)
+    parser.add_argument("--token-delay", type=float, default=0.002, help="seconds per streamed word")
+    parser.add_argument("--guard", type=float, default=0.3, help="guard base latency in seconds")
+    parser.add_argument("--guard-per-kchar", type=float, default=0.1, help="guard seconds per 1000 chars")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'progressive':12s} {'total':>8s} {'after-last':>10s} {'checks':>7s} {'final chars':>11s}")
+    for progressive in (False, True):
+        total, tail, calls = run(progressive, args)
+        final = calls[-1] if calls else 0
+        print(f"{'on' if progressive else 'off':12s} {total * 1000:6.0f}ms {tail * 1000:8.0f}ms "
+              f"{len(calls):7d} {final:11d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Multithreaded stress benchmark for the gateway core.
+
+Runs Layer 1 input and output checks on one shared policy engine from 1,
+2, 4 ... threads and reports throughput, then hammers one ArgusGateway
+(result cache and single-flight on, stand-in LLM and guard) from the same
+thread counts and checks every answer against a sequential run. On a
+standard build the GIL keeps CPU-bound L1 throughput flat; on a
+free-threaded build (python3.13t) it should grow with the thread count.
+
+Usage: python scripts/bench_threads.py [--texts 20000] [--max-threads 8]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from argus.core import gateway as gateway_module  # noqa: E402
+from argus.core.cache import ResultCache  # noqa: E402
+from argus.core.gateway import ArgusGateway  # noqa: E402
+from argus.core.policy import PolicyRegistry  # noqa: E402
+from argus.llm.base import BaseLLM  # noqa: E402
+from argus.utils.concurrency import gil_enabled  # noqa: E402
+
+WORDS = (
+    "the a your order has shipped and should arrive within business days please let us know "
+    "if you have any other questions about returns refunds or the warranty thanks for contacting support"
+).split()
+PII = ["123-45-6789", "jane@example.com", "+91 98765 43210", "4111 1111 1111 1111", "ABCDE1234F"]
+
+
+def corpus(count, seed=1):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(30, 120))
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(PII))
+        texts.append(" ".join(words).capitalize() + ".")
+    return texts
+
+
+class EchoLLM(BaseLLM):
+    def get_response(self, prompt):
+        return prompt
+
+    def get_model_name(self):
+        return "echo"
+
+
+def clean_guard(user_prompt, response_text, prompt_template=None):
+    return {"status": "success", "decision": "CLEAN", "reason": None}
+
+
+def run_threads(threads, work, items):
+    """Seconds for threads to process items (split evenly), all starting together."""
+    barrier = threading.Barrier(threads + 1)
+    chunks = [items[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        barrier.wait()
+        return [work(item) for item in chunk]
+
+    with ThreadPoolExecutor(threads) as pool:
+        futures = [pool.submit(worker, chunk) for chunk in chunks]
+        barrier.wait()
+        start = time.perf_counter()
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+    ordered = [None] * len(items)
+    for i, chunk_results in enumerate(results):
+        ordered[i::threads] = chunk_results
+    return elapsed, ordered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--max-threads", type=int, default=8)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_threads:
+        counts.append(counts[-1] * 2)
+    texts = corpus(args.texts)
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}, "
+          f"{os.cpu_count()} CPUs, {len(texts)} texts")
+
+    engine = PolicyRegistry().engine_for(None)
+
+    def l1(text):
+        return engine.input_pipeline.run(text).passed and engine.output_pipeline.run(text).passed
+
+    print("\nL1 input+output checks on one shared engine")
+    baseline, expected = None, None
+    for threads in counts:
+        elapsed, results = run_threads(threads, l1, texts)
+        expected = expected or results
+        baseline = baseline or elapsed
+        status = "ok" if results == expected else "MISMATCH"
+        print(f"  {threads:2d} thread(s) {len(texts) / elapsed:10.0f} texts/s  {baseline / elapsed:4.1f}x  {status}")
+
+    print("\nArgusGateway.process_prompt (result cache, single-flight, stand-in LLM and guard)")
+    prompts = texts[: max(1, len(texts) // 4)]
+    requests = prompts + prompts[: len(prompts) // 2]  # a third of the traffic repeats
+    with patch.object(gateway_module, "analyze_response_with_guard", clean_guard):
+        reference = ArgusGateway(llm=EchoLLM())
+        expected = {prompt: reference.process_prompt(prompt) for prompt in prompts}
+        reference.close()
+        for threads in counts:
+            gateway = ArgusGateway(llm=EchoLLM(), result_cache=ResultCache(len(prompts) * 2))
+            elapsed, results = run_threads(threads, gateway.process_prompt, requests)
+            wrong = sum(1 for prompt, result in zip(requests, results) if result != expected[prompt])
+            cache = gateway.result_cache
+            print(f"  {threads:2d} thread(s) {len(requests) / elapsed:10.0f} req/s  "
+                  f"cache {cache.hits}/{cache.hits + cache.misses} hits  "
+                  f"{'ok' if wrong == 0 else f'{wrong} WRONG'}")
+            gateway.close()
+
+
+if __name__ == "__main__":
+    main()
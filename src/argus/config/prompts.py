@@ -47,3 +47,14 @@ The primary AI assistant (whose intended role is: "{primary_role}") provided thi
 
 Respond ONLY with the specified JSON format: `{{ "decision": "CLEAN", "reason": null }}` or `{{ "decision": "VIOLATION", "reason": "REASON_CODE" }}`. Choose the single most relevant reason code if a violation is found. I REPEAT Do NOT include explanations, apologies, or any text outside this JSON structure. Accuracy and adherence to the format are critical and also DO NOT RETURN THE JSON IN MARKDOWN WITH (```) in the begiining and end JUST RAW TEXT JSON.
 """
+
+# JSON schema for structured-output guard models (GUARD_RESPONSE_FORMAT=json_schema)
+GUARD_VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "decision": {"type": "string", "enum": ["CLEAN", "VIOLATION"]},
+        "reason": {"type": ["string", "null"]},
+    },
+    "required": ["decision", "reason"],
+    "additionalProperties": False,
+}
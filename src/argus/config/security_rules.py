@@ -32,6 +32,75 @@ PII_PATTERNS = [
     re.compile(r"\bProjectArgusSecret\b", re.IGNORECASE),
 ]
 
+# Stable rule names for PII_PATTERNS, index-aligned; used to attribute findings
+PII_PATTERN_NAMES = [
+    "SSN",
+    "CREDIT_CARD",
+    "EMAIL",
+    "PHONE",
+    "AADHAAR",
+    "PAN",
+    "INDIAN_MOBILE",
+    "PIN_CODE",
+    "EMAIL_IN",
+    "INTERNATIONAL_PHONE",
+    "CREDIT_CARD_IN",
+    "DATE_OF_BIRTH",
+    "VOTER_ID",
+    "DRIVING_LICENSE",
+    "UPI_ID",
+    "CCN_REFERENCE",
+    "PROJECT_SECRET",
+]
+
+# PII kind reported for each rule name; kinds select the redaction token
+PII_PATTERN_KINDS = {
+    "SSN": "SSN",
+    "CREDIT_CARD": "CREDIT_CARD",
+    "EMAIL": "EMAIL",
+    "PHONE": "PHONE",
+    "AADHAAR": "AADHAAR",
+    "PAN": "PAN",
+    "INDIAN_MOBILE": "PHONE",
+    "PIN_CODE": "PIN_CODE",
+    "EMAIL_IN": "EMAIL",
+    "INTERNATIONAL_PHONE": "PHONE",
+    "CREDIT_CARD_IN": "CREDIT_CARD",
+    "DATE_OF_BIRTH": "DATE_OF_BIRTH",
+    "VOTER_ID": "VOTER_ID",
+    "DRIVING_LICENSE": "DRIVING_LICENSE",
+    "UPI_ID": "UPI_ID",
+    "CCN_REFERENCE": "CREDIT_CARD",
+    "PROJECT_SECRET": "SECRET",
+}
+
+# Replacement tokens used when PII is redacted instead of blocked
+PII_REDACTION_TOKENS = {
+    "SSN": "[REDACTED_SSN]",
+    "CREDIT_CARD": "[REDACTED_CARD]",
+    "EMAIL": "[REDACTED_EMAIL]",
+    "PHONE": "[REDACTED_PHONE]",
+    "AADHAAR": "[REDACTED_AADHAAR]",
+    "PAN": "[REDACTED_PAN]",
+    "PIN_CODE": "[REDACTED_PIN]",
+    "DATE_OF_BIRTH": "[REDACTED_DOB]",
+    "VOTER_ID": "[REDACTED_VOTER_ID]",
+    "DRIVING_LICENSE": "[REDACTED_DL]",
+    "UPI_ID": "[REDACTED_UPI]",
+    "SECRET": "[REDACTED]",
+}
+DEFAULT_REDACTION_TOKEN = "[REDACTED]"
+
+# Bounded rewrites used in hardened matching mode for rules whose original form
+# can backtrack quadratically on attacker-controlled text. Quantifiers are capped
+# at realistic maxima (e.g. 64-char email local parts) to keep matching linear.
+PII_SAFE_PATTERNS = {
+    "EMAIL": re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
+    "PHONE": re.compile(r"\b(?:\+?(\d{1,3}))?[-. (]{0,3}(\d{3})[-. )]{0,3}(\d{3})[-. ]{0,3}(\d{4})(?: {0,3}x(\d+))?\b"),
+    "EMAIL_IN": re.compile(r'\b[a-zA-Z0-9._%+-]{1,64}@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'),
+    "UPI_ID": re.compile(r'\b[a-zA-Z0-9.-]{2,64}@[a-zA-Z][a-zA-Z]{2,64}\b'),
+}
+
 INPUT_BLOCKLIST_TERMS = [
     "ignore previous instructions",
     "disregard the above",
@@ -3,7 +3,7 @@ Application settings using Pydantic for type safety and validation.
 """
 
 import os
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseSettings, Field
 from dotenv import load_dotenv
 
@@ -18,6 +18,15 @@ class ArgusSettings(BaseSettings):
         "deepseek/deepseek-r1-distill-qwen-32b:free", 
         env="GUARD_LLM_MODEL"
     )
+    guard_llm_provider: Optional[str] = Field("Nineteen", env="GUARD_LLM_PROVIDER")  # OpenRouter provider
+    
+    # Guard routing: targets as "model@provider" (JSON list); overrides the two above
+    guard_targets: List[str] = Field([], env="GUARD_TARGETS")
+    guard_router_alpha: float = Field(0.3, env="GUARD_ROUTER_ALPHA")  # EWMA weight of the newest call
+    guard_router_error_threshold: float = Field(0.5, env="GUARD_ROUTER_ERROR_THRESHOLD")
+    guard_router_cooldown: float = Field(30.0, env="GUARD_ROUTER_COOLDOWN")  # seconds before re-probing
+    guard_quorum_size: int = Field(1, env="GUARD_QUORUM_SIZE")  # >1 races that many targets
+    guard_quorum_clean: int = Field(2, env="GUARD_QUORUM_CLEAN")  # CLEAN verdicts needed to pass
     
     # Site Configuration
     site_url: str = Field("http://localhost:8000", env="YOUR_SITE_URL")
@@ -28,6 +37,125 @@ class ArgusSettings(BaseSettings):
     max_tokens: int = Field(6000, env="MAX_TOKENS")
     temperature: float = Field(0.1, env="TEMPERATURE")
     
+    # Guard LLM output handling
+    guard_streaming: bool = Field(False, env="GUARD_STREAMING")  # stop reading once the verdict is parsed
+    guard_response_format: str = Field("none", env="GUARD_RESPONSE_FORMAT")  # none | json_object | json_schema
+    guard_max_tokens: Optional[int] = Field(None, env="GUARD_MAX_TOKENS")  # overrides MAX_TOKENS for the guard
+    
+    # Primary LLM provider (mock | openai)
+    primary_llm_provider: str = Field("mock", env="PRIMARY_LLM_PROVIDER")
+    primary_llm_base_url: str = Field("http://localhost:8080/v1", env="PRIMARY_LLM_BASE_URL")
+    primary_llm_api_key: Optional[str] = Field(None, env="PRIMARY_LLM_API_KEY")
+    primary_llm_model: str = Field("gpt-4o-mini", env="PRIMARY_LLM_MODEL")
+    primary_llm_timeout: float = Field(30.0, env="PRIMARY_LLM_TIMEOUT")
+    primary_llm_max_tokens: int = Field(1024, env="PRIMARY_LLM_MAX_TOKENS")
+    primary_llm_max_connections: int = Field(32, env="PRIMARY_LLM_MAX_CONNECTIONS")
+    mock_llm_token_delay: float = Field(0.0, env="MOCK_LLM_TOKEN_DELAY")
+    
+    # Layer 1 filter pipelines (registered stage names, in order)
+    input_filter_stages: List[str] = Field(["input_blocklist", "input_pii"], env="INPUT_FILTER_STAGES")
+    output_filter_stages: List[str] = Field(["output_blocklist", "output_pii"], env="OUTPUT_FILTER_STAGES")
+    
+    # Layer 1 hardened matching (ReDoS protection)
+    l1_hardened_matching: bool = Field(False, env="L1_HARDENED_MATCHING")
+    l1_max_input_chars: int = Field(32768, env="L1_MAX_INPUT_CHARS")
+    l1_time_budget_ms: float = Field(50.0, env="L1_TIME_BUDGET_MS")
+    l1_budget_policy: str = Field("fail_closed", env="L1_BUDGET_POLICY")  # fail_closed | escalate
+    l1_profiling: bool = Field(False, env="L1_PROFILING")  # per-rule timing in the live filters
+    l1_prefilter: bool = Field(True, env="L1_PREFILTER")  # skip PII rules whose required characters are absent
+    l1_rules_artifact: Optional[str] = Field(None, env="L1_RULES_ARTIFACT")  # from `argus-rules compile`
+    
+    # PII handling in responses: block the response, or redact and continue
+    pii_action: str = Field("block", env="PII_ACTION")  # block | redact
+    pii_redaction_tokens: Dict[str, str] = Field({}, env="PII_REDACTION_TOKENS")  # JSON, per PII kind
+    
+    # Per-tenant policy profiles
+    policy_profiles_path: Optional[str] = Field(None, env="POLICY_PROFILES_PATH")
+    policy_cache_max_bytes: int = Field(64 * 1024 * 1024, env="POLICY_CACHE_MAX_BYTES")
+    
+    # Gateway request coalescing and result cache
+    singleflight_enabled: bool = Field(True, env="SINGLEFLIGHT_ENABLED")
+    result_cache_enabled: bool = Field(False, env="RESULT_CACHE_ENABLED")
+    result_cache_ttl: float = Field(30.0, env="RESULT_CACHE_TTL")  # seconds; per-tenant override in profiles
+    result_cache_max_entries: int = Field(10000, env="RESULT_CACHE_MAX_ENTRIES")
+    
+    # Multi-turn sessions (process_turn): LRU of per-conversation scan state
+    session_max_sessions: int = Field(10000, env="SESSION_MAX_SESSIONS")
+    session_ttl: float = Field(3600.0, env="SESSION_TTL")  # seconds idle before a session is dropped
+    session_overlap_chars: int = Field(256, env="SESSION_OVERLAP_CHARS")  # earlier text rescanned with each turn
+    session_history_turns: int = Field(20, env="SESSION_HISTORY_TURNS")  # exchanges sent to the primary LLM
+    session_context_turns: int = Field(3, env="SESSION_CONTEXT_TURNS")  # exchanges summarized for the guard
+    session_context_chars: int = Field(200, env="SESSION_CONTEXT_CHARS")
+    
+    # Admission control: slots per slow stage and priority lanes (JSON, see core/admission.py)
+    admission_enabled: bool = Field(False, env="ADMISSION_ENABLED")
+    admission_primary_slots: int = Field(64, env="ADMISSION_PRIMARY_SLOTS")
+    admission_guard_slots: int = Field(32, env="ADMISSION_GUARD_SLOTS")
+    admission_lanes: Dict[str, Dict[str, float]] = Field({}, env="ADMISSION_LANES")
+    admission_default_lane: str = Field("interactive", env="ADMISSION_DEFAULT_LANE")
+    
+    # End-to-end request deadline, split across the primary LLM and guard stages
+    request_timeout: Optional[float] = Field(None, env="REQUEST_TIMEOUT")  # seconds; callers may pass their own
+    deadline_l2_reserve: float = Field(2.0, env="DEADLINE_L2_RESERVE")  # seconds the primary LLM leaves for L2
+    deadline_action: str = Field("block", env="DEADLINE_ACTION")  # block | release | defer; per-tenant in profiles
+    # Threads running stage calls under a deadline; unset, twice the admission slots (room for abandoned calls)
+    deadline_workers: Optional[int] = Field(None, env="DEADLINE_WORKERS")
+    
+    # Per-client reputation (process_prompt client_id=): decaying violation scores
+    reputation_enabled: bool = Field(False, env="REPUTATION_ENABLED")
+    reputation_max_clients: int = Field(100000, env="REPUTATION_MAX_CLIENTS")
+    reputation_half_life: float = Field(900.0, env="REPUTATION_HALF_LIFE")  # seconds for a score to halve
+    reputation_escalate_score: float = Field(2.0, env="REPUTATION_ESCALATE_SCORE")
+    reputation_block_score: float = Field(8.0, env="REPUTATION_BLOCK_SCORE")  # 0 never blocks
+    reputation_action: str = Field("block", env="REPUTATION_ACTION")  # block | escalate; per-tenant in profiles
+    reputation_trusted_requests: int = Field(20, env="REPUTATION_TRUSTED_REQUESTS")  # clean requests in a row
+    reputation_trusted_sample_factor: float = Field(0.5, env="REPUTATION_TRUSTED_SAMPLE_FACTOR")
+    reputation_throttle_lane: Optional[str] = Field(None, env="REPUTATION_THROTTLE_LANE")
+    reputation_weights: Dict[str, float] = Field({}, env="REPUTATION_WEIGHTS")  # offence kind -> score added
+    
+    # L2 review mode: "sync" reviews every response before release; "sampled" reviews a
+    # fraction (plus every high-risk response) synchronously and queues the rest.
+    l2_review_mode: str = Field("sync", env="L2_REVIEW_MODE")  # sync | sampled
+    l2_sync_rate: float = Field(0.1, env="L2_SYNC_RATE")
+    l2_sync_min_risk: float = Field(0.5, env="L2_SYNC_MIN_RISK")
+    l2_review_queue_path: str = Field("argus_reviews.db", env="L2_REVIEW_QUEUE_PATH")
+    l2_review_workers: int = Field(2, env="L2_REVIEW_WORKERS")
+    l2_review_max_attempts: int = Field(3, env="L2_REVIEW_MAX_ATTEMPTS")
+    l2_review_retry_backoff: float = Field(1.0, env="L2_REVIEW_RETRY_BACKOFF")  # seconds, doubled per attempt
+    l2_review_retry_max_backoff: float = Field(60.0, env="L2_REVIEW_RETRY_MAX_BACKOFF")
+    
+    # Progressive L2: guard checks on completed stretches of a streaming primary response
+    l2_progressive: bool = Field(False, env="L2_PROGRESSIVE")
+    l2_progressive_min_chars: int = Field(400, env="L2_PROGRESSIVE_MIN_CHARS")  # new text per check
+    l2_progressive_overlap_chars: int = Field(200, env="L2_PROGRESSIVE_OVERLAP_CHARS")  # reviewed text resent as context
+    l2_progressive_max_in_flight: int = Field(4, env="L2_PROGRESSIVE_MAX_IN_FLIGHT")  # concurrent checks per response
+    
+    # L2 compaction: send the guard only the highest-risk sentences of long text, within a token budget
+    l2_compaction: bool = Field(False, env="L2_COMPACTION")
+    l2_compaction_budget_tokens: int = Field(200, env="L2_COMPACTION_BUDGET_TOKENS")  # response excerpts
+    l2_compaction_prompt_tokens: int = Field(100, env="L2_COMPACTION_PROMPT_TOKENS")  # prompt excerpts
+    
+    # Traffic capture for offline replay (argus-eval --replay)
+    capture_path: Optional[str] = Field(None, env="CAPTURE_PATH")  # JSONL, gzip when it ends in .gz
+    capture_content: str = Field("full", env="CAPTURE_CONTENT")  # full | hash | redact
+    capture_sample_rate: float = Field(1.0, env="CAPTURE_SAMPLE_RATE")
+    
+    # Sidecar: gateway and standalone L1 checks over a Unix domain socket (argus-sidecar)
+    sidecar_socket_path: str = Field("/tmp/argus-sidecar.sock", env="SIDECAR_SOCKET_PATH")
+    sidecar_workers: int = Field(32, env="SIDECAR_WORKERS")  # concurrent gateway calls
+    sidecar_max_frame_bytes: int = Field(16 * 1024 * 1024, env="SIDECAR_MAX_FRAME_BYTES")
+    
+    # Decision journal and alerts for violations found after release
+    decision_journal_path: Optional[str] = Field(None, env="DECISION_JOURNAL_PATH")
+    alert_webhook_url: Optional[str] = Field(None, env="ALERT_WEBHOOK_URL")
+    
+    # Request tracing (exporter: memory | jsonl | otlp)
+    tracing_enabled: bool = Field(False, env="TRACING_ENABLED")
+    tracing_sample_rate: float = Field(0.05, env="TRACING_SAMPLE_RATE")
+    tracing_exporter: str = Field("jsonl", env="TRACING_EXPORTER")
+    tracing_jsonl_path: str = Field("argus_traces.jsonl", env="TRACING_JSONL_PATH")
+    tracing_otlp_endpoint: str = Field("http://localhost:4318/v1/traces", env="TRACING_OTLP_ENDPOINT")
+    
     # Logging
     log_level: str = Field("INFO", env="LOG_LEVEL")
     log_format: str = Field(
@@ -0,0 +1,218 @@
+"""
+Admission control: bounded, prioritised queues in front of the slow stages.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, Mapping, Optional
+
+from ..config.settings import ArgusSettings, settings
+from .exceptions import ConfigurationError, OverloadedError
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Lane:
+    """
+    A class of traffic.
+
+    Lower priority values are served first. max_share caps the fraction of
+    a stage's slots the lane may hold, so batch work cannot starve
+    interactive traffic; max_wait bounds queueing when the caller gives no
+    deadline.
+    """
+    name: str
+    priority: int = 0
+    max_queue: int = 256
+    max_share: float = 1.0
+    max_wait: float = 5.0
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping[str, Any]) -> "Lane":
+        unknown = set(data) - {"priority", "max_queue", "max_share", "max_wait"}
+        if unknown:
+            raise ConfigurationError(f"Unknown admission lane keys for '{name}': {sorted(unknown)}")
+        lane = cls(name, **data)
+        if not 0.0 < lane.max_share <= 1.0:
+            raise ConfigurationError(f"max_share for lane '{name}' must be in (0, 1]")
+        return lane
+
+
+class _Waiter:
+    __slots__ = ("lane", "granted")
+
+    def __init__(self, lane: Lane):
+        self.lane = lane
+        self.granted = False
+
+
+class AdmissionController:
+    """
+    Admits work to one stage through a fixed number of slots.
+
+    Waiting requests queue per lane and are granted slots in priority
+    order. A request is shed immediately, with OverloadedError, when its
+    lane queue is full or when the predicted wait (requests ahead of it
+    times the EWMA service time, spread over the slots) exceeds its
+    remaining budget; it is also shed if the budget runs out while queued.
+    """
+
+    def __init__(self, stage: str, slots: int, lanes: Mapping[str, Lane], alpha: float = 0.2):
+        if slots < 1:
+            raise ConfigurationError(f"Admission stage '{stage}' needs at least one slot")
+        self.stage = stage
+        self.slots = slots
+        self.lanes = dict(lanes)
+        self.alpha = alpha
+        self.service_time = 0.0
+        self._by_priority = sorted(self.lanes.values(), key=lambda lane: lane.priority)
+        self._lane_slots = {name: max(1, int(slots * lane.max_share)) for name, lane in self.lanes.items()}
+        self._in_flight = 0
+        self._lane_in_flight = {name: 0 for name in self.lanes}
+        self._queues: Dict[str, Deque[_Waiter]] = {name: deque() for name in self.lanes}
+        self._admitted = {name: 0 for name in self.lanes}
+        self._shed = {name: 0 for name in self.lanes}
+        self._cond = threading.Condition()
+
+    def _can_run(self, lane: Lane) -> bool:
+        return self._in_flight < self.slots and self._lane_in_flight[lane.name] < self._lane_slots[lane.name]
+
+    def _ahead_of(self, lane: Lane) -> int:
+        return sum(len(self._queues[other.name]) for other in self._by_priority if other.priority <= lane.priority)
+
+    def _take(self, lane: Lane) -> None:
+        self._in_flight += 1
+        self._lane_in_flight[lane.name] += 1
+        self._admitted[lane.name] += 1
+
+    def _reject(self, lane: Lane, reason: str, predicted_wait: float = 0.0) -> OverloadedError:
+        self._shed[lane.name] += 1
+        return OverloadedError(self.stage, lane.name, reason, predicted_wait)
+
+    def acquire(self, lane_name: str, budget: Optional[float] = None) -> Lane:
+        """Wait for a slot or raise OverloadedError. budget is seconds; None uses the lane's max_wait."""
+        lane = self.lanes.get(lane_name)
+        if lane is None:
+            raise ConfigurationError(f"Unknown admission lane '{lane_name}'")
+        if budget is None:
+            budget = lane.max_wait
+        with self._cond:
+            # Slots are dispatched on every release, so anyone still queued in another
+            # lane is held back by its own share; only this lane's FIFO order matters.
+            if self._can_run(lane) and not self._queues[lane.name]:
+                self._take(lane)
+                return lane
+            if len(self._queues[lane.name]) >= lane.max_queue:
+                raise self._reject(lane, "queue_full")
+            predicted = (self._ahead_of(lane) + 1) * self.service_time / self.slots
+            if predicted > budget:
+                raise self._reject(lane, "predicted_wait", predicted)
+            waiter = _Waiter(lane)
+            self._queues[lane.name].append(waiter)
+            deadline = time.monotonic() + budget
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queues[lane.name].remove(waiter)
+                    raise self._reject(lane, "timeout", budget)
+                self._cond.wait(remaining)
+            return lane
+
+    def release(self, lane: Lane, elapsed: float) -> None:
+        """Return a slot, fold elapsed into the service time and grant waiting requests."""
+        with self._cond:
+            self._in_flight -= 1
+            self._lane_in_flight[lane.name] -= 1
+            self.service_time += self.alpha * (elapsed - self.service_time)
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        granted = False
+        for lane in self._by_priority:
+            queue = self._queues[lane.name]
+            while queue and self._can_run(lane):
+                waiter = queue.popleft()
+                waiter.granted = True
+                self._take(lane)
+                granted = True
+        if granted:
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, lane_name: str, budget: Optional[float] = None) -> Iterator[Lane]:
+        """Hold a slot for the duration of the block."""
+        lane = self.acquire(lane_name, budget)
+        start = time.monotonic()
+        try:
+            yield lane
+        finally:
+            self.release(lane, time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "in_flight": self._in_flight,
+                "service_time": round(self.service_time, 6),
+                "queued": {name: len(queue) for name, queue in self._queues.items()},
+                "admitted": dict(self._admitted),
+                "shed": dict(self._shed),
+            }
+
+
+DEFAULT_LANES = {
+    "interactive": {"priority": 0, "max_queue": 256, "max_share": 1.0, "max_wait": 2.0},
+    "batch": {"priority": 10, "max_queue": 4096, "max_share": 0.5, "max_wait": 60.0},
+}
+
+
+def configured_lanes(config: Optional[ArgusSettings] = None) -> Dict[str, Lane]:
+    """The admission lanes config defines (DEFAULT_LANES when it defines none)."""
+    config = config or settings
+    lane_config = config.admission_lanes or DEFAULT_LANES
+    return {name: Lane.from_dict(name, data) for name, data in lane_config.items()}
+
+
+class AdmissionControl:
+    """
+    One AdmissionController per gateway stage, sharing a lane table.
+
+    A request naming no lane, or a lane the table does not define, is
+    admitted through the default lane.
+    """
+
+    def __init__(self, stage_slots: Mapping[str, int], lanes: Mapping[str, Lane], default_lane: str):
+        if default_lane not in lanes:
+            raise ConfigurationError(f"Default admission lane '{default_lane}' is not defined")
+        self.lanes = dict(lanes)
+        self.default_lane = default_lane
+        self.stages = {stage: AdmissionController(stage, slots, lanes) for stage, slots in stage_slots.items()}
+
+    @classmethod
+    def from_settings(cls, config: Optional[ArgusSettings] = None) -> "AdmissionControl":
+        config = config or settings
+        return cls(
+            {"primary_llm": config.admission_primary_slots, "l2_guard": config.admission_guard_slots},
+            configured_lanes(config),
+            config.admission_default_lane,
+        )
+
+    def lane_for(self, lane_name: Optional[str]) -> str:
+        """The lane a request asking for lane_name is admitted through."""
+        if lane_name is None:
+            return self.default_lane
+        if lane_name not in self.lanes:
+            logger.warning(f"Unknown admission lane '{lane_name}'. Using the '{self.default_lane}' lane.")
+            return self.default_lane
+        return lane_name
+
+    def admit(self, stage: str, lane_name: Optional[str], budget: Optional[float] = None):
+        return self.stages[stage].admit(self.lane_for(lane_name), budget)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, in-flight, admitted and shed counts per stage and lane."""
+        return {stage: controller.stats() for stage, controller in self.stages.items()}
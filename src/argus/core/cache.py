@@ -0,0 +1,128 @@
+"""
+Request coalescing and a short-TTL result cache for the gateway.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def cache_key(policy_fingerprint: str, prompt: str, variant: str = "") -> str:
+    """
+    Key for one prompt under one policy version (and gateway mode, via variant).
+
+    The prompt is keyed exactly as received: L1 sees whitespace and Unicode
+    form, so two spellings that differ only in them can get different verdicts.
+    """
+    content = "\0".join((policy_fingerprint, variant, prompt))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "shared")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.shared = True
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+
+    Callers that arrive while a call for their key is in flight wait for it
+    and share its result (or its exception) instead of running their own.
+    A caller runs fn itself when the result is not for sharing (share
+    returns False for it) or when timeout seconds pass first.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T], timeout: Optional[float] = None,
+           share: Optional[Callable[[T], bool]] = None) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            if not call.done.wait(timeout) or not call.shared:
+                with self._lock:
+                    self.coalesced -= 1
+                    self.executions += 1
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            call.shared = share is None or share(call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class ResultCache:
+    """Bounded LRU of results, each with its own expiry.
+
+    The gateway stores (text, offence) pairs, so a hit is charged to the
+    caller's reputation just as a fresh evaluation would be.
+    """
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,265 @@
+"""
+Traffic capture for offline replay.
+
+With CAPTURE_PATH set, the gateway records each request: its arrival
+time, the prompt, the primary response, every guard call with its verdict,
+the decisions taken and how long each slow stage took. Records are
+written as one JSON object per line, gzip-compressed when the path ends
+in .gz. evaluation/replay.py feeds them back through a gateway.
+
+Content is kept in full, hashed (CAPTURE_CONTENT=hash: only digests and
+lengths are stored, and client and session ids are replaced by keyed
+pseudonyms) or with PII masked by the L1 rules (redact). The
+record of the request in progress lives in a context variable, so the
+gateway notes stages without passing it around; worker threads started
+with a copied context note into the same record.
+"""
+
+import contextvars
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from ..config.settings import ArgusSettings, settings
+from ..filters.layer1.rules import get_default_rules
+from .journal import prompt_digest
+
+logger = logging.getLogger(__name__)
+
+# Gateway entry points
+PROMPT = "prompt"
+TURN = "turn"
+
+# Content modes
+FULL = "full"
+HASH = "hash"
+REDACT = "redact"
+CONTENT_MODES = (FULL, HASH, REDACT)
+
+
+@dataclass
+class GuardCall:
+    """One guard call: input size, time taken and verdict."""
+    chars: int
+    seconds: float
+    status: Optional[str] = None
+    decision: Optional[str] = None
+    reason: Optional[str] = None
+
+    def verdict(self) -> Dict[str, Optional[str]]:
+        return {"status": self.status, "decision": self.decision, "reason": self.reason}
+
+
+@dataclass
+class Interaction:
+    """
+    One captured request.
+
+    at is the arrival time in seconds since the capture started. prompt and
+    response are None when content was hashed; their digests and lengths
+    are always kept. abandoned maps a stage that ran out of time to the
+    budget it had. decisions are (stage, decision, reason) as journalled.
+    """
+    op: str
+    prompt: Optional[str] = None
+    prompt_sha: str = ""
+    prompt_chars: int = 0
+    at: float = 0.0
+    tenant: Optional[str] = None
+    lane: Optional[str] = None
+    client: Optional[str] = None
+    session: Optional[str] = None
+    timeout: Optional[float] = None
+    response: Optional[str] = None
+    response_sha: Optional[str] = None
+    response_chars: Optional[int] = None
+    primary_seconds: Optional[float] = None
+    guard: List[GuardCall] = field(default_factory=list)
+    abandoned: Dict[str, float] = field(default_factory=dict)
+    decisions: List[List[Optional[str]]] = field(default_factory=list)
+    blocked: Optional[bool] = None
+    total_seconds: float = 0.0
+    content: str = FULL
+
+    def outcome(self) -> str:
+        """The first non-clean decision as 'STAGE:DECISION', else CLEAN (or BLOCKED for any other refusal)."""
+        for stage, decision, _ in self.decisions:
+            if decision != "CLEAN":
+                return f"{stage}:{decision}"
+        return "BLOCKED" if self.blocked else "CLEAN"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        # Compact lines: defaults are left out and restored by from_dict.
+        return {key: value for key, value in data.items() if value not in (None, [], {})}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Interaction":
+        data = dict(data)
+        data["guard"] = [GuardCall(**call) for call in data.get("guard", [])]
+        return cls(**data)
+
+
+def _masked(text: str) -> str:
+    return get_default_rules("OUTPUT").redact(text)[0]
+
+
+def _pseudonym(value: Optional[str], key: bytes) -> Optional[str]:
+    """HMAC of an identifier: stable within one capture, not reversible by guessing without the key."""
+    if value is None:
+        return None
+    return hmac.new(key, value.encode("utf-8", "surrogatepass"), hashlib.sha256).hexdigest()[:16]
+
+
+def _stored(interaction: Interaction, mode: str, key: bytes) -> Interaction:
+    """A copy of interaction with its content hashed or masked as mode requires; key keys the pseudonyms."""
+    stored = replace(interaction, guard=list(interaction.guard), decisions=list(interaction.decisions),
+                     abandoned=dict(interaction.abandoned), content=mode,
+                     prompt_sha=prompt_digest(interaction.prompt), prompt_chars=len(interaction.prompt))
+    if interaction.response is not None:
+        stored.response_sha = prompt_digest(interaction.response)
+        stored.response_chars = len(interaction.response)
+    if mode == HASH:
+        stored.prompt = stored.response = None
+        stored.client = _pseudonym(interaction.client, key)
+        stored.session = _pseudonym(interaction.session, key)
+    elif mode == REDACT:
+        stored.prompt = _masked(interaction.prompt or "")
+        stored.response = _masked(interaction.response) if interaction.response is not None else None
+    return stored
+
+
+_current: "contextvars.ContextVar[Optional[Interaction]]" = contextvars.ContextVar("argus_capture", default=None)
+_collector: "contextvars.ContextVar[Optional[List[Interaction]]]" = contextvars.ContextVar(
+    "argus_capture_collector", default=None)
+
+
+class TrafficRecorder:
+    """
+    Writes captured interactions to a JSONL file (gzip for .gz paths).
+
+    Without a path, records are only kept in the bounded recent buffer and
+    handed to collectors. sample_rate is the fraction of requests captured.
+    Client and session pseudonyms (content mode hash) are keyed with a
+    random secret held only by this recorder, so the same id maps to the
+    same pseudonym throughout one capture and differently in the next.
+    """
+
+    def __init__(self, path: Optional[str] = None, content: str = FULL, sample_rate: float = 1.0,
+                 buffer_size: int = 1000):
+        if content not in CONTENT_MODES:
+            raise ValueError(f"Unknown capture content mode '{content}'")
+        self.path = path
+        self.content = content
+        self.sample_rate = sample_rate
+        self.recent: Deque[Interaction] = deque(maxlen=buffer_size)
+        self.started = time.monotonic()
+        self._key = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            self._file = gzip.open(path, "at", encoding="utf-8") if path.endswith(".gz") \
+                else open(path, "a", encoding="utf-8")
+            logger.info(f"Capturing {sample_rate:.0%} of gateway traffic to {path} (content: {content}).")
+
+    @classmethod
+    def from_settings(cls, config: Optional[ArgusSettings] = None) -> "TrafficRecorder":
+        config = config or settings
+        return cls(config.capture_path, config.capture_content, config.capture_sample_rate)
+
+    @contextmanager
+    def record(self, op: str, prompt: str, **attributes: Any) -> Iterator[Optional[Interaction]]:
+        """
+        Capture one request made inside the block; yields None when it is not sampled.
+
+        Set the yielded interaction's blocked flag before leaving the block.
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            yield None
+            return
+        started = time.monotonic()
+        interaction = Interaction(op=op, prompt=prompt, at=round(started - self.started, 6), **attributes)
+        token = _current.set(interaction)
+        try:
+            yield interaction
+        finally:
+            _current.reset(token)
+            interaction.total_seconds = round(time.monotonic() - started, 6)
+            self.write(interaction)
+
+    def write(self, interaction: Interaction) -> None:
+        stored = _stored(interaction, self.content, self._key)
+        with self._lock:
+            self.recent.append(stored)
+            if self._file is not None:
+                self._file.write(json.dumps(stored.to_dict(), separators=(",", ":")) + "\n")
+                self._file.flush()
+        collected = _collector.get()
+        if collected is not None:
+            collected.append(stored)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_capture(path: str) -> List[Interaction]:
+    """Read a capture file written by TrafficRecorder, in arrival order."""
+    opener = gzip.open if path.endswith(".gz") else open
+    interactions = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                interactions.append(Interaction.from_dict(json.loads(line)))
+    interactions.sort(key=lambda interaction: interaction.at)
+    return interactions
+
+
+@contextmanager
+def collecting() -> Iterator[List[Interaction]]:
+    """Collect the interactions recorded by requests made in this context within the block."""
+    collected: List[Interaction] = []
+    token = _collector.set(collected)
+    try:
+        yield collected
+    finally:
+        _collector.reset(token)
+
+
+def note_primary(response: str, seconds: float) -> None:
+    interaction = _current.get()
+    if interaction is not None:
+        interaction.response = response
+        interaction.primary_seconds = round(seconds, 6)
+
+
+def note_guard(chars: int, verdict: Dict[str, Any], seconds: float) -> None:
+    interaction = _current.get()
+    if interaction is not None:
+        interaction.guard.append(GuardCall(chars, round(seconds, 6), verdict.get("status"),
+                                           verdict.get("decision"), verdict.get("reason")))
+
+
+def note_abandoned(stage: str, budget: float) -> None:
+    interaction = _current.get()
+    if interaction is not None:
+        interaction.abandoned[stage] = round(budget, 6)
+
+
+def note_decision(stage: str, decision: str, reason: Optional[str]) -> None:
+    interaction = _current.get()
+    if interaction is not None:
+        interaction.decisions.append([stage, decision, reason])
@@ -0,0 +1,136 @@
+"""
+End-to-end request deadlines and per-stage time budgets.
+
+A deadline is an absolute time.monotonic() value fixed when a request
+enters the gateway. Each slow stage gets what is left of it, capped by the
+stage's own timeout and, for the primary LLM, minus a reserve kept back for
+the guard. The deadline is also published in a context variable so LLM
+clients can pass the remaining budget to their HTTP calls.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TypeVar
+
+from ..config.settings import settings
+from .exceptions import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# What the gateway does when a request runs out of time.
+BLOCK = "block"      # fail closed with an error message
+RELEASE = "release"  # release the primary response without L2 review
+DEFER = "defer"      # release it and queue L2 review (block when there is no queue)
+DEADLINE_ACTIONS = (BLOCK, RELEASE, DEFER)
+
+_current: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar("argus_deadline", default=None)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def deadline_after(timeout: Optional[float]) -> Optional[float]:
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before deadline (never negative), or None without one."""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def stage_budget(deadline: Optional[float], cap: Optional[float] = None, reserve: float = 0.0) -> Optional[float]:
+    """
+    The time a stage may take: what is left of deadline after holding back
+    reserve for later stages, and at most cap. None without a deadline.
+
+    The reserve never takes more than half of what is left, so an early
+    stage is not starved outright when the deadline is tight.
+    """
+    left = remaining(deadline)
+    if left is None:
+        return None
+    budget = left - min(reserve, left / 2)
+    return budget if cap is None else min(budget, cap)
+
+
+def current_deadline() -> Optional[float]:
+    """The deadline of the request being processed on this context, if any."""
+    return _current.get()
+
+
+def request_timeout(cap: float) -> float:
+    """HTTP timeout for a call made now: cap, or less if the current deadline is nearer."""
+    left = remaining(_current.get())
+    return cap if left is None else min(cap, left)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    token = _current.set(deadline)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def check(deadline: Optional[float], stage: str) -> None:
+    """Raise DeadlineExceeded if deadline has already passed before stage."""
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceeded(stage, 0.0)
+
+
+def worker_count() -> int:
+    """DEADLINE_WORKERS, or twice the admission slots: abandoned calls hold a worker until they finish."""
+    if settings.deadline_workers:
+        return settings.deadline_workers
+    return 2 * (settings.admission_primary_slots + settings.admission_guard_slots)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=worker_count(), thread_name_prefix="argus-deadline")
+    return _executor
+
+
+def call_within(budget: Optional[float], stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Call fn, giving up after budget seconds.
+
+    Without a budget fn runs inline. Otherwise it runs on a worker thread
+    (in a copy of the caller's context, so spans and the deadline carry
+    over) and DeadlineExceeded is raised when the budget runs out. The
+    budget starts when a worker picks the call up; waiting for one is
+    bounded only by the request's own deadline. Python cannot stop a
+    running thread: an abandoned call finishes in the background, bounded
+    by the HTTP timeout its client took from request_timeout(), and its
+    result is discarded.
+    """
+    if budget is None:
+        return fn(*args, **kwargs)
+    if budget <= 0:
+        raise DeadlineExceeded(stage, 0.0)
+    started = threading.Event()
+    context = contextvars.copy_context()
+
+    def run() -> T:
+        started.set()
+        return context.run(fn, *args, **kwargs)
+
+    future = _get_executor().submit(run)
+    if not started.wait(remaining(_current.get())) and future.cancel():
+        logger.warning(f"{stage} call never got a worker before the request deadline; see DEADLINE_WORKERS.")
+        raise DeadlineExceeded(stage, budget)
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeout:
+        logger.debug(f"Abandoning {stage} call still running after {budget:.3f}s.")
+        raise DeadlineExceeded(stage, budget) from None
@@ -18,10 +18,44 @@ class ConfigurationError(ArgusException):
     """Raised when there's a configuration error."""
     pass
 
+class RuleArtifactError(ConfigurationError):
+    """Raised when a compiled rule artifact is missing, corrupt or from an incompatible version."""
+    pass
+
 class FilterError(ArgusException):
     """Raised when there's an error in filter processing."""
     pass
 
+class FilterBudgetExceeded(FilterError):
+    """Raised when L1 matching exceeds its per-request size or time budget."""
+    pass
+
 class LLMError(ArgusException):
     """Raised when there's an error with LLM processing."""
     pass
+
+class OverloadedError(ArgusException):
+    """Raised when admission control sheds a request instead of queueing it."""
+    
+    def __init__(self, stage: str, lane: str, reason: str, predicted_wait: float = 0.0):
+        super().__init__(f"{stage} overloaded for lane '{lane}' ({reason})")
+        self.stage = stage
+        self.lane = lane
+        self.reason = reason
+        self.predicted_wait = predicted_wait
+
+class DeadlineExceeded(ArgusException):
+    """Raised when a request's end-to-end deadline leaves no time for a stage."""
+    
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"deadline exceeded in {stage} (budget {budget:.3f}s)")
+        self.stage = stage
+        self.budget = budget
+
+class SidecarError(ArgusException):
+    """Raised by the sidecar client when a request fails or the connection is lost."""
+    pass
+
+class ProtocolError(SidecarError):
+    """Raised for a malformed or oversized sidecar frame."""
+    pass
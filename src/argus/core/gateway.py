@@ -3,59 +3,570 @@ Main ArgusGateway class that orchestrates the security pipeline.
 """
 
 import logging
-from typing import Optional
+import random
+import time
+from contextlib import nullcontext
+from typing import Callable, ContextManager, List, Optional, Tuple
 
 from ..filters.layer1.input_filters import check_input_filters
-from ..filters.layer1.output_filters import check_output_filters
+from ..filters.layer1.output_filters import check_output_filters, redact_output_filters
 from ..filters.layer2.guard_llm import analyze_response_with_guard
-from ..llm.mock_llm import get_llm_response
+from ..filters.layer2.risk import text_risk
+from ..llm.base import BaseLLM
+from ..llm.providers import get_default_llm, get_llm_response
+from ..config.settings import ArgusSettings, settings
 from ..core.types import SecurityResult, SecurityDecision
-from ..core.exceptions import ArgusException
+from ..core.exceptions import ArgusException, DeadlineExceeded, OverloadedError
+from ..core.policy import PolicyEngine, PolicyRegistry
+from ..core.admission import AdmissionControl
+from ..core.cache import ResultCache, SingleFlight, cache_key
+from ..core.capture import (
+    PROMPT, TURN, TrafficRecorder, note_abandoned, note_decision, note_guard, note_primary,
+)
+from ..core.deadline import (
+    BLOCK, DEFER, call_within, deadline_after, deadline_scope, remaining, stage_budget,
+)
+from ..core.journal import (
+    ADMISSION, DEADLINE, L1_INPUT, L1_OUTPUT, L2, REPUTATION,
+    DecisionJournal, JournalEntry, default_alert_hooks, prompt_digest,
+)
+from ..core.reputation import (
+    BLOCKED, ESCALATE, ESCALATED, INPUT_PII, INPUT_TERM, L2_VIOLATION, OUTPUT, TRUSTED, ReputationStore, Standing,
+)
+from ..core.progressive import ProgressiveReview
+from ..core.review_queue import GuardFunction, ReviewQueue, ReviewWorkerPool
+from ..core.session import Session, SessionStore
+from ..utils.tracing import Tracer, current_trace_id, get_tracer, span
 
 logger = logging.getLogger(__name__)
 
 class ArgusGateway:
-    """The main class orchestrating the AI security gateway logic."""
+    """The main class orchestrating the AI security gateway logic.
 
-    def __init__(self):
+    One gateway serves every request thread. Policy engines (compiled rules,
+    pipelines, guard prompt) are immutable once built; caches, sessions,
+    admission and the review queue lock their own state; counters read on
+    hot paths are sharded per thread.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[PolicyRegistry] = None,
+        llm: Optional[BaseLLM] = None,
+        result_cache: Optional[ResultCache] = None,
+        tracer: Optional[Tracer] = None,
+        review_queue: Optional[ReviewQueue] = None,
+        journal: Optional[DecisionJournal] = None,
+        admission: Optional[AdmissionControl] = None,
+        sessions: Optional[SessionStore] = None,
+        reputation: Optional[ReputationStore] = None,
+        capture: Optional[TrafficRecorder] = None,
+        guard: Optional[GuardFunction] = None,
+        config: Optional[ArgusSettings] = None,
+    ):
+        """llm overrides the configured primary LLM provider for this gateway.
+
+        A review_queue (or L2_REVIEW_MODE=sampled) enables deferred L2 review;
+        admission (or ADMISSION_ENABLED) bounds work in flight per stage;
+        sessions holds per-conversation state for process_turn;
+        reputation (or REPUTATION_ENABLED) scores the clients named by client_id;
+        capture (or CAPTURE_PATH) records requests for offline replay;
+        guard replaces the L2 guard call (analyze_response_with_guard);
+        config replaces the application settings for this gateway and the
+        components it builds.
+        """
+        self.config = config or settings
+        self.guard = guard
+        self.policies = policies or PolicyRegistry.from_settings(self.config)
+        self.llm = llm
+        self.singleflight = SingleFlight() if self.config.singleflight_enabled else None
+        if result_cache is None and self.config.result_cache_enabled:
+            result_cache = ResultCache(self.config.result_cache_max_entries)
+        self.result_cache = result_cache
+        self.tracer = tracer or get_tracer()
+        if admission is None and self.config.admission_enabled:
+            admission = AdmissionControl.from_settings(self.config)
+        self.admission = admission
+        self.sessions = sessions or SessionStore.from_settings(self.config)
+        if review_queue is None and self.config.l2_review_mode == "sampled":
+            review_queue = ReviewQueue.from_settings(self.config)
+        self.review_queue = review_queue
+        if journal is None and (review_queue is not None or self.config.decision_journal_path):
+            journal = DecisionJournal(self.config.decision_journal_path, alert_hooks=default_alert_hooks())
+        self.journal = journal
+        if reputation is None and self.config.reputation_enabled:
+            reputation = ReputationStore.from_settings(self.config)
+        self.reputation = reputation
+        if reputation is not None and journal is not None:
+            # Violations found by deferred review count against the client too.
+            journal.add_alert_hook(reputation.alert_hook)
+        if capture is None and self.config.capture_path:
+            capture = TrafficRecorder.from_settings(self.config)
+        self.capture = capture
+        self.review_workers = None
+        if review_queue is not None and self.config.l2_review_workers > 0:
+            self.review_workers = ReviewWorkerPool(
+                review_queue,
+                journal,
+                analyze=self._guard,
+                template_for=lambda tenant: self.policies.engine_for(tenant).guard_prompt,
+                workers=self.config.l2_review_workers,
+            ).start()
         logger.info("ArgusGateway initialized.")
 
+    def close(self) -> None:
+        """Stop review workers and release the review queue, journal and capture file."""
+        if self.review_workers is not None:
+            self.review_workers.stop()
+        if self.review_queue is not None:
+            self.review_queue.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.capture is not None:
+            self.capture.close()
+
+    def _journal(self, stage: str, decision: str, reason: Optional[str], tenant_id: Optional[str],
+                 user_prompt: str) -> None:
+        note_decision(stage, decision, reason)
+        if self.journal is not None:
+            self.journal.record(JournalEntry(
+                stage=stage,
+                decision=decision,
+                reason=reason,
+                tenant=tenant_id,
+                prompt_sha=prompt_digest(user_prompt),
+                trace_id=current_trace_id(),
+            ))
+
+    def _admit(self, stage: str, lane: Optional[str], deadline: Optional[float]) -> ContextManager:
+        """Hold an admission slot for stage; a no-op without admission control."""
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit(stage, lane, remaining(deadline))
+
+    def _overloaded(self, error: OverloadedError, tenant_id: Optional[str],
+                    user_prompt: str) -> Tuple[str, bool, Optional[str]]:
+        logger.warning(f"Request shed by admission control: {error}.")
+        self._journal(ADMISSION, "OVERLOADED", f"{error.stage}:{error.reason}", tenant_id, user_prompt)
+        return f"[Argus] Request rejected: gateway overloaded ({error.stage}, {error.reason}). Retry later.", False, None
+
+    def _deadline_exceeded(self, error: DeadlineExceeded, engine: PolicyEngine, tenant_id: Optional[str],
+                           user_prompt: str, guard_prompt: str, response: Optional[str] = None,
+                           session: Optional[Session] = None) -> Tuple[str, bool, Optional[str]]:
+        """Apply the tenant's deadline action; response is None if the primary LLM never answered."""
+        note_abandoned(error.stage, error.budget)
+        action = engine.deadline_action if response is not None else BLOCK
+        if action == DEFER and self.review_queue is None:
+            action = BLOCK
+        logger.warning(f"Request deadline exceeded: {error}. Action: {action}.")
+        if action == BLOCK:
+            self._journal(DEADLINE, "BLOCKED", error.stage, tenant_id, user_prompt)
+            return f"[Argus] Request blocked: deadline exceeded during {error.stage}.", False, None
+        if action == DEFER:
+            review_id = self.review_queue.enqueue(tenant_id, guard_prompt, response, current_trace_id())
+            if self.review_workers is not None:
+                self.review_workers.notify()
+            logger.info(f"L2 review deferred after deadline (review {review_id}).")
+        self._journal(DEADLINE, "DEFERRED" if action == DEFER else "RELEASED", error.stage, tenant_id, user_prompt)
+        if session is not None:
+            session.commit(user_prompt, response)
+        return response, False, None
+
+    def _standing(self, client_id: Optional[str], tenant_id: Optional[str],
+                  engine: PolicyEngine) -> Optional[Standing]:
+        """The client's reputation tier, or None when clients are not tracked."""
+        if self.reputation is None or client_id is None:
+            return None
+        standing = self.reputation.standing(client_id, tenant_id)
+        if standing.tier == BLOCKED and engine.reputation_action == ESCALATE:
+            standing.tier = ESCALATED
+        return standing
+
+    def _refuse_client(self, standing: Standing, tenant_id: Optional[str], user_prompt: str) -> str:
+        logger.warning(f"Request refused for client with blocking reputation: {standing}.")
+        self._journal(REPUTATION, "BLOCKED", f"score {standing.score:.2f}", tenant_id, user_prompt)
+        return "[Argus] Request blocked: too many recent policy violations from this client. Retry later."
+
+    def _charge(self, standing: Optional[Standing], kind: Optional[str]) -> None:
+        if standing is not None and kind is not None:
+            self.reputation.record_offence(standing.client_id, standing.tenant_id, kind)
+
+    def _review_synchronously(self, engine: PolicyEngine, response: str,
+                              standing: Optional[Standing] = None) -> bool:
+        """High-risk responses and a sampled fraction of the rest wait for L2.
+
+        Escalated clients always wait; trusted ones are sampled at a reduced rate.
+        """
+        if self.review_queue is None:
+            return True
+        rate = engine.l2_sync_rate
+        if standing is not None:
+            if standing.tier == ESCALATED:
+                return True
+            if standing.tier == TRUSTED:
+                rate *= self.config.reputation_trusted_sample_factor
+        if random.random() < rate:
+            return True
+        return text_risk(response) >= engine.l2_sync_min_risk
+
     def _trigger_action_protocol(self, violation_type: str, detailed_reason: str) -> str:
         """Handles the blocking action and logs reinforcement simulation."""
         logger.warning(f"{violation_type} Violation detected. Reason: {detailed_reason}. Blocking.")
         logger.info(f"[REINFORCE] Simulated reinforcement prompt sent regarding {detailed_reason}.")
         return f"[Argus] {violation_type} blocked due to policy violation ({detailed_reason})."
 
-    def process_prompt(self, user_prompt: str) -> str:
-        """Processes a user prompt through the security gateway layers."""
+    def _get_primary_response(self, user_prompt: str) -> str:
+        if self.llm is not None:
+            return self.llm.get_response(user_prompt)
+        return get_llm_response(user_prompt)
+
+    def _guard(self, **kwargs) -> dict:
+        # The module-level guard function is resolved per call so it stays patchable.
+        return (self.guard or analyze_response_with_guard)(**kwargs)
+
+    def _analyze(self, **kwargs) -> dict:
+        """One guard call, timed for capture."""
+        started = time.perf_counter()
+        result = self._guard(**kwargs)
+        note_guard(len(kwargs["user_prompt"]) + len(kwargs["response_text"]), result, time.perf_counter() - started)
+        return result
+
+    def _captured(self, op: str, run: Callable[[], str], prompt: str, **attributes) -> str:
+        """run() the request, recorded for replay when capture is on."""
+        if self.capture is None:
+            return run()
+        with self.capture.record(op, prompt, **attributes) as interaction:
+            output = run()
+            if interaction is not None:
+                interaction.blocked = output.startswith("[Argus]")
+            return output
+
+    def _progressive(self, engine: PolicyEngine, standing: Optional[Standing] = None) -> bool:
+        """Whether this response is reviewed while it streams (L2_PROGRESSIVE)."""
+        if not self.config.l2_progressive or engine.pii_action == "redact":
+            # Redaction rewrites the finished text; the guard must see the masked version.
+            return False
+        # Only responses that will be reviewed synchronously anyway.
+        return self.review_queue is None or (standing is not None and standing.tier == ESCALATED)
+
+    def _progressive_check(self, engine: PolicyEngine, guard_prompt: str, text: str,
+                           lane: Optional[str]) -> dict:
+        """One guard check of a streamed stretch; skipped rather than queued when the guard is busy."""
+        admit = nullcontext() if self.admission is None else self.admission.admit("l2_guard", lane, 0.0)
+        with admit:
+            return self._analyze(user_prompt=guard_prompt, response_text=text, prompt_template=engine.guard_prompt)
+
+    def _stream_primary_response(self, user_prompt: str, review: ProgressiveReview) -> str:
+        """Stream the primary response into review; stops early once a stretch is a violation."""
+        llm = self.llm if self.llm is not None else get_default_llm()
+        stream = llm.stream_response(user_prompt)
+        try:
+            for chunk in stream:
+                review.feed(chunk)
+                if review.violation is not None:
+                    logger.info("Progressive L2 found a violation; stopping the primary stream.")
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return review.text
+
+    def process_prompt(
+        self,
+        user_prompt: str,
+        tenant_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        lane: Optional[str] = None,
+        timeout: Optional[float] = None,
+        client_id: Optional[str] = None,
+    ) -> str:
+        """Processes a user prompt through the security gateway layers.
+
+        tenant_id selects the policy profile; None uses the default policy.
+        Concurrent identical prompts under the same policy share one run, and
+        with the result cache enabled repeats are served until the policy's TTL.
+        trace_id continues an upstream trace, subject to the tracer's
+        sampling like any other request.
+        With admission control, lane picks the priority lane (default: the
+        tenant's, then ADMISSION_DEFAULT_LANE) and timeout, in seconds, is the
+        caller's budget: requests that cannot start in time are rejected with
+        an overload message instead of queueing.
+        timeout (default REQUEST_TIMEOUT) is also the end-to-end deadline the
+        primary LLM and guard calls share; see _evaluate.
+        client_id (an API key, session or IP) is scored by the reputation
+        store: blocked clients are refused before L1, escalated ones bypass
+        the cache and are always reviewed synchronously, in
+        REPUTATION_THROTTLE_LANE when set.
+        With capture on (CAPTURE_PATH) the request is recorded for replay.
+        """
+        return self._captured(
+            PROMPT,
+            lambda: self._process_prompt(user_prompt, tenant_id, trace_id, lane, timeout, client_id),
+            user_prompt, tenant=tenant_id, lane=lane, client=client_id, timeout=timeout,
+        )
+
+    def _process_prompt(self, user_prompt: str, tenant_id: Optional[str], trace_id: Optional[str],
+                        lane: Optional[str], timeout: Optional[float], client_id: Optional[str]) -> str:
+        deadline = deadline_after(timeout if timeout is not None else self.config.request_timeout)
         logger.info(f"Processing prompt: '{user_prompt[:100]}...'")
+        with self.tracer.start_trace("gateway.process_prompt", trace_id=trace_id, tenant=tenant_id or "default") as root, \
+                deadline_scope(deadline):
+            with span("policy.resolve"):
+                engine = self.policies.engine_for(tenant_id)
+            lane = lane or engine.admission_lane
+            standing = self._standing(client_id, tenant_id, engine)
+            if standing is not None:
+                root.set_attribute("reputation", standing.tier)
+                if standing.tier == BLOCKED:
+                    return self._refuse_client(standing, tenant_id, user_prompt)
+                if standing.tier == ESCALATED:
+                    # No shared or cached results: this client's responses all get a full review.
+                    return self._evaluate(user_prompt, engine, tenant_id,
+                                          self.config.reputation_throttle_lane or lane, deadline, standing=standing)[0]
+            use_cache = self.result_cache is not None and engine.result_cache_ttl > 0
+            if not use_cache and self.singleflight is None:
+                return self._evaluate(user_prompt, engine, tenant_id, lane, deadline, standing=standing)[0]
+
+            key = cache_key(engine.fingerprint, user_prompt, engine.pii_action)
+            if use_cache:
+                cached = self.result_cache.get(key)
+                root.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    logger.info("Serving gateway result from cache.")
+                    result, offence = cached
+                    # A repeated offence counts against the client even when its answer is cached.
+                    self._charge(standing, offence)
+                    return result
+
+            ran = []
+
+            def run() -> Tuple[str, bool, Optional[str]]:
+                ran.append(True)
+                evaluation = self._evaluate(user_prompt, engine, tenant_id, lane, deadline, standing=standing)
+                result, cacheable, offence = evaluation
+                if use_cache and cacheable:
+                    self.result_cache.put(key, (result, offence), engine.result_cache_ttl)
+                return evaluation
+
+            if self.singleflight is None:
+                return run()[0]
+            # Only requests in the same lane and reputation tier wait on each other, never past their own
+            # deadline, and overload, deadline and guard-error answers (not cacheable) are not shared.
+            flight_key = "\0".join((key, lane or "", standing.tier if standing is not None else ""))
+            result, _, offence = self.singleflight.do(flight_key, run, timeout=remaining(deadline),
+                                                      share=lambda r: r[1])
+            if not ran:
+                # A follower given the leader's answer is charged for the offence too.
+                self._charge(standing, offence)
+            return result
+
+    def process_turn(
+        self,
+        session_id: str,
+        user_turn: str,
+        tenant_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        lane: Optional[str] = None,
+        timeout: Optional[float] = None,
+        client_id: Optional[str] = None,
+    ) -> str:
+        """Processes one turn of a multi-turn conversation.
+
+        Send only the new turn; the gateway keeps the conversation in
+        self.sessions. L1 input filters scan the turn plus the tail of earlier
+        turns, so matches split across turns are caught without rescanning the
+        history. The primary LLM gets the recent exchanges, the guard a
+        condensed rolling context. Turns are never cached or coalesced.
+        Reputation is tracked per client_id, or per session when none is given.
+        """
+        return self._captured(
+            TURN,
+            lambda: self._process_turn(session_id, user_turn, tenant_id, trace_id, lane, timeout, client_id),
+            user_turn, tenant=tenant_id, lane=lane, client=client_id, session=session_id, timeout=timeout,
+        )
+
+    def _process_turn(self, session_id: str, user_turn: str, tenant_id: Optional[str], trace_id: Optional[str],
+                      lane: Optional[str], timeout: Optional[float], client_id: Optional[str]) -> str:
+        deadline = deadline_after(timeout if timeout is not None else self.config.request_timeout)
+        logger.info(f"Processing turn for session '{session_id}': '{user_turn[:100]}...'")
+        with self.tracer.start_trace("gateway.process_turn", trace_id=trace_id, tenant=tenant_id or "default") as root, \
+                deadline_scope(deadline):
+            with span("policy.resolve"):
+                engine = self.policies.engine_for(tenant_id)
+            lane = lane or engine.admission_lane
+            standing = self._standing(client_id or session_id, tenant_id, engine)
+            if standing is not None:
+                root.set_attribute("reputation", standing.tier)
+                if standing.tier == BLOCKED:
+                    return self._refuse_client(standing, tenant_id, user_turn)
+                if standing.tier == ESCALATED:
+                    lane = self.config.reputation_throttle_lane or lane
+            session = self.sessions.get(session_id, tenant_id)
+            with session.lock:
+                root.set_attribute("session_turn", session.turns)
+                session.begin()
+                try:
+                    return self._evaluate(user_turn, engine, tenant_id, lane, deadline,
+                                          session=session, standing=standing)[0]
+                finally:
+                    session.finish()
+
+    def _evaluate(self, user_prompt: str, engine: PolicyEngine, tenant_id: Optional[str] = None,
+                  lane: Optional[str] = None, deadline: Optional[float] = None,
+                  session: Optional[Session] = None,
+                  standing: Optional[Standing] = None) -> Tuple[str, bool, Optional[str]]:
+        """Run every layer once. Returns the final text, whether it may be cached and the offence it was charged.
+
+        With a session, user_prompt is one turn: L1 input sees the session's
+        scan window, the primary LLM its history and the guard its context.
+        With a deadline, the primary LLM may use what is left of it minus
+        DEADLINE_L2_RESERVE (at most PRIMARY_LLM_TIMEOUT) and the guard the
+        rest (at most GUARD_LLM_TIMEOUT); a stage out of time is abandoned and
+        the tenant's deadline action decides the outcome.
+        With a standing, violations are charged to the client's reputation and
+        clean releases count towards trust.
+        With L2_PROGRESSIVE the primary response is streamed and reviewed
+        stretch by stretch as it arrives; the final guard call covers only the
+        unreviewed tail (see core/progressive.py).
+        """
+        primary_prompt = guard_prompt = user_prompt
+        if session is not None:
+            primary_prompt = session.primary_prompt(user_prompt)
+            guard_prompt = session.guard_context(user_prompt)
+
+        # L1 checks that ran out of budget under L1_BUDGET_POLICY=escalate; the guard must see the response.
+        escalations: List[str] = []
 
         # Layer 1 Input Check
         logger.debug("Applying Layer 1 input filters...")
-        l1_input_violation = check_input_filters(user_prompt)
+        with span("l1.input"):
+            scanned = session.scan_window(user_prompt) if session is not None else user_prompt
+            l1_input_violation = check_input_filters(scanned, pipeline=engine.input_pipeline,
+                                                     on_escalate=escalations.append)
         if l1_input_violation:
-            return self._trigger_action_protocol("Input", "L1 Filter Violation")
+            self._journal(L1_INPUT, "VIOLATION", l1_input_violation, tenant_id, user_prompt)
+            offence = None
+            if "Budget Exceeded" not in l1_input_violation:
+                offence = INPUT_TERM if l1_input_violation.startswith("Blocked Input Term") else INPUT_PII
+            self._charge(standing, offence)
+            return self._trigger_action_protocol("Input", "L1 Filter Violation"), True, offence
         logger.info("L1 Input Check Passed.")
 
+        progressive = None
+        if self._progressive(engine, standing):
+            progressive = ProgressiveReview(
+                lambda text: self._progressive_check(engine, guard_prompt, text, lane),
+                self.config.l2_progressive_min_chars,
+                self.config.l2_progressive_overlap_chars,
+                self.config.l2_progressive_max_in_flight,
+            )
+
         # Primary LLM Interaction
-        logger.debug("Getting response from Primary LLM (Mock)...")
-        primary_response = get_llm_response(user_prompt)
-        logger.info(f"Primary LLM (Mock) response received: '{primary_response[:100]}...'")
+        logger.debug("Getting response from Primary LLM...")
+        try:
+            with span("primary_llm"), self._admit("primary_llm", lane, deadline):
+                budget = stage_budget(deadline, self.config.primary_llm_timeout, self.config.deadline_l2_reserve)
+                started = time.perf_counter()
+                if progressive is None:
+                    primary_response = call_within(budget, "primary_llm", self._get_primary_response, primary_prompt)
+                else:
+                    primary_response = call_within(budget, "primary_llm", self._stream_primary_response,
+                                                   primary_prompt, progressive)
+                note_primary(primary_response, time.perf_counter() - started)
+        except OverloadedError as e:
+            return self._overloaded(e, tenant_id, user_prompt)
+        except DeadlineExceeded as e:
+            if progressive is not None:
+                progressive.finish()
+            return self._deadline_exceeded(e, engine, tenant_id, user_prompt, guard_prompt)
+        logger.info(f"Primary LLM response received: '{primary_response[:100]}...'")
+
+        if progressive is not None:
+            # Checks still in flight are superseded by the final one.
+            unreviewed = progressive.finish()
+            logger.debug(f"Progressive L2: {progressive.checks} check(s), {progressive.reviewed} of "
+                         f"{len(primary_response)} chars reviewed before the stream ended.")
+            if progressive.violation is not None:
+                reason = progressive.violation.get('reason') or "Unknown Reason"
+                self._journal(L2, "VIOLATION", progressive.violation.get('reason'), tenant_id, user_prompt)
+                self._charge(standing, L2_VIOLATION)
+                return self._trigger_action_protocol("Response", f"L2 Violation ({reason})"), True, L2_VIOLATION
 
         # Layer 1 Output Check
         logger.debug("Applying Layer 1 output filters...")
-        l1_output_violation = check_output_filters(primary_response)
+        with span("l1.output"):
+            if engine.pii_action == "redact":
+                # PII is masked in place; L2 then reviews the redacted text.
+                l1_output_violation, primary_response = redact_output_filters(
+                    primary_response, pipeline=engine.redact_pipeline, on_escalate=escalations.append
+                )
+            else:
+                l1_output_violation = check_output_filters(primary_response, pipeline=engine.output_pipeline,
+                                                           on_escalate=escalations.append)
         if l1_output_violation:
-            return self._trigger_action_protocol("Response", "L1 Filter Violation")
+            self._journal(L1_OUTPUT, "VIOLATION", l1_output_violation, tenant_id, user_prompt)
+            offence = OUTPUT if "Budget Exceeded" not in l1_output_violation else None
+            self._charge(standing, offence)
+            return self._trigger_action_protocol("Response", "L1 Filter Violation"), True, offence
         logger.info("L1 Output Check Passed.")
 
+        if escalations:
+            logger.warning(f"L1 incomplete ({'; '.join(escalations)}); forcing synchronous L2 review.")
+        # Layer 2 deferred: release now, review from the queue
+        if not escalations and not self._review_synchronously(engine, primary_response, standing):
+            with span("l2.deferred"):
+                review_id = self.review_queue.enqueue(tenant_id, guard_prompt, primary_response, current_trace_id())
+            if standing is not None:
+                self.reputation.expect_review(review_id, standing.client_id, tenant_id)
+                self.reputation.record_clean(standing.client_id, tenant_id)
+            if self.review_workers is not None:
+                self.review_workers.notify()
+            if session is not None:
+                session.commit(user_prompt, primary_response)
+            logger.info(f"L2 review deferred (review {review_id}). Returning original response.")
+            # Not cached: a repeat should get another chance at synchronous review.
+            return primary_response, False, None
+
+        if progressive is not None and not unreviewed:
+            logger.info("Progressive L2 reviewed the whole response while it streamed. Returning original response.")
+            self._journal(L2, "CLEAN", None, tenant_id, user_prompt)
+            if standing is not None:
+                self.reputation.record_clean(standing.client_id, tenant_id)
+            if session is not None:
+                session.commit(user_prompt, primary_response)
+            return primary_response, True, None
+
         # Layer 2 Guard LLM Analysis
+        guard_input = (guard_prompt, primary_response if progressive is None else unreviewed)
+        if engine.compactor is not None:
+            with span("l2.compact") as compact_span:
+                guard_input = engine.compactor.compact(*guard_input)
+                compact_span.set_attribute("guard_input_chars", len(guard_input[0]) + len(guard_input[1]))
         logger.debug("Sending response to Guard LLM (L2) for analysis...")
-        l2_analysis_result = analyze_response_with_guard(
-            user_prompt=user_prompt,
-            response_text=primary_response
-        )
+        try:
+            with span("l2.guard") as guard_span, self._admit("l2_guard", lane, deadline):
+                l2_analysis_result = call_within(
+                    stage_budget(deadline, self.config.guard_llm_timeout),
+                    "l2_guard",
+                    self._analyze,
+                    user_prompt=guard_input[0],
+                    response_text=guard_input[1],
+                    prompt_template=engine.guard_prompt,
+                )
+                guard_span.set_attribute("decision", l2_analysis_result.get('decision'))
+                if progressive is not None:
+                    guard_span.set_attribute("progressive_reviewed_chars", progressive.reviewed)
+        except OverloadedError as e:
+            return self._overloaded(e, tenant_id, user_prompt)
+        except DeadlineExceeded as e:
+            if escalations:
+                # Unscreened by L1 and now by L2: never released.
+                return self._deadline_exceeded(e, engine, tenant_id, user_prompt, guard_prompt)
+            return self._deadline_exceeded(e, engine, tenant_id, user_prompt, guard_prompt, primary_response, session)
         logger.debug(f"L2 analysis result received: {l2_analysis_result}")
+        self._journal(L2, l2_analysis_result.get('decision') or "ERROR", l2_analysis_result.get('reason'),
+                      tenant_id, user_prompt)
 
         # Final Decision
         if l2_analysis_result.get('status') == 'success':
@@ -63,13 +574,19 @@ class ArgusGateway:
             reason = l2_analysis_result.get('reason') or "Unknown Reason"
             if decision == 'CLEAN':
                 logger.info("L2 Guard LLM analysis: CLEAN. Returning original response.")
-                return primary_response
+                if standing is not None:
+                    self.reputation.record_clean(standing.client_id, tenant_id)
+                if session is not None:
+                    session.commit(user_prompt, primary_response)
+                return primary_response, True, None
             elif decision == 'VIOLATION':
-                return self._trigger_action_protocol("Response", f"L2 Violation ({reason})")
+                self._charge(standing, L2_VIOLATION)
+                return self._trigger_action_protocol("Response", f"L2 Violation ({reason})"), True, L2_VIOLATION
             else:
                 logger.error(f"L2 Guard LLM returned success status but unexpected decision: {decision}. Blocking.")
-                return self._trigger_action_protocol("Response", f"L2 Unexpected Decision ({decision})")
+                return self._trigger_action_protocol("Response", f"L2 Unexpected Decision ({decision})"), False, None
         else:
             error_reason = l2_analysis_result.get('reason', 'Unknown L2 Error')
             logger.error(f"L2 Guard LLM analysis resulted in an ERROR: {error_reason}. Blocking response as a precaution.")
-            return f"[Argus] Response blocked due to an error during security analysis ({error_reason})."
+            # Guard errors are transient; never cache them.
+            return f"[Argus] Response blocked due to an error during security analysis ({error_reason}).", False, None
@@ -0,0 +1,124 @@
+"""
+Decision journal and alert hooks.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Deque, List, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Journal stages
+L1_INPUT = "L1_INPUT"
+L1_OUTPUT = "L1_OUTPUT"
+L2 = "L2"
+L2_DEFERRED = "L2_DEFERRED"
+ADMISSION = "ADMISSION"
+DEADLINE = "DEADLINE"
+REPUTATION = "REPUTATION"
+
+
+def prompt_digest(text: str) -> str:
+    """Short content hash, so the journal identifies prompts without storing them."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+
+
+@dataclass
+class JournalEntry:
+    """One gateway decision."""
+    stage: str
+    decision: str
+    reason: Optional[str] = None
+    tenant: Optional[str] = None
+    prompt_sha: Optional[str] = None
+    review_id: Optional[int] = None
+    trace_id: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+AlertHook = Callable[[JournalEntry], None]
+
+
+def logging_alert_hook(entry: JournalEntry) -> None:
+    """Default alert: a critical log line."""
+    logger.critical(
+        f"[ALERT] {entry.stage} {entry.decision} ({entry.reason}) for tenant '{entry.tenant}', "
+        f"prompt {entry.prompt_sha}, review {entry.review_id}."
+    )
+
+
+class WebhookAlertHook:
+    """Posts the entry as JSON to a URL; failures are logged, never raised."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, entry: JournalEntry) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(asdict(entry)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except Exception as e:
+            logger.error(f"Alert webhook {self.url} failed: {e}")
+
+
+def default_alert_hooks() -> List[AlertHook]:
+    """Logging, plus a webhook when ALERT_WEBHOOK_URL is set."""
+    hooks: List[AlertHook] = [logging_alert_hook]
+    if settings.alert_webhook_url:
+        hooks.append(WebhookAlertHook(settings.alert_webhook_url))
+    return hooks
+
+
+class DecisionJournal:
+    """
+    Append-only record of gateway decisions.
+
+    Entries go to a JSONL file when path is set and are always kept in a
+    bounded in-memory buffer. Violations found after the response was
+    released (stage L2_DEFERRED) are passed to every alert hook.
+    """
+
+    def __init__(self, path: Optional[str] = None, alert_hooks: Optional[List[AlertHook]] = None,
+                 buffer_size: int = 1000):
+        self.path = path
+        self.alert_hooks: List[AlertHook] = list(alert_hooks or [])
+        self.recent: Deque[JournalEntry] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def add_alert_hook(self, hook: AlertHook) -> None:
+        self.alert_hooks.append(hook)
+
+    def record(self, entry: JournalEntry) -> None:
+        with self._lock:
+            self.recent.append(entry)
+            if self._file is not None:
+                self._file.write(json.dumps(asdict(entry)) + "\n")
+                self._file.flush()
+        if entry.stage == L2_DEFERRED and entry.decision != "CLEAN":
+            for hook in self.alert_hooks:
+                try:
+                    hook(entry)
+                except Exception as e:
+                    logger.error(f"Alert hook {hook!r} failed: {e}", exc_info=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
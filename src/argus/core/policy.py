@@ -0,0 +1,322 @@
+"""
+Per-tenant policy profiles and a shared cache of compiled policy engines.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..config.security_rules import (
+    INPUT_BLOCKLIST_TERMS,
+    OUTPUT_BLOCKLIST_TERMS,
+    PII_PATTERN_KINDS,
+    PII_PATTERN_NAMES,
+    PII_PATTERNS,
+    PRIMARY_LLM_ROLE_DESCRIPTION,
+)
+from ..config.settings import ArgusSettings, settings
+from ..filters.layer1.output_filters import redaction_stages
+from ..filters.layer1.rules import CompiledRules, default_rule_options
+from ..filters.pipeline import build_pipeline
+from ..filters.layer2.compaction import GuardInputCompactor
+from ..filters.layer2.guard_llm import GuardPromptTemplate
+from .admission import configured_lanes
+from .cache import SingleFlight
+from .deadline import DEADLINE_ACTIONS
+from .reputation import REPUTATION_ACTIONS
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+
+@dataclass(frozen=True)
+class PolicyProfile:
+    """The rules one tenant is screened with. Unset fields use the global config."""
+    name: str = DEFAULT_TENANT
+    input_blocklist_terms: Tuple[str, ...] = tuple(INPUT_BLOCKLIST_TERMS)
+    output_blocklist_terms: Tuple[str, ...] = tuple(OUTPUT_BLOCKLIST_TERMS)
+    pii_kinds: Optional[Tuple[str, ...]] = None  # None keeps every PII rule
+    primary_role: str = PRIMARY_LLM_ROLE_DESCRIPTION
+    redaction_tokens: Tuple[Tuple[str, str], ...] = field(default=())
+    # Seconds a cached gateway result may be served; 0 disables, None uses the global TTL.
+    result_cache_ttl: Optional[float] = None
+    # Deferred L2 (L2_REVIEW_MODE=sampled): fraction reviewed synchronously, and the
+    # response risk score at or above which review is always synchronous.
+    l2_sync_rate: Optional[float] = None
+    l2_sync_min_risk: Optional[float] = None
+    # Admission lane for this tenant's requests when the caller names none.
+    admission_lane: Optional[str] = None
+    # What to do when the request deadline runs out during L2 (see core/deadline.py).
+    deadline_action: Optional[str] = None
+    # Whether clients with a blocking reputation are refused or only escalated.
+    reputation_action: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping[str, Any]) -> "PolicyProfile":
+        """Build a profile from its JSON form."""
+        unknown = set(data) - {
+            "input_blocklist_terms", "output_blocklist_terms", "pii_kinds",
+            "primary_role", "redaction_tokens", "result_cache_ttl", "l2_sync_rate", "l2_sync_min_risk",
+            "admission_lane", "deadline_action", "reputation_action",
+        }
+        if unknown:
+            raise ConfigurationError(f"Unknown policy profile keys for '{name}': {sorted(unknown)}")
+        kwargs: Dict[str, Any] = {"name": name}
+        for key in ("input_blocklist_terms", "output_blocklist_terms"):
+            if key in data:
+                kwargs[key] = tuple(data[key])
+        if data.get("pii_kinds") is not None:
+            kinds = tuple(sorted(set(data["pii_kinds"])))
+            unknown_kinds = set(kinds) - set(PII_PATTERN_KINDS.values())
+            if unknown_kinds:
+                raise ConfigurationError(f"Unknown PII kinds for '{name}': {sorted(unknown_kinds)}")
+            kwargs["pii_kinds"] = kinds
+        if "primary_role" in data:
+            kwargs["primary_role"] = data["primary_role"]
+        if "redaction_tokens" in data:
+            kwargs["redaction_tokens"] = tuple(sorted(data["redaction_tokens"].items()))
+        if data.get("result_cache_ttl") is not None:
+            ttl = float(data["result_cache_ttl"])
+            if ttl < 0:
+                raise ConfigurationError(f"result_cache_ttl for '{name}' must not be negative")
+            kwargs["result_cache_ttl"] = ttl
+        for key in ("l2_sync_rate", "l2_sync_min_risk"):
+            if data.get(key) is not None:
+                value = float(data[key])
+                if not 0.0 <= value <= 1.0:
+                    raise ConfigurationError(f"{key} for '{name}' must be between 0 and 1")
+                kwargs[key] = value
+        if data.get("admission_lane") is not None:
+            kwargs["admission_lane"] = str(data["admission_lane"])
+        if data.get("deadline_action") is not None:
+            if data["deadline_action"] not in DEADLINE_ACTIONS:
+                raise ConfigurationError(
+                    f"deadline_action for '{name}' must be one of {', '.join(DEADLINE_ACTIONS)}"
+                )
+            kwargs["deadline_action"] = data["deadline_action"]
+        if data.get("reputation_action") is not None:
+            if data["reputation_action"] not in REPUTATION_ACTIONS:
+                raise ConfigurationError(
+                    f"reputation_action for '{name}' must be one of {', '.join(REPUTATION_ACTIONS)}"
+                )
+            kwargs["reputation_action"] = data["reputation_action"]
+        return cls(**kwargs)
+
+    def fingerprint(self) -> str:
+        """Hash of everything except the name; equal rules share an engine."""
+        content = json.dumps([
+            self.input_blocklist_terms,
+            self.output_blocklist_terms,
+            self.pii_kinds,
+            self.primary_role,
+            self.redaction_tokens,
+            self.result_cache_ttl,
+            self.l2_sync_rate,
+            self.l2_sync_min_risk,
+            self.admission_lane,
+            self.deadline_action,
+            self.reputation_action,
+        ])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+class PolicyEngine:
+    """
+    Compiled L1 rules, filter pipelines and guard prompt for one policy fingerprint.
+
+    An engine is not modified after construction and is shared by every
+    request thread of its tenants.
+    """
+
+    def __init__(self, profile: PolicyProfile, config: Optional[ArgusSettings] = None):
+        config = config or settings
+        self.fingerprint = profile.fingerprint()
+        names, patterns = list(PII_PATTERN_NAMES), list(PII_PATTERNS)
+        if profile.pii_kinds is not None:
+            keep = [PII_PATTERN_KINDS.get(name, name) in profile.pii_kinds for name in names]
+            names = [n for n, k in zip(names, keep) if k]
+            patterns = [p for p, k in zip(patterns, keep) if k]
+        options = default_rule_options(config)
+        options["redaction_tokens"] = {**options["redaction_tokens"], **dict(profile.redaction_tokens)}
+        self.input_rules = CompiledRules(
+            profile.input_blocklist_terms, patterns, names, direction="INPUT", **options
+        )
+        self.output_rules = CompiledRules(
+            profile.output_blocklist_terms, patterns, names, direction="OUTPUT", **options
+        )
+        self.input_pipeline = build_pipeline(config.input_filter_stages, self.input_rules, name="input")
+        self.output_pipeline = build_pipeline(config.output_filter_stages, self.output_rules, name="output")
+        self.redact_pipeline = build_pipeline(
+            redaction_stages(config.output_filter_stages), self.output_rules, name="output-redact"
+        )
+        self.guard_prompt = GuardPromptTemplate(profile.primary_role)
+        self.compactor = GuardInputCompactor.from_settings((self.input_rules, self.output_rules), config)
+        self.result_cache_ttl = (
+            profile.result_cache_ttl if profile.result_cache_ttl is not None else config.result_cache_ttl
+        )
+        self.l2_sync_rate = profile.l2_sync_rate if profile.l2_sync_rate is not None else config.l2_sync_rate
+        self.l2_sync_min_risk = (
+            profile.l2_sync_min_risk if profile.l2_sync_min_risk is not None else config.l2_sync_min_risk
+        )
+        self.admission_lane = profile.admission_lane
+        self.deadline_action = profile.deadline_action or config.deadline_action
+        self.reputation_action = profile.reputation_action or config.reputation_action
+        # Read once here so a request never mixes two values if settings change mid-flight.
+        self.pii_action = config.pii_action
+        self.estimated_size = (
+            self.input_rules.estimated_size()
+            + self.output_rules.estimated_size()
+            + 2 * len(self.guard_prompt)
+        )
+
+
+class EngineCache:
+    """
+    LRU cache of PolicyEngine instances bounded by an estimated memory budget.
+
+    Engines are compiled outside the cache lock, so a cold tenant never
+    holds up hits for other tenants; concurrent misses for one fingerprint
+    share a single build.
+    """
+
+    def __init__(self, max_bytes: int, config: Optional[ArgusSettings] = None):
+        self.max_bytes = max_bytes
+        self.config = config
+        self._engines: "OrderedDict[str, PolicyEngine]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._builds = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, profile: PolicyProfile) -> PolicyEngine:
+        """Return the engine for profile, building it on first use."""
+        key = profile.fingerprint()
+        engine = self._lookup(key)
+        if engine is not None:
+            return engine
+        return self._builds.do(key, lambda: self._build(key, profile))
+
+    def _lookup(self, key: str) -> Optional[PolicyEngine]:
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                self.hits += 1
+            return engine
+
+    def _build(self, key: str, profile: PolicyProfile) -> PolicyEngine:
+        # A build for key may have finished between the caller's lookup and this one.
+        engine = self._lookup(key)
+        if engine is not None:
+            return engine
+        with self._lock:
+            self.misses += 1
+        engine = PolicyEngine(profile, self.config)
+        logger.info(
+            f"Compiled policy engine {key} for '{profile.name}' (~{engine.estimated_size} bytes)."
+        )
+        with self._lock:
+            self._engines[key] = engine
+            self._bytes += engine.estimated_size
+            # Always keep the newest engine, even if it alone exceeds the budget.
+            while self._bytes > self.max_bytes and len(self._engines) > 1:
+                _, evicted = self._engines.popitem(last=False)
+                self._bytes -= evicted.estimated_size
+                self.evictions += 1
+        return engine
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+def _snapshot(profiles: Dict[str, PolicyProfile]) -> Tuple[Mapping[str, PolicyProfile], PolicyProfile]:
+    return MappingProxyType(profiles), profiles.get(DEFAULT_TENANT, PolicyProfile())
+
+
+class PolicyRegistry:
+    """
+    Maps tenant IDs to policy profiles and resolves their compiled engines.
+
+    The profile table is an immutable snapshot that register() replaces as
+    a whole, so lookups from request threads never take a lock and never
+    see a half-applied change.
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Mapping[str, PolicyProfile]] = None,
+        cache: Optional[EngineCache] = None,
+        config: Optional[ArgusSettings] = None,
+    ):
+        """config (the application settings by default) configures the engines the cache builds."""
+        self._snapshot = _snapshot(dict(profiles or {}))
+        self._lock = threading.Lock()
+        config = config or settings
+        self._lanes = frozenset(configured_lanes(config))
+        for profile in (profiles or {}).values():
+            self._check_lane(profile)
+        self.cache = cache or EngineCache(config.policy_cache_max_bytes, config)
+
+    @property
+    def profiles(self) -> Mapping[str, PolicyProfile]:
+        return self._snapshot[0]
+
+    @property
+    def default_profile(self) -> PolicyProfile:
+        return self._snapshot[1]
+
+    @classmethod
+    def from_file(cls, path: str, config: Optional[ArgusSettings] = None) -> "PolicyRegistry":
+        """Load profiles from a JSON object of {tenant_id: profile}."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigurationError(f"Could not load policy profiles from '{path}': {e}") from e
+        return cls({tenant: PolicyProfile.from_dict(tenant, body) for tenant, body in data.items()}, config=config)
+
+    @classmethod
+    def from_settings(cls, config: Optional[ArgusSettings] = None) -> "PolicyRegistry":
+        config = config or settings
+        if config.policy_profiles_path:
+            return cls.from_file(config.policy_profiles_path, config)
+        return cls(config=config)
+
+    def _check_lane(self, profile: PolicyProfile) -> None:
+        if profile.admission_lane is not None and profile.admission_lane not in self._lanes:
+            raise ConfigurationError(
+                f"admission_lane for '{profile.name}' must be one of {', '.join(sorted(self._lanes))}"
+            )
+
+    def register(self, tenant_id: str, profile: PolicyProfile) -> None:
+        self._check_lane(profile)
+        with self._lock:
+            profiles = dict(self._snapshot[0])
+            profiles[tenant_id] = profile
+            self._snapshot = _snapshot(profiles)
+
+    def profile_for(self, tenant_id: Optional[str]) -> PolicyProfile:
+        profiles, default = self._snapshot
+        if tenant_id is None:
+            return default
+        profile = profiles.get(tenant_id)
+        if profile is None:
+            logger.warning(f"No policy profile for tenant '{tenant_id}'. Using the default policy.")
+            return default
+        return profile
+
+    def engine_for(self, tenant_id: Optional[str] = None) -> PolicyEngine:
+        return self.cache.get(self.profile_for(tenant_id))
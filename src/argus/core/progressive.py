@@ -0,0 +1,163 @@
+"""
+Progressive L2: guard reviews that run while the primary response streams.
+
+Instead of waiting for the whole response, ProgressiveReview sends each
+completed stretch of text (ending at a paragraph or sentence break, at
+least min_chars long) to the guard as soon as it is generated, with
+overlap_chars of the text before it as context. Up to max_in_flight
+checks run at once; a stretch that completes while all are busy waits,
+and a newer stretch absorbs the waiting one (which is then never sent).
+Reviewed coverage is the prefix covered by contiguous clean stretches.
+
+When the stream ends, anything still running or waiting is abandoned and
+finish() returns the delta the final check must cover: the text after the
+last clean checkpoint, again with a little overlap. Only that final check
+delays the release, and it is skipped when nothing is left to review. A
+VIOLATION found on any completed stretch stops the stream at once.
+"""
+
+import contextvars
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Verdict = Dict[str, Any]
+
+# Checkpoints end after a blank line or a sentence end.
+_BREAK_RE = re.compile(r"\n\s*\n\s*|[.!?][\"')\]]*\s+")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="argus-progressive")
+    return _executor
+
+
+def _start_at_word(text: str, start: int) -> int:
+    """Move start forward to the beginning of a word, unless that passes the end."""
+    if start <= 0:
+        return 0
+    if text[start - 1].isspace():
+        return start
+    space = text.find(" ", start)
+    return space + 1 if 0 <= space < len(text) - 1 else start
+
+
+class ProgressiveReview:
+    """Guard checks over a growing response; analyze(text) returns a verdict dict."""
+
+    def __init__(self, analyze: Callable[[str], Verdict], min_chars: int = 400, overlap_chars: int = 200,
+                 max_in_flight: int = 4):
+        self.analyze = analyze
+        self.min_chars = min_chars
+        self.overlap_chars = overlap_chars
+        self.max_in_flight = max(1, max_in_flight)
+        self.text = ""
+        self.reviewed = 0  # text[:reviewed] is covered by clean checks
+        self.violation: Optional[Verdict] = None
+        self.checks = 0
+        self.superseded = 0
+        self._submitted = 0  # end of the last stretch sent or waiting
+        self._in_flight: Dict[Future, Tuple[int, int]] = {}
+        self._clean: Dict[int, int] = {}  # start -> end of clean stretches beyond reviewed
+        self._waiting: Optional[Tuple[int, int]] = None
+        self._closed = False
+        # Reentrant: a check that is already done runs its callback inside _start.
+        self._lock = threading.RLock()
+
+    def feed(self, chunk: str) -> None:
+        """Append streamed text and start a check if a stretch was completed."""
+        with self._lock:
+            self.text += chunk
+            if self._closed or self.violation is not None:
+                return
+            if len(self.text) - self._submitted < self.min_chars:
+                return
+            end = self._checkpoint()
+            if end is None:
+                return
+            stretch = (self._submitted, end)
+            self._submitted = end
+            if len(self._in_flight) < self.max_in_flight:
+                self._start(stretch)
+                return
+            if self._waiting is not None:
+                self.superseded += 1
+                stretch = (self._waiting[0], end)
+            self._waiting = stretch
+
+    def _checkpoint(self) -> Optional[int]:
+        """End of the last break at least min_chars past the previous stretch."""
+        end = None
+        for match in _BREAK_RE.finditer(self.text, self._submitted + self.min_chars - 1):
+            end = match.end()
+        if end is None and len(self.text) - self._submitted >= 4 * self.min_chars:
+            # No break in sight: settle for the last space.
+            end = self.text.rfind(" ", self._submitted) + 1 or None
+        return end
+
+    def _start(self, stretch: Tuple[int, int]) -> None:
+        start, end = stretch
+        segment = self.text[_start_at_word(self.text, start - self.overlap_chars):end]
+        self.checks += 1
+        future = _get_executor().submit(contextvars.copy_context().run, self.analyze, segment)
+        self._in_flight[future] = stretch
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future) -> None:
+        verdict = None
+        if not future.cancelled():
+            try:
+                verdict = future.result()
+            except Exception as e:
+                # Overloaded or failed checks are skipped; the final check covers their text.
+                logger.debug(f"Progressive guard check skipped: {e}")
+        with self._lock:
+            stretch = self._in_flight.pop(future, None)
+            if self._closed or stretch is None:
+                return
+            if verdict is not None and verdict.get("status") == "success":
+                if verdict.get("decision") == "CLEAN":
+                    self._clean[stretch[0]] = stretch[1]
+                    while self.reviewed in self._clean:
+                        self.reviewed = self._clean.pop(self.reviewed)
+                elif verdict.get("decision") == "VIOLATION":
+                    self.violation = verdict
+                    return
+            if self._waiting is not None:
+                waiting, self._waiting = self._waiting, None
+                try:
+                    self._start(waiting)
+                except RuntimeError as e:  # executor shut down at interpreter exit
+                    logger.debug(f"Progressive guard check not started: {e}")
+
+    def finish(self) -> str:
+        """Abandon checks still pending and return the text the final check must cover.
+
+        Returns "" when clean checks already cover the whole response.
+        """
+        with self._lock:
+            self._closed = True
+            if self._waiting is not None:
+                self.superseded += 1
+                self._waiting = None
+            in_flight = list(self._in_flight)
+            self._in_flight.clear()
+            for future in in_flight:
+                future.cancel()
+            self.superseded += len(in_flight)
+            if self.reviewed == 0:
+                return self.text
+            if self.reviewed >= len(self.text.rstrip()):
+                return ""
+            return self.text[_start_at_word(self.text, self.reviewed - self.overlap_chars):]
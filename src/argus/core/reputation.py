@@ -0,0 +1,188 @@
+"""
+Per-client reputation for fast-path handling of repeat offenders.
+
+Callers identify the client behind a request (API key, session or IP) and
+every violation it causes adds to a score that decays exponentially with
+a configurable half-life. The score places the client in a tier:
+
+    BLOCKED    refused before any L1 scan or primary LLM call
+    ESCALATED  every response reviewed synchronously by L2, and the request
+               moved to the throttle admission lane when one is configured
+    TRUSTED    enough clean history that L2 sync sampling is reduced
+    NORMAL     everyone else
+
+Scores live in a bounded LRU keyed by tenant and client id, in memory only.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from ..config.settings import ArgusSettings, settings
+from .journal import L2_DEFERRED, JournalEntry
+
+BLOCKED = "BLOCKED"
+ESCALATED = "ESCALATED"
+TRUSTED = "TRUSTED"
+NORMAL = "NORMAL"
+
+# What a tenant does with BLOCKED clients: refuse them, or only escalate.
+BLOCK = "block"
+ESCALATE = "escalate"
+REPUTATION_ACTIONS = (BLOCK, ESCALATE)
+
+# Offence kinds and their default weights.
+INPUT_TERM = "input_term"
+INPUT_PII = "input_pii"
+OUTPUT = "output"
+L2_VIOLATION = "l2"
+DEFAULT_WEIGHTS: Dict[str, float] = {INPUT_TERM: 2.0, INPUT_PII: 0.0, OUTPUT: 0.5, L2_VIOLATION: 3.0}
+
+
+class Standing:
+    """A client's tier when its request arrived."""
+
+    __slots__ = ("client_id", "tenant_id", "tier", "score")
+
+    def __init__(self, client_id: str, tenant_id: Optional[str], tier: str, score: float):
+        self.client_id = client_id
+        self.tenant_id = tenant_id
+        self.tier = tier
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"Standing({self.client_id!r}, {self.tier}, score={self.score:.2f})"
+
+
+class _Record:
+    __slots__ = ("score", "updated", "clean", "offences")
+
+    def __init__(self, now: float):
+        self.score = 0.0
+        self.updated = now
+        self.clean = 0
+        self.offences = 0
+
+
+class ReputationStore:
+    """Bounded LRU of decaying per-client violation scores."""
+
+    def __init__(
+        self,
+        max_clients: int = 100000,
+        half_life: float = 900.0,
+        escalate_score: float = 2.0,
+        block_score: float = 8.0,
+        trusted_requests: int = 20,
+        weights: Optional[Mapping[str, float]] = None,
+        max_pending_reviews: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_clients = max_clients
+        self.half_life = half_life
+        self.escalate_score = escalate_score
+        # 0 disables blocking; clients are then only escalated.
+        self.block_score = block_score
+        self.trusted_requests = trusted_requests
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+        self.max_pending_reviews = max_pending_reviews
+        self._clock = clock
+        self._records: "OrderedDict[Tuple[Optional[str], str], _Record]" = OrderedDict()
+        # Deferred review id -> client, so a violation found after release still counts.
+        self._pending: "OrderedDict[int, Tuple[Optional[str], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, config: Optional[ArgusSettings] = None) -> "ReputationStore":
+        config = config or settings
+        return cls(
+            max_clients=config.reputation_max_clients,
+            half_life=config.reputation_half_life,
+            escalate_score=config.reputation_escalate_score,
+            block_score=config.reputation_block_score,
+            trusted_requests=config.reputation_trusted_requests,
+            weights=config.reputation_weights,
+        )
+
+    def _decayed(self, record: _Record, now: float) -> float:
+        if record.score and self.half_life > 0:
+            record.score *= math.exp(-math.log(2) * (now - record.updated) / self.half_life)
+            if record.score < 1e-3:
+                record.score = 0.0
+        record.updated = now
+        return record.score
+
+    def _tier(self, record: Optional[_Record]) -> str:
+        if record is None:
+            return NORMAL
+        if self.block_score > 0 and record.score >= self.block_score:
+            return BLOCKED
+        if record.score >= self.escalate_score:
+            return ESCALATED
+        if record.score == 0.0 and record.clean >= self.trusted_requests:
+            return TRUSTED
+        return NORMAL
+
+    def standing(self, client_id: str, tenant_id: Optional[str] = None) -> Standing:
+        """The client's current tier; unknown clients are NORMAL."""
+        now = self._clock()
+        with self._lock:
+            record = self._records.get((tenant_id, client_id))
+            score = self._decayed(record, now) if record is not None else 0.0
+            return Standing(client_id, tenant_id, self._tier(record), score)
+
+    def _record_for(self, key: Tuple[Optional[str], str], now: float) -> _Record:
+        record = self._records.get(key)
+        if record is None:
+            record = self._records[key] = _Record(now)
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_clients:
+            self._records.popitem(last=False)
+        return record
+
+    def record_offence(self, client_id: str, tenant_id: Optional[str], kind: str) -> float:
+        """Add the weight of one offence of kind; returns the new score."""
+        weight = self.weights.get(kind, 0.0)
+        now = self._clock()
+        with self._lock:
+            record = self._record_for((tenant_id, client_id), now)
+            self._decayed(record, now)
+            record.offences += 1
+            record.clean = 0
+            record.score += weight
+            return record.score
+
+    def record_clean(self, client_id: str, tenant_id: Optional[str] = None) -> None:
+        """Count a request released without any violation."""
+        now = self._clock()
+        with self._lock:
+            record = self._record_for((tenant_id, client_id), now)
+            self._decayed(record, now)
+            record.clean += 1
+
+    def expect_review(self, review_id: int, client_id: str, tenant_id: Optional[str] = None) -> None:
+        """Remember which client a deferred L2 review belongs to."""
+        with self._lock:
+            self._pending[review_id] = (tenant_id, client_id)
+            while len(self._pending) > self.max_pending_reviews:
+                self._pending.popitem(last=False)
+
+    def alert_hook(self, entry: JournalEntry) -> None:
+        """Journal alert hook: charge deferred L2 violations to their client."""
+        if entry.stage != L2_DEFERRED or entry.review_id is None:
+            return
+        with self._lock:
+            owner = self._pending.pop(entry.review_id, None)
+        if owner is not None and entry.decision == "VIOLATION":
+            tenant_id, client_id = owner
+            self.record_offence(client_id, tenant_id, L2_VIOLATION)
+
+    def forget(self, client_id: str, tenant_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._records.pop((tenant_id, client_id), None)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,248 @@
+"""
+Durable queue of deferred L2 reviews and the worker pool that drains it.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..config.settings import ArgusSettings, settings
+from ..utils.concurrency import ShardedCounter
+from .journal import L2_DEFERRED, DecisionJournal, JournalEntry, prompt_digest
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    tenant TEXT,
+    user_prompt TEXT NOT NULL,
+    response_text TEXT NOT NULL,
+    trace_id TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    decision TEXT,
+    reason TEXT,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS reviews_status ON reviews (status, id);
+"""
+
+
+@dataclass
+class ReviewItem:
+    id: int
+    tenant: Optional[str]
+    user_prompt: str
+    response_text: str
+    trace_id: Optional[str]
+    attempts: int
+
+
+class ReviewQueue:
+    """
+    SQLite-backed review queue; survives restarts.
+
+    Items claimed by a worker that died are returned to pending when the
+    queue is reopened. A failed attempt is retried after retry_backoff
+    seconds, doubling per attempt up to retry_max_backoff. Like the
+    journal, the queue keeps no content once a review is done: the prompt
+    and response of completed items are blanked.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, retry_backoff: float = 1.0,
+                 retry_max_backoff: float = 60.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_max_backoff = retry_max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reviews)")}
+        if "next_attempt_at" not in columns:
+            # Queue files written before retries were delayed.
+            self._conn.execute("ALTER TABLE reviews ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute("UPDATE reviews SET status = ? WHERE status = ?", (PENDING, IN_PROGRESS))
+
+    @classmethod
+    def from_settings(cls, config: Optional[ArgusSettings] = None) -> "ReviewQueue":
+        config = config or settings
+        return cls(config.l2_review_queue_path, config.l2_review_max_attempts,
+                   config.l2_review_retry_backoff, config.l2_review_retry_max_backoff)
+
+    def enqueue(self, tenant: Optional[str], user_prompt: str, response_text: str,
+                trace_id: Optional[str] = None) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO reviews (created, tenant, user_prompt, response_text, trace_id, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (time.time(), tenant, user_prompt, response_text, trace_id, PENDING),
+            )
+            return cursor.lastrowid
+
+    def claim(self, limit: int = 1) -> List[ReviewItem]:
+        """Atomically move up to limit pending items due for an attempt to in_progress and return them."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, tenant, user_prompt, response_text, trace_id, attempts FROM reviews "
+                    "WHERE status = ? AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                    (PENDING, self._clock(), limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE reviews SET status = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(IN_PROGRESS, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [ReviewItem(*row[:5], attempts=row[5] + 1) for row in rows]
+
+    def complete(self, item_id: int, decision: str, reason: Optional[str]) -> None:
+        """Record the verdict and drop the reviewed content."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reviews SET status = ?, decision = ?, reason = ?, user_prompt = '', response_text = '' "
+                "WHERE id = ?",
+                (DONE, decision, reason, item_id),
+            )
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before the attempt after the given number of failed ones."""
+        return min(self.retry_max_backoff, self.retry_backoff * 2 ** (attempts - 1))
+
+    def fail(self, item: ReviewItem, reason: str) -> bool:
+        """Return the item to pending after a backoff, or mark it failed after max_attempts. True if retried."""
+        retry = item.attempts < self.max_attempts
+        next_attempt_at = self._clock() + self.retry_delay(item.attempts) if retry else 0
+        with self._lock:
+            self._conn.execute(
+                "UPDATE reviews SET status = ?, reason = ?, next_attempt_at = ? WHERE id = ?",
+                (PENDING if retry else FAILED, reason, next_attempt_at, item.id),
+            )
+        return retry
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM reviews GROUP BY status").fetchall()
+        return dict(rows)
+
+    def pending_count(self) -> int:
+        return self.counts().get(PENDING, 0)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+GuardFunction = Callable[..., Dict]
+
+
+class ReviewWorkerPool:
+    """Threads that run deferred guard reviews and journal the outcome."""
+
+    def __init__(
+        self,
+        queue: ReviewQueue,
+        journal: DecisionJournal,
+        analyze: GuardFunction,
+        template_for: Callable[[Optional[str]], object],
+        workers: int = 2,
+        poll_interval: float = 0.5,
+    ):
+        self.queue = queue
+        self.journal = journal
+        self.analyze = analyze
+        self.template_for = template_for
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._reviewed = ShardedCounter()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "ReviewWorkerPool":
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"argus-review-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    @property
+    def reviewed(self) -> int:
+        return self._reviewed.value
+
+    def notify(self) -> None:
+        """Wake idle workers after an enqueue."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            items = self.queue.claim(1)
+            if not items:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self.review(items[0])
+
+    def review(self, item: ReviewItem) -> None:
+        """Run the guard on one item and record the verdict."""
+        try:
+            result = self.analyze(
+                user_prompt=item.user_prompt,
+                response_text=item.response_text,
+                prompt_template=self.template_for(item.tenant),
+            )
+        except Exception as e:
+            result = {"status": "error", "decision": "ERROR", "reason": f"{type(e).__name__}: {e}"}
+        if result.get("status") != "success":
+            if self.queue.fail(item, result.get("reason") or "guard error"):
+                logger.warning(f"Deferred review {item.id} failed ({result.get('reason')}); will retry.")
+                return
+            decision, reason = "ERROR", result.get("reason")
+        else:
+            decision, reason = result.get("decision"), result.get("reason")
+            self.queue.complete(item.id, decision, reason)
+        self._reviewed.add()
+        self.journal.record(JournalEntry(
+            stage=L2_DEFERRED,
+            decision=decision,
+            reason=reason,
+            tenant=item.tenant,
+            prompt_sha=prompt_digest(item.user_prompt),
+            review_id=item.id,
+            trace_id=item.trace_id,
+        ))
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait until nothing is pending or in progress; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            counts = self.queue.counts()
+            if not counts.get(PENDING) and not counts.get(IN_PROGRESS):
+                return True
+            self.notify()
+            time.sleep(0.01)
+        return False
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
@@ -0,0 +1,174 @@
+"""
+Per-conversation scan state for multi-turn clients.
+
+A Session remembers just enough of a conversation to scan each new turn
+on its own: the tail of the text already scanned (so a blocklist term or
+pattern split across turns is still seen), the recent exchanges that are
+forwarded to the primary LLM, a condensed rolling context for the guard,
+and the verdicts of earlier turns. Sessions live in a bounded LRU
+SessionStore keyed by tenant and session id.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Optional, Tuple
+
+from ..config.settings import ArgusSettings, settings
+
+# Turns are joined with a space when scanned, so "ignore previous" followed by
+# "instructions" in the next turn still contains the blocklisted phrase.
+TURN_JOINER = " "
+
+RELEASED = "RELEASED"
+BLOCKED = "BLOCKED"
+
+
+def _tail(text: str, max_chars: int) -> str:
+    """The last max_chars of text, starting at a word boundary where possible."""
+    if len(text) <= max_chars:
+        return text
+    tail = text[-max_chars:]
+    # A word cut in half could create matches (e.g. a shorter digit run) that never existed.
+    for i, char in enumerate(tail):
+        if char.isspace():
+            return tail[i + 1:]
+    return tail
+
+
+def _clip(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[:max_chars - 3] + "..."
+
+
+class Session:
+    """Scan state, recent history and verdicts for one conversation."""
+
+    def __init__(
+        self,
+        session_id: str,
+        tenant_id: Optional[str] = None,
+        overlap_chars: int = 256,
+        history_turns: int = 20,
+        context_turns: int = 3,
+        context_chars: int = 200,
+    ):
+        self.session_id = session_id
+        self.tenant_id = tenant_id
+        self.overlap_chars = overlap_chars
+        self.context_chars = context_chars
+        # Turns of one session are evaluated one at a time.
+        self.lock = threading.Lock()
+        self.tail = ""
+        self.turns = 0
+        self.history: Deque[Tuple[str, str]] = deque(maxlen=history_turns)
+        self.context: Deque[Tuple[str, str]] = deque(maxlen=context_turns)
+        self.verdicts: Deque[str] = deque(maxlen=max(history_turns, 1))
+        self.last_used = 0.0
+        self._committed = False
+
+    def scan_window(self, turn: str) -> str:
+        """The text L1 input filters see for turn: the scanned tail plus the new turn."""
+        return self.tail + TURN_JOINER + turn if self.tail else turn
+
+    def primary_prompt(self, turn: str) -> str:
+        """The prompt for the primary LLM: recent exchanges followed by turn."""
+        if not self.history:
+            return turn
+        lines = []
+        for user, assistant in self.history:
+            lines.append(f"User: {user}")
+            lines.append(f"Assistant: {assistant}")
+        lines.append(f"User: {turn}")
+        return "\n".join(lines)
+
+    def guard_context(self, turn: str) -> str:
+        """A compact view of the conversation for the guard, ending with turn in full."""
+        if not self.context and BLOCKED not in self.verdicts:
+            return turn
+        lines = ["[Earlier in this conversation]"]
+        for user, assistant in self.context:
+            lines.append(f"User: {user}")
+            lines.append(f"Assistant: {assistant}")
+        blocked = sum(1 for verdict in self.verdicts if verdict == BLOCKED)
+        if blocked:
+            lines.append(f"({blocked} earlier turn(s) blocked by Argus)")
+        lines.append("[Current request]")
+        lines.append(turn)
+        return "\n".join(lines)
+
+    def begin(self) -> None:
+        self._committed = False
+
+    def commit(self, turn: str, response: str) -> None:
+        """Record a released exchange and advance the scanned tail past turn."""
+        self.tail = _tail(self.scan_window(turn), self.overlap_chars)
+        self.history.append((turn, response))
+        self.context.append((_clip(turn, self.context_chars), _clip(response, self.context_chars)))
+        self.verdicts.append(RELEASED)
+        self.turns += 1
+        self._committed = True
+
+    def finish(self) -> None:
+        """Close the current turn; a turn that was never committed was blocked."""
+        if not self._committed:
+            self.verdicts.append(BLOCKED)
+            self.turns += 1
+
+
+class SessionStore:
+    """Bounded LRU of sessions; idle sessions expire after ttl seconds."""
+
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        ttl: float = 3600.0,
+        session_factory: Optional[Callable[[str, Optional[str]], Session]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._factory = session_factory or (lambda session_id, tenant_id: Session(session_id, tenant_id))
+        self._clock = clock
+        self._sessions: "OrderedDict[Tuple[Optional[str], str], Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, config: Optional[ArgusSettings] = None) -> "SessionStore":
+        config = config or settings
+
+        def factory(session_id: str, tenant_id: Optional[str]) -> Session:
+            return Session(
+                session_id,
+                tenant_id,
+                overlap_chars=config.session_overlap_chars,
+                history_turns=config.session_history_turns,
+                context_turns=config.session_context_turns,
+                context_chars=config.session_context_chars,
+            )
+
+        return cls(config.session_max_sessions, config.session_ttl, factory)
+
+    def get(self, session_id: str, tenant_id: Optional[str] = None) -> Session:
+        """The session for (tenant_id, session_id), created if missing or expired."""
+        key = (tenant_id, session_id)
+        now = self._clock()
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and now - session.last_used > self.ttl:
+                session = None
+            if session is None:
+                session = self._factory(session_id, tenant_id)
+                self._sessions[key] = session
+            session.last_used = now
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def drop(self, session_id: str, tenant_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._sessions.pop((tenant_id, session_id), None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -29,12 +29,41 @@ class SecurityResult:
     details: Optional[str] = None
     confidence: Optional[float] = None
 
-@dataclass
 class FilterResult:
-    """Result of filter processing."""
-    passed: bool
-    violation_detail: Optional[str] = None
-    filter_type: Optional[str] = None
+    """Result of filter processing.
+
+    Slotted to keep per-check allocations small; clean checks return the
+    shared PASSED instance, which must not be mutated.
+    """
+    __slots__ = ("passed", "violation_detail", "filter_type", "escalate", "redacted_text")
+
+    def __init__(
+        self,
+        passed: bool,
+        violation_detail: Optional[str] = None,
+        filter_type: Optional[str] = None,
+        escalate: bool = False,
+        redacted_text: Optional[str] = None,
+    ):
+        self.passed = passed
+        self.violation_detail = violation_detail
+        self.filter_type = filter_type
+        self.escalate = escalate
+        self.redacted_text = redacted_text
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"FilterResult({fields})"
+
+PASSED = FilterResult(passed=True)
 
 @dataclass
 class AnalysisContext:
@@ -43,3 +72,14 @@ class AnalysisContext:
     response_text: str
     primary_role: str
     metadata: Optional[Dict[str, Any]] = None
+
+@dataclass
+class Finding:
+    """A single L1 rule match located within scanned text."""
+    rule: str
+    filter_type: str
+    start: int
+    end: int
+    source: Optional[str] = None
+    offset: Optional[int] = None
+    field: Optional[str] = None
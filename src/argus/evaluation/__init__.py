@@ -0,0 +1,24 @@
+"""
+Evaluation of detection quality and cost across gateway configurations.
+"""
+
+from .corpus import EvalCase, builtin_corpus, load_corpus
+from .harness import DEFAULT_CONFIGS, ConfigReport, EvalConfig, evaluate, format_report, run_config
+from .replay import CapturedGuard, CapturedLLM, ReplayReport, format_replay_report, replay
+
+__all__ = [
+    "EvalCase",
+    "builtin_corpus",
+    "load_corpus",
+    "DEFAULT_CONFIGS",
+    "ConfigReport",
+    "EvalConfig",
+    "evaluate",
+    "format_report",
+    "run_config",
+    "CapturedGuard",
+    "CapturedLLM",
+    "ReplayReport",
+    "format_replay_report",
+    "replay",
+]
@@ -0,0 +1,326 @@
+"""
+Accuracy-versus-latency evaluation of gateway configurations.
+
+Every case of a labeled corpus is sent through an ArgusGateway built under
+each named configuration. The primary LLM and the guard are local
+stand-ins that replay the responses and verdicts recorded in the corpus,
+with a configurable latency model for the guard, so runs are repeatable
+and need no network. The report gives precision and recall per reason
+code, latency percentiles, guard calls and guard input size per
+configuration.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..config.settings import ArgusSettings, settings
+from ..core.gateway import ArgusGateway
+from ..core.journal import ADMISSION, DEADLINE, L1_INPUT, L1_OUTPUT, L2, DecisionJournal, JournalEntry
+from ..core.types import ViolationReason
+from ..llm.base import BaseLLM
+from ..llm.mock_llm import MockLLM
+from .corpus import ANY_MODEL, CLEAN, EvalCase
+
+logger = logging.getLogger(__name__)
+
+# Outcomes that are neither CLEAN nor a reason code.
+ERROR = "ERROR"
+OVERLOADED = "OVERLOADED"
+TIMEOUT = "TIMEOUT"
+
+_CLEAN_VERDICT = {"status": "success", "decision": "CLEAN", "reason": None}
+
+
+@dataclass
+class EvalConfig:
+    """
+    One gateway configuration to evaluate.
+
+    overrides are settings attributes applied to the gateway under
+    evaluation (and the policy engines, queues and stores it builds); the
+    application settings are left as they are. guard=False evaluates L1
+    alone. guard_model picks which recorded verdicts the guard stand-in
+    replays; its latency is guard_latency seconds plus
+    guard_latency_per_kchar per 1000 input characters.
+    """
+    name: str
+    overrides: Dict[str, Any] = field(default_factory=dict)
+    guard: bool = True
+    guard_model: str = ANY_MODEL
+    guard_latency: float = 0.0
+    guard_latency_per_kchar: float = 0.0
+    description: str = ""
+
+
+DEFAULT_CONFIGS: Tuple[EvalConfig, ...] = (
+    EvalConfig("l1_only", guard=False, description="Layer 1 filters only"),
+    EvalConfig("l1_l2", description="Layer 1 plus a synchronous guard review"),
+    EvalConfig("l1_l2_redact", {"pii_action": "redact"}, description="Output PII redacted instead of blocked"),
+    EvalConfig(
+        "l1_l2_sampled",
+        {"l2_review_mode": "sampled", "l2_review_queue_path": ":memory:", "l2_review_workers": 0},
+        description="Sampled L2; deferred responses count as released",
+    ),
+    EvalConfig("l1_l2_no_prefilter", {"l1_prefilter": False}, description="Layer 1 without rule preconditions"),
+    EvalConfig("l1_l2_compact", {"l2_compaction": True}, description="Guard shown the highest-risk excerpts only"),
+)
+
+
+@dataclass
+class ReasonStats:
+    """Confusion counts for one reason code (or for detection as a whole)."""
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+
+    @property
+    def precision(self) -> Optional[float]:
+        return self.tp / (self.tp + self.fp) if self.tp + self.fp else None
+
+    @property
+    def recall(self) -> Optional[float]:
+        return self.tp / (self.tp + self.fn) if self.tp + self.fn else None
+
+
+@dataclass
+class CaseResult:
+    case_id: str
+    label: str
+    predicted: str
+    latency: float
+    guard_calls: int
+
+
+@dataclass
+class ConfigReport:
+    """Results of one configuration over the corpus."""
+    config: EvalConfig
+    results: List[CaseResult]
+    guard_calls: int = 0
+    guard_input_chars: int = 0
+    deferred: int = 0
+
+    @property
+    def detection(self) -> ReasonStats:
+        """Any violation versus CLEAN, regardless of the reason reported."""
+        stats = ReasonStats()
+        for result in self.results:
+            flagged = result.predicted != CLEAN
+            if result.label != CLEAN:
+                if flagged:
+                    stats.tp += 1
+                else:
+                    stats.fn += 1
+            elif flagged:
+                stats.fp += 1
+        return stats
+
+    def per_reason(self) -> Dict[str, ReasonStats]:
+        stats: Dict[str, ReasonStats] = {}
+        for result in self.results:
+            if result.label != CLEAN:
+                entry = stats.setdefault(result.label, ReasonStats())
+                if result.predicted == result.label:
+                    entry.tp += 1
+                else:
+                    entry.fn += 1
+            if result.predicted != CLEAN and result.predicted != result.label:
+                stats.setdefault(result.predicted, ReasonStats()).fp += 1
+        return dict(sorted(stats.items()))
+
+    def latency(self, pct: float) -> float:
+        ordered = sorted(result.latency for result in self.results)
+        if not ordered:
+            return float("nan")
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def mismatches(self) -> List[CaseResult]:
+        return [result for result in self.results if result.predicted != result.label]
+
+    def to_dict(self) -> Dict[str, Any]:
+        def rates(stats: ReasonStats) -> Dict[str, Any]:
+            return {"tp": stats.tp, "fp": stats.fp, "fn": stats.fn,
+                    "precision": stats.precision, "recall": stats.recall}
+
+        return {
+            "config": self.config.name,
+            "cases": len(self.results),
+            "detection": rates(self.detection),
+            "per_reason": {reason: rates(stats) for reason, stats in self.per_reason().items()},
+            "latency_ms": {f"p{p}": self.latency(p) * 1000 for p in (50, 95, 99)},
+            "guard_calls": self.guard_calls,
+            "guard_input_chars": self.guard_input_chars,
+            "deferred": self.deferred,
+            "mismatches": [
+                {"id": r.case_id, "label": r.label, "predicted": r.predicted} for r in self.mismatches()
+            ],
+        }
+
+
+class ReplayLLM(BaseLLM):
+    """Primary LLM stand-in returning each case's recorded response."""
+
+    def __init__(self, cases: Sequence[EvalCase], latency: float = 0.0):
+        self._responses = {case.prompt: case.response for case in cases if case.response is not None}
+        self._fallback = MockLLM(latency_range=(0.0, 0.0))
+        self.latency = latency
+
+    def get_response(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        response = self._responses.get(prompt)
+        return response if response is not None else self._fallback.select_response(prompt)
+
+    def get_model_name(self) -> str:
+        return "replay"
+
+
+class ReplayGuard:
+    """Guard stand-in replaying recorded verdicts for one guard model."""
+
+    def __init__(self, cases: Sequence[EvalCase], model: str = ANY_MODEL, latency: float = 0.0,
+                 latency_per_kchar: float = 0.0):
+        self._by_prompt = {case.prompt: case for case in cases}
+        self._by_response = {case.response: case for case in cases if case.response is not None}
+        self.model = model
+        self.latency = latency
+        self.latency_per_kchar = latency_per_kchar
+        self.calls = 0
+        self.input_chars = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, user_prompt: str, response_text: str, prompt_template=None) -> Dict[str, Optional[str]]:
+        chars = len(user_prompt) + len(response_text)
+        with self._lock:
+            self.calls += 1
+            self.input_chars += chars
+        delay = self.latency + self.latency_per_kchar * chars / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+        case = self._by_prompt.get(user_prompt) or self._by_response.get(response_text)
+        verdict = case.guard_verdict(self.model) if case is not None else None
+        if verdict is None:
+            return dict(_CLEAN_VERDICT)
+        if (verdict.get("decision") == "VIOLATION" and case.evidence is not None
+                and case.evidence not in user_prompt + response_text):
+            # The guard can only flag what it is shown (e.g. after compaction).
+            return dict(_CLEAN_VERDICT)
+        return dict(verdict)
+
+
+class _CaseJournal(DecisionJournal):
+    """In-memory journal whose entries are collected per case."""
+
+    def __init__(self):
+        super().__init__(buffer_size=16)
+        self.entries: List[JournalEntry] = []
+
+    def record(self, entry: JournalEntry) -> None:
+        self.entries.append(entry)
+        super().record(entry)
+
+
+def outcome(entries: Sequence[JournalEntry], output: str, case: EvalCase) -> str:
+    """The reason code the gateway acted on for one case, or CLEAN."""
+    for entry in entries:
+        if entry.decision == "CLEAN":
+            continue
+        reason = entry.reason or ""
+        if entry.stage == L1_INPUT:
+            if reason.startswith("Blocked Input Term"):
+                return ViolationReason.PROMPT_INJECTION_ATTEMPT.value
+            return ERROR if "Budget Exceeded" in reason else ViolationReason.PII_DETECTED.value
+        if entry.stage == L1_OUTPUT:
+            if reason.startswith("Blocked Output Term"):
+                return ViolationReason.CONFIDENTIAL_DATA.value
+            return ERROR if "Budget Exceeded" in reason else ViolationReason.PII_DETECTED.value
+        if entry.stage == L2:
+            return ERROR if entry.decision == "ERROR" else (reason or ViolationReason.UNKNOWN_VIOLATION.value)
+        if entry.stage == ADMISSION:
+            return OVERLOADED
+        if entry.stage == DEADLINE and entry.decision == "BLOCKED":
+            return TIMEOUT
+    if output.startswith("[Argus]"):
+        return ERROR
+    if case.response is not None and output != case.response:
+        # Released with PII masked (PII_ACTION=redact).
+        return ViolationReason.PII_DETECTED.value
+    return CLEAN
+
+
+def config_with(overrides: Mapping[str, Any]) -> ArgusSettings:
+    """A copy of the application settings with overrides applied."""
+    unknown = sorted(set(overrides) - set(ArgusSettings.__fields__))
+    if unknown:
+        raise ValueError(f"Unknown settings in overrides: {', '.join(unknown)}")
+    return settings.copy(update=dict(overrides))
+
+
+def run_config(config: EvalConfig, cases: Sequence[EvalCase], seed: int = 0) -> ConfigReport:
+    """Evaluate one configuration over cases, one case at a time."""
+    guard = ReplayGuard(cases, config.guard_model, config.guard_latency, config.guard_latency_per_kchar)
+    journal = _CaseJournal()
+    random.seed(seed)
+    analyze = guard if config.guard else (lambda **kwargs: dict(_CLEAN_VERDICT))
+    gateway = ArgusGateway(llm=ReplayLLM(cases), journal=journal, guard=analyze,
+                           config=config_with(config.overrides))
+    # Every case must run: no coalescing or cached results.
+    gateway.singleflight = None
+    gateway.result_cache = None
+    results = []
+    try:
+        for case in cases:
+            journal.entries.clear()
+            calls_before = guard.calls
+            started = time.perf_counter()
+            output = gateway.process_prompt(case.prompt)
+            elapsed = time.perf_counter() - started
+            results.append(CaseResult(case.case_id, case.label, outcome(journal.entries, output, case),
+                                      elapsed, guard.calls - calls_before))
+        deferred = gateway.review_queue.pending_count() if gateway.review_queue is not None else 0
+    finally:
+        gateway.close()
+    logger.info(f"Evaluated '{config.name}' on {len(cases)} case(s).")
+    return ConfigReport(config, results, guard.calls, guard.input_chars, deferred)
+
+
+def evaluate(cases: Sequence[EvalCase], configs: Sequence[EvalConfig] = DEFAULT_CONFIGS,
+             seed: int = 0) -> List[ConfigReport]:
+    """Evaluate every configuration over the same cases."""
+    return [run_config(config, cases, seed) for config in configs]
+
+
+def _rate(value: Optional[float]) -> str:
+    return "   -" if value is None else f"{value:4.2f}"
+
+
+def format_report(reports: Sequence[ConfigReport]) -> str:
+    """Plain-text tables: a summary per configuration, then per-reason precision/recall."""
+    lines = [
+        f"{'config':22s} {'prec':>5s} {'recall':>6s} {'p50':>8s} {'p95':>8s} {'p99':>8s} "
+        f"{'guard':>6s} {'g.chars':>8s} {'deferred':>8s}"
+    ]
+    for report in reports:
+        detection = report.detection
+        lines.append(
+            f"{report.config.name:22s} {_rate(detection.precision):>5s} {_rate(detection.recall):>6s} "
+            f"{report.latency(50) * 1000:6.1f}ms {report.latency(95) * 1000:6.1f}ms "
+            f"{report.latency(99) * 1000:6.1f}ms {report.guard_calls:6d} {report.guard_input_chars:8d} "
+            f"{report.deferred:8d}"
+        )
+    reasons = sorted({reason for report in reports for reason in report.per_reason()})
+    if reasons:
+        lines.append("")
+        lines.append(f"{'precision/recall':22s} " + " ".join(f"{reason[:14]:>14s}" for reason in reasons))
+        for report in reports:
+            per_reason = report.per_reason()
+            cells = []
+            for reason in reasons:
+                stats = per_reason.get(reason, ReasonStats())
+                cells.append(f"{_rate(stats.precision)}/{_rate(stats.recall)}".rjust(14))
+            lines.append(f"{report.config.name:22s} " + " ".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,315 @@
+"""
+Deterministic replay of captured traffic (see core/capture.py).
+
+Captured requests are sent through an ArgusGateway built under an
+EvalConfig, at their recorded arrival times divided by speed, or back to
+back. The primary LLM and the guard are stand-ins that return what was
+recorded for each request and take the recorded time multiplied by
+time_scale, so latency and throughput changes can be measured against the
+real traffic shape. Unlike run_config, the result cache and coalescing
+stay as configured, since repeats are part of that shape.
+
+Hashed captures are replayed with filler text of the recorded lengths:
+timings and guard verdicts are reproduced, L1 matches are not.
+"""
+
+import contextvars
+import logging
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from ..core.capture import TURN, GuardCall, Interaction, TrafficRecorder, collecting
+from ..core.gateway import ArgusGateway
+from ..llm.base import BaseLLM
+from ..llm.mock_llm import MockLLM, split_tokens
+from .harness import _CLEAN_VERDICT, EvalConfig, config_with
+
+logger = logging.getLogger(__name__)
+
+# Outcome of a replayed request that raised instead of answering.
+ERROR = "ERROR"
+
+
+def _filler(sha: Optional[str], chars: int) -> str:
+    unit = f"{sha or 'x'} "
+    return (unit * (chars // len(unit) + 1))[:chars]
+
+
+def replay_prompt(interaction: Interaction) -> str:
+    """The prompt to send: the recorded text, or filler of its length when it was hashed."""
+    if interaction.prompt is not None:
+        return interaction.prompt
+    return _filler(interaction.prompt_sha, interaction.prompt_chars)
+
+
+def replay_response(interaction: Interaction) -> Optional[str]:
+    if interaction.response is not None:
+        return interaction.response
+    if interaction.response_chars is None:
+        return None
+    return _filler(interaction.response_sha, interaction.response_chars)
+
+
+class _Replay:
+    """Replay state of one captured request, shared by the threads serving it."""
+
+    def __init__(self, interaction: Interaction):
+        self.interaction = interaction
+        self.guard_calls = 0
+        self.guard_chars = 0
+        self._lock = threading.Lock()
+
+    def next_guard(self, chars: int) -> Optional[GuardCall]:
+        """The recorded guard call matching this one; the last recorded when there are more calls now."""
+        recorded = self.interaction.guard
+        with self._lock:
+            index = self.guard_calls
+            self.guard_calls += 1
+            self.guard_chars += chars
+        if not recorded:
+            return None
+        return recorded[min(index, len(recorded) - 1)]
+
+
+_replaying: "contextvars.ContextVar[Optional[_Replay]]" = contextvars.ContextVar("argus_replaying", default=None)
+
+
+class CapturedLLM(BaseLLM):
+    """Primary LLM stand-in returning each request's recorded response in its recorded time."""
+
+    def __init__(self, interactions: Sequence[Interaction], time_scale: float = 1.0):
+        # Requests answered from the cache or by a coalesced run recorded no
+        # response of their own; a replay that misses the cache uses another's.
+        self._by_prompt = {replay_prompt(i): i for i in interactions if i.response_chars is not None}
+        self._fallback = MockLLM(latency_range=(0.0, 0.0))
+        self.time_scale = time_scale
+
+    def _recorded(self, prompt: str) -> Optional[Interaction]:
+        state = _replaying.get()
+        if state is not None and (state.interaction.response_chars is not None
+                                  or "primary_llm" in state.interaction.abandoned):
+            return state.interaction
+        return self._by_prompt.get(prompt)
+
+    def _replayed(self, prompt: str):
+        """(seconds to take, response text) for prompt."""
+        interaction = self._recorded(prompt)
+        if interaction is None:
+            return 0.0, self._fallback.select_response(prompt)
+        seconds = interaction.primary_seconds or interaction.abandoned.get("primary_llm", 0.0)
+        response = replay_response(interaction)
+        if response is None:
+            response = self._fallback.select_response(prompt)
+        return seconds * self.time_scale, response
+
+    def get_response(self, prompt: str) -> str:
+        seconds, response = self._replayed(prompt)
+        if seconds > 0:
+            time.sleep(seconds)
+        return response
+
+    def stream_response(self, prompt: str) -> Iterator[str]:
+        """The recorded response in word tokens, spread evenly over the recorded time."""
+        seconds, response = self._replayed(prompt)
+        tokens = split_tokens(response)
+        delay = seconds / max(1, len(tokens))
+        for token in tokens:
+            if delay > 0:
+                time.sleep(delay)
+            yield token
+
+    def get_model_name(self) -> str:
+        return "capture-replay"
+
+
+class CapturedGuard:
+    """
+    Guard stand-in replaying each request's recorded verdicts and timings.
+
+    Calls are matched to the recorded ones in order. With scale_by_chars
+    a call's time is scaled by its input size relative to the recorded
+    call, so changes to guard input show up in latency.
+    """
+
+    def __init__(self, interactions: Sequence[Interaction], time_scale: float = 1.0,
+                 scale_by_chars: bool = False):
+        recorded = [call.seconds for interaction in interactions for call in interaction.guard]
+        self.default_seconds = statistics.median(recorded) if recorded else 0.0
+        self.time_scale = time_scale
+        self.scale_by_chars = scale_by_chars
+        self.calls = 0
+        self.input_chars = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, user_prompt: str, response_text: str, prompt_template=None) -> Dict[str, Optional[str]]:
+        chars = len(user_prompt) + len(response_text)
+        with self._lock:
+            self.calls += 1
+            self.input_chars += chars
+        state = _replaying.get()
+        call = state.next_guard(chars) if state is not None else None
+        if call is not None:
+            seconds = call.seconds * (chars / call.chars if self.scale_by_chars and call.chars else 1.0)
+        elif state is not None and "l2_guard" in state.interaction.abandoned:
+            seconds = state.interaction.abandoned["l2_guard"]
+        else:
+            seconds = self.default_seconds
+        if seconds * self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+        if call is None or call.status is None:
+            return dict(_CLEAN_VERDICT)
+        return call.verdict()
+
+
+@dataclass
+class ReplayResult:
+    index: int
+    recorded_outcome: str
+    outcome: str
+    recorded_latency: float
+    latency: float
+    guard_calls: int
+    guard_chars: int
+
+
+@dataclass
+class ReplayReport:
+    """Results of replaying one capture under one configuration."""
+    config: EvalConfig
+    results: List[ReplayResult]
+    wall_seconds: float
+    recorded_guard_calls: int = 0
+    recorded_guard_chars: int = 0
+
+    @property
+    def guard_calls(self) -> int:
+        return sum(result.guard_calls for result in self.results)
+
+    @property
+    def guard_input_chars(self) -> int:
+        return sum(result.guard_chars for result in self.results)
+
+    def latency(self, pct: float, recorded: bool = False) -> float:
+        ordered = sorted(r.recorded_latency if recorded else r.latency for r in self.results)
+        if not ordered:
+            return float("nan")
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def changed(self) -> List[ReplayResult]:
+        """Requests whose outcome differs from the recorded one."""
+        return [result for result in self.results if result.outcome != result.recorded_outcome]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "config": self.config.name,
+            "requests": len(self.results),
+            "changed": len(self.changed()),
+            "latency_ms": {f"p{p}": self.latency(p) * 1000 for p in (50, 95, 99)},
+            "recorded_latency_ms": {f"p{p}": self.latency(p, recorded=True) * 1000 for p in (50, 95, 99)},
+            "guard_calls": self.guard_calls,
+            "guard_input_chars": self.guard_input_chars,
+            "recorded_guard_calls": self.recorded_guard_calls,
+            "recorded_guard_chars": self.recorded_guard_chars,
+            "wall_seconds": self.wall_seconds,
+            "changes": [
+                {"index": r.index, "recorded": r.recorded_outcome, "replayed": r.outcome} for r in self.changed()
+            ],
+        }
+
+
+def _send(gateway: ArgusGateway, interaction: Interaction, time_scale: float) -> str:
+    timeout = interaction.timeout
+    if timeout is not None and time_scale > 0:
+        timeout *= time_scale
+    prompt = replay_prompt(interaction)
+    if interaction.op == TURN:
+        return gateway.process_turn(interaction.session or "replay", prompt, tenant_id=interaction.tenant,
+                                    lane=interaction.lane, timeout=timeout, client_id=interaction.client)
+    return gateway.process_prompt(prompt, tenant_id=interaction.tenant, lane=interaction.lane, timeout=timeout,
+                                  client_id=interaction.client)
+
+
+def replay(interactions: Sequence[Interaction], config: Optional[EvalConfig] = None, time_scale: float = 1.0,
+           speed: Optional[float] = 1.0, workers: int = 16, scale_guard_by_chars: bool = False,
+           seed: int = 0) -> ReplayReport:
+    """
+    Replay captured interactions through a gateway built under config.
+
+    time_scale multiplies recorded LLM and guard times and request
+    timeouts (0 replays without waiting). speed compresses the arrival
+    schedule; None sends requests back to back, workers at a time.
+    """
+    config = config or EvalConfig("replay")
+    llm = CapturedLLM(interactions, time_scale)
+    guard = CapturedGuard(interactions, time_scale, scale_guard_by_chars)
+    analyze = guard if config.guard else (lambda **kwargs: dict(_CLEAN_VERDICT))
+    results: List[Optional[ReplayResult]] = [None] * len(interactions)
+    random.seed(seed)
+
+    def run(index: int) -> None:
+        interaction = interactions[index]
+        state = _Replay(interaction)
+        token = _replaying.set(state)
+        try:
+            with collecting() as collected:
+                started = time.perf_counter()
+                try:
+                    _send(gateway, interaction, time_scale)
+                except Exception as e:
+                    logger.error(f"Replayed request {index} failed: {e}", exc_info=True)
+                elapsed = time.perf_counter() - started
+        finally:
+            _replaying.reset(token)
+        outcome = collected[-1].outcome() if collected else ERROR
+        results[index] = ReplayResult(index, interaction.outcome(), outcome, interaction.total_seconds, elapsed,
+                                      state.guard_calls, state.guard_chars)
+
+    gateway = ArgusGateway(llm=llm, capture=TrafficRecorder(buffer_size=0), guard=analyze,
+                           config=config_with(config.overrides))
+    try:
+        first = interactions[0].at if interactions else 0.0
+        started = time.monotonic()
+        with ThreadPoolExecutor(workers, thread_name_prefix="argus-replay") as pool:
+            futures = []
+            for index, interaction in enumerate(interactions):
+                if speed:
+                    wait = started + (interaction.at - first) / speed - time.monotonic()
+                    if wait > 0:
+                        time.sleep(wait)
+                futures.append(pool.submit(run, index))
+            for future in futures:
+                future.result()
+        wall = time.monotonic() - started
+    finally:
+        gateway.close()
+    logger.info(f"Replayed {len(interactions)} request(s) under '{config.name}' in {wall:.2f}s.")
+    return ReplayReport(
+        config, results, wall,
+        recorded_guard_calls=sum(len(i.guard) for i in interactions),
+        recorded_guard_chars=sum(call.chars for i in interactions for call in i.guard),
+    )
+
+
+def format_replay_report(reports: Sequence[ReplayReport]) -> str:
+    """One line per configuration: outcome changes, replayed versus recorded latency, guard load."""
+    lines = [
+        f"{'config':22s} {'reqs':>5s} {'changed':>7s} {'p50':>8s} {'p95':>8s} {'p99':>8s} "
+        f"{'rec.p50':>8s} {'rec.p99':>8s} {'guard':>6s} {'g.chars':>8s} {'wall':>7s}"
+    ]
+    for report in reports:
+        lines.append(
+            f"{report.config.name:22s} {len(report.results):5d} {len(report.changed()):7d} "
+            f"{report.latency(50) * 1000:6.1f}ms {report.latency(95) * 1000:6.1f}ms "
+            f"{report.latency(99) * 1000:6.1f}ms {report.latency(50, True) * 1000:6.1f}ms "
+            f"{report.latency(99, True) * 1000:6.1f}ms {report.guard_calls:6d} {report.guard_input_chars:8d} "
+            f"{report.wall_seconds:6.2f}s"
+        )
+    if reports:
+        lines.append(f"recorded: {reports[0].recorded_guard_calls} guard call(s), "
+                     f"{reports[0].recorded_guard_chars} guard input chars")
+    return "\n".join(lines)
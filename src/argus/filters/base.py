@@ -3,18 +3,37 @@ Abstract base filter class for extensibility.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Sequence
 from ..core.types import FilterResult
 
 class BaseFilter(ABC):
-    """Abstract base class for all filters."""
+    """Abstract base class for all filters.
+
+    Filters are built once and reused across requests, so check() must not
+    keep per-call state on the instance.
+    """
     
     @abstractmethod
     def check(self, text: str) -> FilterResult:
         """Check text for violations."""
         pass
     
+    def check_batch(self, texts: Sequence[str]) -> List[FilterResult]:
+        """Check many texts; results are in input order. Override to amortise per-call cost."""
+        return [self.check(text) for text in texts]
+    
     @abstractmethod
     def get_filter_name(self) -> str:
         """Get the name of this filter."""
         pass
+
+# Stage name -> factory taking the stage's CompiledRules (or None for defaults)
+FilterFactory = Callable[[Optional[object]], BaseFilter]
+FILTER_REGISTRY: Dict[str, FilterFactory] = {}
+
+def register_filter(name: str) -> Callable[[FilterFactory], FilterFactory]:
+    """Register a filter class or factory as a named pipeline stage."""
+    def decorator(factory: FilterFactory) -> FilterFactory:
+        FILTER_REGISTRY[name] = factory
+        return factory
+    return decorator
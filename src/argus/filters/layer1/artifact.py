@@ -0,0 +1,264 @@
+"""
+Precompiled Layer 1 rule artifact, memory-mapped read-only by workers.
+
+`argus-rules compile` runs the per-pattern analysis once (backtracking
+risk, the matcher chosen for hardened mode, precondition tables) and
+writes it to a versioned binary file:
+
+    header   magic, format and analysis versions, entry count,
+             SHA-256 of everything after the header, payload length
+    metadata JSON: rules version, creation time, Argus and Python versions
+    index    entry_count x (16-byte rule key, offset, length), sorted by key
+    records  one JSON record per rule
+
+Workers open the file with mmap (ACCESS_READ), so every process shares the
+same page-cache pages, and decode only the records they look up. CPython
+cannot load a compiled regex program from memory, so each process still
+calls re.compile; what the artifact removes is the analysis, which is the
+part that grows with rule count and runs again for every tenant engine.
+
+Records are keyed by rule name, pattern, flags and safe rewrite, so a rule
+changed since the artifact was built is a miss and is analysed as usual.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+from ...core.exceptions import RuleArtifactError
+from .prefilter import CharRequirement, Precondition, derive_precondition
+from .redos import RuleRisk
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ARGUSRUL"
+FORMAT_VERSION = 1
+# Bump when analyze_pattern, _harden or derive_precondition change their output.
+ANALYSIS_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHI32sQ")
+_INDEX = struct.Struct("<16sQI")
+
+# Matcher forms recorded per rule.
+MATCH_PATTERN = "pattern"
+MATCH_SAFE = "safe"
+MATCH_WINDOWED = "windowed"
+
+
+def rule_key(name: str, pattern: Pattern[str], safe_form: Optional[Pattern[str]] = None) -> bytes:
+    """Identity of one rule's inputs; any change gives a different key."""
+    parts = [name, str(pattern.flags), pattern.pattern]
+    if safe_form is not None:
+        parts += [str(safe_form.flags), safe_form.pattern]
+    return hashlib.blake2b("\0".join(parts).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _precondition_to_dict(precondition: Optional[Precondition]) -> Optional[Dict]:
+    if precondition is None:
+        return None
+    return {
+        "classes": [["".join(sorted(r.chars)), r.closed] for r in precondition.classes],
+        "literal": precondition.literal,
+        "ignore_case": precondition.ignore_case,
+    }
+
+
+def _precondition_from_dict(data: Optional[Dict]) -> Optional[Precondition]:
+    if data is None:
+        return None
+    classes = [CharRequirement(frozenset(chars), closed) for chars, closed in data["classes"]]
+    return Precondition(classes, data["literal"], data["ignore_case"])
+
+
+@dataclass
+class RuleEntry:
+    """Analysis results for one PII rule."""
+    name: str
+    risk_level: str
+    risk_reasons: List[str]
+    matcher: str
+    precondition: Optional[Dict] = None
+    # Precondition of the hardened matcher, when it is a different pattern.
+    safe_precondition: Optional[Dict] = None
+    window: Optional[Tuple[int, int]] = None
+
+    @property
+    def risk(self) -> RuleRisk:
+        return RuleRisk(self.risk_level, tuple(self.risk_reasons))
+
+    def precondition_for(self, hardened: bool) -> Optional[Precondition]:
+        if hardened and self.matcher == MATCH_SAFE:
+            return _precondition_from_dict(self.safe_precondition)
+        return _precondition_from_dict(self.precondition)
+
+
+def analyze_rules(names: Sequence[str], patterns: Sequence[Pattern[str]],
+                  safe_patterns: Mapping[str, Pattern[str]]) -> List[Tuple[bytes, RuleEntry]]:
+    """Run the hardened-mode and precondition analysis for every rule."""
+    from .rules import _harden
+
+    entries = []
+    for name, pattern in zip(names, patterns):
+        rule = _harden(name, pattern)
+        if rule.matcher is rule.pattern:
+            matcher, window = MATCH_PATTERN, None
+        elif isinstance(rule.matcher, re.Pattern):
+            matcher, window = MATCH_SAFE, None
+        else:
+            matcher, window = MATCH_WINDOWED, (rule.matcher.window, rule.matcher.overlap)
+        entry = RuleEntry(
+            name=name,
+            risk_level=rule.risk.level,
+            risk_reasons=list(rule.risk.reasons),
+            matcher=matcher,
+            precondition=_precondition_to_dict(derive_precondition(pattern)),
+            safe_precondition=(
+                _precondition_to_dict(derive_precondition(rule.matcher)) if matcher == MATCH_SAFE else None
+            ),
+            window=window,
+        )
+        entries.append((rule_key(name, pattern, safe_patterns.get(name)), entry))
+    return entries
+
+
+def rules_version(keys: Sequence[bytes]) -> str:
+    return hashlib.sha256(b"".join(sorted(keys))).hexdigest()[:16]
+
+
+def write_artifact(path: str, entries: Sequence[Tuple[bytes, RuleEntry]]) -> Dict[str, object]:
+    """Write entries to path atomically; returns the metadata written."""
+    from ... import __version__
+
+    ordered = sorted(entries, key=lambda item: item[0])
+    metadata = {
+        "rules_version": rules_version([key for key, _ in ordered]),
+        "created_at": time.time(),
+        "argus_version": __version__,
+        "python": "%d.%d" % sys.version_info[:2],
+        "rules": [entry.name for _, entry in ordered],
+    }
+    meta_bytes = json.dumps(metadata).encode("utf-8")
+    records = [json.dumps(asdict(entry)).encode("utf-8") for _, entry in ordered]
+
+    index_size = _INDEX.size * len(ordered)
+    offset = 4 + len(meta_bytes) + index_size
+    index = []
+    for (key, _), record in zip(ordered, records):
+        index.append(_INDEX.pack(key, offset, len(record)))
+        offset += len(record)
+    payload = struct.pack("<I", len(meta_bytes)) + meta_bytes + b"".join(index) + b"".join(records)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, ANALYSIS_VERSION, len(ordered),
+                          hashlib.sha256(payload).digest(), len(payload))
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return metadata
+
+
+class RuleArtifact:
+    """A read-only, memory-mapped rule artifact."""
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise RuleArtifactError(f"Cannot map rule artifact '{path}': {e}") from e
+        try:
+            self._parse(verify)
+        except Exception:
+            self._map.close()
+            raise
+        self._decoded: Dict[bytes, RuleEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _parse(self, verify: bool) -> None:
+        if len(self._map) < _HEADER.size:
+            raise RuleArtifactError(f"'{self.path}' is too short to be a rule artifact")
+        magic, fmt, analysis, count, digest, payload_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise RuleArtifactError(f"'{self.path}' is not a rule artifact")
+        if fmt != FORMAT_VERSION or analysis != ANALYSIS_VERSION:
+            raise RuleArtifactError(
+                f"'{self.path}' has format {fmt}/analysis {analysis}; this build needs "
+                f"{FORMAT_VERSION}/{ANALYSIS_VERSION}. Re-run 'argus-rules compile'."
+            )
+        if len(self._map) != _HEADER.size + payload_len:
+            raise RuleArtifactError(f"'{self.path}' is truncated")
+        if verify and hashlib.sha256(self._map[_HEADER.size:]).digest() != digest:
+            raise RuleArtifactError(f"'{self.path}' failed its checksum")
+        (meta_len,) = struct.unpack_from("<I", self._map, _HEADER.size)
+        meta_start = _HEADER.size + 4
+        self.metadata: Dict[str, object] = json.loads(bytes(self._map[meta_start:meta_start + meta_len]))
+        self.count = count
+        self._index_start = meta_start + meta_len
+        self.checksum = digest.hex()
+
+    def _find(self, key: bytes) -> Optional[Tuple[int, int]]:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key, offset, length = _INDEX.unpack_from(self._map, self._index_start + mid * _INDEX.size)
+            if mid_key == key:
+                return _HEADER.size + offset, length
+            if mid_key < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def lookup(self, name: str, pattern: Pattern[str],
+               safe_form: Optional[Pattern[str]] = None) -> Optional[RuleEntry]:
+        """The recorded analysis for this exact rule, or None."""
+        key = rule_key(name, pattern, safe_form)
+        with self._lock:
+            entry = self._decoded.get(key)
+            if entry is None:
+                location = self._find(key)
+                if location is None:
+                    self.misses += 1
+                    return None
+                start, length = location
+                data = json.loads(bytes(self._map[start:start + length]))
+                if data.get("window") is not None:
+                    data["window"] = tuple(data["window"])
+                entry = self._decoded[key] = RuleEntry(**data)
+            self.hits += 1
+            return entry
+
+    def close(self) -> None:
+        self._map.close()
+
+
+_shared: Dict[str, Optional[RuleArtifact]] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_artifact(path: Optional[str]) -> Optional[RuleArtifact]:
+    """The process-wide artifact for path, opened once; None if unset or unusable."""
+    if not path:
+        return None
+    with _shared_lock:
+        if path not in _shared:
+            try:
+                _shared[path] = RuleArtifact(path)
+                logger.info(f"Mapped L1 rule artifact '{path}' ({_shared[path].metadata.get('rules_version')}).")
+            except RuleArtifactError as e:
+                logger.warning(f"{e}. Analysing L1 rules at startup instead.")
+                _shared[path] = None
+        return _shared[path]
@@ -0,0 +1,250 @@
+"""
+Batch Layer 1 matching: many short texts, one pass per rule.
+
+Texts are joined into a single buffer with a separator that no rule can
+match, the blocklist terms and a combined PII screen run once over the
+buffer, and match offsets are mapped back to texts by binary search over
+the cumulative start offsets (NumPy searchsorted when NumPy is installed,
+bisect otherwise). Results are per-text and in the same order as the
+input.
+"""
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Set, Tuple
+
+from ...core.types import Finding
+from .rules import CompiledRules, PiiRule
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+# NUL is neither a word nor a whitespace character, so \b and \s behave at a
+# separator exactly as at the start or end of a string.
+SEPARATOR = "\x00"
+DEFAULT_CHUNK_CHARS = 1 << 20
+
+# Anchors see the buffer, not the text; rules using them run per text.
+_ANCHOR_RE = re.compile(r"(?<![\[\\])\^|(?<!\\)\$|\\[AZ]")
+
+
+class _Buffer:
+    """A run of texts joined by SEPARATOR, with their start offsets."""
+
+    __slots__ = ("first", "count", "text", "starts")
+
+    def __init__(self, texts: Sequence[str], first: int):
+        self.first = first
+        self.count = len(texts)
+        self.text = SEPARATOR.join(texts)
+        starts = list(accumulate([len(text) + 1 for text in texts[:-1]], initial=0)) if texts else []
+        self.starts = np.asarray(starts, dtype=np.int64) if np is not None else starts
+
+    def owners(self, positions: Sequence[int]) -> List[int]:
+        """Index (within this buffer) of the text containing each position."""
+        if np is not None:
+            return (np.searchsorted(self.starts, positions, side="right") - 1).tolist()
+        return [bisect_right(self.starts, pos) - 1 for pos in positions]
+
+    def start_of(self, index: int) -> int:
+        return int(self.starts[index])
+
+    def lowered(self, texts: Sequence[str]) -> "_Buffer":
+        """The same texts case-folded, as str.lower() would per text."""
+        lower = self.text.lower()
+        if len(lower) == len(self.text):
+            folded = _Buffer.__new__(_Buffer)
+            folded.first, folded.count, folded.text, folded.starts = self.first, self.count, lower, self.starts
+            return folded
+        # A few characters change length when lowered; offsets must be rebuilt.
+        return _Buffer([text.lower() for text in texts[self.first:self.first + self.count]], self.first)
+
+
+def _chunks(texts: Sequence[str], chunk_chars: int) -> Iterator[_Buffer]:
+    """Split texts into buffers of roughly chunk_chars characters."""
+    first = 0
+    size = 0
+    for i, text in enumerate(texts):
+        size += len(text) + 1
+        if size >= chunk_chars:
+            yield _Buffer(texts[first:i + 1], first)
+            first = i + 1
+            size = 0
+    if first < len(texts):
+        yield _Buffer(texts[first:], first)
+
+
+def batch_safe(rule: PiiRule) -> bool:
+    """True if the rule's matches cannot depend on neighbouring texts."""
+    return not _ANCHOR_RE.search(rule.pattern.pattern) and SEPARATOR not in rule.pattern.pattern
+
+
+class BatchMatcher:
+    """
+    Runs one CompiledRules over many texts at once.
+
+    Blocklist terms are found with one case-folded substring search per
+    term over the whole buffer. PII rules are combined into a single
+    alternation that screens the buffer in one pass: a text that no
+    alternative touches cannot match any rule, so only the few screened-in
+    texts are checked rule by rule. Rules with a precondition (L1_PREFILTER)
+    are screened by the rules' combined precondition trigger, also in one
+    pass over the buffer: only texts it touches have their preconditions
+    evaluated and gated rules run. Rules that cannot be screened on a
+    shared buffer (anchored patterns, windowed matchers) run per text.
+
+    Results are the same as calling CompiledRules.first_blocklist_term,
+    first_pii or pii_findings per text. Per-request time budgets do not
+    apply to a batch; callers use CompiledRules.batchable() to keep
+    oversized texts on the per-text path.
+    """
+
+    def __init__(self, rules: CompiledRules, chunk_chars: int = DEFAULT_CHUNK_CHARS):
+        self.rules = rules
+        self.chunk_chars = chunk_chars
+        self._folded_terms: Tuple[Tuple[str, str], ...] = tuple(
+            (term, term.lower()) for term in rules.blocklist_terms
+        )
+        # Rules with a precondition are screened by the rules' precondition trigger instead (see _triggered).
+        screened = [
+            rule for rule in rules.pii_rules
+            if batch_safe(rule) and isinstance(rule.matcher, re.Pattern) and rule.precondition is None
+        ]
+        self._screens = _combine(screened)
+        self._screened: Set[PiiRule] = set(screened)
+        self._unscreened: Tuple[PiiRule, ...] = tuple(rule for rule in rules.pii_rules if rule not in screened)
+        self._trigger = rules.trigger if rules.prefilter else None
+        self._trigger_chars = self._trigger.char_pattern() if self._trigger is not None else None
+        self._ungated_unscreened: Tuple[PiiRule, ...] = tuple(
+            rule for rule in rules.ungated_rules if rule not in screened
+        )
+        # Texts that neither screen touches need no work unless some rule runs on every text.
+        self._always = self._ungated_unscreened if rules.prefilter else self._unscreened
+
+    def first_blocklist_terms(self, texts: Sequence[str]) -> List[Optional[str]]:
+        """The first configured term contained in each text, or None."""
+        results: List[Optional[str]] = [None] * len(texts)
+        for buffer in _chunks(texts, self.chunk_chars):
+            buffer = buffer.lowered(texts)
+            remaining = buffer.count
+            for term, folded in self._folded_terms:
+                if not folded:
+                    continue
+                positions = _find_all(buffer.text, folded)
+                if not positions:
+                    continue
+                for owner in buffer.owners(positions):
+                    index = buffer.first + owner
+                    if results[index] is None:
+                        results[index] = term
+                        remaining -= 1
+                if remaining == 0:
+                    break
+        return results
+
+    def first_pii(self, texts: Sequence[str]) -> List[Optional[PiiRule]]:
+        """The first PII rule (in rule order) matching each text, or None."""
+        results: List[Optional[PiiRule]] = [None] * len(texts)
+        for buffer in _chunks(texts, self.chunk_chars):
+            candidates = self._screen_in(buffer)
+            triggered = self._triggered(buffer, texts)
+            for index in self._to_check(buffer, candidates, triggered):
+                rules = self._rules_for(texts[index], index in candidates, triggered is None or index in triggered)
+                for rule in rules:
+                    if rule.matcher.search(texts[index]):
+                        results[index] = rule
+                        break
+        return results
+
+    def pii_findings(self, texts: Sequence[str]) -> List[List[Finding]]:
+        """Every PII match per text, with offsets relative to that text."""
+        results: List[List[Finding]] = [[] for _ in texts]
+        pii_type = self.rules.pii_type
+        for buffer in _chunks(texts, self.chunk_chars):
+            candidates = self._screen_in(buffer)
+            triggered = self._triggered(buffer, texts)
+            for index in self._to_check(buffer, candidates, triggered):
+                rules = self._rules_for(texts[index], index in candidates, triggered is None or index in triggered)
+                for rule in rules:
+                    for match in rule.matcher.finditer(texts[index]):
+                        if match.end() > match.start():
+                            results[index].append(Finding(rule.name, pii_type, match.start(), match.end()))
+        return results
+
+    def _rules_for(self, text: str, candidate: bool, triggered: bool) -> Sequence[PiiRule]:
+        """The rules to run on one text, given whether the screen and the precondition trigger touched it."""
+        if not self.rules.prefilter:
+            return self.rules.pii_rules if candidate else self._unscreened
+        if not triggered:
+            # No precondition can hold: as applicable_rules would, keep only the ungated rules.
+            return self.rules.ungated_rules if candidate else self._ungated_unscreened
+        rules = self.rules.applicable_rules(text)
+        if candidate or not self._screened:
+            return rules
+        return [rule for rule in rules if rule not in self._screened]
+
+    def _to_check(self, buffer: _Buffer, candidates: Set[int], triggered: Optional[Set[int]]) -> Iterator[int]:
+        """Indexes (into texts) of the texts in buffer that may have rules to run."""
+        if self._always or triggered is None:
+            return iter(range(buffer.first, buffer.first + buffer.count))
+        return iter(sorted(candidates | triggered))
+
+    def _triggered(self, buffer: _Buffer, texts: Sequence[str]) -> Optional[Set[int]]:
+        """Indexes (into texts) of every text the precondition trigger fires in; None when rules have none."""
+        if self._trigger is None:
+            return None
+        positions = [match.start() for match in self._trigger_chars.finditer(buffer.text)]
+        triggered = {buffer.first + owner for owner in buffer.owners(positions)} if positions else set()
+        lowered = None
+        for literal, ignore_case in self._trigger.literals:
+            searched = buffer
+            if ignore_case:
+                lowered = lowered or buffer.lowered(texts)
+                searched = lowered
+            positions = _find_all(searched.text, literal)
+            if positions:
+                triggered.update(buffer.first + owner for owner in searched.owners(positions))
+        return triggered
+
+    def _screen_in(self, buffer: _Buffer) -> Set[int]:
+        """Indexes (into texts) of every text a screen match starts in or overlaps."""
+        starts = []
+        lasts = []
+        for screen in self._screens:
+            for match in screen.finditer(buffer.text):
+                starts.append(match.start())
+                lasts.append(max(match.start(), match.end() - 1))
+        if not starts:
+            return set()
+        candidates: Set[int] = set()
+        for owner, last_owner in zip(buffer.owners(starts), buffer.owners(lasts)):
+            # A match may run across a separator and hide a match in the next text.
+            candidates.update(range(buffer.first + owner, buffer.first + last_owner + 1))
+        return candidates
+
+
+def _combine(rules: Sequence[PiiRule]) -> Tuple[Pattern[str], ...]:
+    """
+    Alternations that together match wherever any of rules matches.
+
+    Every position where some rule matches is either tried by a scan or
+    covered by an earlier screen match, so no matching text is missed.
+    Rules are grouped by flags: scoped inline flags make re's scan several
+    times slower than one alternation per flag set.
+    """
+    groups: Dict[int, List[str]] = {}
+    for rule in rules:
+        groups.setdefault(rule.matcher.flags, []).append(f"(?:{rule.matcher.pattern})")
+    return tuple(re.compile("|".join(parts), flags) for flags, parts in groups.items())
+
+
+def _find_all(haystack: str, needle: str) -> List[int]:
+    positions = []
+    pos = haystack.find(needle)
+    while pos != -1:
+        positions.append(pos)
+        pos = haystack.find(needle, pos + 1)
+    return positions
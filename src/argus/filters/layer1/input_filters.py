@@ -3,59 +3,107 @@ Layer 1 Input Filters - Fast deterministic checks for user input.
 """
 
 import logging
-from typing import Optional
-from ...config.security_rules import INPUT_BLOCKLIST_TERMS, PII_PATTERNS
-from ...core.types import FilterResult
-from ..base import BaseFilter
+import threading
+from typing import Callable, List, Optional, Sequence
+from ...config.settings import settings
+from ...core.exceptions import FilterBudgetExceeded
+from ...core.types import PASSED, FilterResult
+from ..base import BaseFilter, register_filter
+from ..pipeline import Pipeline, build_pipeline
+from .rules import CompiledRules, PiiRule, get_default_rules
 
 logger = logging.getLogger(__name__)
 
+@register_filter("input_blocklist")
 class InputBlocklistFilter(BaseFilter):
     """Filter for blocked input terms."""
     
+    def __init__(self, rules: Optional[CompiledRules] = None):
+        self.rules = rules or get_default_rules("INPUT")
+    
     def check(self, text: str) -> FilterResult:
         """Check for blocked input terms."""
-        text_lower = text.lower()
-        for term in INPUT_BLOCKLIST_TERMS:
-            if term.lower() in text_lower:
-                detail = f"Blocked Input Term: '{term}'"
-                logger.warning(f"L1 Input Violation: {detail}")
-                return FilterResult(passed=False, violation_detail=detail, filter_type="INPUT_BLOCKLIST")
-        return FilterResult(passed=True)
+        term = self.rules.first_blocklist_term(text)
+        return PASSED if term is None else self._violation(term)
+    
+    def check_batch(self, texts: Sequence[str]) -> List[FilterResult]:
+        """Check many texts with one pass per term."""
+        if not self.rules.batchable(texts):
+            return super().check_batch(texts)
+        terms = self.rules.batch_matcher().first_blocklist_terms(texts)
+        return [PASSED if term is None else self._violation(term) for term in terms]
+    
+    def _violation(self, term: str) -> FilterResult:
+        detail = f"Blocked Input Term: '{term}'"
+        logger.warning(f"L1 Input Violation: {detail}")
+        return FilterResult(passed=False, violation_detail=detail, filter_type="INPUT_BLOCKLIST")
     
     def get_filter_name(self) -> str:
         return "InputBlocklistFilter"
 
+@register_filter("input_pii")
 class InputPIIFilter(BaseFilter):
     """Filter for PII in input."""
     
+    def __init__(self, rules: Optional[CompiledRules] = None):
+        self.rules = rules or get_default_rules("INPUT")
+    
     def check(self, text: str) -> FilterResult:
         """Check for PII patterns in input."""
-        for pattern in PII_PATTERNS:
-            if pattern.search(text):
-                detail = f"Potential Input PII Pattern: '{pattern.pattern}'"
-                logger.warning(f"L1 Input Violation: {detail}")
-                return FilterResult(passed=False, violation_detail=detail, filter_type="INPUT_PII")
-        return FilterResult(passed=True)
+        try:
+            rule = self.rules.first_pii(text)
+        except FilterBudgetExceeded as e:
+            if self.rules.budget_policy == "escalate":
+                logger.warning(f"L1 Input budget exceeded ({e}); escalating to L2.")
+                return FilterResult(passed=True, violation_detail=str(e), filter_type="INPUT_PII", escalate=True)
+            detail = f"L1 Input Budget Exceeded: {e}"
+            logger.warning(f"L1 Input Violation: {detail}")
+            return FilterResult(passed=False, violation_detail=detail, filter_type="INPUT_PII")
+        return PASSED if rule is None else self._violation(rule)
+    
+    def check_batch(self, texts: Sequence[str]) -> List[FilterResult]:
+        """Check many texts with one pass per PII rule."""
+        if not self.rules.batchable(texts):
+            return super().check_batch(texts)
+        rules = self.rules.batch_matcher().first_pii(texts)
+        return [PASSED if rule is None else self._violation(rule) for rule in rules]
+    
+    def _violation(self, rule: PiiRule) -> FilterResult:
+        detail = f"Potential Input PII Pattern: '{rule.pattern.pattern}'"
+        logger.warning(f"L1 Input Violation: {detail}")
+        return FilterResult(passed=False, violation_detail=detail, filter_type="INPUT_PII")
     
     def get_filter_name(self) -> str:
         return "InputPIIFilter"
 
-def check_input_filters(prompt: str) -> Optional[str]:
-    """Legacy function for backward compatibility."""
+_default_pipeline: Optional[Pipeline] = None
+_default_pipeline_lock = threading.Lock()
+
+def get_input_pipeline() -> Pipeline:
+    """Return the default input pipeline, built once on first use."""
+    global _default_pipeline
+    if _default_pipeline is None:
+        with _default_pipeline_lock:
+            if _default_pipeline is None:
+                _default_pipeline = build_pipeline(
+                    settings.input_filter_stages, get_default_rules("INPUT"), name="input"
+                )
+    return _default_pipeline
+
+def check_input_filters(prompt: str, pipeline: Optional[Pipeline] = None,
+                        on_escalate: Optional[Callable[[str], None]] = None) -> Optional[str]:
+    """Legacy function for backward compatibility.
+
+    on_escalate is called with the detail when a stage passed the prompt
+    without finishing its check (L1_BUDGET_POLICY=escalate).
+    """
     logger.info("Running L1 Input Filters...")
     
-    # Check blocklist
-    blocklist_filter = InputBlocklistFilter()
-    result = blocklist_filter.check(prompt)
-    if not result.passed:
-        return result.violation_detail
-    
-    # Check PII
-    pii_filter = InputPIIFilter()
-    result = pii_filter.check(prompt)
+    result = (pipeline or get_input_pipeline()).run(prompt)
     if not result.passed:
         return result.violation_detail
+    if result.escalate and on_escalate is not None:
+        on_escalate(result.violation_detail)
     
     logger.info("L1 Input Filters Passed.")
     return None
@@ -3,59 +3,151 @@ Layer 1 Output Filters - Fast deterministic checks for AI responses.
 """
 
 import logging
-from typing import Optional
-from ...config.security_rules import OUTPUT_BLOCKLIST_TERMS, PII_PATTERNS
-from ...core.types import FilterResult
-from ..base import BaseFilter
+import threading
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from ...config.settings import settings
+from ...core.exceptions import FilterBudgetExceeded
+from ...core.types import PASSED, FilterResult
+from ..base import BaseFilter, register_filter
+from ..pipeline import Pipeline, build_pipeline
+from .rules import CompiledRules, PiiRule, get_default_rules
 
 logger = logging.getLogger(__name__)
 
+@register_filter("output_blocklist")
 class OutputBlocklistFilter(BaseFilter):
     """Filter for blocked output terms."""
     
+    def __init__(self, rules: Optional[CompiledRules] = None):
+        self.rules = rules or get_default_rules("OUTPUT")
+    
     def check(self, text: str) -> FilterResult:
         """Check for blocked output terms."""
-        text_lower = text.lower()
-        for term in OUTPUT_BLOCKLIST_TERMS:
-            if term.lower() in text_lower:
-                detail = f"Blocked Output Term: '{term}'"
-                logger.warning(f"L1 Output Violation: {detail}")
-                return FilterResult(passed=False, violation_detail=detail, filter_type="OUTPUT_BLOCKLIST")
-        return FilterResult(passed=True)
+        term = self.rules.first_blocklist_term(text)
+        return PASSED if term is None else self._violation(term)
+    
+    def check_batch(self, texts: Sequence[str]) -> List[FilterResult]:
+        """Check many texts with one pass per term."""
+        if not self.rules.batchable(texts):
+            return super().check_batch(texts)
+        terms = self.rules.batch_matcher().first_blocklist_terms(texts)
+        return [PASSED if term is None else self._violation(term) for term in terms]
+    
+    def _violation(self, term: str) -> FilterResult:
+        detail = f"Blocked Output Term: '{term}'"
+        logger.warning(f"L1 Output Violation: {detail}")
+        return FilterResult(passed=False, violation_detail=detail, filter_type="OUTPUT_BLOCKLIST")
     
     def get_filter_name(self) -> str:
         return "OutputBlocklistFilter"
 
+@register_filter("output_pii")
 class OutputPIIFilter(BaseFilter):
-    """Filter for PII in output."""
+    """Filter for PII in output. With redact=True, PII is masked instead of blocked."""
+    
+    def __init__(self, rules: Optional[CompiledRules] = None, redact: bool = False):
+        self.rules = rules or get_default_rules("OUTPUT")
+        self.redact = redact
     
     def check(self, text: str) -> FilterResult:
         """Check for PII patterns in output."""
-        for pattern in PII_PATTERNS:
-            if pattern.search(text):
-                detail = f"Potential Output PII Pattern: '{pattern.pattern}'"
-                logger.warning(f"L1 Output Violation: {detail}")
-                return FilterResult(passed=False, violation_detail=detail, filter_type="OUTPUT_PII")
-        return FilterResult(passed=True)
+        try:
+            if self.redact:
+                return self._redact(text)
+            rule = self.rules.first_pii(text)
+        except FilterBudgetExceeded as e:
+            if self.rules.budget_policy == "escalate":
+                logger.warning(f"L1 Output budget exceeded ({e}); escalating to L2.")
+                return FilterResult(passed=True, violation_detail=str(e), filter_type="OUTPUT_PII", escalate=True)
+            detail = f"L1 Output Budget Exceeded: {e}"
+            logger.warning(f"L1 Output Violation: {detail}")
+            return FilterResult(passed=False, violation_detail=detail, filter_type="OUTPUT_PII")
+        return PASSED if rule is None else self._violation(rule)
+    
+    def check_batch(self, texts: Sequence[str]) -> List[FilterResult]:
+        """Check many texts with one pass per PII rule."""
+        if self.redact or not self.rules.batchable(texts):
+            return super().check_batch(texts)
+        rules = self.rules.batch_matcher().first_pii(texts)
+        return [PASSED if rule is None else self._violation(rule) for rule in rules]
+    
+    def _violation(self, rule: PiiRule) -> FilterResult:
+        detail = f"Potential Output PII Pattern: '{rule.pattern.pattern}'"
+        logger.warning(f"L1 Output Violation: {detail}")
+        return FilterResult(passed=False, violation_detail=detail, filter_type="OUTPUT_PII")
+    
+    def _redact(self, text: str) -> FilterResult:
+        # The spans from the single L1 pass are used directly for masking.
+        redacted, applied = self.rules.redact(text)
+        if not applied:
+            return PASSED
+        kind_of = {rule.name: rule.kind for rule in self.rules.pii_rules}
+        kinds = sorted({kind_of[finding.rule] for finding in applied})
+        detail = f"Redacted {len(applied)} Output PII span(s): {', '.join(kinds)}"
+        logger.info(f"L1 Output Redaction: {detail}")
+        return FilterResult(passed=True, violation_detail=detail, filter_type="OUTPUT_PII", redacted_text=redacted)
     
     def get_filter_name(self) -> str:
         return "OutputPIIFilter"
 
-def check_output_filters(response: str) -> Optional[str]:
-    """Legacy function for backward compatibility."""
+register_filter("output_pii_redact")(partial(OutputPIIFilter, redact=True))
+
+def redaction_stages(stage_names: Sequence[str]) -> List[str]:
+    """Swap the blocking PII stage for the redacting one."""
+    return ["output_pii_redact" if name == "output_pii" else name for name in stage_names]
+
+_default_pipelines: Dict[bool, Pipeline] = {}
+_default_pipelines_lock = threading.Lock()
+
+def get_output_pipeline(redact: bool = False) -> Pipeline:
+    """Return the default output pipeline (or its redacting variant), built once."""
+    pipeline = _default_pipelines.get(redact)
+    if pipeline is None:
+        with _default_pipelines_lock:
+            pipeline = _default_pipelines.get(redact)
+            if pipeline is None:
+                stages = settings.output_filter_stages
+                pipeline = build_pipeline(
+                    redaction_stages(stages) if redact else stages,
+                    get_default_rules("OUTPUT"),
+                    name="output-redact" if redact else "output",
+                )
+                _default_pipelines[redact] = pipeline
+    return pipeline
+
+def check_output_filters(response: str, pipeline: Optional[Pipeline] = None,
+                         on_escalate: Optional[Callable[[str], None]] = None) -> Optional[str]:
+    """Legacy function for backward compatibility.
+
+    on_escalate is called with the detail when a stage passed the response
+    without finishing its check (L1_BUDGET_POLICY=escalate).
+    """
     logger.info("Running L1 Output Filters...")
     
-    # Check blocklist
-    blocklist_filter = OutputBlocklistFilter()
-    result = blocklist_filter.check(response)
+    result = (pipeline or get_output_pipeline()).run(response)
     if not result.passed:
         return result.violation_detail
+    if result.escalate and on_escalate is not None:
+        on_escalate(result.violation_detail)
     
-    # Check PII
-    pii_filter = OutputPIIFilter()
-    result = pii_filter.check(response)
+    logger.info("L1 Output Filters Passed.")
+    return None
+
+def redact_output_filters(response: str, pipeline: Optional[Pipeline] = None,
+                          on_escalate: Optional[Callable[[str], None]] = None) -> Tuple[Optional[str], str]:
+    """Run the L1 output filters, masking PII instead of blocking on it.
+
+    Returns (violation detail or None, response text with PII redacted).
+    on_escalate is as for check_output_filters.
+    """
+    logger.info("Running L1 Output Filters (PII redaction mode)...")
+    
+    result = (pipeline or get_output_pipeline(redact=True)).run(response)
     if not result.passed:
-        return result.violation_detail
+        return result.violation_detail, response
+    if result.escalate and on_escalate is not None:
+        on_escalate(result.violation_detail)
     
     logger.info("L1 Output Filters Passed.")
-    return None
+    return None, result.redacted_text if result.redacted_text is not None else response
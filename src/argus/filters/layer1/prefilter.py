@@ -0,0 +1,249 @@
+"""
+Required-literal and character-class preconditions for Layer 1 regex rules.
+
+derive_precondition walks a pattern's parse tree and collects what every
+match must contain: characters from some class (a digit, an '@', a '-')
+and, where the pattern has one, a fixed multi-character literal. Checking
+those against a text costs a set() of its characters plus a few C-level
+set and substring operations, so a rule whose precondition fails is
+skipped without running its regex. Preconditions are conservative: when a
+requirement cannot be proven (lookarounds, back-references, non-ASCII
+case folding) it is simply left out.
+"""
+
+import re
+from typing import FrozenSet, List, Optional, Pattern, Sequence, Tuple
+
+from .redos import _REPEAT_OPS, _in_charset, sre_constants, sre_parse
+
+# Requirements kept per rule; the most selective ones are checked first.
+MAX_CLASSES = 3
+MIN_LITERAL = 2
+
+
+class CharRequirement:
+    """
+    The text must contain one of chars.
+
+    chars lists only ASCII characters. When the class can also match
+    non-ASCII characters (\\d, \\w, case folding), closed is False and any
+    non-ASCII text is assumed to satisfy it.
+    """
+
+    __slots__ = ("chars", "closed")
+
+    def __init__(self, chars: FrozenSet[str], closed: bool):
+        self.chars = chars
+        self.closed = closed
+
+    def key(self) -> Tuple[FrozenSet[str], bool]:
+        return self.chars, self.closed
+
+    def __repr__(self) -> str:
+        return f"CharRequirement({''.join(sorted(self.chars))!r}, closed={self.closed})"
+
+
+class TextFeatures:
+    """What preconditions need to know about one text, computed once and shared by all rules."""
+
+    __slots__ = ("text", "chars", "ascii", "_lower")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.chars = set(text)
+        self.ascii = text.isascii()
+        self._lower: Optional[str] = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+
+class Precondition:
+    """Cheap necessary conditions for a rule to match."""
+
+    __slots__ = ("classes", "literal", "ignore_case")
+
+    def __init__(self, classes: Sequence[CharRequirement], literal: Optional[str], ignore_case: bool):
+        self.classes: Tuple[CharRequirement, ...] = tuple(classes)
+        self.literal = literal.lower() if literal is not None and ignore_case else literal
+        self.ignore_case = ignore_case
+
+    def holds(self, features: TextFeatures) -> bool:
+        """False only if the rule cannot match the text."""
+        for requirement in self.classes:
+            if features.chars.isdisjoint(requirement.chars) and (requirement.closed or features.ascii):
+                return False
+        if self.literal is not None:
+            if self.ignore_case:
+                # Non-ASCII case folding (e.g. the Kelvin sign) is not modelled.
+                return not features.ascii or self.literal in features.lower
+            return self.literal in features.text
+        return True
+
+    def __repr__(self) -> str:
+        return f"Precondition(classes={list(self.classes)!r}, literal={self.literal!r})"
+
+
+class Trigger:
+    """
+    One check for whether any of several preconditions might hold.
+
+    Each precondition contributes its literal, or else the class least
+    likely to occur in prose; an ASCII text that contains none of those cannot satisfy any of
+    them, so the per-rule checks are skipped entirely.
+    """
+
+    __slots__ = ("chars", "literals")
+
+    def __init__(self, preconditions: Sequence[Precondition]):
+        chars: FrozenSet[str] = frozenset()
+        literals: List[Tuple[str, bool]] = []
+        for precondition in preconditions:
+            if precondition.literal is not None:
+                literals.append((precondition.literal, precondition.ignore_case))
+            else:
+                chars |= min(precondition.classes, key=_prose_frequency).chars
+        self.chars = chars
+        self.literals: Tuple[Tuple[str, bool], ...] = tuple(literals)
+
+    def fires(self, features: TextFeatures) -> bool:
+        """False only if no precondition can hold for the text."""
+        if not features.ascii or not features.chars.isdisjoint(self.chars):
+            return True
+        return any(literal in (features.lower if ignore_case else features.text)
+                   for literal, ignore_case in self.literals)
+
+    def char_pattern(self) -> Pattern[str]:
+        """
+        A one-character class matching the trigger characters and any non-ASCII one.
+
+        With a search for each literal, it screens many texts joined into
+        one buffer: a text in which neither finds anything cannot fire.
+        """
+        return re.compile("[\\x80-\\U0010ffff" + "".join(re.escape(c) for c in sorted(self.chars)) + "]")
+
+
+def _prose_frequency(requirement: CharRequirement) -> Tuple[bool, int]:
+    # Spaces and letters are in almost every text; digits and punctuation are not.
+    return any(c.isspace() or c.isalpha() for c in requirement.chars), len(requirement.chars)
+
+
+def _literal_requirement(code: int, ignore_case: bool) -> CharRequirement:
+    char = chr(code)
+    if not ignore_case:
+        return CharRequirement(frozenset([char]) if code < 128 else frozenset(), closed=code < 128)
+    variants = frozenset(c for c in (char, char.lower(), char.upper()) if len(c) == 1 and ord(c) < 128)
+    return CharRequirement(variants, closed=False)
+
+
+def _class_requirement(av, ignore_case: bool, ascii_only: bool) -> Optional[CharRequirement]:
+    negated = any(op == sre_constants.NEGATE for op, _ in av)
+    if negated:
+        return None
+    closed = not ignore_case
+    for op, value in av:
+        if op == sre_constants.LITERAL and value >= 128:
+            closed = False
+        elif op == sre_constants.RANGE and value[1] >= 128:
+            closed = False
+        elif op == sre_constants.CATEGORY and not ascii_only:
+            closed = False
+    chars = frozenset(chr(c) for c in _in_charset(av, ignore_case))
+    if not chars and closed:
+        return None
+    return CharRequirement(chars, closed)
+
+
+def _required(items, ignore_case: bool, ascii_only: bool) -> Tuple[List[CharRequirement], List[str]]:
+    """Requirements every match of the sequence items must satisfy."""
+    classes: List[CharRequirement] = []
+    literals: List[str] = []
+    run: List[str] = []
+
+    def flush() -> None:
+        if len(run) >= MIN_LITERAL:
+            literals.append("".join(run))
+        run.clear()
+
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            classes.append(_literal_requirement(av, ignore_case))
+            run.append(chr(av))
+            continue
+        flush()
+        if op == sre_constants.IN:
+            requirement = _class_requirement(av, ignore_case, ascii_only)
+            if requirement is not None:
+                classes.append(requirement)
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            sub_classes, sub_literals = _required(av[2], ignore_case, ascii_only)
+            classes.extend(sub_classes)
+            literals.extend(sub_literals)
+        elif op == sre_constants.SUBPATTERN:
+            add_flags, del_flags = av[1], av[2]
+            sub_ignore_case = bool((ignore_case or add_flags & re.IGNORECASE) and not del_flags & re.IGNORECASE)
+            sub_ascii_only = ascii_only or bool(add_flags & re.ASCII)
+            sub_classes, sub_literals = _required(av[-1], sub_ignore_case, sub_ascii_only)
+            classes.extend(sub_classes)
+            literals.extend(sub_literals)
+        elif op == sre_constants.BRANCH:
+            requirement = _branch_requirement(av[1], ignore_case, ascii_only)
+            if requirement is not None:
+                classes.append(requirement)
+        # AT (\b, ^), lookarounds, ANY, NOT_LITERAL, optional repeats and
+        # group references add no requirement.
+    flush()
+    return classes, literals
+
+
+def _branch_requirement(branches, ignore_case: bool, ascii_only: bool) -> Optional[CharRequirement]:
+    """One class covering the most selective requirement of every alternative."""
+    chars: FrozenSet[str] = frozenset()
+    closed = True
+    for branch in branches:
+        classes, _ = _required(branch, ignore_case, ascii_only)
+        if not classes:
+            return None
+        best = min(classes, key=lambda r: (not r.closed, len(r.chars)))
+        chars |= best.chars
+        closed = closed and best.closed
+    return CharRequirement(chars, closed)
+
+
+def derive_precondition(pattern: Pattern[str]) -> Optional[Precondition]:
+    """The precondition for pattern, or None when nothing useful can be derived."""
+    ignore_case = bool(pattern.flags & re.IGNORECASE)
+    ascii_only = bool(pattern.flags & re.ASCII)
+    try:
+        tree = sre_parse.parse(pattern.pattern, pattern.flags)
+    except re.error:
+        return None
+    classes, literals = _required(tree.data, ignore_case, ascii_only)
+    if any(_has_scoped_ignore_case(tree.data)):
+        # A literal from a (?i:...) group must not be checked case-sensitively.
+        literals = []
+    unique = {}
+    for requirement in classes:
+        if requirement.chars or not requirement.closed:
+            unique.setdefault(requirement.key(), requirement)
+    # Closed, small classes reject the most text; open classes last.
+    ranked = sorted(unique.values(), key=lambda r: (not r.closed, len(r.chars)))[:MAX_CLASSES]
+    literal = max(literals, key=len) if literals else None
+    if not ranked and literal is None:
+        return None
+    return Precondition(ranked, literal, ignore_case)
+
+
+def _has_scoped_ignore_case(items):
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN:
+            yield bool(av[1] & re.IGNORECASE or av[2] & re.IGNORECASE)
+            yield from _has_scoped_ignore_case(av[-1])
+        elif op in _REPEAT_OPS:
+            yield from _has_scoped_ignore_case(av[2])
+        elif op == sre_constants.BRANCH:
+            for branch in av[1]:
+                yield from _has_scoped_ignore_case(branch)
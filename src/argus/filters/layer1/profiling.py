@@ -0,0 +1,198 @@
+"""
+Per-rule cost accounting for the Layer 1 filters.
+
+A RuleProfiler attached to a CompiledRules (CompiledRules(profile=True), or
+L1_PROFILING=true for the defaults) times every blocklist term and PII
+pattern the filters actually evaluate. profile_corpus instead evaluates
+every rule on every text of a sample corpus, which also shows what the
+filters' first-failure exit hides: "exits" counts the texts on which a rule
+was the one reported, "shadowed" the texts it matched after an earlier rule
+had already ended the check.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .rules import CompiledRules, PiiRule
+from .scanner import JSONL_EXTENSIONS, iter_json_strings
+
+BLOCKLIST = "blocklist"
+PII = "pii"
+
+
+class RuleStats:
+    """Evaluation cost and outcomes of one rule."""
+
+    __slots__ = ("rule", "kind", "filter_type", "evaluations", "total_ns", "max_ns", "matches", "exits", "shadowed")
+
+    def __init__(self, rule: str, kind: str, filter_type: str):
+        self.rule = rule
+        self.kind = kind
+        self.filter_type = filter_type
+        self.evaluations = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.matches = 0
+        self.exits = 0
+        self.shadowed = 0
+
+    def record(self, elapsed_ns: int, matched: bool) -> None:
+        self.evaluations += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if matched:
+            self.matches += 1
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_ns / self.evaluations / 1000 if self.evaluations else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rule": self.rule,
+            "kind": self.kind,
+            "filter_type": self.filter_type,
+            "evaluations": self.evaluations,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_us": round(self.mean_us, 3),
+            "max_us": round(self.max_ns / 1000, 3),
+            "matches": self.matches,
+            "exits": self.exits,
+            "shadowed": self.shadowed,
+        }
+
+
+class RuleProfiler:
+    """Collects RuleStats for one CompiledRules; safe to share across threads."""
+
+    def __init__(self, rules: CompiledRules):
+        self.rules = rules
+        self.texts = 0
+        self.chars = 0
+        self._lock = threading.Lock()
+        self._terms = [(term, term.lower()) for term in rules.blocklist_terms]
+        self.stats: Dict[str, RuleStats] = {}
+        for term in rules.blocklist_terms:
+            self.stats.setdefault(f"term:{term}", RuleStats(term, BLOCKLIST, rules.blocklist_type))
+        for rule in rules.pii_rules:
+            self.stats[f"pii:{rule.name}"] = RuleStats(rule.name, PII, rules.pii_type)
+
+    def _record(self, key: str, elapsed_ns: int, matched: bool) -> None:
+        with self._lock:
+            self.stats[key].record(elapsed_ns, matched)
+
+    def first_blocklist_term(self, text: str) -> Optional[str]:
+        """Timed equivalent of CompiledRules.first_blocklist_term."""
+        text_lower = text.lower()
+        clock = time.perf_counter_ns
+        for term, folded in self._terms:
+            started = clock()
+            matched = folded in text_lower
+            self._record(f"term:{term}", clock() - started, matched)
+            if matched:
+                with self._lock:
+                    self.stats[f"term:{term}"].exits += 1
+                return term
+        return None
+
+    def first_pii(self, text: str) -> Optional[PiiRule]:
+        """Timed equivalent of CompiledRules.first_pii, budgets included."""
+        rules = self.rules
+        deadline = rules._start_budget(text)
+        clock = time.perf_counter_ns
+        applicable = rules.applicable_rules(text)
+        rules._check_budget(deadline)
+        for rule in applicable:
+            started = clock()
+            matched = rule.matcher.search(text) is not None
+            self._record(f"pii:{rule.name}", clock() - started, matched)
+            if matched:
+                with self._lock:
+                    self.stats[f"pii:{rule.name}"].exits += 1
+                return rule
+            rules._check_budget(deadline)
+        return None
+
+    def profile_text(self, text: str) -> None:
+        """Evaluate every rule on text, recording which ones the early exit would hide."""
+        clock = time.perf_counter_ns
+        text_lower = text.lower()
+        checks = [(f"term:{term}", lambda t=folded: t in text_lower) for term, folded in self._terms]
+        pii_checks = [(f"pii:{rule.name}", lambda m=rule.matcher: m.search(text) is not None)
+                      for rule in self.rules.pii_rules]
+        with self._lock:
+            self.texts += 1
+            self.chars += len(text)
+            for group in (checks, pii_checks):
+                exited = False
+                for key, check in group:
+                    started = clock()
+                    matched = check()
+                    stats = self.stats[key]
+                    stats.record(clock() - started, matched)
+                    if matched:
+                        if exited:
+                            stats.shadowed += 1
+                        else:
+                            stats.exits += 1
+                            exited = True
+
+    def report(self) -> List[RuleStats]:
+        """Rules ordered by total evaluation time, most expensive first."""
+        with self._lock:
+            return sorted(self.stats.values(), key=lambda s: s.total_ns, reverse=True)
+
+    def total_ns(self) -> int:
+        return sum(s.total_ns for s in self.stats.values())
+
+
+def iter_corpus_texts(path: str, fields: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """Texts from a JSONL corpus (string values, optionally only under fields) or one per line."""
+    is_jsonl = path.lower().endswith(JSONL_EXTENSIONS)
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            if not is_jsonl:
+                yield line
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line
+                continue
+            for field, key, value in iter_json_strings(record):
+                if fields is None or not field or key in fields:
+                    yield value
+
+
+def profile_corpus(texts: Iterable[str], rule_sets: Sequence[CompiledRules]) -> List[RuleProfiler]:
+    """Profile every rule in rule_sets against every text."""
+    profilers = [RuleProfiler(rules) for rules in rule_sets]
+    for text in texts:
+        for profiler in profilers:
+            profiler.profile_text(text)
+    return profilers
+
+
+def format_report(profilers: Sequence[RuleProfiler], top: Optional[int] = None) -> str:
+    """Plain-text table of the most expensive rules across all profilers."""
+    rows = sorted((s for p in profilers for s in p.stats.values()), key=lambda s: s.total_ns, reverse=True)
+    grand_total = sum(p.total_ns() for p in profilers) or 1
+    texts = max((p.texts for p in profilers), default=0)
+    chars = max((p.chars for p in profilers), default=0)
+    lines = [
+        f"Profiled {texts} texts ({chars} chars); total L1 rule time {grand_total / 1e6:.1f}ms",
+        f"{'rule':32s} {'type':16s} {'total ms':>9s} {'share':>6s} {'mean us':>8s} {'max us':>8s} "
+        f"{'matches':>7s} {'exits':>6s} {'shadow':>6s}",
+    ]
+    for s in rows[:top] if top else rows:
+        lines.append(
+            f"{s.rule[:32]:32s} {s.filter_type:16s} {s.total_ns / 1e6:9.2f} {100 * s.total_ns / grand_total:5.1f}% "
+            f"{s.mean_us:8.2f} {s.max_ns / 1000:8.1f} {s.matches:7d} {s.exits:6d} {s.shadowed:6d}"
+        )
+    return "\n".join(lines)
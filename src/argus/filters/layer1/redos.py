@@ -0,0 +1,213 @@
+"""
+Backtracking-risk analysis and hardened matchers for Layer 1 regex rules.
+
+CPython's re engine backtracks, so an attacker who controls prompt or response
+text can make some patterns run in quadratic (or worse) time. analyze_pattern
+classifies a compiled pattern from its parse tree; risky patterns are then
+either replaced by a curated bounded form or run through a WindowedMatcher,
+which caps how much text any single match attempt can see.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import FrozenSet, Iterator, List, Match, Optional, Pattern, Tuple
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants  # type: ignore
+    import sre_parse  # type: ignore
+
+SAFE = "safe"
+POLYNOMIAL = "polynomial"
+EXPONENTIAL = "exponential"
+
+# Repeats bounded at or below this many iterations are treated as cheap.
+LARGE_REPEAT = 64
+
+_REPEAT_OPS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEAT_OPS.add(sre_constants.POSSESSIVE_REPEAT)
+
+_ASCII = frozenset(range(128))
+_CATEGORY_SETS = {
+    sre_constants.CATEGORY_DIGIT: frozenset(i for i in range(128) if chr(i).isdigit()),
+    sre_constants.CATEGORY_SPACE: frozenset(i for i in range(128) if chr(i).isspace()),
+    sre_constants.CATEGORY_WORD: frozenset(i for i in range(128) if chr(i).isalnum() or i == ord("_")),
+}
+_CATEGORY_SETS[sre_constants.CATEGORY_NOT_DIGIT] = _ASCII - _CATEGORY_SETS[sre_constants.CATEGORY_DIGIT]
+_CATEGORY_SETS[sre_constants.CATEGORY_NOT_SPACE] = _ASCII - _CATEGORY_SETS[sre_constants.CATEGORY_SPACE]
+_CATEGORY_SETS[sre_constants.CATEGORY_NOT_WORD] = _ASCII - _CATEGORY_SETS[sre_constants.CATEGORY_WORD]
+
+
+@dataclass(frozen=True)
+class RuleRisk:
+    """Backtracking risk of one pattern."""
+    level: str
+    reasons: Tuple[str, ...] = ()
+
+    @property
+    def risky(self) -> bool:
+        return self.level != SAFE
+
+
+def _fold(chars: FrozenSet[int], ignore_case: bool) -> FrozenSet[int]:
+    if not ignore_case:
+        return chars
+    extra = set()
+    for c in chars:
+        ch = chr(c)
+        extra.add(ord(ch.lower()))
+        extra.add(ord(ch.upper()))
+    return frozenset(chars | {c for c in extra if c < 128})
+
+
+def _charset(items, ignore_case: bool) -> FrozenSet[int]:
+    """Approximate (ASCII) set of characters a subpattern can consume."""
+    chars = set()
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            chars |= _fold(frozenset([av]), ignore_case) if av < 128 else set()
+        elif op == sre_constants.NOT_LITERAL or op == sre_constants.ANY:
+            chars |= _ASCII
+        elif op == sre_constants.IN:
+            chars |= _in_charset(av, ignore_case)
+        elif op in _REPEAT_OPS:
+            chars |= _charset(av[2], ignore_case)
+        elif op == sre_constants.SUBPATTERN:
+            chars |= _charset(av[-1], ignore_case)
+        elif op == sre_constants.BRANCH:
+            for branch in av[1]:
+                chars |= _charset(branch, ignore_case)
+    return frozenset(chars)
+
+
+def _in_charset(av, ignore_case: bool) -> FrozenSet[int]:
+    chars = set()
+    negate = False
+    for op, value in av:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            if value < 128:
+                chars.add(value)
+        elif op == sre_constants.RANGE:
+            chars |= set(range(value[0], min(value[1], 127) + 1))
+        elif op == sre_constants.CATEGORY:
+            chars |= _CATEGORY_SETS.get(value, _ASCII)
+    result = _fold(frozenset(chars), ignore_case)
+    return _ASCII - result if negate else result
+
+
+def _has_variable_repeat(items) -> bool:
+    for op, av in items:
+        if op in _REPEAT_OPS and av[0] != av[1]:
+            return True
+        if op in _REPEAT_OPS and _has_variable_repeat(av[2]):
+            return True
+        if op == sre_constants.SUBPATTERN and _has_variable_repeat(av[-1]):
+            return True
+        if op == sre_constants.BRANCH and any(_has_variable_repeat(b) for b in av[1]):
+            return True
+    return False
+
+
+def _has_branch(items) -> bool:
+    for op, av in items:
+        if op == sre_constants.BRANCH:
+            return True
+        if op in _REPEAT_OPS and _has_branch(av[2]):
+            return True
+        if op == sre_constants.SUBPATTERN and _has_branch(av[-1]):
+            return True
+    return False
+
+
+def _walk(items, ignore_case: bool, reasons: List[Tuple[str, str]], previous=None) -> None:
+    for op, av in items:
+        if op in _REPEAT_OPS:
+            low, high, body = av
+            if high > 1 and (_has_variable_repeat(body) or _has_branch(body)):
+                reasons.append((EXPONENTIAL, "nested quantifier or alternation under a repeat"))
+            if high > LARGE_REPEAT and high != low:
+                # A long run that follows a literal the run cannot contain only
+                # starts at occurrences of that literal, so total work stays linear.
+                anchored = (
+                    previous is not None
+                    and previous[0] == sre_constants.LITERAL
+                    and not (_fold(frozenset([previous[1]]), ignore_case) & _charset(body, ignore_case))
+                )
+                if not anchored:
+                    bound = "unbounded" if high == sre_constants.MAXREPEAT else f"up to {high}"
+                    reasons.append((POLYNOMIAL, f"{bound} repeat can be re-entered at many start positions"))
+            _walk(body, ignore_case, reasons)
+        elif op == sre_constants.SUBPATTERN:
+            _walk(av[-1], ignore_case, reasons, previous)
+        elif op == sre_constants.BRANCH:
+            for branch in av[1]:
+                _walk(branch, ignore_case, reasons, previous)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _walk(av[1], ignore_case, reasons)
+        previous = (op, av)
+
+
+def analyze_pattern(pattern: Pattern[str]) -> RuleRisk:
+    """Classify a compiled pattern as safe, polynomial or exponential."""
+    tree = sre_parse.parse(pattern.pattern, pattern.flags)
+    ignore_case = bool(pattern.flags & re.IGNORECASE)
+    reasons: List[Tuple[str, str]] = []
+    _walk(tree.data, ignore_case, reasons)
+    if any(level == EXPONENTIAL for level, _ in reasons):
+        level = EXPONENTIAL
+    elif reasons:
+        level = POLYNOMIAL
+    else:
+        level = SAFE
+    return RuleRisk(level, tuple(dict.fromkeys(reason for _, reason in reasons)))
+
+
+class WindowedMatcher:
+    """
+    Runs a pattern over fixed-size overlapping windows.
+
+    Each match attempt is limited to one window, so the worst case is
+    O(len(text) * window) rather than O(len(text) ** 2). Matches longer than
+    overlap that straddle a window boundary may be missed.
+    """
+
+    def __init__(self, pattern: Pattern[str], window: int = 1024, overlap: int = 256):
+        if overlap >= window:
+            raise ValueError("overlap must be smaller than window")
+        self.pattern = pattern
+        self.window = window
+        self.overlap = overlap
+
+    def _windows(self, length: int) -> Iterator[Tuple[int, int]]:
+        step = self.window - self.overlap
+        start = 0
+        while True:
+            end = min(start + self.window, length)
+            yield start, end
+            if end >= length:
+                return
+            start += step
+
+    def search(self, text: str) -> Optional[Match[str]]:
+        for start, end in self._windows(len(text)):
+            match = self.pattern.search(text, start, end)
+            if match:
+                return match
+        return None
+
+    def finditer(self, text: str) -> Iterator[Match[str]]:
+        step = self.window - self.overlap
+        last_end = 0
+        for start, end in self._windows(len(text)):
+            # Matches starting in the overlap are reported by the next window.
+            owned = start + step if end < len(text) else end
+            for match in self.pattern.finditer(text, max(start, last_end), end):
+                if match.start() >= owned:
+                    break
+                last_end = match.end()
+                yield match
@@ -0,0 +1,370 @@
+"""
+Compiled Layer 1 rule sets shared by the filters and bulk scanning.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+from ...config.security_rules import (
+    DEFAULT_REDACTION_TOKEN,
+    INPUT_BLOCKLIST_TERMS,
+    OUTPUT_BLOCKLIST_TERMS,
+    PII_PATTERN_KINDS,
+    PII_PATTERN_NAMES,
+    PII_PATTERNS,
+    PII_REDACTION_TOKENS,
+    PII_SAFE_PATTERNS,
+)
+from ...config.settings import ArgusSettings, settings
+from ...core.exceptions import ConfigurationError, FilterBudgetExceeded
+from ...core.types import Finding
+from .prefilter import Precondition, TextFeatures, Trigger, derive_precondition
+from .redos import EXPONENTIAL, SAFE, RuleRisk, WindowedMatcher, analyze_pattern
+
+logger = logging.getLogger(__name__)
+
+
+class PiiRule:
+    """A named PII pattern and the matcher used to evaluate it."""
+
+    __slots__ = ("name", "pattern", "matcher", "risk", "kind", "precondition")
+
+    def __init__(self, name: str, pattern: Pattern[str], matcher=None, risk: Optional[RuleRisk] = None):
+        self.name = name
+        self.pattern = pattern
+        self.matcher = matcher if matcher is not None else pattern
+        self.risk = risk
+        self.kind = PII_PATTERN_KINDS.get(name, name)
+        self.precondition: Optional[Precondition] = None
+
+    def derive_precondition(self) -> None:
+        """Set the cheap precondition checked before this rule's regex runs."""
+        source = self.matcher if isinstance(self.matcher, re.Pattern) else self.pattern
+        self.precondition = derive_precondition(source)
+
+
+def _harden(name: str, pattern: Pattern[str]) -> PiiRule:
+    """Pick a linear-time matcher for one rule, or refuse it."""
+    risk = analyze_pattern(pattern)
+    if not risk.risky:
+        return PiiRule(name, pattern, risk=risk)
+    safe_form = PII_SAFE_PATTERNS.get(name)
+    if safe_form is not None and analyze_pattern(safe_form).level == SAFE:
+        logger.info(f"L1 rule '{name}' is {risk.level}; using bounded rewrite.")
+        return PiiRule(name, pattern, safe_form, risk)
+    if risk.level == EXPONENTIAL:
+        raise ConfigurationError(
+            f"PII rule '{name}' can backtrack exponentially ({'; '.join(risk.reasons)}) "
+            "and has no safe rewrite."
+        )
+    logger.info(f"L1 rule '{name}' is {risk.level}; using windowed matching.")
+    return PiiRule(name, pattern, WindowedMatcher(pattern), risk)
+
+
+def _rule_from_entry(entry, name: str, pattern: Pattern[str], hardened: bool) -> PiiRule:
+    """Rebuild a rule from its artifact record instead of analysing it."""
+    from .artifact import MATCH_SAFE, MATCH_WINDOWED
+
+    if not hardened:
+        rule = PiiRule(name, pattern)
+    elif entry.matcher == MATCH_SAFE:
+        rule = PiiRule(name, pattern, PII_SAFE_PATTERNS[name], entry.risk)
+    elif entry.matcher == MATCH_WINDOWED:
+        rule = PiiRule(name, pattern, WindowedMatcher(pattern, *entry.window), entry.risk)
+    else:
+        rule = PiiRule(name, pattern, risk=entry.risk)
+    rule.precondition = entry.precondition_for(hardened)
+    return rule
+
+
+class CompiledRules:
+    """
+    Blocklist terms and PII patterns compiled for one filter direction.
+
+    With hardened=True every PII rule is analysed for backtracking risk and
+    risky rules run in a linear-time form; first_pii then also enforces
+    max_chars and time_budget (seconds) by raising FilterBudgetExceeded, and
+    budget_policy ('fail_closed' or 'escalate') tells the PII filters how to
+    answer it. redaction_tokens overrides the replacement token per PII kind.
+    With profile=True a RuleProfiler (self.profiler) times every rule the
+    first-match methods evaluate. With prefilter=True (the default) each PII
+    rule gets a precondition (required characters or literal) and is only
+    run on texts that satisfy it. An artifact (see artifact.py) supplies the
+    per-rule analysis precomputed by `argus-rules compile`; rules it does not
+    cover are analysed as usual.
+    """
+
+    def __init__(
+        self,
+        blocklist_terms: Sequence[str],
+        pii_patterns: Sequence[Pattern[str]],
+        pii_names: Optional[Sequence[str]] = None,
+        direction: str = "INPUT",
+        hardened: bool = False,
+        max_chars: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        budget_policy: str = "fail_closed",
+        redaction_tokens: Optional[Mapping[str, str]] = None,
+        profile: bool = False,
+        prefilter: bool = True,
+        artifact=None,
+    ):
+        if pii_names is None:
+            pii_names = [f"PII_{i}" for i in range(len(pii_patterns))]
+        if len(pii_names) != len(pii_patterns):
+            raise ValueError("pii_names must be index-aligned with pii_patterns")
+
+        self.direction = direction
+        self.blocklist_type = f"{direction}_BLOCKLIST"
+        self.pii_type = f"{direction}_PII"
+        self.hardened = hardened
+        self.max_chars = max_chars
+        self.time_budget = time_budget
+        self.budget_policy = budget_policy
+        self.blocklist_terms: Tuple[str, ...] = tuple(blocklist_terms)
+        self.redaction_tokens: Dict[str, str] = dict(PII_REDACTION_TOKENS)
+        self.redaction_tokens.update(redaction_tokens or {})
+        rules = []
+        for name, pattern in zip(pii_names, pii_patterns):
+            entry = artifact.lookup(name, pattern, PII_SAFE_PATTERNS.get(name)) if artifact is not None else None
+            if entry is not None:
+                rule = _rule_from_entry(entry, name, pattern, hardened)
+            else:
+                rule = _harden(name, pattern) if hardened else PiiRule(name, pattern)
+                if prefilter:
+                    rule.derive_precondition()
+            if not prefilter:
+                rule.precondition = None
+            rules.append(rule)
+        self.pii_rules: Tuple[PiiRule, ...] = tuple(rules)
+        self.prefilter = prefilter
+        self._prefiltered = any(rule.precondition is not None for rule in self.pii_rules)
+        self._ungated: Tuple[PiiRule, ...] = tuple(rule for rule in self.pii_rules if rule.precondition is None)
+        self._trigger = Trigger([rule.precondition for rule in self.pii_rules if rule.precondition is not None])
+
+        # Matched text is folded back to the first configured spelling of each term.
+        self._term_by_folded: Dict[str, str] = {}
+        for term in self.blocklist_terms:
+            self._term_by_folded.setdefault(term.lower(), term)
+        self._blocklist_re: Optional[Pattern[str]] = None
+        if self._term_by_folded:
+            # Longest terms first so overlapping terms report the most specific one.
+            alternatives = sorted(self._term_by_folded, key=len, reverse=True)
+            self._blocklist_re = re.compile(
+                "|".join(re.escape(term) for term in alternatives), re.IGNORECASE
+            )
+
+        self._batch_matcher = None
+        self._batch_lock = threading.Lock()
+        self.profiler = None
+        if profile:
+            from .profiling import RuleProfiler
+            self.profiler = RuleProfiler(self)
+
+    @classmethod
+    def for_input(cls, **options) -> "CompiledRules":
+        """Rules applied by the L1 input filters."""
+        return cls(INPUT_BLOCKLIST_TERMS, PII_PATTERNS, PII_PATTERN_NAMES, direction="INPUT", **options)
+
+    @classmethod
+    def for_output(cls, **options) -> "CompiledRules":
+        """Rules applied by the L1 output filters."""
+        return cls(OUTPUT_BLOCKLIST_TERMS, PII_PATTERNS, PII_PATTERN_NAMES, direction="OUTPUT", **options)
+
+    def estimated_size(self) -> int:
+        """Rough memory footprint in bytes, used for cache budgeting."""
+        size = 1024 + 16 * sum(len(term) for term in self.blocklist_terms)
+        for rule in self.pii_rules:
+            size += 512 + 8 * len(rule.pattern.pattern)
+            if rule.matcher is not rule.pattern:
+                # A safe rewrite is a compiled pattern; a WindowedMatcher wraps one.
+                source = rule.matcher if isinstance(rule.matcher, re.Pattern) else rule.matcher.pattern
+                size += 512 + 8 * len(source.pattern)
+        return size
+
+    def batch_matcher(self):
+        """The BatchMatcher for these rules, built on first use."""
+        if self._batch_matcher is None:
+            with self._batch_lock:
+                if self._batch_matcher is None:
+                    from .batch import BatchMatcher
+                    self._batch_matcher = BatchMatcher(self)
+        return self._batch_matcher
+
+    def batchable(self, texts: Sequence[str]) -> bool:
+        """Whether texts can go through the batch matcher with the same results as per-text checks."""
+        if self.profiler is not None:
+            return False
+        if self.hardened and self.max_chars is not None:
+            return all(len(text) <= self.max_chars for text in texts)
+        return True
+
+    def first_blocklist_term(self, text: str) -> Optional[str]:
+        """Return the first configured term (in list order) contained in text."""
+        if self.profiler is not None:
+            return self.profiler.first_blocklist_term(text)
+        text_lower = text.lower()
+        for term in self.blocklist_terms:
+            if term.lower() in text_lower:
+                return term
+        return None
+
+    def _start_budget(self, text: str) -> Optional[float]:
+        """Apply the size guard and return the time-budget deadline, if any."""
+        if not self.hardened:
+            return None
+        if self.max_chars is not None and len(text) > self.max_chars:
+            raise FilterBudgetExceeded(
+                f"text of {len(text)} chars exceeds the L1 limit of {self.max_chars}"
+            )
+        return time.perf_counter() + self.time_budget if self.time_budget is not None else None
+
+    def _check_budget(self, deadline: Optional[float]) -> None:
+        # Each matcher is linear-time, so checking between rules bounds the overrun.
+        if deadline is not None and time.perf_counter() > deadline:
+            raise FilterBudgetExceeded(f"L1 time budget of {self.time_budget * 1000:.0f}ms exhausted")
+
+    @property
+    def trigger(self) -> Optional[Trigger]:
+        """The combined check of every rule precondition, or None when no rule has one."""
+        return self._trigger if self._prefiltered else None
+
+    @property
+    def ungated_rules(self) -> Tuple[PiiRule, ...]:
+        """The PII rules without a precondition; the only ones to run on a text the trigger skips."""
+        return self._ungated
+
+    def applicable_rules(self, text: str) -> Sequence[PiiRule]:
+        """The PII rules whose preconditions hold for text, in rule order."""
+        if not self._prefiltered:
+            return self.pii_rules
+        features = TextFeatures(text)
+        if not self._trigger.fires(features):
+            return self._ungated
+        return [rule for rule in self.pii_rules if rule.precondition is None or rule.precondition.holds(features)]
+
+    def first_pii(self, text: str) -> Optional[PiiRule]:
+        """Return the first PII rule (in list order) that matches text."""
+        if self.profiler is not None:
+            return self.profiler.first_pii(text)
+        deadline = self._start_budget(text)
+        rules = self.applicable_rules(text)
+        # The precondition pass reads the whole text; it counts against the budget too.
+        self._check_budget(deadline)
+        for rule in rules:
+            if rule.matcher.search(text):
+                return rule
+            self._check_budget(deadline)
+        return None
+
+    def pii_findings(self, text: str) -> List[Finding]:
+        """Return every PII match in text; Finding.rule is the rule name."""
+        deadline = self._start_budget(text)
+        findings = []
+        rules = self.applicable_rules(text)
+        self._check_budget(deadline)
+        for rule in rules:
+            for match in rule.matcher.finditer(text):
+                if match.end() > match.start():
+                    findings.append(Finding(rule.name, self.pii_type, match.start(), match.end()))
+            self._check_budget(deadline)
+        return findings
+
+    def redact(self, text: str, findings: Optional[List[Finding]] = None) -> Tuple[str, List[Finding]]:
+        """
+        Mask every PII span in text with the token for its kind.
+
+        Spans come from findings when given (e.g. from an earlier scan), so
+        the patterns are not evaluated twice. Overlapping spans are merged and
+        take the kind of the earliest, longest match. Returns the redacted text
+        and the findings that were applied.
+        """
+        if findings is None:
+            findings = self.pii_findings(text)
+        if not findings:
+            return text, []
+
+        kinds = {rule.name: rule.kind for rule in self.pii_rules}
+        ordered = sorted(findings, key=lambda f: (f.start, -f.end))
+        parts = []
+        applied = []
+        cursor = 0
+        for finding in ordered:
+            if finding.end <= cursor:
+                continue
+            start, end = max(finding.start, cursor), finding.end
+            # Some patterns absorb surrounding separators; keep the whitespace.
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            kind = kinds.get(finding.rule, finding.rule)
+            parts.append(text[cursor:start])
+            parts.append(self.redaction_tokens.get(kind, DEFAULT_REDACTION_TOKEN))
+            cursor = end
+            applied.append(finding)
+        parts.append(text[cursor:])
+        return "".join(parts), applied
+
+    def find_all(self, text: str) -> List[Finding]:
+        """Return every blocklist and PII match in text, ordered by rule then position."""
+        findings = []
+        if self._blocklist_re is not None:
+            for match in self._blocklist_re.finditer(text):
+                term = self._term_by_folded.get(match.group(0).lower(), match.group(0))
+                findings.append(Finding(term, self.blocklist_type, match.start(), match.end()))
+        for rule in self.applicable_rules(text):
+            for match in rule.matcher.finditer(text):
+                if match.end() > match.start():
+                    findings.append(Finding(rule.name, self.pii_type, match.start(), match.end()))
+        return findings
+
+
+_default_rules: Dict[str, CompiledRules] = {}
+_default_rules_lock = threading.Lock()
+
+
+def default_rule_options(config: Optional[ArgusSettings] = None) -> Dict[str, object]:
+    """CompiledRules keyword options derived from config (the application settings by default)."""
+    config = config or settings
+    options: Dict[str, object] = {
+        "hardened": config.l1_hardened_matching,
+        "redaction_tokens": config.pii_redaction_tokens,
+        "profile": config.l1_profiling,
+        "prefilter": config.l1_prefilter,
+        "budget_policy": config.l1_budget_policy,
+    }
+    if config.l1_rules_artifact:
+        from .artifact import shared_artifact
+        options["artifact"] = shared_artifact(config.l1_rules_artifact)
+    if config.l1_hardened_matching:
+        options["max_chars"] = config.l1_max_input_chars
+        options["time_budget"] = config.l1_time_budget_ms / 1000.0
+    return options
+
+
+def get_default_rules(direction: str) -> CompiledRules:
+    """Return the process-wide rules for 'INPUT' or 'OUTPUT', compiled on first use."""
+    rules = _default_rules.get(direction)
+    if rules is None:
+        with _default_rules_lock:
+            rules = _default_rules.get(direction)
+            if rules is None:
+                factory = CompiledRules.for_input if direction == "INPUT" else CompiledRules.for_output
+                rules = factory(**default_rule_options())
+                _default_rules[direction] = rules
+    return rules
+
+
+def build_rule_sets(selection: str = "all") -> Tuple[CompiledRules, ...]:
+    """Build the rule sets named by selection: 'input', 'output' or 'all'."""
+    if selection == "input":
+        return (CompiledRules.for_input(),)
+    if selection == "output":
+        return (CompiledRules.for_output(),)
+    if selection == "all":
+        return (CompiledRules.for_input(), CompiledRules.for_output())
+    raise ValueError(f"Unknown rule selection: '{selection}'")
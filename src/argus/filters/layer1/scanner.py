@@ -0,0 +1,236 @@
+"""
+Bulk Layer 1 scanning of files and corpora.
+
+Files are memory-mapped and split into line-aligned chunks that are scanned
+in a process pool, where each worker compiles the rule sets once at start-up,
+or in a thread pool sharing one compiled copy. Threads only scale across
+cores on free-threaded CPython builds, which is when executor="auto" picks
+them.
+"""
+
+import json
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ...core.types import Finding
+from ...utils.concurrency import AUTO, THREAD, default_executor_mode
+from .rules import CompiledRules, build_rule_sets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Plain-text chunks are scanned this far past their end so matches that
+# straddle a chunk boundary are still found (by the chunk they start in).
+CHUNK_OVERLAP = 4096
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+# (path, format, start byte, end byte)
+ChunkTask = Tuple[str, str, int, int]
+
+_worker_rules: Tuple[CompiledRules, ...] = ()
+_worker_fields: Optional[Set[str]] = None
+
+
+def _init_worker(selection: str, fields: Optional[Sequence[str]]) -> None:
+    """Compile the rule sets once per worker process."""
+    global _worker_rules, _worker_fields
+    _worker_rules = build_rule_sets(selection)
+    _worker_fields = set(fields) if fields else None
+
+
+def scan_text(text: str, rule_sets: Sequence[CompiledRules]) -> List[Finding]:
+    """Scan one string with several rule sets, dropping duplicate matches."""
+    findings = []
+    seen = set()
+    for rules in rule_sets:
+        for finding in rules.find_all(text):
+            key = (finding.rule, finding.start, finding.end)
+            if key not in seen:
+                seen.add(key)
+                findings.append(finding)
+    return findings
+
+
+def _detect_format(path: str, fmt: str) -> str:
+    if fmt != "auto":
+        return fmt
+    return "jsonl" if path.lower().endswith(JSONL_EXTENSIONS) else "text"
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[str]:
+    """Expand paths into regular files, walking directories in sorted order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def plan_chunks(path: str, fmt: str = "auto", chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[ChunkTask]:
+    """Split a file into chunks of roughly chunk_size bytes ending on a newline."""
+    fmt = _detect_format(path, fmt)
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    chunks = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                newline = mm.find(b"\n", end - 1)
+                end = size if newline == -1 else newline + 1
+            chunks.append((path, fmt, start, end))
+            start = end
+    return chunks
+
+
+def _byte_offsets(text: str, findings: List[Finding], base: int) -> List[Tuple[int, int]]:
+    """Map character spans in a decoded chunk back to absolute byte spans."""
+    spans = []
+    char_pos = 0
+    byte_pos = 0
+
+    def to_bytes(char_index: int) -> int:
+        nonlocal char_pos, byte_pos
+        if char_index >= char_pos:
+            byte_pos += len(text[char_pos:char_index].encode("utf-8", "surrogateescape"))
+        else:
+            byte_pos -= len(text[char_index:char_pos].encode("utf-8", "surrogateescape"))
+        char_pos = char_index
+        return base + byte_pos
+
+    for finding in findings:
+        start = to_bytes(finding.start)
+        end = to_bytes(finding.end)
+        spans.append((start, end))
+    return spans
+
+
+def _scan_text_chunk(mm: mmap.mmap, path: str, start: int, end: int,
+                     rule_sets: Sequence[CompiledRules]) -> List[Finding]:
+    raw = mm[start:min(end + CHUNK_OVERLAP, len(mm))]
+    text = raw.decode("utf-8", "surrogateescape")
+    findings = sorted(scan_text(text, rule_sets), key=lambda f: f.start)
+    if raw.isascii():
+        spans = [(start + f.start, start + f.end) for f in findings]
+    else:
+        spans = _byte_offsets(text, findings, start)
+
+    results = []
+    for finding, (byte_start, byte_end) in zip(findings, spans):
+        if byte_start >= end:
+            continue  # belongs to the next chunk
+        finding.start, finding.end = byte_start, byte_end
+        finding.source = path
+        finding.offset = byte_start
+        results.append(finding)
+    return results
+
+
+def iter_json_strings(value: Any, path: str = "") -> Iterator[Tuple[str, str, str]]:
+    """Yield (field path, key name, string) for every string inside a JSON value."""
+    if isinstance(value, str):
+        yield path, path.rsplit(".", 1)[-1].split("[", 1)[0], value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from iter_json_strings(item, f"{path}.{key}" if path else str(key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from iter_json_strings(item, f"{path}[{index}]")
+
+
+def _scan_jsonl_chunk(mm: mmap.mmap, path: str, start: int, end: int, rule_sets: Sequence[CompiledRules],
+                      fields: Optional[Set[str]]) -> List[Finding]:
+    results = []
+    pos = start
+    while pos < end:
+        newline = mm.find(b"\n", pos, end)
+        line_end = end if newline == -1 else newline
+        line = mm[pos:line_end]
+        if line.strip():
+            try:
+                strings = iter_json_strings(json.loads(line))
+            except ValueError:
+                # Unparseable records are scanned verbatim rather than skipped.
+                strings = iter([("", "", line.decode("utf-8", "surrogateescape"))])
+            for field, key, value in strings:
+                if fields is not None and field and key not in fields:
+                    continue
+                for finding in scan_text(value, rule_sets):
+                    finding.source = path
+                    finding.offset = pos
+                    finding.field = field or None
+                    results.append(finding)
+        pos = line_end + 1
+    return results
+
+
+def _scan_chunk(task: ChunkTask, rule_sets: Optional[Sequence[CompiledRules]] = None,
+                fields: Optional[Set[str]] = None) -> List[Finding]:
+    """Scan one chunk, with the worker process's rule sets unless rule_sets is given."""
+    if rule_sets is None:
+        rule_sets, fields = _worker_rules, _worker_fields
+    path, fmt, start, end = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if fmt == "jsonl":
+            return _scan_jsonl_chunk(mm, path, start, end, rule_sets, fields)
+        return _scan_text_chunk(mm, path, start, end, rule_sets)
+
+
+def _iter_tasks(paths: Iterable[str], fmt: str, chunk_size: int) -> Iterator[ChunkTask]:
+    for path in iter_files(paths):
+        try:
+            yield from plan_chunks(path, fmt, chunk_size)
+        except OSError as e:
+            logger.error(f"Skipping unreadable file '{path}': {e}")
+
+
+def scan_paths(
+    paths: Iterable[str],
+    rules: str = "all",
+    fmt: str = "auto",
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fields: Optional[Sequence[str]] = None,
+    executor: str = AUTO,
+) -> Iterator[Finding]:
+    """
+    Stream L1 findings for files and directories.
+
+    rules selects the 'input', 'output' or 'all' rule sets; fmt is 'auto',
+    'jsonl' or 'text'. For text files start/end/offset are absolute byte
+    offsets; for JSONL, offset is the record's byte offset and start/end are
+    character offsets within the string at field. fields restricts JSONL
+    scanning to string values under the given key names. workers=1 scans
+    in-process; None uses one worker per CPU. executor is 'process',
+    'thread' or 'auto' (threads on free-threaded builds, else processes).
+    """
+    tasks = _iter_tasks(paths, fmt, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(rules, fields)
+        for task in tasks:
+            yield from _scan_chunk(task)
+        return
+
+    if default_executor_mode(executor) == THREAD:
+        # Compiled rules are never mutated, so one copy serves every thread.
+        scan = partial(_scan_chunk, rule_sets=build_rule_sets(rules), fields=set(fields) if fields else None)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argus-scan") as pool:
+            for findings in pool.map(scan, tasks):
+                yield from findings
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(rules, fields)
+    ) as executor:
+        for findings in executor.map(_scan_chunk, tasks):
+            yield from findings
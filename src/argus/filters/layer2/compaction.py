@@ -0,0 +1,194 @@
+"""
+Risk-focused extractive compaction of guard input.
+
+A long prompt or response is cut to its riskiest sentences before it is
+sent to the guard, within a token budget. Each sentence is scored by:
+
+- L1 near misses: PII rules whose preconditions hold (the characters or
+  literal a match needs are present, though L1 found no match), and words
+  sharing a stem with a blocklist term;
+- numeric and named-entity density (text_risk);
+- word overlap with the other side of the exchange (the prompt, for a
+  response), since a response that departs from its role usually does so
+  while answering the question.
+
+Sentences longer than a piece (and unpunctuated text such as code or
+one-line JSON) are cut into pieces first, so no part of the text is out
+of reach. The chosen pieces keep their original order, gaps are marked,
+and a closing note summarises what was left out: how many sentences,
+figures and names, and the most frequent terms. Text within budget is
+unchanged, and nothing is ever truncated.
+"""
+
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from ...config.settings import ArgusSettings, settings
+from ..layer1.rules import CompiledRules
+from .risk import text_risk, token_counts
+
+# Rough token estimate, in characters per token.
+CHARS_PER_TOKEN = 4
+
+# A sentence ends at terminal punctuation followed by whitespace, or at a line break.
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?]+[\"')\]]*(?=\s)|\n|\Z)", re.S)
+_WORD_RE = re.compile(r"[a-z][a-z0-9'-]{3,}")
+_STEM = 5
+
+_STOPWORDS = frozenset(
+    "about above after again also because been before being below between both could does doing down during "
+    "each from further have having here into itself just more most once only other over same should some such "
+    "than that their them then there these they this those through under until very what when where which while "
+    "will with would your yours".split()
+)
+
+# Weights of the three signals, and a bonus that keeps the opening sentence
+# (which usually states what the text is about) ahead of equally bland ones.
+_NEAR_MISS_WEIGHT = 0.4
+_RISK_WEIGHT = 0.4
+_SIMILARITY_WEIGHT = 0.2
+_LEAD_BONUS = 0.1
+
+# Room kept in the budget for the closing note, and charged per kept sentence for the gap marker it may add.
+_SUMMARY_CHARS = 256
+_GAP_CHARS = 36
+
+# Longer sentences (or unpunctuated text: code, one-line JSON) are cut into pieces of at most this many
+# characters, so every part of the text can be selected. Below _MIN_PIECE_CHARS of room, text goes uncompacted.
+_PIECE_CHARS = 200
+_MIN_PIECE_CHARS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_sentences(text: str) -> List[str]:
+    return [match.group(0).strip() for match in _SENTENCE_RE.finditer(text)]
+
+
+def split_pieces(text: str, max_chars: int = _PIECE_CHARS) -> List[str]:
+    """Sentences and lines of text, each longer one cut at whitespace (or hard) into max_chars pieces."""
+    pieces = []
+    for sentence in split_sentences(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", max_chars // 2, max_chars)
+            if cut < 0:
+                cut = max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS]
+
+
+class GuardInputCompactor:
+    """Cuts guard input to its highest-risk sentences; built once per policy engine."""
+
+    def __init__(self, rules: Sequence[CompiledRules], budget_tokens: int, prompt_budget_tokens: int):
+        self.rules = tuple(rules)
+        self.budget_tokens = budget_tokens
+        self.prompt_budget_tokens = prompt_budget_tokens
+        self._stems: Set[str] = {
+            word[:_STEM] for compiled in self.rules for term in compiled.blocklist_terms
+            for word in _words(term) if len(word) >= _STEM
+        }
+
+    @classmethod
+    def from_settings(cls, rules: Sequence[CompiledRules],
+                      config: Optional[ArgusSettings] = None) -> Optional["GuardInputCompactor"]:
+        """A compactor when L2_COMPACTION is on, else None."""
+        config = config or settings
+        if not config.l2_compaction:
+            return None
+        return cls(rules, config.l2_compaction_budget_tokens, config.l2_compaction_prompt_tokens)
+
+    def compact(self, user_prompt: str, response_text: str) -> Tuple[str, str]:
+        """(user_prompt, response_text), each cut to its budget."""
+        return (
+            self.compact_text(user_prompt, response_text, self.prompt_budget_tokens),
+            self.compact_text(response_text, user_prompt, self.budget_tokens),
+        )
+
+    def near_miss(self, sentence: str) -> float:
+        """0-1: PII preconditions that hold plus blocklist stems present, without an L1 match."""
+        preconditions = sum(
+            1 for compiled in self.rules for rule in compiled.applicable_rules(sentence)
+            if rule.precondition is not None
+        )
+        stems = sum(1 for word in _words(sentence) if word[:_STEM] in self._stems)
+        return min(1.0, 0.25 * preconditions + 0.5 * stems)
+
+    def score(self, sentence: str, reference: Set[str]) -> float:
+        words = set(_words(sentence))
+        similarity = len(words & reference) / len(words) if words else 0.0
+        return (_NEAR_MISS_WEIGHT * self.near_miss(sentence) + _RISK_WEIGHT * text_risk(sentence)
+                + _SIMILARITY_WEIGHT * similarity)
+
+    def compact_text(self, text: str, reference: str, budget_tokens: int) -> str:
+        """
+        text cut to about budget_tokens, closing note included, keeping its highest-scoring sentences.
+
+        Text is never truncated: when the budget leaves no room for a piece
+        of it, it is returned whole.
+        """
+        if estimate_tokens(text) <= budget_tokens:
+            return text
+        budget = budget_tokens * CHARS_PER_TOKEN - _SUMMARY_CHARS - _GAP_CHARS
+        room = min(_PIECE_CHARS, budget - 1 - _GAP_CHARS)
+        if room < _MIN_PIECE_CHARS:
+            return text
+        sentences = split_pieces(text, room)
+        if len(sentences) < 2:
+            return text
+        reference_words = set(_words(reference))
+        scores = [self.score(sentence, reference_words) for sentence in sentences]
+        scores[0] += _LEAD_BONUS
+        chosen: Set[int] = set()
+        used = 0
+        for index in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            size = len(sentences[index]) + 1 + _GAP_CHARS
+            if used + size <= budget:
+                chosen.add(index)
+                used += size
+        return self._render(sentences, chosen, len(text))
+
+    def _render(self, sentences: List[str], chosen: Set[int], original_chars: int) -> str:
+        parts: List[str] = []
+        omitted: List[str] = []
+        run = 0
+        for index, sentence in enumerate(sentences):
+            if index in chosen:
+                if run:
+                    parts.append(f"[... {run} sentence(s) omitted ...]")
+                    run = 0
+                parts.append(sentence)
+            else:
+                omitted.append(sentence)
+                run += 1
+        if run:
+            parts.append(f"[... {run} sentence(s) omitted ...]")
+        shown = sum(len(sentences[index]) for index in chosen)
+        parts.append(f"[Excerpts selected by risk: {len(chosen)} of {len(sentences)} sentences, {shown} of "
+                     f"{original_chars} chars. {self._summary(omitted)}]")
+        return "\n".join(parts)
+
+    @staticmethod
+    def _summary(omitted: Iterable[str]) -> str:
+        """Counts and frequent terms of the omitted sentences."""
+        omitted = list(omitted)
+        figures = names = 0
+        terms: Counter = Counter()
+        for sentence in omitted:
+            _, numeric, entities = token_counts(sentence)
+            figures += numeric
+            names += entities
+            terms.update(_words(sentence))
+        frequent = ", ".join(term for term, _ in terms.most_common(6))
+        summary = f"Omitted: {len(omitted)} sentence(s) with {figures} figure(s) and {names} name(s)"
+        return f"{summary}; frequent terms: {frequent}." if frequent else f"{summary}."
@@ -2,24 +2,71 @@
 Layer 2 Guard LLM - AI-powered contextual analysis.
 """
 
+import contextvars
 import logging
 import json
-from typing import Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
 from openai import OpenAI, APIConnectionError, AuthenticationError, RateLimitError, APIStatusError
 
 from ...config.settings import settings
-from ...config.prompts import GUARD_LLM_SYSTEM_PROMPT, GUARD_LLM_ANALYSIS_PROMPT_TEMPLATE
+from ...config.prompts import GUARD_LLM_SYSTEM_PROMPT, GUARD_LLM_ANALYSIS_PROMPT_TEMPLATE, GUARD_VERDICT_SCHEMA
 from ...config.security_rules import PRIMARY_LLM_ROLE_DESCRIPTION, VIOLATION_REASONS
 from ...core.types import SecurityResult, SecurityDecision, ViolationReason
+from ...core.deadline import request_timeout
 from ...core.exceptions import LLMError
+from ...utils.tracing import span
+from .router import GuardRouter, GuardTarget
+from .verdict_parser import IncrementalVerdictParser
 
 logger = logging.getLogger(__name__)
 
+class GuardPromptTemplate:
+    """The L2 analysis prompt with the primary role bound in once.
+
+    The template is split around the user prompt and response placeholders,
+    so rendering a request is a plain concatenation.
+    """
+    
+    _USER = "\x00user_prompt\x00"
+    _RESPONSE = "\x00response_text\x00"
+    
+    def __init__(self, primary_role: str, template: str = GUARD_LLM_ANALYSIS_PROMPT_TEMPLATE):
+        self.primary_role = primary_role
+        bound = template.format(user_prompt=self._USER, primary_role=primary_role, response_text=self._RESPONSE)
+        head, rest = bound.split(self._USER, 1)
+        middle, tail = rest.split(self._RESPONSE, 1)
+        self._parts = (head, middle, tail)
+    
+    def render(self, user_prompt: str, response_text: str) -> str:
+        head, middle, tail = self._parts
+        return "".join((head, user_prompt, middle, response_text, tail))
+    
+    def __len__(self) -> int:
+        return sum(len(part) for part in self._parts)
+
+_default_template: Optional[GuardPromptTemplate] = None
+_default_template_lock = threading.Lock()
+
+def get_default_prompt_template() -> GuardPromptTemplate:
+    """Return the analysis prompt bound to PRIMARY_LLM_ROLE_DESCRIPTION."""
+    global _default_template
+    if _default_template is None:
+        with _default_template_lock:
+            if _default_template is None:
+                _default_template = GuardPromptTemplate(PRIMARY_LLM_ROLE_DESCRIPTION)
+    return _default_template
+
 class GuardLLMClient:
     """Client for interacting with the Guard LLM via OpenRouter."""
     
-    def __init__(self):
+    def __init__(self, router: Optional[GuardRouter] = None):
         self.client = None
+        self.router = router or GuardRouter.from_settings()
+        self._quorum_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         if settings.openrouter_api_key:
             try:
                 self.client = OpenAI(
@@ -34,7 +81,12 @@ class GuardLLMClient:
         else:
             logger.error("OpenRouter API Key not found in configuration. Guard LLM handler will be disabled.")
     
-    def analyze(self, user_prompt: str, response_text: str) -> SecurityResult:
+    def analyze(
+        self,
+        user_prompt: str,
+        response_text: str,
+        prompt_template: Optional[GuardPromptTemplate] = None,
+    ) -> SecurityResult:
         """Analyze the primary LLM's response using the Guard LLM."""
         if not self.client:
             logger.error("Guard LLM client not initialized. Cannot perform analysis.")
@@ -48,11 +100,9 @@ class GuardLLMClient:
         logger.debug(f"Primary Response (L2 Input): '{response_text[:100]}...'")
         
         try:
-            analysis_prompt = GUARD_LLM_ANALYSIS_PROMPT_TEMPLATE.format(
-                user_prompt=user_prompt,
-                primary_role=PRIMARY_LLM_ROLE_DESCRIPTION,
-                response_text=response_text
-            )
+            with span("guard.render"):
+                template = prompt_template or get_default_prompt_template()
+                analysis_prompt = template.render(user_prompt, response_text)
         except KeyError as e:
             logger.error(f"Missing key in GUARD_LLM_ANALYSIS_PROMPT_TEMPLATE: {e}")
             return SecurityResult(
@@ -71,84 +121,84 @@ class GuardLLMClient:
             {"role": "user", "content": analysis_prompt}
         ]
         
+        if settings.guard_quorum_size > 1:
+            return self._analyze_quorum(messages)
+        return self._call_target(messages, self.router.select()[0])
+    
+    def _call_target(self, messages: List[Dict[str, str]], target: GuardTarget) -> SecurityResult:
+        """One guard call against target; its latency and outcome feed the router."""
+        start = time.perf_counter()
+        result = self._request(messages, target)
+        self.router.record(target, time.perf_counter() - start, result.decision != SecurityDecision.ERROR)
+        return result
+    
+    def _analyze_quorum(self, messages: List[Dict[str, str]]) -> SecurityResult:
+        """
+        Race the best GUARD_QUORUM_SIZE targets.
+        
+        The first VIOLATION wins outright; CLEAN needs GUARD_QUORUM_CLEAN
+        agreeing verdicts. Anything short of that is an error, so the
+        gateway fails closed. Calls still running when the outcome is known
+        finish in the background and only update the router statistics.
+        """
+        targets = self.router.select(settings.guard_quorum_size)
+        needed = min(settings.guard_quorum_clean, len(targets))
+        executor = self._get_quorum_executor()
+        with span("guard.quorum", targets=len(targets), needed=needed) as quorum_span:
+            # Each call gets its own context copy so its spans join this trace.
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._call_target, messages, target)
+                for target in targets
+            ]
+            clean = 0
+            error: Optional[SecurityResult] = None
+            for future in as_completed(futures):
+                result = future.result()
+                if result.decision == SecurityDecision.VIOLATION:
+                    quorum_span.set_attribute("outcome", "violation")
+                    return result
+                if result.decision == SecurityDecision.CLEAN:
+                    clean += 1
+                    if clean >= needed:
+                        quorum_span.set_attribute("outcome", "clean")
+                        return result
+                else:
+                    error = result
+            quorum_span.set_attribute("outcome", "no_quorum")
+        logger.error(f"Guard quorum not reached: {clean}/{needed} CLEAN verdicts.")
+        return SecurityResult(
+            decision=SecurityDecision.ERROR,
+            details=f"No guard quorum ({clean}/{needed} CLEAN; {error.details if error else 'no error'})"
+        )
+    
+    def _get_quorum_executor(self) -> ThreadPoolExecutor:
+        if self._quorum_executor is None:
+            with self._executor_lock:
+                if self._quorum_executor is None:
+                    self._quorum_executor = ThreadPoolExecutor(
+                        max_workers=max(4, settings.guard_quorum_size * 4), thread_name_prefix="argus-guard"
+                    )
+        return self._quorum_executor
+    
+    def _request(self, messages: List[Dict[str, str]], target: GuardTarget) -> SecurityResult:
         try:
-            completion = self.client.chat.completions.create(
-                model=settings.guard_llm_model,
-                messages=messages,
-                temperature=settings.temperature,
-                max_tokens=settings.max_tokens,
-                extra_headers={
-                    "HTTP-Referer": settings.site_url,
-                    "X-Title": settings.site_name,
-                },
-                extra_body={
-                    "provider": {
-                        "order": ["Nineteen"],
-                        "quantizations": ["bf16"],
-                    }
-                }
-            )
-            
-            if completion.choices[0].message.reasoning:
-                guard_reasoning_content = completion.choices[0].message.reasoning.strip()
-                logger.info(f"Guard LLM reasoning: '{guard_reasoning_content}'")
-            else:
-                logger.info("Guard LLM reasoning: NO REASONING")
-            
-            guard_response_content = completion.choices[0].message.content.strip()
-            logger.info(f"Guard LLM raw response content: '{guard_response_content}'")
+            request = self._build_request(messages, target)
+            if settings.guard_streaming:
+                return self._analyze_streaming(request)
             
-            # Clean the response
-            cleaned_content = guard_response_content
-            if cleaned_content.startswith("```json"):
-                cleaned_content = cleaned_content[len("```json"):].strip()
-            if cleaned_content.endswith("```"):
-                cleaned_content = cleaned_content[:-len("```")].strip()
+            with span("guard.http", model=target.model, provider=target.provider):
+                completion = self.client.chat.completions.create(**request)
             
-            # Parse JSON response
-            try:
-                analysis_result = json.loads(cleaned_content)
-                decision = analysis_result.get("decision")
-                reason = analysis_result.get("reason")
-                
-                if decision == "CLEAN":
-                    logger.info("Guard LLM analysis result: CLEAN")
-                    return SecurityResult(decision=SecurityDecision.CLEAN)
-                elif decision == "VIOLATION":
-                    if reason in VIOLATION_REASONS.values():
-                        logger.warning(f"Guard LLM analysis result: VIOLATION (Reason: {reason})")
-                        return SecurityResult(
-                            decision=SecurityDecision.VIOLATION,
-                            reason=ViolationReason(reason),
-                            details=reason
-                        )
-                    else:
-                        logger.warning(f"Guard LLM returned VIOLATION with unknown reason code: '{reason}'. Defaulting reason.")
-                        return SecurityResult(
-                            decision=SecurityDecision.VIOLATION,
-                            reason=ViolationReason.UNKNOWN_VIOLATION,
-                            details=VIOLATION_REASONS["UNKNOWN"]
-                        )
+            with span("guard.parse"):
+                reasoning = getattr(completion.choices[0].message, "reasoning", None)
+                if reasoning:
+                    logger.info(f"Guard LLM reasoning: '{reasoning.strip()}'")
                 else:
-                    logger.warning(f"Guard LLM JSON response had unexpected decision value: '{decision}'. Defaulting to VIOLATION.")
-                    return SecurityResult(
-                        decision=SecurityDecision.VIOLATION,
-                        reason=ViolationReason.UNKNOWN_VIOLATION,
-                        details=VIOLATION_REASONS["UNKNOWN"]
-                    )
-                    
-            except json.JSONDecodeError as json_err:
-                logger.error(f"Failed to parse Guard LLM JSON response: '{guard_response_content}'. Error: {json_err}")
-                return SecurityResult(
-                    decision=SecurityDecision.ERROR,
-                    details="Invalid JSON response format"
-                )
-            except Exception as parse_err:
-                logger.error(f"Error processing Guard LLM response structure: {parse_err}", exc_info=True)
-                return SecurityResult(
-                    decision=SecurityDecision.ERROR,
-                    details="Error processing response structure"
-                )
+                    logger.info("Guard LLM reasoning: NO REASONING")
+                
+                guard_response_content = (completion.choices[0].message.content or "").strip()
+                logger.info(f"Guard LLM raw response content: '{guard_response_content}'")
+                return self._parse_content(guard_response_content)
                 
         except AuthenticationError as e:
             logger.error(f"Guard LLM API Error: Authentication failed. Check API Key. Details: {e}")
@@ -157,16 +207,136 @@ class GuardLLMClient:
                 details="Authentication Error"
             )
         except Exception as e:
-            logger.error(f"An unexpected error occurred during Guard LLM analysis: {e}", exc_info=True)
+            logger.error(f"An unexpected error occurred during Guard LLM analysis ({target}): {e}", exc_info=True)
             return SecurityResult(
                 decision=SecurityDecision.ERROR,
                 details=f"Unexpected Error: {type(e).__name__}"
             )
+    
+    def _build_request(self, messages: List[Dict[str, str]], target: GuardTarget) -> Dict[str, Any]:
+        """Chat completion arguments for one guard call."""
+        provider: Dict[str, Any] = {"quantizations": ["bf16"]}
+        if target.provider:
+            provider["order"] = [target.provider]
+        request: Dict[str, Any] = {
+            "model": target.model,
+            "messages": messages,
+            "temperature": settings.temperature,
+            "max_tokens": settings.guard_max_tokens or settings.max_tokens,
+            "timeout": request_timeout(settings.guard_llm_timeout),
+            "extra_headers": {
+                "HTTP-Referer": settings.site_url,
+                "X-Title": settings.site_name,
+            },
+            "extra_body": {"provider": provider},
+        }
+        if settings.guard_response_format == "json_object":
+            request["response_format"] = {"type": "json_object"}
+        elif settings.guard_response_format == "json_schema":
+            request["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "guard_verdict", "strict": True, "schema": GUARD_VERDICT_SCHEMA},
+            }
+        return request
+    
+    def _analyze_streaming(self, request: Dict[str, Any]) -> SecurityResult:
+        """Stream the completion and stop reading as soon as the verdict is complete."""
+        parser = IncrementalVerdictParser()
+        with span("guard.http", model=request["model"], stream=True) as http_span:
+            stream = self.client.chat.completions.create(stream=True, **request)
+            chunks = 0
+            try:
+                for chunk in stream:
+                    chunks += 1
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta and parser.feed(delta) is not None:
+                        break
+            finally:
+                # Closing the response makes the server stop generating.
+                stream.close()
+            http_span.set_attribute("chunks", chunks)
+            http_span.set_attribute("early_exit", parser.verdict is not None)
+        
+        with span("guard.parse"):
+            if parser.verdict is not None:
+                logger.info(f"Guard LLM verdict parsed from stream after {chunks} chunks: {parser.verdict}")
+                return self._result_from_verdict(parser.verdict)
+            guard_response_content = parser.text.strip()
+            logger.info(f"Guard LLM raw response content: '{guard_response_content}'")
+            return self._parse_content(guard_response_content)
+    
+    def _parse_content(self, guard_response_content: str) -> SecurityResult:
+        """Parse a complete guard response into a SecurityResult."""
+        # Clean the response
+        cleaned_content = guard_response_content
+        if cleaned_content.startswith("```json"):
+            cleaned_content = cleaned_content[len("```json"):].strip()
+        if cleaned_content.endswith("```"):
+            cleaned_content = cleaned_content[:-len("```")].strip()
+        
+        # Parse JSON response
+        try:
+            return self._result_from_verdict(json.loads(cleaned_content))
+        except json.JSONDecodeError as json_err:
+            logger.error(f"Failed to parse Guard LLM JSON response: '{guard_response_content}'. Error: {json_err}")
+            return SecurityResult(
+                decision=SecurityDecision.ERROR,
+                details="Invalid JSON response format"
+            )
+        except Exception as parse_err:
+            logger.error(f"Error processing Guard LLM response structure: {parse_err}", exc_info=True)
+            return SecurityResult(
+                decision=SecurityDecision.ERROR,
+                details="Error processing response structure"
+            )
+    
+    def _result_from_verdict(self, analysis_result: Dict[str, Any]) -> SecurityResult:
+        decision = analysis_result.get("decision")
+        reason = analysis_result.get("reason")
+        
+        if decision == "CLEAN":
+            logger.info("Guard LLM analysis result: CLEAN")
+            return SecurityResult(decision=SecurityDecision.CLEAN)
+        elif decision == "VIOLATION":
+            if reason in VIOLATION_REASONS.values():
+                logger.warning(f"Guard LLM analysis result: VIOLATION (Reason: {reason})")
+                return SecurityResult(
+                    decision=SecurityDecision.VIOLATION,
+                    reason=ViolationReason(reason),
+                    details=reason
+                )
+            else:
+                logger.warning(f"Guard LLM returned VIOLATION with unknown reason code: '{reason}'. Defaulting reason.")
+                return SecurityResult(
+                    decision=SecurityDecision.VIOLATION,
+                    reason=ViolationReason.UNKNOWN_VIOLATION,
+                    details=VIOLATION_REASONS["UNKNOWN"]
+                )
+        else:
+            logger.warning(f"Guard LLM JSON response had unexpected decision value: '{decision}'. Defaulting to VIOLATION.")
+            return SecurityResult(
+                decision=SecurityDecision.VIOLATION,
+                reason=ViolationReason.UNKNOWN_VIOLATION,
+                details=VIOLATION_REASONS["UNKNOWN"]
+            )
+
+_default_client: Optional[GuardLLMClient] = None
+_default_client_lock = threading.Lock()
 
-def analyze_response_with_guard(user_prompt: str, response_text: str) -> Dict:
+def analyze_response_with_guard(
+    user_prompt: str,
+    response_text: str,
+    prompt_template: Optional[GuardPromptTemplate] = None,
+) -> Dict:
     """Legacy function for backward compatibility."""
-    client = GuardLLMClient()
-    result = client.analyze(user_prompt, response_text)
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = GuardLLMClient()
+    result = _default_client.analyze(user_prompt, response_text, prompt_template)
     
     # Convert to legacy format
     if result.decision == SecurityDecision.CLEAN:
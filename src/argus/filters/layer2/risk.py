@@ -0,0 +1,40 @@
+"""
+Cheap risk signals used to decide how much L2 attention a response gets.
+"""
+
+from typing import Tuple
+
+_SENTENCE_END = (".", "!", "?", ":", ";")
+
+
+def token_counts(text: str) -> Tuple[int, int, int]:
+    """
+    (tokens, numeric, entities) for text.
+
+    Tokens containing a digit count as numeric, and capitalised tokens
+    that do not start a sentence count as entities.
+    """
+    tokens = text.split()
+    numeric = 0
+    entities = 0
+    previous = "."
+    for token in tokens:
+        if any(char.isdigit() for char in token):
+            numeric += 1
+        elif token[0].isupper() and not previous.endswith(_SENTENCE_END):
+            entities += 1
+        previous = token
+    return len(tokens), numeric, entities
+
+
+def text_risk(text: str) -> float:
+    """
+    Score text from 0 to 1 by numeric and named-entity density.
+
+    Leaks tend to carry figures, identifiers and proper nouns; ordinary
+    prose scores low.
+    """
+    tokens, numeric, entities = token_counts(text)
+    if not tokens:
+        return 0.0
+    return min(1.0, (3.0 * numeric + 1.5 * entities) / tokens)
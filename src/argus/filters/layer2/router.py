@@ -0,0 +1,141 @@
+"""
+Latency- and health-aware routing across guard models and providers.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ...config.settings import settings
+from ...core.exceptions import ConfigurationError
+
+
+@dataclass(frozen=True)
+class GuardTarget:
+    """One guard model, optionally pinned to an OpenRouter provider."""
+    model: str
+    provider: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "GuardTarget":
+        """Parse "model" or "model@provider"."""
+        model, _, provider = spec.strip().partition("@")
+        if not model:
+            raise ConfigurationError(f"Invalid guard target '{spec}'")
+        return cls(model, provider or None)
+
+    def __str__(self) -> str:
+        return f"{self.model}@{self.provider}" if self.provider else self.model
+
+
+class TargetStats:
+    """EWMA latency and error rate for one target."""
+
+    __slots__ = ("latency", "error_rate", "calls", "failures", "last_failure", "probe_started")
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.last_failure = float("-inf")
+        self.probe_started = float("-inf")
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "latency": self.latency,
+            "error_rate": round(self.error_rate, 4),
+            "calls": self.calls,
+            "failures": self.failures,
+        }
+
+
+class GuardRouter:
+    """
+    Orders guard targets fastest-healthy-first.
+
+    Every call reports its latency and outcome; both are tracked as
+    exponentially weighted moving averages. A target whose error rate
+    reaches error_threshold is skipped until cooldown seconds after its
+    last failure, then gets a single probe: it is handed to one caller
+    and skipped by the rest until that call is recorded (or a further
+    cooldown passes without it). Targets with no samples yet sort first
+    so each one is measured.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[GuardTarget],
+        alpha: float = 0.3,
+        error_threshold: float = 0.5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not targets:
+            raise ConfigurationError("GuardRouter needs at least one target")
+        self.targets = list(targets)
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._stats = {target: TargetStats() for target in self.targets}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "GuardRouter":
+        if settings.guard_targets:
+            targets = [GuardTarget.parse(spec) for spec in settings.guard_targets]
+        else:
+            targets = [GuardTarget(settings.guard_llm_model, settings.guard_llm_provider)]
+        return cls(
+            targets,
+            alpha=settings.guard_router_alpha,
+            error_threshold=settings.guard_router_error_threshold,
+            cooldown=settings.guard_router_cooldown,
+        )
+
+    def _failing(self, stats: TargetStats) -> bool:
+        return stats.error_rate >= self.error_threshold
+
+    def _healthy(self, stats: TargetStats, now: float) -> bool:
+        if not self._failing(stats):
+            return True
+        return now - stats.last_failure >= self.cooldown and now - stats.probe_started >= self.cooldown
+
+    def select(self, count: int = 1) -> List[GuardTarget]:
+        """The best count targets; unhealthy ones only if nothing else is left."""
+        now = self.clock()
+        with self._lock:
+            healthy = {target: self._healthy(self._stats[target], now) for target in self.targets}
+            ranked = sorted(
+                self.targets,
+                key=lambda target: (not healthy[target], self._stats[target].latency or 0.0),
+            )[:count]
+            for target in ranked:
+                stats = self._stats[target]
+                if healthy[target] and self._failing(stats):
+                    stats.probe_started = now
+        return ranked
+
+    def record(self, target: GuardTarget, latency: float, ok: bool) -> None:
+        """Fold one call's latency and outcome into the target's averages."""
+        with self._lock:
+            stats = self._stats[target]
+            stats.calls += 1
+            stats.probe_started = float("-inf")
+            if ok:
+                # Failed calls are often fast (connection refused) or capped by the
+                # timeout, so only successful calls feed the latency average.
+                stats.latency = latency if stats.latency is None else (
+                    self.alpha * latency + (1 - self.alpha) * stats.latency
+                )
+            else:
+                stats.failures += 1
+                stats.last_failure = self.clock()
+            stats.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * stats.error_rate
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Current averages per target, for logs and health endpoints."""
+        with self._lock:
+            return {str(target): self._stats[target].as_dict() for target in self.targets}
@@ -0,0 +1,91 @@
+"""
+Incremental parser that finds the guard's JSON verdict in a token stream.
+"""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+VERDICT_DECISIONS = ("CLEAN", "VIOLATION")
+
+# What may precede the verdict: whitespace, closed reasoning blocks and an opening code fence.
+_PREAMBLE_RE = re.compile(r"\s*(?:<think>.*?</think>\s*)*(?:```(?:json)?\s*)?", re.S)
+
+
+class IncrementalVerdictParser:
+    """
+    Finds the JSON verdict object that opens the guard's answer.
+
+    Chunks are fed as they arrive and every character is examined once:
+    the parser tracks brace depth outside of JSON strings, so braces inside
+    reasoning blocks and strings are skipped. Only an object preceded by
+    nothing but whitespace, <think> blocks and a code fence counts; a
+    verdict-shaped object after prose or another object (an example quoted
+    in the reasoning, say) is not taken, and the caller parses the full
+    text instead. feed() returns the verdict dict as soon as its closing
+    brace arrives, which lets the caller close the stream without waiting
+    for the rest of the generation.
+    """
+
+    __slots__ = ("_buffer", "_pos", "_start", "_leading", "_depth", "_in_string", "_escape", "verdict")
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._start = -1
+        self._leading = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.verdict: Optional[Dict[str, Any]] = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Consume chunk; return the verdict once it is complete."""
+        if self.verdict is not None:
+            return self.verdict
+        self._buffer += chunk
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == "{":
+                if self._depth == 0:
+                    self._start = pos
+                    self._leading = _PREAMBLE_RE.fullmatch(buffer, 0, pos) is not None
+                self._depth += 1
+            elif self._depth == 0:
+                # Quotes outside any object (prose, reasoning) are not JSON strings.
+                continue
+            elif char == '"':
+                self._in_string = True
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._leading:
+                    verdict = self._decode(buffer[self._start:pos + 1])
+                    if verdict is not None:
+                        self._pos = pos + 1
+                        self.verdict = verdict
+                        return verdict
+        self._pos = len(buffer)
+        return None
+
+    @staticmethod
+    def _decode(candidate: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            return None
+        if isinstance(value, dict) and value.get("decision") in VERDICT_DECISIONS:
+            return value
+        return None
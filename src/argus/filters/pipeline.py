@@ -0,0 +1,113 @@
+"""
+Composable filter pipeline built once from registered BaseFilter stages.
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from ..core.exceptions import ConfigurationError
+from ..core.types import PASSED, FilterResult
+from .base import FILTER_REGISTRY, BaseFilter
+
+logger = logging.getLogger(__name__)
+
+NO_VIOLATIONS: Tuple[FilterResult, ...] = ()
+
+class Pipeline:
+    """An ordered, reusable sequence of stateless filter stages.
+
+    run() stops at the first failing stage; run_all() evaluates every stage
+    and collects all failures. A stage that passes with redacted_text hands
+    the redacted text to later stages. On a clean request both return shared
+    constants, so the fast path allocates nothing beyond the stages' own work.
+    """
+    
+    __slots__ = ("stages", "name")
+    
+    def __init__(self, stages: Sequence[BaseFilter], name: str = "pipeline"):
+        self.stages: Tuple[BaseFilter, ...] = tuple(stages)
+        self.name = name
+    
+    def run(self, text: str) -> FilterResult:
+        """Return the first failing result, or a passing one."""
+        notable = None
+        for stage in self.stages:
+            result = stage.check(text)
+            if result is PASSED:
+                continue
+            if not result.passed:
+                return result
+            notable = _merge(notable, result)
+            if result.redacted_text is not None:
+                text = result.redacted_text
+        return PASSED if notable is None else notable
+    
+    def run_all(self, text: str) -> Tuple[FilterResult, ...]:
+        """Return every failing result (empty when clean)."""
+        failures = None
+        for stage in self.stages:
+            result = stage.check(text)
+            if result is PASSED:
+                continue
+            if not result.passed:
+                failures = [result] if failures is None else failures + [result]
+            elif result.redacted_text is not None:
+                text = result.redacted_text
+        return NO_VIOLATIONS if failures is None else tuple(failures)
+    
+    def run_batch(self, texts: Sequence[str]) -> List[FilterResult]:
+        """run() for many texts, one check_batch() call per stage."""
+        results: List[FilterResult] = [PASSED] * len(texts)
+        current = list(texts)
+        pending = list(range(len(texts)))
+        for stage in self.stages:
+            if not pending:
+                break
+            still_pending = []
+            for i, result in zip(pending, stage.check_batch([current[i] for i in pending])):
+                if result is PASSED:
+                    still_pending.append(i)
+                elif not result.passed:
+                    results[i] = result
+                else:
+                    results[i] = _merge(None if results[i] is PASSED else results[i], result)
+                    if result.redacted_text is not None:
+                        current[i] = result.redacted_text
+                    still_pending.append(i)
+            pending = still_pending
+        return results
+    
+    def __len__(self) -> int:
+        return len(self.stages)
+    
+    def __repr__(self) -> str:
+        return f"Pipeline({self.name}: {', '.join(s.get_filter_name() for s in self.stages)})"
+
+def _merge(previous: Optional[FilterResult], result: FilterResult) -> FilterResult:
+    """Combine passing results that carry escalation or redaction."""
+    if previous is None:
+        return result
+    return FilterResult(
+        passed=True,
+        violation_detail="; ".join(d for d in (previous.violation_detail, result.violation_detail) if d),
+        filter_type=result.filter_type,
+        escalate=previous.escalate or result.escalate,
+        redacted_text=result.redacted_text if result.redacted_text is not None else previous.redacted_text,
+    )
+
+def build_pipeline(stage_names: Sequence[str], rules=None, name: str = "pipeline") -> Pipeline:
+    """Instantiate the registered stages once, sharing the given CompiledRules."""
+    # Importing the built-in filters registers their stages.
+    from .layer1 import input_filters, output_filters  # noqa: F401
+    
+    stages = []
+    for stage_name in stage_names:
+        factory = FILTER_REGISTRY.get(stage_name)
+        if factory is None:
+            raise ConfigurationError(
+                f"Unknown filter stage '{stage_name}'. Registered: {sorted(FILTER_REGISTRY)}"
+            )
+        stages.append(factory(rules))
+    pipeline = Pipeline(stages, name=name)
+    logger.debug(f"Built {pipeline!r}")
+    return pipeline
@@ -2,22 +2,46 @@
 Command-Line Interface for the Argus AI Gateway.
 """
 
+import argparse
+import json
 import logging
 from ..core.gateway import ArgusGateway
-from ..config.settings import settings
+from ..filters.layer1.profiling import format_report, iter_corpus_texts, profile_corpus
+from ..filters.layer1.rules import build_rule_sets
+from ..utils.logging import setup_logging
 
-def setup_logging():
-    """Setup logging configuration."""
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
-        format=settings.log_format,
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="argus-cli", description="Argus AI Gateway command line.")
+    parser.add_argument("--profile-rules", metavar="CORPUS", default=None,
+                        help="Rank L1 rules by cost against a sample corpus (JSONL or one text per line) and exit.")
+    parser.add_argument("--rules", choices=["input", "output", "all"], default="all",
+                        help="Rule sets to profile (default: all).")
+    parser.add_argument("--fields", nargs="*", default=None,
+                        help="Only profile JSONL string values under these key names.")
+    parser.add_argument("--top", type=int, default=None, help="Show only the N most expensive rules.")
+    parser.add_argument("--json", action="store_true", help="Print the profile as JSON.")
+    return parser
 
-def main():
+def profile_rules(args) -> None:
+    """Profile the L1 rules against a corpus and print the ranking."""
+    profilers = profile_corpus(iter_corpus_texts(args.profile_rules, args.fields), build_rule_sets(args.rules))
+    if args.json:
+        rows = sorted((s for p in profilers for s in p.stats.values()), key=lambda s: s.total_ns, reverse=True)
+        if args.top:
+            rows = rows[:args.top]
+        print(json.dumps([s.to_dict() for s in rows], indent=2))
+    else:
+        print(format_report(profilers, args.top))
+
+def main(argv=None):
     """Main function to run the CLI application."""
+    args = build_parser().parse_args(argv)
     setup_logging()
     logger = logging.getLogger(__name__)
+
+    if args.profile_rules:
+        profile_rules(args)
+        return
     
     logger.info("Initializing Argus AI Gateway...")
     try:
@@ -0,0 +1,111 @@
+"""
+argus-eval - precision/recall and latency of gateway configurations on a labeled corpus,
+or replay of captured traffic (--replay).
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import replace
+
+from ..core.capture import load_capture
+from ..evaluation import (
+    DEFAULT_CONFIGS, builtin_corpus, evaluate, format_report, format_replay_report, load_corpus, replay,
+)
+from ..utils.logging import setup_logging
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="argus-eval",
+        description="Replay a labeled corpus through named gateway configurations and report "
+                    "precision/recall per reason code, latency percentiles and guard calls.",
+    )
+    parser.add_argument("--corpus", default=None,
+                        help="JSONL corpus of {id, prompt, label, response, guard, evidence} (default: built-in).")
+    parser.add_argument("--configs", nargs="*", default=None,
+                        help=f"Configurations to run (default: all of {', '.join(c.name for c in DEFAULT_CONFIGS)}).")
+    parser.add_argument("--guard-model", default=None,
+                        help="Replay the verdicts recorded for this guard model.")
+    parser.add_argument("--guard-latency-ms", type=float, default=0.0,
+                        help="Fixed latency of the guard stand-in per call.")
+    parser.add_argument("--guard-ms-per-kchar", type=float, default=0.0,
+                        help="Extra guard latency per 1000 input characters.")
+    replay_group = parser.add_argument_group("replay", "Replay a capture (CAPTURE_PATH) instead of a corpus.")
+    replay_group.add_argument("--replay", metavar="CAPTURE", default=None,
+                              help="Capture file to replay; --configs then defaults to l1_l2.")
+    replay_group.add_argument("--time-scale", type=float, default=1.0,
+                              help="Multiply recorded LLM/guard times and timeouts (0: no waiting).")
+    replay_group.add_argument("--speed", type=float, default=1.0,
+                              help="Arrival schedule speed-up; 0 sends requests back to back.")
+    replay_group.add_argument("--workers", type=int, default=16, help="Requests in flight at most.")
+    replay_group.add_argument("--scale-guard-by-chars", action="store_true",
+                              help="Scale recorded guard times by the change in guard input size.")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON.")
+    parser.add_argument("--show-mismatches", action="store_true",
+                        help="List the cases each configuration got wrong.")
+    return parser
+
+
+def run_replay(args, configs) -> int:
+    interactions = load_capture(args.replay)
+    reports = [
+        replay(interactions, config, time_scale=args.time_scale, speed=args.speed or None, workers=args.workers,
+               scale_guard_by_chars=args.scale_guard_by_chars)
+        for config in configs
+    ]
+    if args.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=2))
+        return 0
+    print(f"{len(interactions)} captured request(s)")
+    print(format_replay_report(reports))
+    if args.show_mismatches:
+        for report in reports:
+            for result in report.changed():
+                print(f"{report.config.name}: request {result.index} recorded {result.recorded_outcome}, "
+                      f"replayed {result.outcome}")
+    return 0
+
+
+def main(argv=None):
+    """Main function for the argus-eval command."""
+    args = build_parser().parse_args(argv)
+    # Per-case filter and guard logs would drown the report.
+    setup_logging(level="ERROR", stream=sys.stderr)
+
+    by_name = {config.name: config for config in DEFAULT_CONFIGS}
+    names = args.configs or (["l1_l2"] if args.replay else list(by_name))
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        print(f"Unknown configuration(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    configs = []
+    for name in names:
+        config = replace(
+            by_name[name],
+            guard_latency=args.guard_latency_ms / 1000.0,
+            guard_latency_per_kchar=args.guard_ms_per_kchar / 1000.0,
+        )
+        if args.guard_model:
+            config = replace(config, guard_model=args.guard_model)
+        configs.append(config)
+
+    if args.replay:
+        return run_replay(args, configs)
+
+    cases = load_corpus(args.corpus) if args.corpus else builtin_corpus()
+    reports = evaluate(cases, configs)
+    if args.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=2))
+        return 0
+    print(f"{len(cases)} case(s)")
+    print(format_report(reports))
+    if args.show_mismatches:
+        for report in reports:
+            for result in report.mismatches():
+                print(f"{report.config.name}: {result.case_id} expected {result.label}, got {result.predicted}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
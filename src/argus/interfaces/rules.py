@@ -0,0 +1,69 @@
+"""
+argus-rules - build and inspect the precompiled Layer 1 rule artifact.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from ..config.security_rules import PII_PATTERN_NAMES, PII_PATTERNS, PII_SAFE_PATTERNS
+from ..core.exceptions import ConfigurationError
+from ..filters.layer1.artifact import RuleArtifact, analyze_rules, write_artifact
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="argus-rules", description="Manage the precompiled L1 rule artifact.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_cmd = commands.add_parser("compile", help="Analyse every PII rule and write the artifact.")
+    compile_cmd.add_argument("--output", "-o", default="rules.argus", help="Artifact path (default: rules.argus).")
+    inspect_cmd = commands.add_parser("inspect", help="Verify an artifact and print its metadata.")
+    inspect_cmd.add_argument("path", help="Artifact to inspect.")
+    inspect_cmd.add_argument("--json", action="store_true", help="Print the metadata as JSON.")
+    return parser
+
+
+def compile_rules(args) -> int:
+    started = time.perf_counter()
+    try:
+        entries = analyze_rules(PII_PATTERN_NAMES, PII_PATTERNS, PII_SAFE_PATTERNS)
+    except ConfigurationError as e:
+        print(f"argus-rules: {e}", file=sys.stderr)
+        return 1
+    metadata = write_artifact(args.output, entries)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {args.output}: {len(entries)} rule(s), rules version {metadata['rules_version']} "
+          f"({elapsed * 1000:.0f}ms).")
+    return 0
+
+
+def inspect_artifact(args) -> int:
+    try:
+        artifact = RuleArtifact(args.path)
+    except ConfigurationError as e:
+        print(f"argus-rules: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.json:
+            print(json.dumps(dict(artifact.metadata, checksum=artifact.checksum, entries=artifact.count), indent=2))
+        else:
+            print(f"{args.path}: {artifact.count} rule(s), checksum OK")
+            for key in ("rules_version", "argus_version", "python"):
+                print(f"  {key}: {artifact.metadata.get(key)}")
+            print(f"  created: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(artifact.metadata['created_at']))}")
+            print(f"  rules: {', '.join(artifact.metadata.get('rules', []))}")
+    finally:
+        artifact.close()
+    return 0
+
+
+def main(argv=None):
+    """Main function for the argus-rules command."""
+    args = build_parser().parse_args(argv)
+    if args.command == "compile":
+        return compile_rules(args)
+    return inspect_artifact(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+argus-scan - bulk Layer 1 scanning of files, JSONL corpora and directories.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from ..filters.layer1.scanner import DEFAULT_CHUNK_SIZE, scan_paths
+from ..utils.concurrency import AUTO, EXECUTOR_MODES
+from ..utils.logging import setup_logging
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="argus-scan",
+        description="Scan files with the Argus L1 rules and emit findings as JSON lines.",
+    )
+    parser.add_argument("paths", nargs="+", help="Files or directories to scan.")
+    parser.add_argument("--rules", choices=["input", "output", "all"], default="all",
+                        help="Which L1 rule sets to apply (default: all).")
+    parser.add_argument("--format", dest="fmt", choices=["auto", "jsonl", "text"], default="auto",
+                        help="Input format; auto treats .jsonl/.ndjson as JSONL (default: auto).")
+    parser.add_argument("--fields", nargs="*", default=None,
+                        help="Only scan JSONL string values under these key names.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Workers (default: one per CPU).")
+    parser.add_argument("--executor", choices=EXECUTOR_MODES, default=AUTO,
+                        help="Run workers as processes or threads; auto uses threads only on "
+                             "free-threaded Python builds (default: auto).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Approximate bytes per work unit.")
+    parser.add_argument("--output", "-o", default=None,
+                        help="Write findings to this file instead of stdout.")
+    return parser
+
+
+def main(argv=None):
+    """Main function for the argus-scan command."""
+    args = build_parser().parse_args(argv)
+    # Findings go to stdout.
+    setup_logging(stream=sys.stderr)
+    logger = logging.getLogger(__name__)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    started = time.perf_counter()
+    try:
+        for finding in scan_paths(
+            args.paths,
+            rules=args.rules,
+            fmt=args.fmt,
+            workers=args.workers,
+            executor=args.executor,
+            chunk_size=args.chunk_size,
+            fields=args.fields,
+        ):
+            out.write(json.dumps({
+                "file": finding.source,
+                "offset": finding.offset,
+                "rule": finding.rule,
+                "filter_type": finding.filter_type,
+                "field": finding.field,
+                "start": finding.start,
+                "end": finding.end,
+            }) + "\n")
+            count += 1
+    except KeyboardInterrupt:
+        logger.info("KeyboardInterrupt received. Stopping scan.")
+        return 130
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Scan finished: {count} finding(s) in {elapsed:.2f}s.")
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+argus-sidecar - serve the gateway and L1 checks over a Unix domain socket.
+"""
+
+import argparse
+import logging
+import sys
+
+from ..config.settings import settings
+from ..core.exceptions import ConfigurationError
+from ..sidecar import SidecarServer
+from ..utils.logging import setup_logging
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="argus-sidecar",
+                                     description="Run Argus as a local sidecar on a Unix domain socket.")
+    parser.add_argument("--socket", default=settings.sidecar_socket_path,
+                        help=f"Socket path (default: {settings.sidecar_socket_path}).")
+    parser.add_argument("--workers", type=int, default=settings.sidecar_workers,
+                        help=f"Concurrent gateway calls (default: {settings.sidecar_workers}).")
+    return parser
+
+
+def main(argv=None):
+    """Main function for the argus-sidecar command."""
+    args = build_parser().parse_args(argv)
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    try:
+        server = SidecarServer(args.socket, workers=args.workers).start()
+    except (ConfigurationError, OSError) as e:
+        logger.critical(f"Failed to start the Argus sidecar: {e}")
+        return 1
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down the Argus sidecar.")
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,17 @@
 Abstract base LLM interface for extensibility.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterator
 
 class BaseLLM(ABC):
-    """Abstract base class for all LLM implementations."""
+    """Abstract base class for all LLM implementations.
+    
+    Only get_response and get_model_name are required. The async and
+    streaming methods fall back to the blocking call; providers that can
+    stream tokens or do native async I/O should override them.
+    """
     
     @abstractmethod
     def get_response(self, prompt: str) -> str:
@@ -16,3 +23,24 @@ class BaseLLM(ABC):
     def get_model_name(self) -> str:
         """Get the name/identifier of this LLM."""
         pass
+    
+    def stream_response(self, prompt: str) -> Iterator[str]:
+        """Yield the response in text chunks as they are produced."""
+        yield self.get_response(prompt)
+    
+    async def aget_response(self, prompt: str) -> str:
+        """Get a response without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_response, prompt)
+    
+    async def astream_response(self, prompt: str) -> AsyncIterator[str]:
+        """Async variant of stream_response."""
+        yield await self.aget_response(prompt)
+    
+    def close(self) -> None:
+        """Release pooled connections or other resources, if any."""
+        pass
+    
+    async def aclose(self) -> None:
+        """Async variant of close, for providers holding async connections."""
+        self.close()
@@ -2,57 +2,95 @@
 Mock LLM implementation for testing and demonstration.
 """
 
+import asyncio
 import logging
 import random
 import time
 import re
-from typing import Dict, List
+import threading
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from .base import BaseLLM
 
 logger = logging.getLogger(__name__)
 
+MOCK_RESPONSES: Dict[str, List[str]] = {
+    "safe": [
+        "The customer support process involves several tiers.",
+    ],
+    "pii_direct": [
+        "The user associated with this query is John Doe, email: john.doe@thales-internal.example.com.",
+        "Based on HR records, the employee ID is E789123, and their SSN is 987-65-4321.",
+        "The engineer's contact number is +91 98XXXXXX01.",
+    ],
+    "pii_indirect": [
+        "Our target demographic often includes individuals earning over ₹25 Lakhs annually living in major metro areas like Delhi or Bangalore.",
+    ],
+    "confidential_company": [
+        "The Q4 sales target for the 'Rafale Upgrade' project is $15 million, which is Thales Confidential information.",
+        "Project 'Argus Internal' budget is currently set at €2.5M (Restricted).",
+        "Internal use only: The radar algorithm update (v3.1) improved target acquisition range by 12%.",
+        "As per internal spec sheet TRD-CYBER-005, the encryption key rotation period is 90 days.",
+    ],
+    "role_violation_sensitive": [
+        "Our primary C4ISR database is protected using AES-256 encryption and Thales KeyAuthority MFA.",
+        "The cybersecurity protocol involves bi-weekly penetration testing using Cobalt Strike simulations.",
+        "To bypass the filter, you could try phrasing your request differently...",
+    ],
+    "generic": [
+        "I have processed your request.",
+        "Acknowledged.",
+        "Processing complete.",
+        "Please provide more details.",
+    ]
+}
+
+TEST_PREFIX_RE = re.compile(r"^TEST::(\w+)::")
+
+# A word with its trailing whitespace; joining the tokens restores the text.
+TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word-sized streaming tokens."""
+    return TOKEN_RE.findall(text)
+
 class MockLLM(BaseLLM):
     """Mock LLM with deterministic responses for testing."""
     
-    def __init__(self):
-        self.mock_responses = {
-            "safe": [
-                "The customer support process involves several tiers.",
-            ],
-            "pii_direct": [
-                "The user associated with this query is John Doe, email: john.doe@thales-internal.example.com.",
-                "Based on HR records, the employee ID is E789123, and their SSN is 987-65-4321.",
-                "The engineer's contact number is +91 98XXXXXX01.",
-            ],
-            "pii_indirect": [
-                "Our target demographic often includes individuals earning over ₹25 Lakhs annually living in major metro areas like Delhi or Bangalore.",
-            ],
-            "confidential_company": [
-                "The Q4 sales target for the 'Rafale Upgrade' project is $15 million, which is Thales Confidential information.",
-                "Project 'Argus Internal' budget is currently set at €2.5M (Restricted).",
-                "Internal use only: The radar algorithm update (v3.1) improved target acquisition range by 12%.",
-                "As per internal spec sheet TRD-CYBER-005, the encryption key rotation period is 90 days.",
-            ],
-            "role_violation_sensitive": [
-                "Our primary C4ISR database is protected using AES-256 encryption and Thales KeyAuthority MFA.",
-                "The cybersecurity protocol involves bi-weekly penetration testing using Cobalt Strike simulations.",
-                "To bypass the filter, you could try phrasing your request differently...",
-            ],
-            "generic": [
-                "I have processed your request.",
-                "Acknowledged.",
-                "Processing complete.",
-                "Please provide more details.",
-            ]
-        }
-        self.test_prefix_re = re.compile(r"^TEST::(\w+)::")
+    def __init__(self, token_delay: float = 0.0, latency_range: Tuple[float, float] = (0.2, 0.8)):
+        self.mock_responses = MOCK_RESPONSES
+        self.test_prefix_re = TEST_PREFIX_RE
+        self.token_delay = token_delay
+        self.latency_range = latency_range
     
     def get_response(self, prompt: str) -> str:
         """Simulate getting a response from the primary LLM."""
         logger.info(f"Primary LLM Mock received prompt: '{prompt[:100]}...'")
         
-        time.sleep(random.uniform(0.2, 0.8))
+        time.sleep(random.uniform(*self.latency_range))
         
+        return self.select_response(prompt)
+    
+    def stream_response(self, prompt: str) -> Iterator[str]:
+        """Simulate streaming: the first token after the usual latency, then one per token_delay."""
+        time.sleep(random.uniform(*self.latency_range))
+        for i, token in enumerate(split_tokens(self.select_response(prompt))):
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            yield token
+    
+    async def aget_response(self, prompt: str) -> str:
+        await asyncio.sleep(random.uniform(*self.latency_range))
+        return self.select_response(prompt)
+    
+    async def astream_response(self, prompt: str) -> AsyncIterator[str]:
+        await asyncio.sleep(random.uniform(*self.latency_range))
+        for i, token in enumerate(split_tokens(self.select_response(prompt))):
+            if i and self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token
+    
+    def select_response(self, prompt: str) -> str:
+        """Pick the canned response for prompt, without any simulated latency."""
         response_category = "generic"
         
         # Check for deterministic test prefix
@@ -91,8 +129,15 @@ class MockLLM(BaseLLM):
     def get_model_name(self) -> str:
         return "MockLLM-v1.0"
 
+_default_mock: Optional[MockLLM] = None
+_default_mock_lock = threading.Lock()
+
 # Legacy function for backward compatibility
 def get_llm_response(prompt: str) -> str:
     """Legacy function for backward compatibility."""
-    mock_llm = MockLLM()
-    return mock_llm.get_response(prompt)
+    global _default_mock
+    if _default_mock is None:
+        with _default_mock_lock:
+            if _default_mock is None:
+                _default_mock = MockLLM()
+    return _default_mock.get_response(prompt)
@@ -0,0 +1,188 @@
+"""
+Primary LLM backed by any OpenAI-compatible chat completions endpoint.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+from openai import APIError, AsyncOpenAI, OpenAI
+
+from ..config.security_rules import PRIMARY_LLM_ROLE_DESCRIPTION
+from ..config.settings import settings
+from ..core.deadline import request_timeout
+from ..core.exceptions import ConfigurationError, LLMError
+from .base import BaseLLM
+
+logger = logging.getLogger(__name__)
+
+class OpenAICompatibleLLM(BaseLLM):
+    """
+    Chat completions over HTTP with pooled keep-alive connections.
+
+    Works against OpenAI, vLLM, llama.cpp, Ollama and similar servers, or the
+    local stand-in in argus.llm.stub_server. The sync and async clients are
+    each created once, on first use, and reused for every request.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        system_prompt: Optional[str] = PRIMARY_LLM_ROLE_DESCRIPTION,
+    ):
+        self.base_url = base_url or settings.primary_llm_base_url
+        # Local servers usually ignore the key, but the SDK requires one.
+        self.api_key = api_key or settings.primary_llm_api_key or "not-needed"
+        self.model = model or settings.primary_llm_model
+        self.timeout = timeout if timeout is not None else settings.primary_llm_timeout
+        self.max_connections = max_connections or settings.primary_llm_max_connections
+        self.system_prompt = system_prompt
+        if not self.base_url:
+            raise ConfigurationError("An OpenAI-compatible provider needs a base URL.")
+        self._client: Optional[OpenAI] = None
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._lock = threading.Lock()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+
+    @property
+    def client(self) -> OpenAI:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = OpenAI(
+                        base_url=self.base_url,
+                        api_key=self.api_key,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=httpx.Client(limits=self._limits(), timeout=self.timeout),
+                    )
+                    logger.info(f"Primary LLM client initialized for {self.base_url} ({self.model}).")
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    self._async_client = AsyncOpenAI(
+                        base_url=self.base_url,
+                        api_key=self.api_key,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=httpx.AsyncClient(limits=self._limits(), timeout=self.timeout),
+                    )
+        return self._async_client
+
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        messages = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _request(self, prompt: str, stream: bool) -> Dict:
+        return {
+            "model": self.model,
+            "messages": self._messages(prompt),
+            "max_tokens": settings.primary_llm_max_tokens,
+            "temperature": settings.temperature,
+            "stream": stream,
+            # Shorter than the client default when the request deadline is nearer.
+            "timeout": request_timeout(self.timeout),
+        }
+
+    def get_response(self, prompt: str) -> str:
+        """Get the full completion for prompt."""
+        try:
+            completion = self.client.chat.completions.create(**self._request(prompt, stream=False))
+        except APIError as e:
+            raise LLMError(f"Primary LLM request failed: {e}") from e
+        if not completion.choices:
+            raise LLMError("Primary LLM returned no choices.")
+        return completion.choices[0].message.content or ""
+
+    def stream_response(self, prompt: str) -> Iterator[str]:
+        """Yield content deltas as the server sends them."""
+        try:
+            stream = self.client.chat.completions.create(**self._request(prompt, stream=True))
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Returns the connection to the pool even if the caller stops early.
+                stream.close()
+        except APIError as e:
+            raise LLMError(f"Primary LLM stream failed: {e}") from e
+
+    async def aget_response(self, prompt: str) -> str:
+        try:
+            completion = await self.async_client.chat.completions.create(**self._request(prompt, stream=False))
+        except APIError as e:
+            raise LLMError(f"Primary LLM request failed: {e}") from e
+        if not completion.choices:
+            raise LLMError("Primary LLM returned no choices.")
+        return completion.choices[0].message.content or ""
+
+    async def astream_response(self, prompt: str) -> AsyncIterator[str]:
+        try:
+            stream = await self.async_client.chat.completions.create(**self._request(prompt, stream=True))
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+        except APIError as e:
+            raise LLMError(f"Primary LLM stream failed: {e}") from e
+
+    def get_model_name(self) -> str:
+        return self.model
+
+    def _detach(self):
+        with self._lock:
+            client, self._client = self._client, None
+            async_client, self._async_client = self._async_client, None
+        return client, async_client
+
+    def close(self) -> None:
+        """
+        Close both clients.
+
+        The async client is closed on a fresh event loop when none is running;
+        inside a running loop its close is scheduled there (prefer aclose).
+        """
+        client, async_client = self._detach()
+        if client is not None:
+            client.close()
+        if async_client is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                asyncio.run(async_client.close())
+            except RuntimeError as e:
+                # Connections opened on a loop that has since closed cannot be shut down cleanly.
+                logger.warning(f"Primary LLM async client not closed cleanly: {e}")
+        else:
+            loop.create_task(async_client.close())
+
+    async def aclose(self) -> None:
+        """Close both clients from within the event loop the async client ran on."""
+        client, async_client = self._detach()
+        if client is not None:
+            client.close()
+        if async_client is not None:
+            await async_client.close()
@@ -0,0 +1,53 @@
+"""
+Primary LLM provider registry and the configured default instance.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from ..config.settings import settings
+from ..core.exceptions import ConfigurationError
+from .base import BaseLLM
+from .mock_llm import MockLLM
+
+logger = logging.getLogger(__name__)
+
+def _mock_provider() -> BaseLLM:
+    return MockLLM(token_delay=settings.mock_llm_token_delay)
+
+def _openai_provider() -> BaseLLM:
+    # Imported lazily so the mock provider works without the HTTP stack.
+    from .openai_compat import OpenAICompatibleLLM
+    return OpenAICompatibleLLM()
+
+PROVIDERS: Dict[str, Callable[[], BaseLLM]] = {
+    "mock": _mock_provider,
+    "openai": _openai_provider,
+}
+
+def create_llm(provider: Optional[str] = None) -> BaseLLM:
+    """Build a primary LLM by provider name (default: settings.primary_llm_provider)."""
+    name = (provider or settings.primary_llm_provider).lower()
+    factory = PROVIDERS.get(name)
+    if factory is None:
+        raise ConfigurationError(f"Unknown primary LLM provider '{name}'. Available: {sorted(PROVIDERS)}")
+    llm = factory()
+    logger.info(f"Primary LLM provider '{name}' ready ({llm.get_model_name()}).")
+    return llm
+
+_default_llm: Optional[BaseLLM] = None
+_default_llm_lock = threading.Lock()
+
+def get_default_llm() -> BaseLLM:
+    """Return the process-wide configured primary LLM, created on first use."""
+    global _default_llm
+    if _default_llm is None:
+        with _default_llm_lock:
+            if _default_llm is None:
+                _default_llm = create_llm()
+    return _default_llm
+
+def get_llm_response(prompt: str) -> str:
+    """Get a response from the configured primary LLM."""
+    return get_default_llm().get_response(prompt)
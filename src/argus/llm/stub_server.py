@@ -0,0 +1,135 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions server.
+
+Serves MockLLM responses over /v1/chat/completions, with or without SSE
+streaming, so the HTTP provider can be exercised and benchmarked without a
+real model. HTTP/1.1 keep-alive is supported, so connection pooling applies.
+
+Usage: python -m argus.llm.stub_server [--port 8080] [--token-delay 0.02]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+from .mock_llm import MockLLM, split_tokens
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - signature is fixed by the base class
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+        prompt = next(
+            (m.get("content", "") for m in reversed(body.get("messages", [])) if m.get("role") == "user"), ""
+        )
+        model = body.get("model", "stub")
+        time.sleep(self.server.first_token_delay)
+        content = self.server.llm.select_response(prompt)
+        if body.get("stream"):
+            self._stream(model, content)
+        else:
+            self._send_json(200, {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+            })
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _stream(self, model: str, content: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        created = int(time.time())
+        for i, token in enumerate(split_tokens(content)):
+            if i and self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            self._write_chunk(self._event(model, created, {"content": token}, None))
+        self._write_chunk(self._event(model, created, {}, "stop"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def _event(model: str, created: int, delta: dict, finish_reason: Optional[str]) -> bytes:
+        chunk = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n"
+
+class StubServer(ThreadingHTTPServer):
+    """A threaded stand-in server; port 0 picks a free port."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0), token_delay: float = 0.0,
+                 first_token_delay: float = 0.0):
+        super().__init__(address, _Handler)
+        self.llm = MockLLM(latency_range=(0.0, 0.0))
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> threading.Thread:
+        """Serve in a daemon thread and return it."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stand-in server backed by MockLLM.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed tokens")
+    parser.add_argument("--first-token-delay", type=float, default=0.0, help="seconds before the first token")
+    args = parser.parse_args()
+    server = StubServer((args.host, args.port), args.token_delay, args.first_token_delay)
+    print(f"Serving OpenAI-compatible stand-in at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Argus as a local sidecar: a Unix domain socket server and its client.
+"""
+
+from .client import SidecarClient
+from .server import SidecarServer
+
+__all__ = ["SidecarClient", "SidecarServer"]
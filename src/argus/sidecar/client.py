@@ -0,0 +1,164 @@
+"""
+Python client for the Argus sidecar.
+
+One SidecarClient keeps a single connection open and may be shared by
+many threads: each request gets an id, its frame is written under a lock,
+and a reader thread hands every response to the caller waiting for that
+id. Requests are therefore pipelined and may complete out of order. A lost
+connection fails the requests in flight and is reopened on the next call.
+"""
+
+import itertools
+import socket
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config.settings import settings
+from ..core.exceptions import ProtocolError, SidecarError
+from .protocol import (
+    DEFAULT_MAX_FRAME, ERROR, L1_INPUT, L1_OUTPUT, PING, PROCESS, PROCESS_TURN, VIOLATION,
+    decode_response, encode_request, read_frame,
+)
+
+Response = Tuple[int, Optional[str]]
+
+
+class SidecarClient:
+    """Thread-safe client with one reused, pipelined connection."""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 30.0, max_frame: int = DEFAULT_MAX_FRAME):
+        self.path = path or settings.sidecar_socket_path
+        self.timeout = timeout
+        self.max_frame = max_frame
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            raise SidecarError(f"Cannot connect to Argus sidecar at '{self.path}': {e}") from e
+        threading.Thread(target=self._read_loop, args=(sock,), name="argus-sidecar-client", daemon=True).start()
+        return sock
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        reader = sock.makefile("rb")
+        error: Exception = SidecarError("sidecar closed the connection")
+        try:
+            while True:
+                body = read_frame(reader, self.max_frame)
+                if body is None:
+                    break
+                request_id, status, payload = decode_response(body)
+                with self._lock:
+                    future = self._pending.pop(request_id, None)
+                if future is not None:
+                    future.set_result((status, payload))
+        except (OSError, ProtocolError) as e:
+            error = SidecarError(f"sidecar connection lost: {e}")
+        finally:
+            reader.close()
+            with self._lock:
+                if self._sock is sock:
+                    self._sock = None
+                    failed = list(self._pending.values())
+                    self._pending.clear()
+                else:
+                    failed = []
+            sock.close()
+            for future in failed:
+                future.set_exception(error)
+
+    def submit(self, op: int, fields: Sequence[Optional[str]] = (), timeout: Optional[float] = None) -> Future:
+        """Send one request; the future resolves to (status, payload)."""
+        future: Future = Future()
+        # Writes are serialized by _send_lock alone: holding _lock across a
+        # blocking sendall would stop the reader from draining responses.
+        with self._send_lock:
+            with self._lock:
+                if self._sock is None:
+                    self._sock = self._connect()
+                sock = self._sock
+                request_id = next(self._ids) & 0xFFFFFFFF
+                self._pending[request_id] = future
+            try:
+                sock.sendall(encode_request(request_id, op, fields, timeout))
+            except OSError as e:
+                with self._lock:
+                    self._pending.pop(request_id, None)
+                    if self._sock is sock:
+                        self._sock = None
+                sock.close()
+                raise SidecarError(f"sidecar connection lost: {e}") from e
+        return future
+
+    def _result(self, future: Future, wait: Optional[float] = None) -> Response:
+        try:
+            status, payload = future.result(wait or self.timeout)
+        except FutureTimeout as e:
+            raise SidecarError(f"no sidecar response within {wait or self.timeout:.1f}s") from e
+        if status == ERROR:
+            raise SidecarError(payload or "sidecar request failed")
+        return status, payload
+
+    def _check(self, op: int, text: str, tenant_id: Optional[str]) -> Optional[str]:
+        status, payload = self._result(self.submit(op, (text, tenant_id)))
+        return payload if status == VIOLATION else None
+
+    def ping(self) -> str:
+        return self._result(self.submit(PING))[1] or ""
+
+    def check_input(self, text: str, tenant_id: Optional[str] = None) -> Optional[str]:
+        """L1 input filters only; the violation detail, or None if clean."""
+        return self._check(L1_INPUT, text, tenant_id)
+
+    def check_output(self, text: str, tenant_id: Optional[str] = None) -> Optional[str]:
+        """L1 output filters only; the violation detail, or None if clean."""
+        return self._check(L1_OUTPUT, text, tenant_id)
+
+    def check_input_many(self, texts: Sequence[str], tenant_id: Optional[str] = None) -> List[Optional[str]]:
+        """Pipelined L1 input checks: every request is sent before any response is awaited."""
+        futures = [self.submit(L1_INPUT, (text, tenant_id)) for text in texts]
+        results = []
+        for future in futures:
+            status, payload = self._result(future)
+            results.append(payload if status == VIOLATION else None)
+        return results
+
+    def _gateway_wait(self, timeout: Optional[float]) -> float:
+        return self.timeout if timeout is None else max(self.timeout, timeout + 1.0)
+
+    def process_prompt(self, prompt: str, tenant_id: Optional[str] = None, client_id: Optional[str] = None,
+                       lane: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """ArgusGateway.process_prompt in the sidecar."""
+        future = self.submit(PROCESS, (prompt, tenant_id, client_id, lane), timeout)
+        return self._result(future, self._gateway_wait(timeout))[1] or ""
+
+    def process_turn(self, session_id: str, turn: str, tenant_id: Optional[str] = None,
+                     client_id: Optional[str] = None, lane: Optional[str] = None,
+                     timeout: Optional[float] = None) -> str:
+        """ArgusGateway.process_turn in the sidecar."""
+        future = self.submit(PROCESS_TURN, (session_id, turn, tenant_id, client_id, lane), timeout)
+        return self._result(future, self._gateway_wait(timeout))[1] or ""
+
+    def close(self) -> None:
+        with self._lock:
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def __enter__(self) -> "SidecarClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
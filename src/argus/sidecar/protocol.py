@@ -0,0 +1,117 @@
+"""
+Wire format of the Argus sidecar.
+
+Every message is one length-prefixed frame:
+
+    u32 length       bytes after this field
+    u32 request_id   chosen by the client, echoed in the response
+    u8  code         an op in requests, a status in responses
+    f64 timeout      requests only; NaN when unset
+    fields           each u32 byte length + UTF-8, 0xFFFFFFFF for None
+
+All integers are little-endian. Requests on one connection may be
+pipelined; responses carry the request id and may arrive in any order.
+"""
+
+import math
+import struct
+from typing import List, Optional, Sequence, Tuple
+
+from ..core.exceptions import ProtocolError
+
+# Ops: fields in order
+PING = 0          # -
+L1_INPUT = 1      # text, tenant_id
+L1_OUTPUT = 2     # text, tenant_id
+PROCESS = 3       # prompt, tenant_id, client_id, lane
+PROCESS_TURN = 4  # session_id, turn, tenant_id, client_id, lane
+OPS = (PING, L1_INPUT, L1_OUTPUT, PROCESS, PROCESS_TURN)
+
+# Statuses: one field, the violation detail, response text or error message
+OK = 0
+VIOLATION = 1
+ERROR = 2
+
+_LENGTH = struct.Struct("<I")
+_HEAD = struct.Struct("<IB")
+_TIMEOUT = struct.Struct("<d")
+_NONE = 0xFFFFFFFF
+
+DEFAULT_MAX_FRAME = 16 * 1024 * 1024
+
+
+def _pack_fields(fields: Sequence[Optional[str]]) -> bytes:
+    parts = []
+    for field in fields:
+        if field is None:
+            parts.append(_LENGTH.pack(_NONE))
+        else:
+            data = field.encode("utf-8", "surrogatepass")
+            parts.append(_LENGTH.pack(len(data)))
+            parts.append(data)
+    return b"".join(parts)
+
+
+def _unpack_fields(body: bytes, offset: int) -> List[Optional[str]]:
+    fields: List[Optional[str]] = []
+    end = len(body)
+    while offset < end:
+        if offset + 4 > end:
+            raise ProtocolError("truncated field length")
+        (size,) = _LENGTH.unpack_from(body, offset)
+        offset += 4
+        if size == _NONE:
+            fields.append(None)
+            continue
+        if offset + size > end:
+            raise ProtocolError("truncated field")
+        fields.append(body[offset:offset + size].decode("utf-8", "surrogatepass"))
+        offset += size
+    return fields
+
+
+def encode_request(request_id: int, op: int, fields: Sequence[Optional[str]] = (),
+                   timeout: Optional[float] = None) -> bytes:
+    body = _HEAD.pack(request_id, op) + _TIMEOUT.pack(math.nan if timeout is None else timeout)
+    body += _pack_fields(fields)
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_request(body: bytes) -> Tuple[int, int, Optional[float], List[Optional[str]]]:
+    """(request_id, op, timeout, fields) from a frame body (the bytes after the length)."""
+    if len(body) < _HEAD.size + _TIMEOUT.size:
+        raise ProtocolError("request frame too short")
+    request_id, op = _HEAD.unpack_from(body, 0)
+    (timeout,) = _TIMEOUT.unpack_from(body, _HEAD.size)
+    fields = _unpack_fields(body, _HEAD.size + _TIMEOUT.size)
+    return request_id, op, None if math.isnan(timeout) else timeout, fields
+
+
+def encode_response(request_id: int, status: int, payload: Optional[str] = None) -> bytes:
+    body = _HEAD.pack(request_id, status) + _pack_fields((payload,))
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_response(body: bytes) -> Tuple[int, int, Optional[str]]:
+    """(request_id, status, payload) from a frame body."""
+    if len(body) < _HEAD.size:
+        raise ProtocolError("response frame too short")
+    request_id, status = _HEAD.unpack_from(body, 0)
+    fields = _unpack_fields(body, _HEAD.size)
+    return request_id, status, fields[0] if fields else None
+
+
+def read_frame(stream, max_frame: int = DEFAULT_MAX_FRAME) -> Optional[bytes]:
+    """Read one frame body from a binary file-like stream; None at a clean end of stream."""
+    head = stream.read(_LENGTH.size)
+    if not head:
+        return None
+    if len(head) < _LENGTH.size:
+        raise ProtocolError("connection closed inside a frame")
+    (length,) = _LENGTH.unpack(head)
+    if length > max_frame:
+        raise ProtocolError(f"frame of {length} bytes exceeds the {max_frame} byte limit")
+    body = stream.read(length)
+    if len(body) < length:
+        raise ProtocolError("connection closed inside a frame")
+    return body
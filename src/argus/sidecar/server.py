@@ -0,0 +1,194 @@
+"""
+Sidecar server: the gateway and standalone L1 checks over a Unix domain socket.
+
+Each connection gets a thread that reads frames (see protocol.py). Pings
+and L1 checks are answered inline, in order, on that thread. Gateway calls
+run on a shared worker pool and are answered when they finish, so a slow
+LLM call never holds up L1 checks pipelined behind it on the same
+connection.
+"""
+
+import logging
+import os
+import socket
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Set
+
+from ..config.settings import settings
+from ..core.exceptions import ConfigurationError, ProtocolError
+from ..core.gateway import ArgusGateway
+from .protocol import (
+    ERROR, L1_INPUT, L1_OUTPUT, OK, PING, PROCESS, PROCESS_TURN, VIOLATION,
+    decode_request, encode_response, read_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[bytes], None]
+
+
+def _fields(fields: List[Optional[str]], count: int) -> List[Optional[str]]:
+    return (fields + [None] * count)[:count]
+
+
+def _require(value: Optional[str], name: str) -> str:
+    if value is None:
+        raise ValueError(f"missing {name}")
+    return value
+
+
+class SidecarServer:
+    """Serves one ArgusGateway to local clients over a Unix domain socket."""
+
+    def __init__(self, path: Optional[str] = None, gateway: Optional[ArgusGateway] = None,
+                 workers: Optional[int] = None, max_frame: Optional[int] = None):
+        self.path = path or settings.sidecar_socket_path
+        self.gateway = gateway or ArgusGateway()
+        self.max_frame = max_frame or settings.sidecar_max_frame_bytes
+        self._executor = ThreadPoolExecutor(workers or settings.sidecar_workers, thread_name_prefix="argus-sidecar")
+        self._sock: Optional[socket.socket] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._connections: Set[socket.socket] = set()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def _remove_stale_socket(self) -> None:
+        try:
+            mode = os.stat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise ConfigurationError(f"Sidecar path '{self.path}' exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise ConfigurationError(f"Another sidecar is already listening on '{self.path}'")
+
+    def start(self) -> "SidecarServer":
+        """Bind the socket and accept connections on a background thread."""
+        self._remove_stale_socket()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        # Owner and group only: the socket is the sidecar's whole access control.
+        os.chmod(self.path, 0o660)
+        sock.listen(128)
+        self._sock = sock
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="argus-sidecar-accept", daemon=True)
+        self._accept_thread.start()
+        logger.info(f"Argus sidecar listening on {self.path}.")
+        return self
+
+    def serve_forever(self) -> None:
+        if self._sock is None:
+            self.start()
+        self._closed.wait()
+
+    def close(self) -> None:
+        """Stop accepting, drop open connections and remove the socket file."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._sock is not None:
+            self._sock.close()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._executor.shutdown(wait=False)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _accept_loop(self) -> None:
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            with self._lock:
+                self._connections.add(conn)
+            threading.Thread(target=self._serve_connection, args=(conn,), name="argus-sidecar-conn",
+                             daemon=True).start()
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        reader = conn.makefile("rb")
+        write_lock = threading.Lock()
+
+        def send(frame: bytes) -> None:
+            with write_lock:
+                conn.sendall(frame)
+
+        try:
+            while True:
+                body = read_frame(reader, self.max_frame)
+                if body is None:
+                    break
+                self._dispatch(body, send)
+        except ProtocolError as e:
+            logger.warning(f"Closing sidecar connection: {e}.")
+        except OSError as e:
+            if not self._closed.is_set():
+                logger.debug(f"Sidecar connection lost: {e}")
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            reader.close()
+            conn.close()
+
+    def _dispatch(self, body: bytes, send: Send) -> None:
+        request_id, op, timeout, fields = decode_request(body)
+        if op in (PROCESS, PROCESS_TURN):
+            try:
+                self._executor.submit(self._answer_later, request_id, op, timeout, fields, send)
+            except RuntimeError:  # shutting down
+                send(encode_response(request_id, ERROR, "sidecar is shutting down"))
+        else:
+            send(self.answer(request_id, op, timeout, fields))
+
+    def _answer_later(self, request_id: int, op: int, timeout: Optional[float], fields: List[Optional[str]],
+                      send: Send) -> None:
+        frame = self.answer(request_id, op, timeout, fields)
+        try:
+            send(frame)
+        except OSError as e:
+            logger.debug(f"Sidecar client left before response {request_id}: {e}")
+
+    def answer(self, request_id: int, op: int, timeout: Optional[float], fields: List[Optional[str]]) -> bytes:
+        """The response frame for one decoded request."""
+        try:
+            if op == PING:
+                return encode_response(request_id, OK, "pong")
+            if op in (L1_INPUT, L1_OUTPUT):
+                text, tenant_id = _fields(fields, 2)
+                engine = self.gateway.policies.engine_for(tenant_id)
+                pipeline = engine.input_pipeline if op == L1_INPUT else engine.output_pipeline
+                result = pipeline.run(_require(text, "text"))
+                if result.passed:
+                    return encode_response(request_id, OK)
+                return encode_response(request_id, VIOLATION, result.violation_detail)
+            if op == PROCESS:
+                prompt, tenant_id, client_id, lane = _fields(fields, 4)
+                text = self.gateway.process_prompt(_require(prompt, "prompt"), tenant_id=tenant_id, lane=lane,
+                                                   timeout=timeout, client_id=client_id)
+                return encode_response(request_id, OK, text)
+            if op == PROCESS_TURN:
+                session_id, turn, tenant_id, client_id, lane = _fields(fields, 5)
+                text = self.gateway.process_turn(_require(session_id, "session_id"), _require(turn, "turn"),
+                                                 tenant_id=tenant_id, lane=lane, timeout=timeout,
+                                                 client_id=client_id)
+                return encode_response(request_id, OK, text)
+            return encode_response(request_id, ERROR, f"unknown op {op}")
+        except Exception as e:
+            logger.error(f"Sidecar request {request_id} (op {op}) failed: {e}", exc_info=True)
+            return encode_response(request_id, ERROR, f"{type(e).__name__}: {e}")
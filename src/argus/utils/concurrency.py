@@ -0,0 +1,101 @@
+"""
+Concurrency helpers shared by the gateway core.
+
+The gateway is called from many threads at once. Shared objects (compiled
+rules, pipelines, policy engines) are built once and never mutated, so
+readers need no locks; what does change at runtime is either guarded by a
+lock or, for statistics on hot paths, kept in a ShardedCounter. On
+free-threaded CPython builds (3.13t and later) that is enough for CPU-bound
+L1 work on threads to run on every core.
+"""
+
+import sys
+import threading
+import weakref
+from typing import List
+
+# Executor modes for CPU-bound L1 work (see default_executor_mode).
+THREAD = "thread"
+PROCESS = "process"
+AUTO = "auto"
+EXECUTOR_MODES = (AUTO, THREAD, PROCESS)
+
+
+def gil_enabled() -> bool:
+    """False only on a free-threaded build running with the GIL disabled."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def default_executor_mode(mode: str = AUTO) -> str:
+    """Resolve 'auto': threads when they can use every core, otherwise processes."""
+    if mode == AUTO:
+        return PROCESS if gil_enabled() else THREAD
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(f"Unknown executor mode '{mode}'; expected one of {', '.join(EXECUTOR_MODES)}")
+    return mode
+
+
+class _Cell:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+class _Owner:
+    """Held only by a thread's locals, so it is collected when the thread exits."""
+    __slots__ = ("__weakref__",)
+
+
+class ShardedCounter:
+    """
+    A counter many threads can increment without contending on a lock.
+
+    Each thread adds to its own cell; reading sums the cells. Only the
+    first increment from a new thread takes the lock. When a thread exits
+    its cell is folded into a base value, so short-lived threads do not
+    leave cells behind.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells: List[_Cell] = []
+        self._base = 0
+        self._lock = threading.Lock()
+
+    def add(self, amount: int = 1) -> None:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._register()
+        cell.value += amount
+
+    def _register(self) -> _Cell:
+        cell = _Cell()
+        with self._lock:
+            self._cells.append(cell)
+        owner = _Owner()
+        weakref.finalize(owner, ShardedCounter._retire, weakref.ref(self), cell)
+        self._local.owner = owner
+        self._local.cell = cell
+        return cell
+
+    @staticmethod
+    def _retire(counter_ref: "weakref.ref[ShardedCounter]", cell: _Cell) -> None:
+        counter = counter_ref()
+        if counter is not None:
+            with counter._lock:
+                counter._base += cell.value
+                counter._cells.remove(cell)
+
+    @property
+    def value(self) -> int:
+        with self._lock:
+            return self._base + sum(cell.value for cell in self._cells)
+
+    def __int__(self) -> int:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"ShardedCounter({self.value})"
+
@@ -4,35 +4,51 @@ Structured logging utilities.
 
 import logging
 import sys
-from typing import Optional
+import threading
+from typing import Optional, TextIO
 from ..config.settings import settings
 
+_setup_lock = threading.Lock()
+_configured = False
+
 def setup_logging(
     level: Optional[str] = None,
     format_string: Optional[str] = None,
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    stream: Optional[TextIO] = None,
 ) -> None:
-    """Setup structured logging configuration."""
-    
-    log_level = level or settings.log_level
-    log_format = format_string or settings.log_format
+    """Setup structured logging configuration.
     
-    # Configure basic logging
-    handlers = [logging.StreamHandler(sys.stdout)]
+    The root logger is configured once per process; later calls (from
+    another entry point or thread) only adjust the level.
+    """
+    global _configured
     
-    if log_file:
-        handlers.append(logging.FileHandler(log_file))
-    
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format=log_format,
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=handlers
-    )
+    log_level = getattr(logging, (level or settings.log_level).upper())
+    log_format = format_string or settings.log_format
     
-    # Set specific loggers
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.WARNING)
+    with _setup_lock:
+        if _configured:
+            logging.getLogger().setLevel(log_level)
+            return
+        
+        # Configure basic logging
+        handlers = [logging.StreamHandler(stream or sys.stdout)]
+        
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        
+        logging.basicConfig(
+            level=log_level,
+            format=log_format,
+            datefmt='%Y-%m-%d %H:%M:%S',
+            handlers=handlers
+        )
+        
+        # Set specific loggers
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        logging.getLogger("openai").setLevel(logging.WARNING)
+        _configured = True
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name."""
@@ -0,0 +1,359 @@
+"""
+Lightweight per-request tracing with batched, pluggable exporters.
+
+A trace starts at the gateway (Tracer.start_trace) and every stage opens a
+child with span(name). The current span lives in a context variable, so
+nothing has to be threaded through call signatures. Unsampled requests get a
+shared no-op span, which keeps the cost of instrumentation to one context
+variable lookup per stage. Finished spans are queued to a background thread
+that exports them in batches, off the request path.
+"""
+
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings
+from .concurrency import ShardedCounter
+
+logger = logging.getLogger(__name__)
+
+_current_span: "ContextVar[Optional[Span]]" = ContextVar("argus_current_span", default=None)
+
+
+# W3C trace context and OTLP both carry a trace ID as 16 bytes, not all zero.
+_TRACE_ID = re.compile(r"(?!0{32})[0-9a-f]{32}")
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """One timed operation within a trace. Use as a context manager."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+        "attributes", "status", "_processor", "_token",
+    )
+
+    def __init__(self, processor, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self._processor = processor
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.status = "error"
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self._processor.on_end(self)
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in for unsampled or untraced work; every method does nothing."""
+
+    __slots__ = ()
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes: Any):
+    """Open a child of the current span, or a no-op span outside a sampled trace."""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent._processor, name, parent.trace_id, parent.span_id, attributes)
+
+
+def current_trace_id() -> Optional[str]:
+    parent = _current_span.get()
+    return parent.trace_id if parent is not None else None
+
+
+class SpanExporter(ABC):
+    """Receives batches of finished spans."""
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Send one batch of finished spans."""
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps exported spans in a list; for tests and ad-hoc debugging."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JsonlFileExporter(SpanExporter):
+    """Appends one JSON object per span to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: List[Span]) -> None:
+        self._file.write("".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OTLPHttpExporter(SpanExporter):
+    """Posts spans as OTLP/JSON to a collector, e.g. http://localhost:4318/v1/traces."""
+
+    def __init__(self, endpoint: str, service_name: str = "argus-gateway", timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "argus"},
+                "spans": [{
+                    "traceId": s.trace_id,
+                    "spanId": s.span_id,
+                    "parentSpanId": s.parent_id or "",
+                    "name": s.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(s.start_ns),
+                    "endTimeUnixNano": str(s.end_ns),
+                    "attributes": [self._attribute(k, v) for k, v in s.attributes.items()],
+                    "status": {"code": 2 if s.status == "error" else 1},
+                } for s in spans],
+            }],
+        }]}
+
+    def export(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self._payload(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class BatchSpanProcessor:
+    """
+    Queues finished spans and exports them in batches from a daemon thread.
+
+    When the queue is full, spans are dropped and counted rather than
+    blocking the request.
+    """
+
+    def __init__(self, exporter: SpanExporter, max_queue: int = 4096, batch_size: int = 256,
+                 interval: float = 1.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        # Spans are dropped from request threads and the export thread alike.
+        self._dropped = ShardedCounter()
+        self.exported = 0
+        self._queue: "queue.Queue" = queue.Queue(max_queue)
+        self._stop_marker: Optional[threading.Event] = None
+        self._thread = threading.Thread(target=self._run, name="argus-span-export", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self._dropped.add()
+
+    def _export(self, batch: List[Span]) -> None:
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self._dropped.add(len(batch))
+            logger.warning(f"Span export failed ({type(e).__name__}: {e}); dropped {len(batch)} spans.")
+
+    def _run(self) -> None:
+        batch: List[Span] = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                self._export(batch)
+                batch = []
+                continue
+            if isinstance(item, threading.Event):
+                # Flush or shutdown marker.
+                self._export(batch)
+                batch = []
+                item.set()
+                if item is self._stop_marker:
+                    return
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._export(batch)
+                batch = []
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped.value
+
+    def force_flush(self, timeout: float = 5.0) -> bool:
+        """Export everything queued so far; returns False on timeout."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._stop_marker = threading.Event()
+        self._queue.put(self._stop_marker)
+        self._stop_marker.wait(timeout)
+        self.exporter.shutdown()
+
+
+class Tracer:
+    """Starts sampled traces; a Tracer without a processor never records."""
+
+    def __init__(self, processor: Optional[BatchSpanProcessor] = None, sample_rate: float = 1.0):
+        self.processor = processor
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    def start_trace(
+        self, name: str, trace_id: Optional[str] = None, force: bool = False, **attributes: Any
+    ):
+        """
+        Open the root span of a request.
+
+        sample_rate applies to every request, including one that continues an
+        upstream trace_id; force=True records it regardless, so a specific
+        slow request can be traced on demand. A trace_id that is not 32 hex
+        digits is replaced with a new one.
+        """
+        if self.processor is None:
+            return NOOP_SPAN
+        if not force and random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        if trace_id is not None:
+            trace_id = trace_id.lower()
+            if not _TRACE_ID.fullmatch(trace_id):
+                logger.warning(f"Ignoring malformed trace ID '{trace_id[:64]}'; starting a new trace.")
+                trace_id = None
+        if trace_id is None:
+            trace_id = _new_id(128)
+        return Span(self.processor, name, trace_id, None, attributes)
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+def create_exporter(kind: str) -> SpanExporter:
+    if kind == "memory":
+        return InMemoryExporter()
+    if kind == "jsonl":
+        return JsonlFileExporter(settings.tracing_jsonl_path)
+    if kind == "otlp":
+        return OTLPHttpExporter(settings.tracing_otlp_endpoint)
+    raise ValueError(f"Unknown tracing exporter: '{kind}'")
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer configured from settings."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                if settings.tracing_enabled:
+                    processor = BatchSpanProcessor(create_exporter(settings.tracing_exporter))
+                    _tracer = Tracer(processor, settings.tracing_sample_rate)
+                else:
+                    _tracer = Tracer()
+    return _tracer
@@ -0,0 +1,147 @@
+"""
+Tests for admission control and priority lanes.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.argus.core.admission import AdmissionControl, AdmissionController, Lane
+from src.argus.core.exceptions import ConfigurationError, OverloadedError
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.policy import PolicyProfile, PolicyRegistry
+from src.argus.llm.mock_llm import MockLLM
+
+LANES = {
+    "interactive": Lane("interactive", priority=0, max_queue=8, max_wait=5.0),
+    "batch": Lane("batch", priority=10, max_queue=2, max_share=0.5, max_wait=5.0),
+}
+
+class TestAdmissionController(unittest.TestCase):
+    """Test cases for AdmissionController."""
+
+    def setUp(self):
+        self.controller = AdmissionController("primary_llm", 2, LANES)
+
+    def _wait_queued(self, lane, count):
+        deadline = time.monotonic() + 5
+        while self.controller.stats()["queued"][lane] < count and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def test_interactive_served_before_earlier_batch(self):
+        """Test that a freed slot goes to the higher-priority lane first."""
+        first = self.controller.acquire("interactive")
+        second = self.controller.acquire("interactive")
+        order = []
+
+        def worker(lane):
+            self.controller.acquire(lane)
+            order.append(lane)
+
+        batch = threading.Thread(target=worker, args=("batch",))
+        batch.start()
+        self._wait_queued("batch", 1)
+        interactive = threading.Thread(target=worker, args=("interactive",))
+        interactive.start()
+        self._wait_queued("interactive", 1)
+        self.controller.release(first, 0.01)
+        interactive.join(5)
+        self.assertEqual(order, ["interactive"])
+        self.assertEqual(self.controller.stats()["queued"]["batch"], 1)
+        self.controller.release(second, 0.01)
+        batch.join(5)
+        self.assertEqual(order, ["interactive", "batch"])
+
+    def test_batch_share_is_capped(self):
+        """Test that batch cannot hold more than its share of slots."""
+        held = self.controller.acquire("batch")
+        with self.assertRaises(OverloadedError) as ctx:
+            self.controller.acquire("batch", budget=0.01)
+        self.assertEqual(ctx.exception.reason, "timeout")
+        self.controller.acquire("interactive", budget=0)
+        self.controller.release(held, 0.01)
+
+    def test_full_queue_and_predicted_wait_are_shed_fast(self):
+        """Test fast rejection when the lane queue is full or the wait is too long."""
+        self.controller.service_time = 1.0
+        held = [self.controller.acquire("interactive") for _ in range(2)]
+        with self.assertRaises(OverloadedError) as ctx:
+            self.controller.acquire("interactive", budget=0.1)
+        self.assertEqual(ctx.exception.reason, "predicted_wait")
+
+        waiters = [threading.Thread(target=self._try_acquire, args=("batch",)) for _ in range(2)]
+        for t in waiters:
+            t.start()
+        self._wait_queued("batch", 2)
+        start = time.monotonic()
+        with self.assertRaises(OverloadedError) as ctx:
+            self.controller.acquire("batch")
+        self.assertEqual(ctx.exception.reason, "queue_full")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(self.controller.stats()["shed"], {"interactive": 1, "batch": 1})
+        for lane in held:
+            self.controller.release(lane, 1.0)
+        for t in waiters:
+            t.join(5)
+
+    def _try_acquire(self, lane):
+        self.controller.release(self.controller.acquire(lane), 0.0)
+
+class _SlowLLM(MockLLM):
+    def __init__(self, release):
+        super().__init__(latency_range=(0.0, 0.0))
+        self.release = release
+
+    def get_response(self, prompt):
+        self.release.wait(5)
+        return "ok"
+
+@patch('src.argus.core.gateway.analyze_response_with_guard',
+       return_value={'status': 'success', 'decision': 'CLEAN', 'reason': None})
+class TestGatewayAdmission(unittest.TestCase):
+    """Test cases for admission control in ArgusGateway."""
+
+    def test_overload_is_a_clear_rejection(self, _):
+        """Test that a shed request returns an overload message and is counted."""
+        release = threading.Event()
+        admission = AdmissionControl({"primary_llm": 1, "l2_guard": 1}, LANES, "interactive")
+        gateway = ArgusGateway(llm=_SlowLLM(release), admission=admission)
+        gateway.singleflight = None
+        busy = threading.Thread(target=gateway.process_prompt, args=("TEST::safe::first",))
+        busy.start()
+        while admission.stats()["primary_llm"]["in_flight"] == 0:
+            time.sleep(0.001)
+        result = gateway.process_prompt("TEST::safe::second", lane="batch", timeout=0.05)
+        release.set()
+        busy.join(5)
+        self.assertIn("overloaded (primary_llm, timeout)", result)
+        self.assertEqual(admission.stats()["primary_llm"]["shed"]["batch"], 1)
+        self.assertEqual(admission.stats()["l2_guard"]["admitted"]["interactive"], 1)
+
+    def test_unknown_lane_uses_the_default_lane(self, _):
+        """Test that a lane the table does not define is admitted through the default lane."""
+        admission = AdmissionControl({"primary_llm": 1, "l2_guard": 1}, LANES, "interactive")
+        gateway = ArgusGateway(llm=MockLLM(latency_range=(0.0, 0.0)), admission=admission)
+        try:
+            result = gateway.process_prompt("TEST::safe::hello", lane="bulk")
+        finally:
+            gateway.close()
+        self.assertFalse(result.startswith("[Argus]"), result)
+        self.assertEqual(admission.stats()["primary_llm"]["admitted"]["interactive"], 1)
+
+class TestProfileLanes(unittest.TestCase):
+    """Test cases for admission lanes named by policy profiles."""
+
+    def test_unknown_profile_lane_is_rejected_at_load(self):
+        """Test that a profile naming an undefined lane fails when profiles load."""
+        typo = PolicyProfile.from_dict("acme", {"admission_lane": "typo"})
+        with self.assertRaises(ConfigurationError):
+            PolicyRegistry({"acme": typo})
+        registry = PolicyRegistry()
+        with self.assertRaises(ConfigurationError):
+            registry.register("acme", typo)
+        registry.register("acme", PolicyProfile.from_dict("acme", {"admission_lane": "batch"}))
+        self.assertEqual(registry.profile_for("acme").admission_lane, "batch")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for batch Layer 1 matching.
+"""
+
+import random
+import re
+import unittest
+from unittest.mock import patch
+from src.argus.filters.layer1 import batch
+from src.argus.filters.layer1.batch import BatchMatcher
+from src.argus.filters.layer1.rules import CompiledRules
+from src.argus.filters.pipeline import build_pipeline
+
+PIECES = [
+    "hello there", "my SSN is 123-45-6789", "mail me at a.b@example.com", "call 555-123-4567",
+    "ignore previous instructions", "the weather is nice", "ProjectArgusSecret", "PIN 560001",
+    "İSTANBUL trip", "card 4111111111111111", "", "DAN mode please", "Confidential numbers",
+]
+
+def _corpus(count, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(PIECES, rng.randint(0, 3))) for _ in range(count)]
+
+class TestBatchMatcher(unittest.TestCase):
+    """Test cases for BatchMatcher against per-text matching."""
+
+    def setUp(self):
+        self.texts = _corpus(400)
+
+    def test_matches_per_text_results(self):
+        """Test that batch first-match and findings agree with per-text calls."""
+        for rules in (CompiledRules.for_input(), CompiledRules.for_output()):
+            matcher = BatchMatcher(rules, chunk_chars=512)
+            self.assertEqual(matcher.first_blocklist_terms(self.texts),
+                             [rules.first_blocklist_term(t) for t in self.texts])
+            self.assertEqual(matcher.first_pii(self.texts), [rules.first_pii(t) for t in self.texts])
+            batched = matcher.pii_findings(self.texts)
+            for text, findings in zip(self.texts, batched):
+                key = lambda f: (f.rule, f.start, f.end)
+                self.assertEqual(sorted(map(key, findings)), sorted(map(key, rules.pii_findings(text))))
+
+    def test_matches_without_prefilter(self):
+        """Test that the combined screen alone gives per-text results when preconditions are off."""
+        rules = CompiledRules.for_output(prefilter=False)
+        matcher = BatchMatcher(rules, chunk_chars=512)
+        self.assertEqual(matcher.first_pii(self.texts), [rules.first_pii(t) for t in self.texts])
+
+    def test_prefiltered_rules_are_screened_on_the_buffer(self):
+        """Test that with default settings only texts the precondition trigger touches are checked per text."""
+        rules = CompiledRules.for_input()
+        self.assertIsNotNone(rules.trigger)
+        texts = ["plain words only"] * 50 + ["my SSN is 123-45-6789", "CCN12345 here", "İSTANBUL trip"]
+        matcher = BatchMatcher(rules)
+        with patch.object(rules, "applicable_rules", wraps=rules.applicable_rules) as applicable:
+            found = matcher.first_pii(texts)
+        self.assertEqual(sorted(call.args[0] for call in applicable.call_args_list), sorted(texts[50:]))
+        self.assertEqual([r and r.name for r in found[49:52]], [None, "SSN", "CCN_REFERENCE"])
+
+    def test_matches_across_separator_are_rechecked(self):
+        """Test that a match spanning two texts is dropped and hidden matches are recovered."""
+        rules = CompiledRules([], [re.compile(r"..b")], ["DOTS"])
+        matcher = BatchMatcher(rules)
+        self.assertEqual([r and r.name for r in matcher.first_pii(["x", "ab", "xab"])], [None, None, "DOTS"])
+        rules = CompiledRules([], [re.compile(r".b")], ["DOT"])
+        self.assertEqual([len(f) for f in BatchMatcher(rules).pii_findings(["x", "bb"])], [0, 1])
+
+    def test_anchored_rules_run_per_text(self):
+        """Test that rules anchored to the string start are not run on the buffer."""
+        rules = CompiledRules([], [re.compile(r"^id\d+")], ["ANCHORED"])
+        self.assertFalse(batch.batch_safe(rules.pii_rules[0]))
+        found = BatchMatcher(rules).first_pii(["id1", "x id2", "id3"])
+        self.assertEqual([r is not None for r in found], [True, False, True])
+
+    def test_pipeline_run_batch(self):
+        """Test that Pipeline.run_batch returns what run() returns per text."""
+        for stages, rules in ((["input_blocklist", "input_pii"], CompiledRules.for_input()),
+                              (["output_blocklist", "output_pii"], CompiledRules.for_output())):
+            pipeline = build_pipeline(stages, rules)
+            self.assertEqual(pipeline.run_batch(self.texts), [pipeline.run(t) for t in self.texts])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+Tests for request coalescing and the gateway result cache.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.argus.core.cache import ResultCache, SingleFlight, cache_key
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.policy import PolicyProfile, PolicyRegistry
+from src.argus.llm.mock_llm import MockLLM
+
+CLEAN = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+
+class _CountingLLM(MockLLM):
+    def __init__(self, delay=0.0):
+        super().__init__(latency_range=(delay, delay))
+        self.calls = 0
+
+    def get_response(self, prompt):
+        self.calls += 1
+        return super().get_response(prompt)
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_callers_share_one_execution(self):
+        """Test that concurrent calls for one key run the function once."""
+        flight = SingleFlight()
+        release = threading.Event()
+        results = []
+
+        def slow():
+            release.wait(5)
+            return "done"
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        while flight.executions + flight.coalesced < 8:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["done"] * 8)
+        self.assertEqual((flight.executions, flight.coalesced, flight.in_flight), (1, 7, 0))
+
+    def test_errors_propagate_and_do_not_stick(self):
+        """Test that a failed call raises for its caller and the next call runs again."""
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+        self.assertEqual(flight.do("k", lambda: "ok"), "ok")
+
+    def test_unshared_results_and_timeouts_run_their_own(self):
+        """Test that followers run fn themselves after timeout or when the result is not for sharing."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def leader():
+            calls.append("leader")
+            release.wait(5)
+            return "overloaded"
+
+        thread = threading.Thread(target=lambda: flight.do("k", leader, share=lambda r: r != "overloaded"))
+        thread.start()
+        while flight.in_flight == 0:
+            time.sleep(0.001)
+        self.assertEqual(flight.do("k", lambda: "own", timeout=0.05), "own")
+        waiting = []
+        follower = threading.Thread(target=lambda: waiting.append(flight.do("k", lambda: "retried")))
+        follower.start()
+        while flight.coalesced == 0:
+            time.sleep(0.001)
+        release.set()
+        thread.join()
+        follower.join()
+        self.assertEqual(waiting, ["retried"])
+        self.assertEqual((flight.executions, flight.coalesced), (3, 0))
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache and keys."""
+
+    def test_entries_expire(self):
+        """Test per-entry TTL and LRU bound."""
+        now = [0.0]
+        cache = ResultCache(max_entries=2, clock=lambda: now[0])
+        cache.put("a", "A", ttl=10)
+        cache.put("b", "B", ttl=1)
+        now[0] = 5
+        self.assertEqual(cache.get("a"), "A")
+        self.assertIsNone(cache.get("b"))
+        cache.put("c", "C", ttl=10)
+        cache.put("d", "D", ttl=10)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 2)
+
+    def test_key_is_exact_prompt_and_policy(self):
+        """Test that keys differ by policy version and by any change to the prompt."""
+        self.assertEqual(cache_key("p1", "hello world"), cache_key("p1", "hello world"))
+        self.assertNotEqual(cache_key("p1", "  hello \n world "), cache_key("p1", "hello world"))
+        self.assertNotEqual(cache_key("p1", "cafe\u0301"), cache_key("p1", "caf\u00e9"))
+        self.assertNotEqual(cache_key("p1", "hello"), cache_key("p2", "hello"))
+
+class TestGatewayCaching(unittest.TestCase):
+    """Test cases for gateway-level coalescing and caching."""
+
+    def setUp(self):
+        self.registry = PolicyRegistry({
+            "live": PolicyProfile.from_dict("live", {"result_cache_ttl": 0}),
+        })
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_repeats_served_from_cache(self, mock_guard):
+        """Test that a repeat prompt skips both LLM calls, unless the policy disables caching."""
+        mock_guard.return_value = CLEAN
+        llm = _CountingLLM()
+        gateway = ArgusGateway(policies=self.registry, llm=llm, result_cache=ResultCache(100))
+        prompt = "TEST::safe::How does support work?"
+        first = gateway.process_prompt(prompt)
+        self.assertEqual(gateway.process_prompt(prompt), first)
+        self.assertEqual((llm.calls, mock_guard.call_count), (1, 1))
+
+        gateway.process_prompt(prompt, tenant_id="live")
+        gateway.process_prompt(prompt, tenant_id="live")
+        self.assertEqual(llm.calls, 3)
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_whitespace_variant_does_not_share_a_verdict(self, mock_guard):
+        """Test that a prompt L1 blocks is not served the cached result of a spelling L1 passes."""
+        mock_guard.return_value = CLEAN
+        gateway = ArgusGateway(policies=self.registry, llm=_CountingLLM(), result_cache=ResultCache(100))
+        self.assertFalse(gateway.process_prompt("id 2345  6789 1234 please").startswith("[Argus]"))
+        self.assertTrue(gateway.process_prompt("id 2345 6789 1234 please").startswith("[Argus]"))
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_guard_errors_are_not_cached(self, mock_guard):
+        """Test that transient guard errors are retried on the next request."""
+        mock_guard.return_value = {'status': 'error', 'decision': 'ERROR', 'reason': 'timeout'}
+        llm = _CountingLLM()
+        gateway = ArgusGateway(policies=self.registry, llm=llm, result_cache=ResultCache(100))
+        gateway.process_prompt("TEST::safe::hi")
+        gateway.process_prompt("TEST::safe::hi")
+        self.assertEqual(llm.calls, 2)
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_burst_is_coalesced(self, mock_guard):
+        """Test that a burst of identical prompts makes one upstream call."""
+        mock_guard.return_value = CLEAN
+        llm = _CountingLLM(delay=0.2)
+        gateway = ArgusGateway(policies=self.registry, llm=llm)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(gateway.process_prompt("TEST::safe::burst")))
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(llm.calls, 1)
+
+    def _burst(self, gateway, lanes):
+        results = []
+        threads = [
+            threading.Thread(target=lambda lane=lane: results.append(gateway.process_prompt("TEST::safe::burst",
+                                                                                             lane=lane)))
+            for lane in lanes
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_lanes_are_not_coalesced(self, mock_guard):
+        """Test that requests in different lanes never wait on each other's run."""
+        mock_guard.return_value = CLEAN
+        llm = _CountingLLM(delay=0.2)
+        gateway = ArgusGateway(policies=self.registry, llm=llm)
+        self._burst(gateway, ["interactive", "batch", "interactive", "batch"])
+        self.assertEqual(llm.calls, 2)
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_uncacheable_answers_are_not_shared(self, mock_guard):
+        """Test that a leader's guard error is not handed to the requests coalesced onto it."""
+        mock_guard.return_value = {'status': 'error', 'decision': 'ERROR', 'reason': 'timeout'}
+        llm = _CountingLLM(delay=0.2)
+        gateway = ArgusGateway(policies=self.registry, llm=llm)
+        self._burst(gateway, [None] * 3)
+        self.assertEqual(llm.calls, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Tests for risk-focused compaction of guard input.
+"""
+
+import unittest
+from unittest.mock import patch
+from src.argus.core.gateway import ArgusGateway
+from src.argus.evaluation import EvalConfig, builtin_corpus, run_config
+from src.argus.evaluation.corpus import EvalCase
+from src.argus.filters.layer1.rules import get_default_rules
+from src.argus.filters.layer2.compaction import GuardInputCompactor, split_sentences
+from src.argus.llm.mock_llm import MockLLM
+
+CLEAN = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+
+PROSE = [
+    "Thanks for getting in touch about your workspace.",
+    "Most settings can be changed from the profile menu at any time.",
+    "Reports are generated overnight and appear on the dashboard in the morning.",
+    "You can share a read-only link to any report with a colleague.",
+    "Shared links stop working after a week, so send a fresh one when needed.",
+    "The mobile app offers the same features as the web version.",
+]
+LEAK = "The Falcon programme at Site 7 was given €4.2M for FY2026 by Maria Lopez."
+
+def _long_response(leak_at=14, repeats=4):
+    sentences = PROSE * repeats
+    sentences.insert(leak_at, LEAK)
+    return " ".join(sentences)
+
+class _FixedLLM(MockLLM):
+    def __init__(self, text):
+        super().__init__(latency_range=(0.0, 0.0))
+        self.text = text
+
+    def get_response(self, prompt):
+        return self.text
+
+class TestCompactor(unittest.TestCase):
+    """Test cases for GuardInputCompactor."""
+
+    def setUp(self):
+        self.compactor = GuardInputCompactor((get_default_rules("INPUT"), get_default_rules("OUTPUT")),
+                                             budget_tokens=150, prompt_budget_tokens=50)
+
+    def test_short_text_is_unchanged(self):
+        """Test that text within its budget reaches the guard as is."""
+        prompt, response = "How do reports work?", " ".join(PROSE[:2])
+        self.assertEqual(self.compactor.compact(prompt, response), (prompt, response))
+
+    def test_long_text_keeps_risky_sentences_within_budget(self):
+        """Test that a buried leak survives, order is kept and omissions are summarised."""
+        response = _long_response()
+        _, compacted = self.compactor.compact("How do reports work?", response)
+        self.assertIn(LEAK, compacted)
+        self.assertLessEqual(len(compacted), 150 * 4)
+        self.assertLess(len(compacted), len(response) / 3)
+        lines = compacted.split("\n")
+        self.assertEqual(lines[0], PROSE[0])
+        self.assertIn("sentence(s) omitted", compacted)
+        self.assertTrue(lines[-1].startswith(f"[Excerpts selected by risk: {len(lines) - 1 - compacted.count('[...')}"
+                                             f" of {len(split_sentences(response))} sentences"))
+
+    def test_summary_counts_omitted_figures_and_names(self):
+        """Test that figures and names left out are counted in the closing note."""
+        compactor = GuardInputCompactor((get_default_rules("OUTPUT"),), budget_tokens=120, prompt_budget_tokens=50)
+        response = _long_response() + " " + LEAK.replace("Falcon", "Osprey")
+        _, compacted = compactor.compact("", response)
+        self.assertEqual(compacted.count("€4.2M"), 1)
+        self.assertIn("with 3 figure(s) and 4 name(s)", compacted)
+
+    def test_near_misses_and_prompt_overlap_score(self):
+        """Test that L1 near misses and words shared with the prompt raise a sentence's score."""
+        prose = self.compactor.score("The mobile app offers the same features as the web version.", set())
+        self.assertGreater(self.compactor.near_miss("The secretary keeps the roster at hr (at) acme."),
+                           self.compactor.near_miss(PROSE[1]))
+        self.assertGreater(self.compactor.score(PROSE[0], {"workspace"}), prose)
+
+    def test_unpunctuated_text_is_chunked_not_truncated(self):
+        """Test that risky content past the first budget of a single-line text still reaches the guard."""
+        text = '{"items": [' + ", ".join(f'"item {chr(97 + i % 26)}"' for i in range(300)) + \
+               ', "owner": "Maria Lopez", "account": "4411-2250"]}'
+        compacted = self.compactor.compact_text(text, "", 150)
+        self.assertIn('"owner": "Maria Lopez", "account": "4411-2250"', compacted)
+        self.assertLessEqual(len(compacted), 150 * 4)
+        self.assertIn("omitted", compacted)
+
+    def test_no_room_means_uncompacted(self):
+        """Test that a budget too small for any piece sends the text whole."""
+        text = _long_response()
+        self.assertEqual(self.compactor.compact_text(text, "", 60), text)
+
+class TestGatewayCompaction(unittest.TestCase):
+    """Test cases for compaction in the gateway's synchronous L2 review."""
+
+    def _guard_inputs(self, **overrides):
+        seen = []
+
+        def guard(user_prompt, response_text, prompt_template=None):
+            seen.append(response_text)
+            return CLEAN
+
+        with patch.multiple('src.argus.core.gateway.settings', **overrides), \
+                patch('src.argus.core.gateway.analyze_response_with_guard', guard):
+            gateway = ArgusGateway(llm=_FixedLLM(_long_response()))
+            output = gateway.process_prompt("How do reports work?")
+            gateway.close()
+        self.assertEqual(output, _long_response())
+        return seen
+
+    def test_guard_sees_full_response_without_compaction(self):
+        """Test that the guard sees the full response with L2_COMPACTION off."""
+        self.assertEqual(self._guard_inputs(l2_compaction=False), [_long_response()])
+
+    def test_guard_sees_excerpts_when_enabled(self):
+        """Test that the guard sees compacted text and the released response is the original."""
+        seen = self._guard_inputs(l2_compaction=True, l2_compaction_budget_tokens=150)
+        self.assertEqual(len(seen), 1)
+        self.assertIn(LEAK, seen[0])
+        self.assertLess(len(seen[0]), len(_long_response()) / 3)
+
+class TestCompactionEvaluation(unittest.TestCase):
+    """Test cases for reporting compaction's effect on recall."""
+
+    def test_builtin_corpus_recall_and_guard_input(self):
+        """Test that compaction keeps recall on the built-in corpus while cutting guard input."""
+        cases = builtin_corpus()
+        full = run_config(EvalConfig("l2"), cases)
+        compact = run_config(EvalConfig("compact", {"l2_compaction": True}), cases)
+        self.assertEqual(compact.detection.recall, full.detection.recall)
+        self.assertLess(compact.guard_input_chars * 2, full.guard_input_chars)
+
+    def test_evidence_left_out_is_missed(self):
+        """Test that a recorded violation counts as missed when its evidence is compacted away."""
+        response = _long_response(leak_at=20)
+        case = EvalCase("buried", "How do reports work?", "CONFIDENTIAL_DATA", response,
+                        {"*": {"status": "success", "decision": "VIOLATION", "reason": "CONFIDENTIAL_DATA"}},
+                        evidence=PROSE[3])
+        config = EvalConfig("compact", {"l2_compaction": True, "l2_compaction_budget_tokens": 150})
+        self.assertEqual(run_config(EvalConfig("l2"), [case]).detection.recall, 1.0)
+        self.assertEqual(run_config(config, [case]).detection.recall, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Tests for end-to-end request deadlines.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.argus.core import deadline as deadline_module
+from src.argus.core.deadline import (
+    call_within, current_deadline, deadline_after, deadline_scope, request_timeout, stage_budget,
+)
+from src.argus.core.exceptions import ConfigurationError, DeadlineExceeded
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.journal import DEADLINE, L2_DEFERRED, DecisionJournal
+from src.argus.core.policy import PolicyProfile, PolicyRegistry
+from src.argus.core.review_queue import ReviewQueue
+from src.argus.llm.base import BaseLLM
+
+CLEAN = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+
+class _SlowLLM(BaseLLM):
+    def __init__(self, text, delay=0.0):
+        self.text = text
+        self.delay = delay
+
+    def get_response(self, prompt):
+        time.sleep(self.delay)
+        return self.text
+
+    def get_model_name(self):
+        return "slow"
+
+def _slow_guard(delay):
+    def guard(**kwargs):
+        time.sleep(delay)
+        return dict(CLEAN)
+    return guard
+
+class TestStageBudget(unittest.TestCase):
+    """Test cases for splitting a deadline across stages."""
+
+    def test_no_deadline(self):
+        """Test that without a deadline there is no budget and calls run inline."""
+        self.assertIsNone(stage_budget(None, cap=5.0))
+        self.assertEqual(call_within(None, "stage", lambda: 7), 7)
+
+    def test_reserve_and_cap(self):
+        """Test that the reserve is held back, but never more than half of what is left."""
+        deadline = deadline_after(10.0)
+        self.assertAlmostEqual(stage_budget(deadline, reserve=2.0), 8.0, delta=0.05)
+        self.assertAlmostEqual(stage_budget(deadline, cap=3.0, reserve=2.0), 3.0, delta=0.05)
+        self.assertAlmostEqual(stage_budget(deadline_after(1.0), reserve=2.0), 0.5, delta=0.05)
+        self.assertEqual(stage_budget(time.monotonic() - 1), 0.0)
+
+    def test_call_within_gives_up(self):
+        """Test that a call still running when its budget ends raises DeadlineExceeded."""
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded) as ctx:
+            call_within(0.05, "slow", time.sleep, 1.0)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(ctx.exception.stage, "slow")
+        with self.assertRaises(DeadlineExceeded):
+            call_within(0.0, "late", lambda: None)
+
+    def test_queue_time_is_not_charged_to_the_stage(self):
+        """Test that calls waiting for a busy pool get their full budget once they start."""
+        results = []
+
+        def call():
+            with deadline_scope(deadline_after(5.0)):
+                results.append(call_within(0.3, "slow", lambda: time.sleep(0.1) or "ok"))
+
+        with patch.object(deadline_module, "_executor", None), \
+                patch("src.argus.core.deadline.settings.deadline_workers", 2):
+            threads = [threading.Thread(target=call) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(deadline_module._get_executor()._max_workers, 2)
+            deadline_module._get_executor().shutdown()
+        self.assertEqual(results, ["ok"] * 8)
+
+    def test_request_deadline_bounds_the_wait_for_a_worker(self):
+        """Test that a call still queued when the request deadline passes is dropped."""
+        release = threading.Event()
+        with patch.object(deadline_module, "_executor", None), \
+                patch("src.argus.core.deadline.settings.deadline_workers", 1):
+            blocker = threading.Thread(target=lambda: call_within(5.0, "busy", release.wait, 5.0))
+            blocker.start()
+            time.sleep(0.05)
+            ran = []
+            with deadline_scope(deadline_after(0.1)), self.assertRaises(DeadlineExceeded):
+                call_within(5.0, "queued", ran.append, 1)
+            release.set()
+            blocker.join()
+            deadline_module._get_executor().shutdown()
+        self.assertEqual(ran, [])
+
+    def test_deadline_visible_to_calls(self):
+        """Test that calls made under a deadline see it and shorten their HTTP timeout."""
+        deadline = deadline_after(1.0)
+        with deadline_scope(deadline):
+            self.assertEqual(call_within(0.5, "probe", current_deadline), deadline)
+            self.assertLessEqual(request_timeout(20.0), 1.0)
+        self.assertIsNone(current_deadline())
+        self.assertEqual(request_timeout(20.0), 20.0)
+
+    def test_profile_deadline_action(self):
+        """Test that profiles accept only known deadline actions."""
+        self.assertEqual(PolicyProfile.from_dict("a", {"deadline_action": "release"}).deadline_action, "release")
+        with self.assertRaises(ConfigurationError):
+            PolicyProfile.from_dict("a", {"deadline_action": "ignore"})
+
+@patch('src.argus.core.gateway.check_output_filters', return_value=None)
+@patch('src.argus.core.gateway.check_input_filters', return_value=None)
+class TestGatewayDeadline(unittest.TestCase):
+    """Test cases for deadlines in the gateway."""
+
+    def setUp(self):
+        self.journal = DecisionJournal()
+
+    def _gateway(self, llm, action="block", review_queue=None):
+        policies = PolicyRegistry({"default": PolicyProfile(deadline_action=action)})
+        with patch('src.argus.core.gateway.settings.l2_review_workers', 0):
+            gateway = ArgusGateway(policies=policies, llm=llm, review_queue=review_queue, journal=self.journal)
+        self.addCleanup(gateway.close)
+        return gateway
+
+    def _timed(self, gateway, timeout):
+        start = time.monotonic()
+        result = gateway.process_prompt("hello", timeout=timeout)
+        return result, time.monotonic() - start
+
+    def test_slow_primary_is_cut_off(self, *_):
+        """Test that a slow primary LLM is abandoned at the deadline and the request blocked."""
+        gateway = self._gateway(_SlowLLM("late", delay=1.0), action="release")
+        with patch('src.argus.core.gateway.analyze_response_with_guard') as mock_guard:
+            result, elapsed = self._timed(gateway, 0.1)
+        self.assertIn("deadline exceeded during primary_llm", result)
+        self.assertLess(elapsed, 0.5)
+        mock_guard.assert_not_called()
+        self.assertEqual([(e.stage, e.decision) for e in self.journal.recent], [(DEADLINE, "BLOCKED")])
+
+    def test_guard_gets_only_what_is_left(self, *_):
+        """Test that time spent in the primary LLM comes out of the guard's budget."""
+        gateway = self._gateway(_SlowLLM("fine", delay=0.1))
+        with patch('src.argus.core.gateway.analyze_response_with_guard', _slow_guard(0.25)):
+            # The primary LLM may use half of 0.3s (the rest is the L2 reserve), leaving the guard ~0.2s.
+            result, elapsed = self._timed(gateway, 0.3)
+            self.assertIn("deadline exceeded during l2_guard", result)
+            self.assertLess(elapsed, 0.5)
+            self.assertEqual(gateway.process_prompt("hello", timeout=1.0), "fine")
+
+    def test_release_action(self, *_):
+        """Test that DEADLINE_ACTION=release returns the unreviewed response."""
+        gateway = self._gateway(_SlowLLM("fine"), action="release")
+        with patch('src.argus.core.gateway.analyze_response_with_guard', _slow_guard(1.0)):
+            result, elapsed = self._timed(gateway, 0.1)
+        self.assertEqual(result, "fine")
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual([(e.stage, e.decision) for e in self.journal.recent], [(DEADLINE, "RELEASED")])
+
+    def test_defer_action_queues_review(self, *_):
+        """Test that DEADLINE_ACTION=defer releases the response and queues L2 review."""
+        queue = ReviewQueue(":memory:")
+        gateway = self._gateway(_SlowLLM("fine"), action="defer", review_queue=queue)
+        with patch('src.argus.core.gateway.analyze_response_with_guard', _slow_guard(1.0)), \
+                patch('src.argus.core.gateway.random.random', return_value=0.0):
+            result, _ = self._timed(gateway, 0.1)
+        self.assertEqual(result, "fine")
+        self.assertEqual(queue.pending_count(), 1)
+        self.assertEqual([(e.stage, e.decision) for e in self.journal.recent], [(DEADLINE, "DEFERRED")])
+        self.assertNotIn(L2_DEFERRED, [e.stage for e in self.journal.recent])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -64,5 +64,37 @@ class TestArgusGateway(unittest.TestCase):
         self.assertIn("[Argus]", result)
         self.assertIn("Response blocked", result)
 
+    @patch('src.argus.core.gateway.settings.pii_action', 'redact')
+    @patch('src.argus.core.gateway.check_input_filters')
+    @patch('src.argus.core.gateway.get_llm_response')
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_pii_redaction_mode(self, mock_guard, mock_llm, mock_input):
+        """Test that redaction mode returns the masked response and L2 sees only that."""
+        mock_input.return_value = None
+        mock_llm.return_value = "Contact john.doe@example.com for details."
+        mock_guard.return_value = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+        
+        result = self.gateway.process_prompt("Who should I contact?")
+        
+        self.assertEqual(result, "Contact [REDACTED_EMAIL] for details.")
+        self.assertEqual(mock_guard.call_args.kwargs['response_text'], result)
+
+    @patch('src.argus.core.gateway.get_llm_response')
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_injected_guard_and_config(self, mock_guard, mock_llm):
+        """Test that a gateway uses its own guard and settings in place of the module-level ones."""
+        from src.argus.config.settings import settings
+        mock_llm.return_value = "Contact john.doe@example.com for details."
+        guard = Mock(return_value={'status': 'success', 'decision': 'CLEAN', 'reason': None})
+        gateway = ArgusGateway(guard=guard, config=settings.copy(update={'pii_action': 'redact'}))
+        self.addCleanup(gateway.close)
+
+        result = gateway.process_prompt("Who should I contact?")
+
+        self.assertEqual(result, "Contact [REDACTED_EMAIL] for details.")
+        self.assertEqual(guard.call_args.kwargs['response_text'], result)
+        mock_guard.assert_not_called()
+        self.assertNotEqual(settings.pii_action, 'redact')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for guard routing and quorum mode.
+"""
+
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from src.argus.core.types import SecurityDecision
+from src.argus.filters.layer2.guard_llm import GuardLLMClient
+from src.argus.filters.layer2.router import GuardRouter, GuardTarget
+
+FAST = GuardTarget("guard-a", "Fast")
+SLOW = GuardTarget("guard-b", "Slow")
+THIRD = GuardTarget("guard-c")
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, reasoning=None))])
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestGuardRouter(unittest.TestCase):
+    """Test cases for GuardRouter."""
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.router = GuardRouter([SLOW, FAST], alpha=0.5, error_threshold=0.5, cooldown=10, clock=self.clock)
+
+    def test_parse_target(self):
+        """Test the model@provider form."""
+        self.assertEqual(GuardTarget.parse("m/x:free@Nineteen"), GuardTarget("m/x:free", "Nineteen"))
+        self.assertEqual(GuardTarget.parse("m/x"), GuardTarget("m/x", None))
+
+    def test_fastest_target_first(self):
+        """Test that targets are ranked by average latency."""
+        self.router.record(SLOW, 2.0, True)
+        self.router.record(FAST, 0.3, True)
+        self.assertEqual(self.router.select(2), [FAST, SLOW])
+
+    def test_failing_target_sits_out_cooldown(self):
+        """Test that an unhealthy target is skipped, then probed after the cooldown."""
+        self.router.record(SLOW, 2.0, True)
+        self.router.record(FAST, 0.3, True)
+        self.router.record(FAST, 0.1, False)
+        self.assertEqual(self.router.select(), [SLOW])
+        self.clock.now = 11
+        self.assertEqual(self.router.select(), [FAST])
+        self.assertEqual(self.router.snapshot()["guard-a@Fast"]["failures"], 1)
+
+    def test_cooled_down_target_gets_one_probe(self):
+        """Test that only one caller probes a cooled-down target until the probe reports back."""
+        self.router.record(SLOW, 2.0, True)
+        self.router.record(FAST, 0.3, True)
+        self.router.record(FAST, 0.1, False)
+        self.clock.now = 11
+        self.assertEqual(self.router.select(), [FAST])
+        self.assertEqual(self.router.select(), [SLOW])
+        self.router.record(FAST, 0.2, True)
+        self.assertEqual(self.router.select(), [FAST])
+        self.router.record(FAST, 0.1, False)
+        self.clock.now = 22
+        self.assertEqual(self.router.select(), [FAST])
+        # A probe that never reports frees the slot after another cooldown.
+        self.clock.now = 31
+        self.assertEqual(self.router.select(), [SLOW])
+        self.clock.now = 33
+        self.assertEqual(self.router.select(), [FAST])
+
+class TestGuardClientRouting(unittest.TestCase):
+    """Test cases for routing and quorum in GuardLLMClient."""
+
+    def setUp(self):
+        self.router = GuardRouter([FAST, SLOW, THIRD])
+        self.client = GuardLLMClient(router=self.router)
+        self.client.client = MagicMock()
+
+    def _verdicts(self, by_model):
+        """Answer each guard model with its own verdict."""
+        def create(**request):
+            value = by_model[request["model"]]
+            if isinstance(value, threading.Event):
+                value.wait(5)
+                value = '{"decision": "CLEAN", "reason": null}'
+            return _completion(value)
+        self.client.client.chat.completions.create.side_effect = create
+
+    def test_request_uses_target_provider(self):
+        """Test that the routed model and provider reach the request."""
+        self._verdicts({"guard-a": '{"decision": "CLEAN", "reason": null}'})
+        result = self.client.analyze("q", "r")
+        self.assertEqual(result.decision, SecurityDecision.CLEAN)
+        kwargs = self.client.client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["model"], "guard-a")
+        self.assertEqual(kwargs["extra_body"]["provider"]["order"], ["Fast"])
+        self.assertEqual(self.router.snapshot()["guard-a@Fast"]["calls"], 1)
+
+    @patch.multiple("src.argus.filters.layer2.guard_llm.settings", guard_quorum_size=3, guard_quorum_clean=2)
+    def test_quorum_violation_does_not_wait(self):
+        """Test that one VIOLATION decides while a slower model is still running."""
+        hold = threading.Event()
+        self._verdicts({
+            "guard-a": '{"decision": "VIOLATION", "reason": "PII_DETECTED"}',
+            "guard-b": hold,
+            "guard-c": '{"decision": "CLEAN", "reason": null}',
+        })
+        result = self.client.analyze("q", "r")
+        hold.set()
+        self.assertEqual(result.decision, SecurityDecision.VIOLATION)
+
+    @patch.multiple("src.argus.filters.layer2.guard_llm.settings", guard_quorum_size=3, guard_quorum_clean=2)
+    def test_quorum_needs_agreeing_clean_verdicts(self):
+        """Test that CLEAN needs the configured agreement and errors fail closed."""
+        self._verdicts({
+            "guard-a": '{"decision": "CLEAN", "reason": null}',
+            "guard-b": "not json",
+            "guard-c": '{"decision": "CLEAN", "reason": null}',
+        })
+        self.assertEqual(self.client.analyze("q", "r").decision, SecurityDecision.CLEAN)
+        self._verdicts({"guard-a": '{"decision": "CLEAN", "reason": null}', "guard-b": "x", "guard-c": "y"})
+        self.assertEqual(self.client.analyze("q", "r").decision, SecurityDecision.ERROR)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for streaming guard analysis and the incremental verdict parser.
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from src.argus.core.types import SecurityDecision, ViolationReason
+from src.argus.filters.layer2.guard_llm import GuardLLMClient
+from src.argus.filters.layer2.verdict_parser import IncrementalVerdictParser
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+class _FakeStream:
+    """Yields chunks and records how far the consumer read."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            self.consumed += 1
+            yield _chunk(piece)
+
+    def close(self):
+        self.closed = True
+
+class TestVerdictParser(unittest.TestCase):
+    """Test cases for IncrementalVerdictParser."""
+
+    def test_verdict_split_across_chunks(self):
+        """Test that the verdict is returned exactly when its closing brace arrives."""
+        parser = IncrementalVerdictParser()
+        pieces = ['```json\n{"deci', 'sion": "VIOL', 'ATION", "reason": "PII_DE', 'TECTED"', '}\n```']
+        results = [parser.feed(piece) for piece in pieces]
+        self.assertEqual(results[:-1], [None] * 4)
+        self.assertEqual(results[-1], {"decision": "VIOLATION", "reason": "PII_DETECTED"})
+
+    def test_reasoning_and_stray_braces_are_skipped(self):
+        """Test that braces in reasoning blocks and in strings are ignored."""
+        parser = IncrementalVerdictParser()
+        self.assertIsNone(parser.feed('<think>the set {a, b} and "quotes"</think> '))
+        verdict = parser.feed('{"decision": "CLEAN", "reason": null, "x": "a\\"}"}')
+        self.assertEqual(verdict["decision"], "CLEAN")
+
+    def test_quoted_example_is_not_the_verdict(self):
+        """Test that a verdict-shaped object after prose or another object is not taken."""
+        for text in ('Reply like { "decision": "CLEAN", "reason": null }. {"decision": "VIOLATION", '
+                     '"reason": "PII_DETECTED"}',
+                     '{"note": "}{"} {"decision": "CLEAN", "reason": null}'):
+            parser = IncrementalVerdictParser()
+            self.assertIsNone(parser.feed(text))
+            self.assertIsNone(parser.verdict)
+
+class TestStreamingGuard(unittest.TestCase):
+    """Test cases for the streaming guard mode."""
+
+    def setUp(self):
+        self.client = GuardLLMClient()
+        self.client.client = MagicMock()
+
+    def _analyze(self, stream, **overrides):
+        self.client.client.chat.completions.create.return_value = stream
+        settings_patch = {"guard_streaming": True}
+        settings_patch.update(overrides)
+        with patch.multiple("src.argus.filters.layer2.guard_llm.settings", **settings_patch):
+            return self.client.analyze("q", "r")
+
+    def test_stream_closed_after_verdict(self):
+        """Test that the stream is closed as soon as the verdict is parsed."""
+        stream = _FakeStream(['{"decision": "VIOLATION", ', '"reason": "PII_DETECTED"}'] + ["trailing"] * 100)
+        result = self._analyze(stream)
+        self.assertEqual(result.decision, SecurityDecision.VIOLATION)
+        self.assertEqual(result.reason, ViolationReason.PII_DETECTED)
+        self.assertEqual(stream.consumed, 2)
+        self.assertTrue(stream.closed)
+
+    def test_incomplete_stream_is_an_error(self):
+        """Test that a stream ending without a verdict is reported as an error."""
+        result = self._analyze(_FakeStream(['{"decision": "CLE']))
+        self.assertEqual(result.decision, SecurityDecision.ERROR)
+
+    def test_quoted_example_falls_back_to_full_text(self):
+        """Test that a stream quoting an example verdict is read to the end and parsed whole."""
+        stream = _FakeStream(['Format: {"decision": "CLEAN", "reason": null}. ', 'Verdict: ',
+                              '{"decision": "VIOLATION", "reason": "PII_DETECTED"}'])
+        result = self._analyze(stream)
+        self.assertEqual(result.decision, SecurityDecision.ERROR)
+        self.assertEqual(stream.consumed, 3)
+
+    def test_structured_output_and_token_cap(self):
+        """Test that JSON-schema mode and the guard token cap reach the request."""
+        self._analyze(_FakeStream(['{"decision": "CLEAN", "reason": null}']),
+                      guard_response_format="json_schema", guard_max_tokens=64)
+        kwargs = self.client.client.chat.completions.create.call_args.kwargs
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["max_tokens"], 64)
+        self.assertEqual(kwargs["response_format"]["type"], "json_schema")
+
+if __name__ == '__main__':
+    unittest.main()
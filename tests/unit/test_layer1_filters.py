@@ -4,7 +4,12 @@ Tests for Layer 1 filters.
 
 import unittest
 from src.argus.filters.layer1.input_filters import check_input_filters
-from src.argus.filters.layer1.output_filters import check_output_filters
+from src.argus.filters.layer1.output_filters import (
+    OutputPIIFilter,
+    check_output_filters,
+    redact_output_filters,
+)
+from src.argus.filters.layer1.rules import CompiledRules
 
 class TestLayer1Filters(unittest.TestCase):
     """Test cases for Layer 1 filters."""
@@ -42,5 +47,32 @@ class TestLayer1Filters(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn("PII", result)
 
+    def test_output_redaction_masks_each_kind(self):
+        """Test that redaction replaces every PII span with its kind's token."""
+        response = "Reach John at john.doe@example.com or 555-123-4567; SSN 987-65-4321."
+        violation, redacted = redact_output_filters(response)
+        self.assertIsNone(violation)
+        self.assertEqual(
+            redacted,
+            "Reach John at [REDACTED_EMAIL] or [REDACTED_PHONE]; SSN [REDACTED_SSN].",
+        )
+
+    def test_output_redaction_custom_tokens(self):
+        """Test that replacement tokens can be configured per PII kind."""
+        rules = CompiledRules.for_output(redaction_tokens={"EMAIL": "<email>"})
+        result = OutputPIIFilter(rules, redact=True).check("mail a.b@example.org")
+        self.assertTrue(result.passed)
+        self.assertEqual(result.redacted_text, "mail <email>")
+
+    def test_output_redaction_still_blocks_blocklist(self):
+        """Test that blocklisted output is still blocked in redaction mode."""
+        violation, _ = redact_output_filters("This is confidential: a.b@example.org")
+        self.assertIn("Blocked Output Term", violation)
+
+    def test_output_redaction_clean_response_unchanged(self):
+        """Test that clean responses pass through redaction untouched."""
+        clean_response = "The weather today is sunny with mild temperatures."
+        self.assertEqual(redact_output_filters(clean_response), (None, clean_response))
+
 if __name__ == '__main__':
     unittest.main()
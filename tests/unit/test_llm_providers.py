@@ -0,0 +1,117 @@
+"""
+Tests for primary LLM providers and streaming.
+"""
+
+import asyncio
+import http.client
+import importlib.util
+import json
+import time
+import unittest
+from unittest.mock import patch
+from src.argus.core.exceptions import ConfigurationError
+from src.argus.core.gateway import ArgusGateway
+from src.argus.llm.mock_llm import MockLLM
+from src.argus.llm.providers import create_llm
+from src.argus.llm.stub_server import StubServer
+
+PROMPT = "TEST::safe::How does support work?"
+EXPECTED = "The customer support process involves several tiers."
+
+class TestMockStreaming(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the streaming mock."""
+
+    def setUp(self):
+        self.llm = MockLLM(token_delay=0.01, latency_range=(0.0, 0.0))
+
+    def test_stream_reassembles_response(self):
+        """Test that streamed tokens join back into the full response."""
+        started = time.perf_counter()
+        tokens = list(self.llm.stream_response(PROMPT))
+        self.assertEqual("".join(tokens), EXPECTED)
+        self.assertGreater(len(tokens), 1)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.01 * (len(tokens) - 1))
+
+    async def test_async_stream(self):
+        """Test the async response and stream variants."""
+        self.assertEqual(await self.llm.aget_response(PROMPT), EXPECTED)
+        tokens = [token async for token in self.llm.astream_response(PROMPT)]
+        self.assertEqual("".join(tokens), EXPECTED)
+
+class TestProviderSelection(unittest.TestCase):
+    """Test cases for provider selection and injection."""
+
+    def test_unknown_provider_is_rejected(self):
+        """Test that an unknown provider name is a configuration error."""
+        with self.assertRaises(ConfigurationError):
+            create_llm("no-such-provider")
+
+    @patch('src.argus.core.gateway.get_llm_response')
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_gateway_uses_injected_llm(self, mock_guard, mock_default_llm):
+        """Test that an injected provider replaces the configured default."""
+        mock_guard.return_value = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+        gateway = ArgusGateway(llm=MockLLM(latency_range=(0.0, 0.0)))
+        self.assertEqual(gateway.process_prompt(PROMPT), EXPECTED)
+        mock_default_llm.assert_not_called()
+
+class TestStubServer(unittest.TestCase):
+    """Test cases for the OpenAI-compatible stand-in and HTTP provider."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer()
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _post(self, conn, body):
+        conn.request("POST", "/v1/chat/completions", json.dumps(body), {"Content-Type": "application/json"})
+        return conn.getresponse()
+
+    def test_streaming_protocol_over_one_connection(self):
+        """Test SSE chunks and keep-alive on the stand-in server."""
+        host, port = self.server.server_address[:2]
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        messages = [{"role": "user", "content": PROMPT}]
+        response = self._post(conn, {"model": "stub", "messages": messages, "stream": True})
+        events = [line[6:] for line in response.read().decode().splitlines() if line.startswith("data: ")]
+        self.assertEqual(events[-1], "[DONE]")
+        content = "".join(json.loads(e)["choices"][0]["delta"].get("content", "") for e in events[:-1])
+        self.assertEqual(content, EXPECTED)
+        # The same connection serves the next request.
+        response = self._post(conn, {"model": "stub", "messages": messages})
+        self.assertEqual(json.loads(response.read())["choices"][0]["message"]["content"], EXPECTED)
+        conn.close()
+
+    @unittest.skipUnless(importlib.util.find_spec("httpx"), "httpx is required by the HTTP provider")
+    def test_openai_compatible_provider(self):
+        """Test the HTTP provider against the stand-in server."""
+        from src.argus.llm.openai_compat import OpenAICompatibleLLM
+        llm = OpenAICompatibleLLM(base_url=self.server.base_url, api_key="test", model="stub")
+        self.addCleanup(llm.close)
+        self.assertEqual(llm.get_response(PROMPT), EXPECTED)
+        self.assertEqual("".join(llm.stream_response(PROMPT)), EXPECTED)
+
+    @unittest.skipUnless(importlib.util.find_spec("httpx"), "httpx is required by the HTTP provider")
+    def test_openai_compatible_provider_closes_async_client(self):
+        """Test that aclose releases the async client as well as the sync one."""
+        from src.argus.llm.openai_compat import OpenAICompatibleLLM
+        llm = OpenAICompatibleLLM(base_url=self.server.base_url, api_key="test", model="stub")
+
+        async def run():
+            response = await llm.aget_response(PROMPT)
+            async_client = llm.async_client
+            await llm.aclose()
+            return response, async_client
+
+        response, async_client = asyncio.run(run())
+        self.assertEqual(response, EXPECTED)
+        self.assertTrue(async_client.is_closed())
+        self.assertIsNone(llm._async_client)
+
+if __name__ == '__main__':
+    unittest.main()
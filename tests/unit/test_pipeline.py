@@ -0,0 +1,53 @@
+"""
+Tests for prebuilt filter pipelines.
+"""
+
+import unittest
+from src.argus.core.exceptions import ConfigurationError
+from src.argus.core.types import PASSED
+from src.argus.filters.layer1.rules import CompiledRules
+from src.argus.filters.pipeline import NO_VIOLATIONS, build_pipeline
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the composable filter pipeline."""
+
+    def setUp(self):
+        self.rules = CompiledRules.for_output()
+        self.pipeline = build_pipeline(["output_blocklist", "output_pii"], self.rules)
+
+    def test_clean_text_returns_shared_constants(self):
+        """Test that a clean request allocates no result objects."""
+        self.assertIs(self.pipeline.run("The weather is nice."), PASSED)
+        self.assertIs(self.pipeline.run_all("The weather is nice."), NO_VIOLATIONS)
+
+    def test_first_failure_and_collect_all(self):
+        """Test that run() stops early while run_all() reports every stage."""
+        text = "This is confidential. Contact john.doe@example.com"
+        result = self.pipeline.run(text)
+        self.assertFalse(result.passed)
+        self.assertEqual(result.filter_type, "OUTPUT_BLOCKLIST")
+        failures = self.pipeline.run_all(text)
+        self.assertEqual([f.filter_type for f in failures], ["OUTPUT_BLOCKLIST", "OUTPUT_PII"])
+
+    def test_stages_are_reused(self):
+        """Test that stage instances persist across runs."""
+        stages = self.pipeline.stages
+        self.pipeline.run("first")
+        self.pipeline.run("second")
+        self.assertIs(self.pipeline.stages, stages)
+        self.assertIs(stages[1].rules, self.rules)
+
+    def test_redacting_stage_passes_redacted_text(self):
+        """Test that a redacting stage passes with the masked text."""
+        pipeline = build_pipeline(["output_blocklist", "output_pii_redact"], self.rules)
+        result = pipeline.run("Reach me at john.doe@example.com")
+        self.assertTrue(result.passed)
+        self.assertEqual(result.redacted_text, "Reach me at [REDACTED_EMAIL]")
+
+    def test_unknown_stage_is_rejected(self):
+        """Test that an unregistered stage name fails at build time."""
+        with self.assertRaises(ConfigurationError):
+            build_pipeline(["no_such_stage"])
+
+if __name__ == '__main__':
+    unittest.main()
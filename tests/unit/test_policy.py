@@ -0,0 +1,116 @@
+"""
+Tests for per-tenant policy profiles and the engine cache.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from src.argus.core.exceptions import ConfigurationError
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.policy import EngineCache, PolicyEngine, PolicyProfile, PolicyRegistry
+from src.argus.filters.layer1.input_filters import check_input_filters
+
+class TestPolicyProfiles(unittest.TestCase):
+    """Test cases for tenant-scoped policies."""
+
+    def setUp(self):
+        self.registry = PolicyRegistry({
+            "acme": PolicyProfile.from_dict("acme", {
+                "input_blocklist_terms": ["project falcon"],
+                "pii_kinds": ["EMAIL"],
+                "primary_role": "You are Acme's billing assistant.",
+            }),
+            "globex": PolicyProfile.from_dict("globex", {
+                "input_blocklist_terms": ["project falcon"],
+                "pii_kinds": ["EMAIL"],
+                "primary_role": "You are Acme's billing assistant.",
+            }),
+        })
+
+    def test_tenant_rules_apply(self):
+        """Test that each tenant is screened with its own rules."""
+        acme = self.registry.engine_for("acme")
+        self.assertIsNotNone(check_input_filters("Tell me about Project Falcon", pipeline=acme.input_pipeline))
+        # SSN is not an enabled PII kind for acme, and "bypass" is not on its blocklist.
+        self.assertIsNone(check_input_filters("bypass 123-45-6789", pipeline=acme.input_pipeline))
+        default = self.registry.engine_for(None)
+        self.assertIsNone(check_input_filters("Tell me about Project Falcon", pipeline=default.input_pipeline))
+
+    def test_identical_rules_share_an_engine(self):
+        """Test that tenants with the same rules share one compiled engine."""
+        self.assertIs(self.registry.engine_for("acme"), self.registry.engine_for("globex"))
+        self.assertEqual(self.registry.cache.misses, 1)
+
+    def test_unknown_tenant_uses_default(self):
+        """Test that an unknown tenant falls back to the default policy."""
+        self.assertIs(self.registry.engine_for("nobody"), self.registry.engine_for(None))
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the engine cache stays within its memory budget."""
+        cache = EngineCache(max_bytes=1)
+        first = cache.get(PolicyProfile(input_blocklist_terms=("a",)))
+        cache.get(PolicyProfile(input_blocklist_terms=("b",)))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNot(cache.get(PolicyProfile(input_blocklist_terms=("a",))), first)
+
+    def test_cold_build_does_not_block_other_tenants(self):
+        """Test that engines build outside the cache lock, once per fingerprint."""
+        cache = EngineCache(max_bytes=10**9)
+        warm = cache.get(PolicyProfile(input_blocklist_terms=("warm",)))
+        cold = PolicyProfile(input_blocklist_terms=("cold",))
+        started, release = threading.Event(), threading.Event()
+
+        def slow_engine(profile, config):
+            started.set()
+            release.wait(5)
+            return PolicyEngine(profile, config)
+
+        results = []
+        with patch("src.argus.core.policy.PolicyEngine", side_effect=slow_engine) as build:
+            builders = [threading.Thread(target=lambda: results.append(cache.get(cold))) for _ in range(3)]
+            for thread in builders:
+                thread.start()
+            self.assertTrue(started.wait(5))
+            hits = []
+            warm_profile = PolicyProfile(input_blocklist_terms=("warm",))
+            reader = threading.Thread(target=lambda: hits.append(cache.get(warm_profile)))
+            reader.start()
+            reader.join(2)
+            release.set()
+            self.assertEqual(hits, [warm])
+            for thread in builders:
+                thread.join(5)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(engine is results[0] for engine in results))
+
+    def test_profiles_load_from_file(self):
+        """Test loading and validating profiles from JSON."""
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"acme": {"pii_kinds": ["PHONE"]}}, f)
+        self.addCleanup(os.unlink, f.name)
+        registry = PolicyRegistry.from_file(f.name)
+        self.assertEqual(registry.profile_for("acme").pii_kinds, ("PHONE",))
+        with self.assertRaises(ConfigurationError):
+            PolicyProfile.from_dict("bad", {"pii_kinds": ["NOT_A_KIND"]})
+
+    @patch('src.argus.core.gateway.get_llm_response')
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_gateway_uses_tenant_guard_role(self, mock_guard, mock_llm):
+        """Test that the guard receives the tenant's role description."""
+        mock_llm.return_value = "Your invoice is ready."
+        mock_guard.return_value = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+        gateway = ArgusGateway(policies=self.registry)
+
+        self.assertEqual(gateway.process_prompt("Where is my invoice?", tenant_id="acme"), "Your invoice is ready.")
+        template = mock_guard.call_args.kwargs['prompt_template']
+        self.assertIn("Acme's billing assistant", template.render("q", "r"))
+
+        self.assertIn("[Argus]", gateway.process_prompt("Status of project falcon?", tenant_id="acme"))
+
+if __name__ == '__main__':
+    unittest.main()
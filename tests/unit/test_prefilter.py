@@ -0,0 +1,88 @@
+"""
+Tests for Layer 1 rule preconditions.
+"""
+
+import random
+import re
+import unittest
+from src.argus.config.security_rules import PII_PATTERN_NAMES, PII_PATTERNS
+from src.argus.filters.layer1.prefilter import TextFeatures, Trigger, derive_precondition
+from src.argus.filters.layer1.rules import CompiledRules
+
+SAMPLES = [
+    "hello there", "my SSN is 123-45-6789", "mail me at a.b@example.com", "call 555-123-4567",
+    "ProjectArgusSecret", "projectargussecret", "PIN 560001", "İSTANBUL trip", "card 4111111111111111",
+    "DOB 01/02/1990", "+91 98765 43210", "pay me at name@okaxis", "ABCDE1234F", "my CCN is 4111",
+    "SSN ٣٣٣-٣٣-٣٣٣٣", "phone ۵۵۵۱۲۳۴۵۶۷", "mail ｊａｎｅ＠example.com", "Ｋ and K",
+]
+
+def _precondition(pattern):
+    return derive_precondition(re.compile(pattern) if isinstance(pattern, str) else pattern)
+
+class TestDerivePrecondition(unittest.TestCase):
+    """Test cases for derive_precondition."""
+
+    def _required_chars(self, name):
+        pattern = PII_PATTERNS[PII_PATTERN_NAMES.index(name)]
+        return [set(r.chars) for r in derive_precondition(pattern).classes if r.closed]
+
+    def test_default_rules_require_their_punctuation(self):
+        """Test that email needs '@' and SSN needs '-'."""
+        self.assertIn({"@"}, self._required_chars("EMAIL"))
+        self.assertIn({"-"}, self._required_chars("SSN"))
+
+    def test_literal_is_derived(self):
+        """Test that a fixed run of characters becomes a literal requirement."""
+        precondition = _precondition(r"(?i)\bproject\s*argus\b")
+        self.assertEqual(precondition.literal, "project")
+        self.assertFalse(precondition.holds(TextFeatures("argus proj")))
+        self.assertTrue(precondition.holds(TextFeatures("PROJECT ARGUS")))
+
+    def test_optional_and_unprovable_parts_add_nothing(self):
+        """Test that optional groups, alternations without a shared class and lookarounds are left out."""
+        self.assertIsNone(_precondition(r"(?:-)?x?"))
+        self.assertIsNone(_precondition(r"(?=@)"))
+        precondition = _precondition(r"a@|b#")
+        self.assertEqual(set(precondition.classes[0].chars), {"a", "b"})
+
+    def test_scoped_flags_are_respected(self):
+        """Test that a (?i:...) group is not checked case-sensitively."""
+        precondition = _precondition(r"x(?i:secret)")
+        self.assertTrue(precondition.holds(TextFeatures("xSECRET")))
+
+    def test_trigger_skips_prose(self):
+        """Test that the shared trigger ignores prose and fires on any rule's required characters."""
+        trigger = Trigger([_precondition(r"\d{3}-\d{4}"), _precondition(r"\w+@\w+"), _precondition(r"(?i)secret")])
+        self.assertFalse(trigger.fires(TextFeatures("nothing to see here")))
+        for text in ("a - b", "at @ sign", "SECRET", "non-ASCII é"):
+            self.assertTrue(trigger.fires(TextFeatures(text)), text)
+
+class TestPrefilteredRules(unittest.TestCase):
+    """Test cases for prefiltered CompiledRules."""
+
+    def test_prose_skips_every_rule(self):
+        """Test that plain prose runs none of the default PII regexes."""
+        rules = CompiledRules.for_output()
+        self.assertEqual(list(rules.applicable_rules("Thanks, your order ships on Monday.")), [])
+
+    def test_same_results_as_unfiltered(self):
+        """Test that preconditions never hide a match, including non-ASCII digits and case folding."""
+        rng = random.Random(3)
+        texts = SAMPLES + [" ".join(rng.sample(SAMPLES, 3)) for _ in range(200)]
+        for factory in (CompiledRules.for_input, CompiledRules.for_output):
+            for hardened in (False, True):
+                plain = factory(prefilter=False, hardened=hardened)
+                gated = factory(hardened=hardened)
+                for text in texts:
+                    first = gated.first_pii(text)
+                    expected = plain.first_pii(text)
+                    self.assertEqual(first and first.name, expected and expected.name, text)
+                    self.assertEqual(gated.find_all(text), plain.find_all(text), text)
+
+    def test_prefilter_can_be_disabled(self):
+        """Test that prefilter=False runs every rule."""
+        rules = CompiledRules.for_input(prefilter=False)
+        self.assertEqual(len(rules.applicable_rules("plain words")), len(rules.pii_rules))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for L1 rule profiling.
+"""
+
+import io
+import json
+import os
+import re
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from src.argus.filters.layer1.input_filters import InputPIIFilter
+from src.argus.filters.layer1.profiling import iter_corpus_texts, profile_corpus
+from src.argus.filters.layer1.rules import CompiledRules
+from src.argus.interfaces.cli import main
+
+class TestRuleProfiling(unittest.TestCase):
+    """Test cases for per-rule cost accounting."""
+
+    def setUp(self):
+        self.rules = CompiledRules(
+            ["secret"],
+            [re.compile(r"\b\d{3}-\d{2}-\d{4}\b"), re.compile(r"\b\d{6}\b")],
+            ["SSN", "PIN_CODE"],
+            profile=True,
+        )
+
+    def test_live_profiling_counts_evaluated_rules(self):
+        """Test that a profiled filter times only the rules it evaluates."""
+        result = InputPIIFilter(self.rules).check("SSN 123-45-6789 near 560001")
+        self.assertFalse(result.passed)
+        stats = self.rules.profiler.stats
+        self.assertEqual((stats["pii:SSN"].evaluations, stats["pii:SSN"].exits), (1, 1))
+        self.assertEqual(stats["pii:PIN_CODE"].evaluations, 0)
+
+    def test_corpus_profile_reports_shadowed_matches(self):
+        """Test that corpus mode evaluates every rule and counts hidden matches."""
+        texts = ["SSN 123-45-6789 near 560001", "pin 560001", "nothing here"]
+        patterns = [rule.pattern for rule in self.rules.pii_rules]
+        profiler = profile_corpus(texts, [CompiledRules(["secret"], patterns, ["SSN", "PIN_CODE"])])[0]
+        pin = profiler.stats["pii:PIN_CODE"]
+        self.assertEqual((pin.evaluations, pin.matches, pin.exits, pin.shadowed), (3, 2, 1, 1))
+        self.assertEqual(profiler.texts, 3)
+        self.assertEqual(len(profiler.report()), 3)
+
+    def test_cli_ranks_rules_from_jsonl(self):
+        """Test argus-cli --profile-rules against a JSONL corpus."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "corpus.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"prompt": "call 555-123-4567", "meta": {"id": "x"}}) + "\n")
+                f.write("not json 560001\n")
+            self.assertEqual(list(iter_corpus_texts(path, ["prompt"])), ["call 555-123-4567", "not json 560001"])
+            out = io.StringIO()
+            with redirect_stdout(out):
+                main(["--profile-rules", path, "--rules", "input", "--fields", "prompt", "--json"])
+        rows = json.loads(out.getvalue())
+        self.assertTrue(all(row["filter_type"].startswith("INPUT_") for row in rows))
+        self.assertEqual(rows, sorted(rows, key=lambda r: r["total_ms"], reverse=True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for progressive L2 review of streaming responses.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.journal import L2, DecisionJournal
+from src.argus.core.progressive import ProgressiveReview
+from src.argus.llm.mock_llm import MockLLM
+
+CLEAN = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+VIOLATION = {'status': 'success', 'decision': 'VIOLATION', 'reason': 'CONFIDENTIAL_DATA'}
+
+PARAGRAPHS = [f"Paragraph {i} explains one harmless step of the process in plain words." for i in range(6)]
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+class _StreamingLLM(MockLLM):
+    """Streams fixed paragraphs, pausing between them like a slow generator."""
+
+    def __init__(self, paragraphs, delay=0.02):
+        super().__init__(latency_range=(0.0, 0.0))
+        self.paragraphs = paragraphs
+        self.delay = delay
+        self.yielded = 0
+
+    def stream_response(self, prompt):
+        for paragraph in self.paragraphs:
+            time.sleep(self.delay)
+            self.yielded += 1
+            yield paragraph + "\n\n"
+
+class TestProgressiveReview(unittest.TestCase):
+    """Test cases for ProgressiveReview."""
+
+    def test_checks_cover_a_growing_prefix(self):
+        """Test that completed stretches are reviewed and finish returns only the tail."""
+        seen = []
+        review = ProgressiveReview(lambda text: seen.append(text) or CLEAN, min_chars=100, overlap_chars=20)
+        for paragraph in PARAGRAPHS[:4]:
+            review.feed(paragraph + "\n\n")
+            self.assertTrue(_wait_for(lambda: not review._in_flight))
+        review.feed("The last sentence")
+        tail = review.finish()
+        self.assertGreater(review.reviewed, 200)
+        self.assertTrue(tail.endswith("The last sentence"))
+        self.assertLess(len(tail), len(review.text) - 200)
+        self.assertTrue(seen[0].startswith("Paragraph 0"))
+        # Later checks start shortly before where the previous clean one ended.
+        self.assertNotIn("Paragraph 0", seen[1])
+
+    def test_newer_checkpoint_supersedes_a_waiting_one(self):
+        """Test that a stretch completed while checks are busy absorbs the one already waiting."""
+        gate = threading.Event()
+        seen = []
+
+        def analyze(text):
+            seen.append(text)
+            gate.wait(2)
+            return CLEAN
+
+        review = ProgressiveReview(analyze, min_chars=60, overlap_chars=0, max_in_flight=1)
+        for paragraph in PARAGRAPHS[:4]:
+            review.feed(paragraph + "\n\n")
+        # Paragraph 0 is running; 1 and 2 were absorbed by the newer waiting stretch.
+        self.assertEqual(review.superseded, 2)
+        gate.set()
+        self.assertTrue(_wait_for(lambda: review.checks == 2 and not review._in_flight))
+        self.assertEqual(len(seen), 2)
+        self.assertTrue(seen[1].rstrip().endswith("Paragraph 3 explains one harmless step of the process in plain words."))
+        self.assertTrue(seen[1].startswith("Paragraph 1"))
+        self.assertEqual(review.finish(), "")
+
+    def test_coverage_waits_for_earlier_stretches(self):
+        """Test that a clean later stretch only counts once every earlier one is clean."""
+        gates = [threading.Event(), threading.Event()]
+
+        def analyze(text):
+            gates[0 if text.startswith("Paragraph 0") else 1].wait(2)
+            return CLEAN
+
+        review = ProgressiveReview(analyze, min_chars=60, overlap_chars=0, max_in_flight=2)
+        for paragraph in PARAGRAPHS[:2]:
+            review.feed(paragraph + "\n\n")
+        self.assertEqual(len(review._in_flight), 2)
+        gates[1].set()
+        self.assertTrue(_wait_for(lambda: len(review._in_flight) == 1))
+        self.assertEqual(review.reviewed, 0)
+        gates[0].set()
+        self.assertTrue(_wait_for(lambda: not review._in_flight))
+        self.assertEqual(review.reviewed, len(review.text))
+
+    def test_violation_on_a_stretch_is_kept(self):
+        """Test that a VIOLATION on any stretch is reported and stops further checks."""
+        review = ProgressiveReview(lambda text: VIOLATION if "2" in text else CLEAN, min_chars=60, overlap_chars=0)
+        for paragraph in PARAGRAPHS[:3]:
+            review.feed(paragraph + "\n\n")
+            _wait_for(lambda: not review._in_flight)
+        self.assertEqual(review.violation, VIOLATION)
+        checks = review.checks
+        review.feed(PARAGRAPHS[3] + "\n\n")
+        self.assertEqual(review.checks, checks)
+
+class TestProgressiveGateway(unittest.TestCase):
+    """Test cases for L2_PROGRESSIVE in ArgusGateway."""
+
+    def setUp(self):
+        patcher = patch.multiple('src.argus.core.gateway.settings', l2_progressive=True,
+                                 l2_progressive_min_chars=100, l2_progressive_overlap_chars=30)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.journal = DecisionJournal()
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_final_check_covers_only_the_unreviewed_tail(self, mock_guard):
+        """Test that the last guard call sees a short delta and the full text is released."""
+        seen = []
+        mock_guard.side_effect = lambda **kwargs: seen.append(kwargs['response_text']) or CLEAN
+        llm = _StreamingLLM(PARAGRAPHS)
+        gateway = ArgusGateway(llm=llm, journal=self.journal)
+        result = gateway.process_prompt("Explain the process.")
+        self.assertEqual(result, "".join(p + "\n\n" for p in PARAGRAPHS))
+        self.assertGreater(len(seen), 1)
+        self.assertLess(len(seen[-1]), len(result) / 2)
+        self.assertEqual([e.stage for e in self.journal.recent], [L2])
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_violation_stops_the_stream(self, mock_guard):
+        """Test that a violating stretch blocks the response before generation finishes."""
+        mock_guard.side_effect = lambda **kwargs: VIOLATION if "Paragraph 1" in kwargs['response_text'] else CLEAN
+        llm = _StreamingLLM(PARAGRAPHS, delay=0.05)
+        gateway = ArgusGateway(llm=llm, journal=self.journal)
+        result = gateway.process_prompt("Explain the process.")
+        self.assertIn("L2 Violation (CONFIDENTIAL_DATA)", result)
+        self.assertLess(llm.yielded, len(PARAGRAPHS))
+        self.assertEqual(self.journal.recent[-1].decision, "VIOLATION")
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard', return_value=CLEAN)
+    def test_redact_mode_reviews_the_full_response(self, mock_guard):
+        """Test that progressive review is not used when PII is redacted after streaming."""
+        llm = _StreamingLLM(PARAGRAPHS)
+        with patch('src.argus.core.gateway.settings.pii_action', 'redact'):
+            gateway = ArgusGateway(llm=llm)
+            gateway.process_prompt("Explain the process.")
+        self.assertEqual(mock_guard.call_count, 1)
+        self.assertEqual(llm.yielded, 0)
+
+if __name__ == '__main__':
+    unittest.main()
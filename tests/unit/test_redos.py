@@ -0,0 +1,146 @@
+"""
+Tests for ReDoS-safe Layer 1 matching.
+"""
+
+import re
+import time
+import unittest
+from unittest.mock import patch
+from src.argus.core.exceptions import ConfigurationError
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.policy import PolicyEngine, PolicyProfile
+from src.argus.core.review_queue import ReviewQueue
+from src.argus.evaluation.harness import config_with
+from src.argus.filters.layer1.input_filters import InputPIIFilter
+from src.argus.filters.layer1.redos import EXPONENTIAL, POLYNOMIAL, SAFE, WindowedMatcher, analyze_pattern
+from src.argus.filters.layer1.rules import CompiledRules
+from src.argus.llm.mock_llm import MockLLM
+
+def _worst_sweep(rules, text, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for rule in rules.pii_rules:
+            rule.matcher.search(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+class TestBacktrackingAnalysis(unittest.TestCase):
+    """Test cases for the rule risk analyser."""
+
+    def test_known_risky_rules_are_flagged(self):
+        """Test that the quadratic PII rules are classified as polynomial."""
+        risks = {rule.name: analyze_pattern(rule.pattern).level for rule in CompiledRules.for_input().pii_rules}
+        for name in ("EMAIL", "EMAIL_IN", "PHONE", "UPI_ID"):
+            self.assertEqual(risks[name], POLYNOMIAL, name)
+        for name in ("SSN", "PAN", "CCN_REFERENCE"):
+            self.assertEqual(risks[name], SAFE, name)
+
+    def test_nested_quantifier_is_exponential(self):
+        """Test that classic catastrophic patterns are classified as exponential."""
+        self.assertEqual(analyze_pattern(re.compile(r"(a+)+b")).level, EXPONENTIAL)
+        self.assertEqual(analyze_pattern(re.compile(r"(?:x|xy)*z")).level, EXPONENTIAL)
+
+    def test_hardened_rules_are_all_safe(self):
+        """Test that hardened mode leaves no risky matcher in the default rules."""
+        for rule in CompiledRules.for_input(hardened=True).pii_rules:
+            matcher = rule.matcher
+            if not isinstance(matcher, WindowedMatcher):
+                self.assertEqual(analyze_pattern(matcher).level, SAFE, rule.name)
+
+    def test_exponential_rule_is_refused(self):
+        """Test that hardened mode refuses rules it cannot make safe."""
+        with self.assertRaises(ConfigurationError):
+            CompiledRules([], [re.compile(r"(\w+\s?)+$")], ["EVIL"], hardened=True)
+
+class TestHardenedMatching(unittest.TestCase):
+    """Test cases for hardened matching and its budgets."""
+
+    def test_hardened_still_detects_pii(self):
+        """Test that bounded rewrites still match ordinary PII."""
+        rules = CompiledRules.for_output(hardened=True)
+        for text in ("mail john.doe@example.com now", "call 555-123-4567", "pay alice@okaxis"):
+            self.assertIsNotNone(rules.first_pii(text), text)
+
+    def test_windowed_matcher_matches_plain_finditer(self):
+        """Test that windowed matching finds the same short matches across windows."""
+        pattern = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+        text = " ".join(f"word{i} 123-45-{i:04d}" for i in range(300))
+        windowed = WindowedMatcher(pattern, window=128, overlap=32)
+        self.assertEqual(
+            [m.span() for m in windowed.finditer(text)],
+            [m.span() for m in pattern.finditer(text)],
+        )
+
+    def test_worst_case_latency_is_linear(self):
+        """Test that adversarial inputs scale linearly and stay within a fixed bound."""
+        rules = CompiledRules.for_input(hardened=True)
+        small = _worst_sweep(rules, ("a." * 40 + "@") * 100)
+        large = _worst_sweep(rules, ("a." * 40 + "@") * 400)
+        # Quadratic behaviour would be ~16x; allow generous noise around 4x.
+        self.assertLess(large / small, 9)
+        self.assertLess(_worst_sweep(rules, "a." * 16384), 1.0)
+
+    def test_size_guard_fail_closed(self):
+        """Test that oversized input is blocked under the fail-closed policy."""
+        rules = CompiledRules.for_input(hardened=True, max_chars=100, time_budget=1.0, budget_policy="fail_closed")
+        result = InputPIIFilter(rules).check("x" * 101)
+        self.assertFalse(result.passed)
+        self.assertIn("Budget Exceeded", result.violation_detail)
+
+    def test_time_budget_escalate(self):
+        """Test that an exhausted time budget escalates instead of blocking."""
+        rules = CompiledRules.for_input(hardened=True, max_chars=10**6, time_budget=0.0, budget_policy="escalate")
+        result = InputPIIFilter(rules).check("nothing sensitive here")
+        self.assertTrue(result.passed)
+        self.assertTrue(result.escalate)
+
+    def test_budget_policy_follows_injected_config(self):
+        """Test that engines take the budget policy from their config, not the global settings."""
+        config = config_with({"l1_budget_policy": "escalate", "l1_hardened_matching": True, "l1_max_input_chars": 100})
+        with patch("src.argus.filters.layer1.rules.settings.l1_budget_policy", "fail_closed"):
+            engine = PolicyEngine(PolicyProfile(), config)
+            inbound = engine.input_pipeline.run("x" * 101)
+            outbound = engine.output_pipeline.run("x" * 101)
+        for result in (inbound, outbound):
+            self.assertTrue(result.passed, result.violation_detail)
+            self.assertTrue(result.escalate)
+
+class TestHardenedGateway(unittest.TestCase):
+    """Test cases for policy engines built with L1_HARDENED_MATCHING on."""
+
+    def test_engine_builds_and_gateway_answers(self):
+        """Test that engines with rewritten and windowed matchers size themselves and serve requests."""
+        clean = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+        with patch("src.argus.filters.layer1.rules.settings.l1_hardened_matching", True), \
+                patch("src.argus.core.gateway.analyze_response_with_guard", return_value=clean):
+            engine = PolicyEngine(PolicyProfile("default"))
+            matchers = {type(rule.matcher) for rule in engine.input_rules.pii_rules if rule.matcher is not rule.pattern}
+            self.assertTrue(matchers)
+            self.assertGreater(engine.estimated_size, 0)
+            gateway = ArgusGateway(llm=MockLLM(latency_range=(0.0, 0.0)))
+            try:
+                output = gateway.process_prompt("hello")
+            finally:
+                gateway.close()
+        self.assertFalse(output.startswith("[Argus]"), output)
+
+    def test_escalated_response_is_reviewed_synchronously(self):
+        """Test that an L1 check cut short by its budget forces L2 review even in sampled mode."""
+        violation = {'status': 'success', 'decision': 'VIOLATION', 'reason': 'PII_DETECTED'}
+        queue = ReviewQueue(":memory:")
+        with patch.multiple("src.argus.filters.layer1.rules.settings", l1_hardened_matching=True,
+                            l1_time_budget_ms=0, l1_budget_policy="escalate", l2_review_workers=0), \
+                patch("src.argus.core.gateway.analyze_response_with_guard", return_value=violation) as guard, \
+                patch("src.argus.core.gateway.random.random", return_value=0.99):
+            gateway = ArgusGateway(llm=MockLLM(latency_range=(0.0, 0.0)), review_queue=queue)
+            try:
+                output = gateway.process_prompt("TEST::safe::write a poem")
+                self.assertEqual(queue.pending_count(), 0)
+            finally:
+                gateway.close()
+        self.assertIn("L2 Violation", output)
+        self.assertEqual(guard.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
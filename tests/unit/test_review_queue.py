@@ -0,0 +1,159 @@
+"""
+Tests for deferred L2 review: the queue, the worker pool and the journal.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.argus.core.gateway import ArgusGateway
+from src.argus.core.journal import L2, L2_DEFERRED, DecisionJournal
+from src.argus.core.review_queue import DONE, FAILED, PENDING, ReviewQueue, ReviewWorkerPool
+from src.argus.filters.layer2.risk import text_risk
+from src.argus.llm.mock_llm import MockLLM
+
+VIOLATION = {'status': 'success', 'decision': 'VIOLATION', 'reason': 'PII_DETECTED'}
+ERROR = {'status': 'error', 'decision': 'ERROR', 'reason': 'timeout'}
+
+class _FixedLLM(MockLLM):
+    def __init__(self, text):
+        super().__init__(latency_range=(0.0, 0.0))
+        self.text = text
+
+    def get_response(self, prompt):
+        return self.text
+
+class TestRisk(unittest.TestCase):
+    """Test cases for the response risk score."""
+
+    def test_prose_scores_below_figures_and_names(self):
+        """Test that numbers and mid-sentence proper nouns raise the score."""
+        prose = text_risk("The weather today is mild with a light breeze in the afternoon.")
+        leaky = text_risk("Account 4411 belongs to John Smith at Acme, balance 12,500.")
+        self.assertLess(prose, 0.2)
+        self.assertGreaterEqual(leaky, 0.5)
+        self.assertEqual(text_risk(""), 0.0)
+
+class TestReviewQueue(unittest.TestCase):
+    """Test cases for ReviewQueue and ReviewWorkerPool."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "reviews.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_claimed_items_survive_restart(self):
+        """Test that items claimed before a crash are pending again on reopen."""
+        queue = ReviewQueue(self.path)
+        queue.enqueue("acme", "q", "r")
+        self.assertEqual(len(queue.claim()), 1)
+        queue.close()
+        reopened = ReviewQueue(self.path)
+        self.assertEqual(reopened.pending_count(), 1)
+        self.assertEqual(reopened.claim()[0].attempts, 2)
+        reopened.close()
+
+    def test_violation_is_journaled_and_alerted(self):
+        """Test that a deferred violation is journaled and fires the alert hooks."""
+        alerts = []
+        queue = ReviewQueue(self.path)
+        journal = DecisionJournal(alert_hooks=[alerts.append])
+        pool = ReviewWorkerPool(queue, journal, analyze=lambda **kwargs: VIOLATION, template_for=lambda t: None)
+        queue.enqueue("acme", "q", "r", trace_id="t1")
+        pool.review(queue.claim()[0])
+        self.assertEqual(queue.counts(), {DONE: 1})
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual((alerts[0].stage, alerts[0].tenant, alerts[0].trace_id), (L2_DEFERRED, "acme", "t1"))
+        queue.close()
+
+    def test_guard_errors_are_retried_then_failed(self):
+        """Test that guard errors return the item to the queue, after a growing backoff, until max_attempts."""
+        now = [1000.0]
+        queue = ReviewQueue(self.path, max_attempts=3, retry_backoff=2.0, retry_max_backoff=3.0,
+                            clock=lambda: now[0])
+        journal = DecisionJournal()
+        pool = ReviewWorkerPool(queue, journal, analyze=lambda **kwargs: ERROR, template_for=lambda t: None)
+        queue.enqueue(None, "q", "r")
+        pool.review(queue.claim()[0])
+        self.assertEqual(queue.counts(), {PENDING: 1})
+        self.assertEqual(len(journal.recent), 0)
+        now[0] += 1.9
+        self.assertEqual(queue.claim(), [])
+        now[0] += 0.1
+        pool.review(queue.claim()[0])
+        # The second delay would be 4s; it is capped at 3s.
+        now[0] += 2.9
+        self.assertEqual(queue.claim(), [])
+        now[0] += 0.1
+        pool.review(queue.claim()[0])
+        self.assertEqual(queue.counts(), {FAILED: 1})
+        self.assertEqual(journal.recent[-1].decision, "ERROR")
+        queue.close()
+
+    def test_completed_items_keep_no_content(self):
+        """Test that a finished review keeps its verdict but not the prompt or response."""
+        queue = ReviewQueue(self.path)
+        item_id = queue.enqueue("acme", "my secret question", "the answer")
+        queue.claim()
+        queue.complete(item_id, "CLEAN", None)
+        row = queue._conn.execute("SELECT user_prompt, response_text, decision FROM reviews").fetchone()
+        self.assertEqual(row, ("", "", "CLEAN"))
+        queue.close()
+
+    def test_queue_files_from_before_backoff_are_upgraded(self):
+        """Test that a queue written without the retry column opens and still serves its items."""
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            "CREATE TABLE reviews (id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL, tenant TEXT, "
+            "user_prompt TEXT NOT NULL, response_text TEXT NOT NULL, trace_id TEXT, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, decision TEXT, reason TEXT);"
+            "INSERT INTO reviews (created, user_prompt, response_text, status) VALUES (0, 'q', 'r', 'pending');"
+        )
+        conn.commit()
+        conn.close()
+        queue = ReviewQueue(self.path)
+        self.assertEqual(queue.claim()[0].user_prompt, "q")
+        queue.close()
+
+@patch('src.argus.core.gateway.check_output_filters', return_value=None)
+@patch('src.argus.core.gateway.check_input_filters', return_value=None)
+class TestSampledGateway(unittest.TestCase):
+    """Test cases for the gateway in sampled review mode."""
+
+    def setUp(self):
+        self.queue = ReviewQueue(":memory:")
+        self.journal = DecisionJournal()
+
+    def _gateway(self, text):
+        with patch('src.argus.core.gateway.settings.l2_review_workers', 1):
+            return ArgusGateway(llm=_FixedLLM(text), review_queue=self.queue, journal=self.journal)
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard', return_value=VIOLATION)
+    def test_low_risk_response_released_then_reviewed(self, mock_guard, *_):
+        """Test that a low-risk response is returned before the guard runs."""
+        gateway = self._gateway("sure, here is a short poem about the sea.")
+        with patch('src.argus.core.gateway.random.random', return_value=0.99):
+            result = gateway.process_prompt("write a poem", tenant_id="acme")
+        self.assertEqual(result, "sure, here is a short poem about the sea.")
+        self.assertTrue(gateway.review_workers.drain(5))
+        gateway.close()
+        self.assertEqual(mock_guard.call_count, 1)
+        self.assertEqual([e.stage for e in self.journal.recent], [L2_DEFERRED])
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard', return_value=VIOLATION)
+    def test_high_risk_response_reviewed_synchronously(self, mock_guard, *_):
+        """Test that a high-risk response always waits for the guard."""
+        gateway = self._gateway("Card 4111 1111 1111 1111 for Jane Doe, exp 09/27.")
+        with patch('src.argus.core.gateway.random.random', return_value=0.99):
+            result = gateway.process_prompt("show the card")
+        self.assertIn("L2 Violation", result)
+        self.assertEqual(self.queue.counts(), {})
+        gateway.close()
+        self.assertEqual([e.stage for e in self.journal.recent], [L2])
+
+if __name__ == '__main__':
+    unittest.main()
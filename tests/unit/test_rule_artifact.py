@@ -0,0 +1,118 @@
+"""
+Tests for the precompiled Layer 1 rule artifact.
+"""
+
+import io
+import logging
+import os
+import re
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from src.argus.config.security_rules import PII_PATTERN_NAMES, PII_PATTERNS, PII_SAFE_PATTERNS
+from src.argus.core.exceptions import RuleArtifactError
+from src.argus.filters.layer1.artifact import RuleArtifact, analyze_rules, shared_artifact, write_artifact
+from src.argus.filters.layer1.rules import CompiledRules
+from src.argus.interfaces.rules import main as rules_main
+
+TEXTS = [
+    "nothing to see here", "my SSN is 123-45-6789", "mail me at a.b@example.com", "call +91 98765 43210",
+    "card 4111 1111 1111 1111", "PAN ABCDE1234F", "pay name@okaxis", "DOB 01/02/1990", "ProjectArgusSecret",
+]
+
+class TestRuleArtifact(unittest.TestCase):
+    """Test cases for writing, mapping and using the rule artifact."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "rules.argus")
+        self.metadata = write_artifact(self.path, analyze_rules(PII_PATTERN_NAMES, PII_PATTERNS, PII_SAFE_PATTERNS))
+
+    def _open(self, **kwargs):
+        artifact = RuleArtifact(self.path, **kwargs)
+        self.addCleanup(artifact.close)
+        return artifact
+
+    def _corrupt(self, offset):
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            byte = f.read(1)
+            f.seek(offset)
+            f.write(bytes([byte[0] ^ 0xFF]))
+
+    def test_metadata_round_trip(self):
+        """Test that the header and metadata are read back."""
+        artifact = self._open()
+        self.assertEqual(artifact.count, len(PII_PATTERNS))
+        self.assertEqual(artifact.metadata["rules_version"], self.metadata["rules_version"])
+        self.assertEqual(sorted(artifact.metadata["rules"]), sorted(PII_PATTERN_NAMES))
+
+    def test_rules_match_analysed_rules(self):
+        """Test that rules built from the artifact behave like freshly analysed ones."""
+        artifact = self._open()
+        for hardened in (False, True):
+            analysed = CompiledRules([], PII_PATTERNS, PII_PATTERN_NAMES, hardened=hardened)
+            mapped = CompiledRules([], PII_PATTERNS, PII_PATTERN_NAMES, hardened=hardened, artifact=artifact)
+            for expected, actual in zip(analysed.pii_rules, mapped.pii_rules):
+                self.assertEqual(type(expected.matcher), type(actual.matcher))
+                self.assertEqual(expected.risk, actual.risk)
+                self.assertEqual(repr(expected.precondition), repr(actual.precondition))
+            for text in TEXTS:
+                self.assertEqual(analysed.pii_findings(text), mapped.pii_findings(text))
+        self.assertEqual(artifact.misses, 0)
+
+    def test_prefilter_off_ignores_preconditions(self):
+        """Test that prefilter=False drops the recorded preconditions."""
+        rules = CompiledRules([], PII_PATTERNS, PII_PATTERN_NAMES, prefilter=False, artifact=self._open())
+        self.assertTrue(all(rule.precondition is None for rule in rules.pii_rules))
+
+    def test_changed_rule_is_a_miss(self):
+        """Test that a rule edited after compiling is analysed instead of looked up."""
+        artifact = self._open()
+        changed = re.compile(PII_PATTERNS[0].pattern + "x")
+        self.assertIsNone(artifact.lookup(PII_PATTERN_NAMES[0], changed))
+        rules = CompiledRules([], [changed], [PII_PATTERN_NAMES[0]], artifact=artifact)
+        self.assertIsNotNone(rules.pii_rules[0].precondition)
+        self.assertEqual(artifact.misses, 2)
+
+    def test_corrupt_payload_fails_checksum(self):
+        """Test that a flipped payload byte is detected."""
+        self._corrupt(os.path.getsize(self.path) - 2)
+        with self.assertRaises(RuleArtifactError):
+            RuleArtifact(self.path)
+
+    def test_bad_magic_and_empty_file(self):
+        """Test that files that are not artifacts are rejected."""
+        self._corrupt(0)
+        with self.assertRaises(RuleArtifactError):
+            RuleArtifact(self.path)
+        open(self.path, "wb").close()
+        with self.assertRaises(RuleArtifactError):
+            RuleArtifact(self.path)
+
+    def test_shared_artifact_falls_back(self):
+        """Test that an unusable artifact is logged and treated as absent."""
+        missing = os.path.join(self.tmp.name, "missing.argus")
+        with self.assertLogs("src.argus.filters.layer1.artifact", logging.WARNING):
+            self.assertIsNone(shared_artifact(missing))
+        self.assertIsNone(shared_artifact(None))
+        artifact = shared_artifact(self.path)
+        self.addCleanup(artifact.close)
+        self.assertIs(shared_artifact(self.path), artifact)
+
+    def test_cli_compile_and_inspect(self):
+        """Test the argus-rules compile and inspect commands."""
+        output = os.path.join(self.tmp.name, "cli.argus")
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            self.assertEqual(rules_main(["compile", "-o", output]), 0)
+            self.assertEqual(rules_main(["inspect", output, "--json"]), 0)
+            with open(output, "r+b") as f:
+                f.write(b"XXXXXXXX")
+            self.assertEqual(rules_main(["inspect", output]), 1)
+        self.assertIn('"rules_version"', out.getvalue())
+        self.assertIn("not a rule artifact", err.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for request tracing.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from src.argus.core.gateway import ArgusGateway
+from src.argus.filters.layer2.guard_llm import GuardLLMClient
+from src.argus.llm.mock_llm import MockLLM
+from src.argus.utils.tracing import (
+    NOOP_SPAN,
+    BatchSpanProcessor,
+    InMemoryExporter,
+    JsonlFileExporter,
+    Tracer,
+    span,
+)
+
+class TestTracing(unittest.TestCase):
+    """Test cases for spans, sampling and exporters."""
+
+    def setUp(self):
+        self.exporter = InMemoryExporter()
+        self.processor = BatchSpanProcessor(self.exporter, interval=0.05)
+        self.addCleanup(self.processor.shutdown)
+
+    @patch('src.argus.core.gateway.analyze_response_with_guard')
+    def test_gateway_stages_share_one_trace(self, mock_guard):
+        """Test that every gateway stage is a child span of the request."""
+        mock_guard.return_value = {'status': 'success', 'decision': 'CLEAN', 'reason': None}
+        gateway = ArgusGateway(llm=MockLLM(latency_range=(0.0, 0.0)), tracer=Tracer(self.processor))
+        gateway.process_prompt("TEST::safe::hello", trace_id="ab" * 16)
+        self.processor.force_flush()
+
+        spans = {s.name: s for s in self.exporter.spans}
+        root = spans["gateway.process_prompt"]
+        self.assertEqual(root.trace_id, "ab" * 16)
+        for name in ("policy.resolve", "l1.input", "primary_llm", "l1.output", "l2.guard"):
+            self.assertEqual(spans[name].parent_id, root.span_id, name)
+            self.assertGreaterEqual(spans[name].end_ns, spans[name].start_ns)
+        self.assertEqual(spans["l2.guard"].attributes["decision"], "CLEAN")
+
+    def test_guard_sub_steps_are_traced(self):
+        """Test the render, HTTP and parse spans inside the guard call."""
+        client = GuardLLMClient()
+        client.client = MagicMock()
+        message = client.client.chat.completions.create.return_value.choices[0].message
+        message.reasoning = None
+        message.content = '{"decision": "CLEAN", "reason": null}'
+        with Tracer(self.processor).start_trace("request"):
+            client.analyze("q", "r")
+        self.processor.force_flush()
+        names = [s.name for s in self.exporter.spans]
+        self.assertEqual(names[:3], ["guard.render", "guard.http", "guard.parse"])
+
+    def test_unsampled_requests_record_nothing(self):
+        """Test that sampling out a request yields no-op spans."""
+        tracer = Tracer(self.processor, sample_rate=0.0)
+        with tracer.start_trace("request") as root:
+            self.assertIs(root, NOOP_SPAN)
+            self.assertIs(span("child"), NOOP_SPAN)
+        self.assertIs(tracer.start_trace("request", trace_id="ab" * 16), NOOP_SPAN)
+        self.assertIs(Tracer().start_trace("request", trace_id="ab" * 16), NOOP_SPAN)
+        self.processor.force_flush()
+        self.assertEqual(self.exporter.spans, [])
+
+    def test_forced_traces_skip_sampling(self):
+        """Test that force=True records a request the sample rate would drop."""
+        tracer = Tracer(self.processor, sample_rate=0.0)
+        with tracer.start_trace("request", trace_id="ab" * 16, force=True) as root:
+            self.assertEqual(root.trace_id, "ab" * 16)
+        self.processor.force_flush()
+        self.assertEqual([s.name for s in self.exporter.spans], ["request"])
+
+    def test_malformed_trace_ids_are_replaced(self):
+        """Test that only 32-hex, non-zero trace IDs are propagated to exporters."""
+        tracer = Tracer(self.processor)
+        for trace_id in ("not-a-trace", "ab" * 15, "0" * 32, "xy" * 16):
+            with self.assertLogs("src.argus.utils.tracing", "WARNING"):
+                root = tracer.start_trace("request", trace_id=trace_id)
+            self.assertRegex(root.trace_id, "^[0-9a-f]{32}$")
+            self.assertNotEqual(root.trace_id, trace_id)
+        self.assertEqual(tracer.start_trace("request", trace_id="AB" * 16).trace_id, "ab" * 16)
+
+    def test_errors_are_recorded(self):
+        """Test that an exception marks its span as failed."""
+        with self.assertRaises(RuntimeError):
+            with Tracer(self.processor).start_trace("request"):
+                raise RuntimeError("boom")
+        self.processor.force_flush()
+        self.assertEqual(self.exporter.spans[0].status, "error")
+
+    def test_jsonl_exporter(self):
+        """Test that the JSONL exporter writes one object per span."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces.jsonl")
+            processor = BatchSpanProcessor(JsonlFileExporter(path), interval=0.05)
+            with Tracer(processor).start_trace("request"):
+                with span("stage", rule="x"):
+                    pass
+            processor.shutdown()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r["name"] for r in records], ["stage", "request"])
+        self.assertEqual(records[0]["parent_id"], records[1]["span_id"])
+
+if __name__ == '__main__':
+    unittest.main()